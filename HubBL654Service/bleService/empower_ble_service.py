@@ -1,4 +1,3 @@
-import re
 import json
 import logging
 import time
@@ -6,8 +5,11 @@ import random
 from utility.utils import ControlResult, dict_diff, telemetry_filter_patterns, location_filter_pattern, Constants
 import reactivex as rx
 from n2kclient.models.empower_system.empower_system import EmpowerSystem
+from n2kclient.util.key_router import KeyCategory, KeyRouter
 from n2kclient.models.empower_system.circuit_thing import CircuitThing
 from n2kclient.client import N2KClient
+from n2kclient.services.broker_service.broker_protocol import BrokerProtocol
+from n2kclient.services.broker_service.broker_client import N2KBrokerClient
 from n2kclient.models.devices import N2kDevice, N2kDevices
 from n2kclient.models.empower_system.battery import Battery
 from n2kclient.models.empower_system.charger import CombiCharger, ACMeterCharger
@@ -18,13 +20,23 @@ class EmpowerBleService:
     def __init__(self, ble_uart=None):
         self._logger = logging.getLogger("EmpowerBleService")
         self.ble_uart = ble_uart
-        self.n2k_client = N2KClient()
+        # With the broker enabled, the state is shared by the N2KClient of the ThingsBoard service.
+        # The alarm history is only recorded by the ThingsBoard service, which serves it.
+        self.n2k_client = (
+            N2KBrokerClient()
+            if BrokerProtocol.enabled
+            else N2KClient(record_alarm_history=False)
+        )
         self._service_init_disposables = []
         self._prev_system_subscription = None
         self.last_telemetry = {}
         self.last_state_attrs = {}
         self.attribute_sub_set = set() #{attribute_ID, ...}
         self.attribute_dict = {} #{attribute_ID: (value, timestamp)}
+        self.key_router = KeyRouter(
+            telemetry_patterns=telemetry_filter_patterns,
+            location_pattern=location_filter_pattern,
+        )
         self.__setup_subscriptions()
         self._logger.debug("Starting empower ble service...")
 
@@ -49,13 +61,7 @@ class EmpowerBleService:
         """
         Handle state changes for the given devices.
         """
-        mobile_dict = devices.to_mobile_dict()
-        state_attrs = {
-            key: value
-            for key, value in mobile_dict.items()
-            if not any(re.match(pattern, key) for pattern in telemetry_filter_patterns)
-               and not re.match(location_filter_pattern, key)
-        }
+        state_attrs = self.key_router.route(devices.to_mobile_dict())[KeyCategory.STATE]
 
         diff_attrs = dict_diff(self.last_state_attrs, state_attrs)
         if diff_attrs:
@@ -78,6 +84,7 @@ class EmpowerBleService:
 
         # Set empty state before parsing into dict to handle case where new config is uploaded
         self.attribute_dict = {}
+        self.key_router.invalidate()
         empower_dict = config.to_config_dict()
         self.attribute_dict = {
             channel_id: (None, 0)
@@ -5,9 +5,7 @@ It uses the Thingsboard MQTT client to connect to the Thingsboard server and sen
 It also handles offline state and stores telemetry and attributes in a queue when offline.
 It uses the reactivex library to handle observables and subscriptions.
 """
-from multiprocessing import Queue
 import hashlib
-import queue
 import threading
 import time
 from typing import Any, Callable
@@ -28,9 +26,30 @@ from tb_utils.utility import (
     get_tb_port,
     get_access_token
 )
+from tb_utils.offline_queue import OfflineTelemetryQueue
+from tb_utils.publish_window import PublishWindow
 from dict_diff import dict_diff
+from n2kclient.util.settings_util import SettingsUtil
 import os
 
+# Seconds changes are gathered for after the first one, before the workers publish them
+COALESCE_WINDOW = SettingsUtil.get_setting(
+    Constants.THINGSBOARD_SETTINGS_KEY,
+    Constants.TELEMETRY,
+    Constants.COALESCE_WINDOW,
+    default_value=0.1
+)
+
+# Maximum size in bytes of the payload of a batch of offline telemetry,
+# the queue offset is committed after each batch. Capped by the max_payload_size
+# of the client, above which the SDK splits the payload again
+TELEMETRY_OFFLINE_BATCH_SIZE = SettingsUtil.get_setting(
+    Constants.THINGSBOARD_SETTINGS_KEY,
+    Constants.TELEMETRY,
+    Constants.TELEMETRY_OFFLINE_BATCH_SIZE,
+    default_value=32768
+)
+
 class ThingsBoardClient:
     """
     Thingsboard Client singleton class to connect to Thingsboard and send telemetry and attributes.
@@ -43,16 +62,18 @@ class ThingsBoardClient:
 
     # Offline cached values
     offline_attributes: {string, any}
-    offline_telemetry_queue: Queue
+    offline_telemetry_queue: OfflineTelemetryQueue
+    publish_window: PublishWindow
     telemetry_thread: threading.Thread
     telemetry_thread_event: threading.Event
+    telemetry_condition: threading.Condition
     attributes_thread: threading.Thread
     attributes_thread_event: threading.Event
+    attributes_condition: threading.Condition
     connect_thread: threading.Thread = None
     connect_thread_event: threading.Event = None
-    # Get the max queue size from appsettings.json
-    queue_size = 3000
-    telemetry_chunk_size = 100
+    telemetry_batch_size = TELEMETRY_OFFLINE_BATCH_SIZE
+    coalesce_window = COALESCE_WINDOW
 
     # Cached last known values
     last_telemetry: dict[str, Any] = {}
@@ -79,7 +100,8 @@ class ThingsBoardClient:
         self._initialized = True
         self._is_connected = False
         self.offline_attributes = {}
-        self.offline_telemetry_queue = Queue(maxsize=self.queue_size)
+        self.offline_telemetry_queue = OfflineTelemetryQueue()
+        self.publish_window = PublishWindow()
         self._client = TBDeviceMqttClient(
             host=get_tb_host(), username=get_access_token(), port=get_tb_port()
         )
@@ -88,6 +110,9 @@ class ThingsBoardClient:
         # listen to. Set Paho's on_disconnect function to client.py
         # on_disconnect, then pass it to Thingsboard SDK.
         self._client._client.on_disconnect = self.__on_disconnect
+        # The Thingsboard SDK does not listen to the publish acknowledgements either,
+        # they release the slots of the publish window.
+        self._client._client.on_publish = self.__on_publish
         # Need to overwrite and remove the __add_metadata_to_data_dict_from_device functionality
         # as it was adding a timestamp to the metadata entry which causes each config to be different.
         self._client._TBDeviceMqttClient__add_metadata_to_data_dict_from_device = lambda x: x
@@ -98,6 +123,10 @@ class ThingsBoardClient:
 
         self._rpc_handlers = {}
 
+        # Signalled when there is something for the workers to publish, or they must stop
+        self.telemetry_condition = threading.Condition()
+        self.attributes_condition = threading.Condition()
+
         self._is_connected_internal = rx.subject.BehaviorSubject(False)
         self.is_connected = self._is_connected_internal.pipe(
             ops.distinct_until_changed()
@@ -107,6 +136,7 @@ class ThingsBoardClient:
             # If we are connected, and we have offline state to publish
             # Go through and update the state to thingsboard
             if connected_value:
+                self._notify_workers()
                 if len(self.offline_attributes) > 0:
                     self._logger.info(
                         "Came back from offline state."
@@ -136,19 +166,51 @@ class ThingsBoardClient:
         """
         self.attributes_thread_event = threading.Event()
         self.attributes_thread = threading.Thread(
-            target=self.attributes_worker, name="Attributes worker"
+            target=self.attributes_worker,
+            args=(self.attributes_thread_event,),
+            name="Attributes worker"
         )
         self.attributes_thread.start()
 
-    def attributes_worker(self):
+    def _notify_workers(self):
+        """
+        Wake up the workers, to publish what is pending or to stop
+        """
+        with self.telemetry_condition:
+            self.telemetry_condition.notify_all()
+        with self.attributes_condition:
+            self.attributes_condition.notify_all()
+
+    def _wait_for_work(
+        self, condition: threading.Condition, stop_event: threading.Event,
+        has_work: Callable[[], bool]) -> bool:
+        """
+        Block until there is work and we are connected, then wait the coalescing window
+        so the changes that follow closely are published together.
+        Returns False if the worker must stop.
+        """
+        with condition:
+            condition.wait_for(
+                lambda: stop_event.is_set()
+                or (has_work() and self._is_connected_internal.value)
+            )
+        return not stop_event.wait(self.coalesce_window)
+
+    def attributes_worker(self, stop_event: threading.Event = None):
         """
         Function to be used on the thread for attributes
-        This will check every wait interval to see if there are any attributes
-        to send to Thingsboard. If we are online, then we will send the attributes then update
+        This will block until attributes are added to the attribute dictionary while we are online,
+        then send the attributes gathered during the coalescing window to Thingsboard and update
         the last known attributes.
         """
         self._logger.info("Starting attributes worker thread")
-        while not self.attributes_thread_event.wait(0.5):
+        if stop_event is None:
+            stop_event = self.attributes_thread_event
+        while self._wait_for_work(
+            self.attributes_condition,
+            stop_event,
+            lambda: len(self.attribute_dictionary) != 0
+        ):
             try:
                 # Check to see if we have any pending items,
                 # if there are items, make sure we are connected
@@ -181,37 +243,46 @@ class ThingsBoardClient:
     def telemetry_worker(self):
         """
         Function to be used on the thread for telemetry
-        If we are offline, then we will add the values into this queue.
-        We check every wait interval to see if the queue is not empty
-        and we are online. We will go back to sleep until we iterate again
+        If we are offline, then the values are added to the offline queue on disk.
+        We block until the queue is not empty and we are online, then send the queue
+        in batches of up to telemetry_batch_size bytes, and at most the max_payload_size
+        of the client, until it is empty. The SDK still publishes one message per
+        timestamp of a batch. A batch is only removed from the queue once the broker
+        acknowledged all its messages, so a batch interrupted by a disconnect or a
+        restart is sent again.
         """
-        while not self.telemetry_thread_event.wait(0.5):
+        while self._wait_for_work(
+            self.telemetry_condition,
+            self.telemetry_thread_event,
+            lambda: not self.offline_telemetry_queue.empty()
+        ):
             try:
-                # Check to see if we have any pending items,
-                # if there are items, make sure we are connected
-                if (
-                    not self.offline_telemetry_queue.empty()
-                    and self._is_connected_internal.value
+                while (
+                    self._is_connected_internal.value
+                    and not self.telemetry_thread_event.is_set()
                 ):
-                    chunk_iteration = 0
-                    # Need to check the connection status in this queue while we loop so
-                    # we don't keep adding the same items back into the queue
-                    while (
-                        not self.offline_telemetry_queue.empty()
-                        and chunk_iteration < self.telemetry_chunk_size
-                        and self._is_connected_internal.value
-                    ):
-                        # Get the oldest message in the telemetry queue
-                        telemetry_attributes = self.offline_telemetry_queue.get_nowait()
-                        self._logger.info(
-                            "Attempting to add telemetry from offline state %s",
-                            json.dumps(telemetry_attributes),
+                    # Get the oldest batch of the telemetry queue
+                    # The server may lower max_payload_size on connect
+                    batch, position = self.offline_telemetry_queue.peek(
+                        min(self.telemetry_batch_size, self._client.max_payload_size)
+                    )
+                    if len(batch) == 0:
+                        break
+                    self._logger.info(
+                        "Sending %d telemetry items from offline state", len(batch)
+                    )
+                    # Wait for the broker to acknowledge the messages of the batch
+                    # before removing it from the queue. The result of the publish
+                    # only tells they were queued.
+                    self.publish_window.acquire()
+                    result = self._client.send_telemetry(batch, wait_for_publish=False)
+                    self.publish_window.track(result)
+                    if not self.publish_window.wait_published(result):
+                        self._logger.warning(
+                            "Offline telemetry was not acknowledged, keeping it in the queue"
                         )
-                        # Send it to thingsboard and increment the chunk counter
-                        self.send_telemetry(telemetry_attributes)
-                        chunk_iteration += 1
-                        # Need to sleep in between messages otherwise thingsboard will lose messages
-                        time.sleep(0.001)
+                        break
+                    self.offline_telemetry_queue.commit(position)
             # Caught an exception, print it out and continue. Need to keep this thread running
             # all the time.
             except Exception as error:
@@ -228,6 +299,8 @@ class ThingsBoardClient:
         except Exception as error:
             self._logger.error("Failed to stop attributes thread")
             self._logger.error(error)
+        self._notify_workers()
+        self.offline_telemetry_queue.close()
         # Disconnect from mqtt if we are connected
         # when the destructor is called
         if self._is_connected:
@@ -301,9 +374,9 @@ class ThingsBoardClient:
                     self._logger.info(
                         "Updating offline configuration state with checksum"
                     )
+                    # The attributes worker publishes the configuration before the other
+                    # attributes, in order.
                     self.update_attributes(configuration_message_entry)
-                    # Need to add a sleep so TB client to process both messages.
-                    time.sleep(0.001)
                 self._logger.info("Updating state from offline")
                 self.update_attributes(self.offline_attributes)
                 self.offline_attributes.clear()
@@ -394,11 +467,17 @@ class ThingsBoardClient:
             self._logger.error("Failed to stop attributes thread upon disconnect")
             self._logger.error(error)
         self._is_connected_internal.on_next(False)
+        self._notify_workers()
+        # The client drops the messages in flight
+        self.publish_window.reset()
         # Send the disconnect event to Thingsboard client, so it can know of the
         # disconnect.
         # pylint: disable=protected-access
         self._client._on_disconnect(client, userdata, result_code, properties)
 
+    def __on_publish(self, client, userdata, mid, *extra_params):
+        self.publish_window.on_publish(mid)
+
     def process_changes(self,
                 new_changes: dict[str, Any],
                 last_known_state: dict[str, Any],
@@ -492,6 +571,22 @@ class ThingsBoardClient:
             self._logger.error(error)
             return
 
+    def publish_attributes(self, attributes: dict[str, Any]):
+        """
+        Publish attributes as they are, without comparing them to the last known
+        or cloud state first. Used when the caller already knows they changed.
+        If we are not connected, add the attributes to the offline attributes.
+        """
+        if attributes is None or len(attributes) == 0:
+            return
+        if self._is_connected_internal.value is False:
+            self.offline_attributes.update(attributes)
+            self._logger.info("Added state to offline attributes %s", attributes.keys())
+            return
+        with self.last_attributes_lock:
+            self.last_attributes.update(attributes)
+        self._add_attributes_to_dictionary(attributes)
+
     def request_then_update_attributes(self,
             not_cached: list[str],
             not_cached_dict: dict[str, Any],
@@ -585,6 +680,8 @@ class ThingsBoardClient:
             self._logger.info(
                 "Adding attributes to dictionary %s", json.dumps(attributes)
             )
+        with self.attributes_condition:
+            self.attributes_condition.notify_all()
 
     def _chunk_and_send_attributes(
         self, attributes: dict[str, Any], chunk_size: int = 100):
@@ -610,19 +707,22 @@ class ThingsBoardClient:
                 # so we don't run into issues with the message size.
                 if Constants.CONFIG_KEY in chunk:
                     config = chunk.pop(Constants.CONFIG_KEY, None)
-                    _ = self._client.send_attributes(
-                        {
-                            Constants.CONFIG_KEY: config
-                        },
-                        wait_for_publish=True
-                    )
-                time.sleep(0.010)  # Sleep to allow Thingsboard to process the message
-                _ = self._client.send_attributes(chunk, wait_for_publish=True)
+                    self._publish_attributes({Constants.CONFIG_KEY: config})
+                if len(chunk) > 0:
+                    self._publish_attributes(chunk)
         except Exception as error:
             self._logger.error("Failed to send attributes")
             self._logger.error(error)
             return
 
+    def _publish_attributes(self, attributes: dict[str, Any]):
+        """
+        Publish attributes once the publish window has room for them, instead of
+        waiting for each message to be acknowledged.
+        """
+        self.publish_window.acquire()
+        result = self._client.send_attributes(attributes, wait_for_publish=False)
+        self.publish_window.track(result)
 
     def subscribe_attribute(
         self, attribute_name: str, default_value: Any
@@ -702,25 +802,14 @@ class ThingsBoardClient:
                 self._logger.error(error)
                 return
         else:
-            # Try to add the telemetry into the queue. Catch if the exception was that the queue
-            # was full. If it is, dequeue the oldest value to put this new value to the back of
-            # the queue.
-            try:
-                self._logger.info("putting telemetry to offline queue")
-                self.offline_telemetry_queue.put_nowait(telemetry)
-            except queue.Full:
-                # Queue was full when attempting to add
-                # Remove the oldest value in order to add the newest value in
-                self._logger.info(
-                    "Failed to add telemetry,"
-                    + " removing oldest value before adding new value"
-                )
-                # Get the oldest value
-                dequeue_value = self.offline_telemetry_queue.get_nowait()
-                # Print the value we are removing
-                self._logger.info("Removed Telemetry Item %s", dequeue_value)
-                # Insert the newest value into thte queue
-                self.offline_telemetry_queue.put_nowait(telemetry)
+            # Stamp the telemetry with the time it was produced, it is only uploaded
+            # once we are back online, possibly days later.
+            if Constants.ts not in telemetry:
+                telemetry = {Constants.ts: current_time, values_key: telemetry}
+            self._logger.debug("putting telemetry to offline queue")
+            self.offline_telemetry_queue.put(telemetry)
+            with self.telemetry_condition:
+                self.telemetry_condition.notify_all()
 
     def request_attributes_state(
         self,
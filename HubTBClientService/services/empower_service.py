@@ -4,7 +4,8 @@ This service sends the state that is received from the N2K client and publishes
 to the Thingsboard cloud.
 """
 import os
-import re
+import base64
+import gzip
 import json
 import hashlib
 from typing import Any, Dict, Optional, Union
@@ -23,16 +24,32 @@ from services.config import (
     bilge_pump_power_filter_pattern,
 )
 from tb_utils.constants import Constants
+from tb_utils.utility import ConfigUploadFormat
 from n2kclient.models.empower_system.engine_list import EngineList
 from n2kclient.models.empower_system.empower_system import EmpowerSystem
 from n2kclient.client import N2KClient
+from n2kclient.services.broker_service.broker_protocol import BrokerProtocol
+from n2kclient.services.broker_service.broker_server import N2KBrokerServer
 from n2kclient.models.devices import N2kDevices
 from n2kclient.models.dbus_connection_status import DBUSConnectionStatus
 from n2kclient.models.empower_system.alarm import AlarmState, Alarm
 from n2kclient.models.empower_system.alarm_list import AlarmList
 from n2kclient.models.empower_system.engine_alarm_list import EngineAlarmList
+from n2kclient.util.key_router import KeyCategory, KeyRouter
+from n2kclient.util.settings_util import SettingsUtil
+from n2kclient.util.tracing import pipeline_tracer
 from .location_service import LocationService
 
+# Format the configuration is uploaded in: json, gzip or sharded
+CONFIG_UPLOAD_FORMAT = SettingsUtil.get_setting(
+    Constants.THINGSBOARD_SETTINGS_KEY,
+    Constants.CONFIGURATION,
+    Constants.UPLOAD_FORMAT,
+    default_value=ConfigUploadFormat.JSON.value
+)
+# Version of the configuration manifest, see doc/ConfigurationUpload.md
+CONFIG_MANIFEST_VERSION = 1
+
 class EmpowerService:
     """
     EmpowerService class for handling telemetry, state, and alarms in a ThingsBoard environment.
@@ -40,10 +57,13 @@ class EmpowerService:
     _logger: logging.Logger = logging.getLogger("EmpowerService")
 
     thingsboard_client: ThingsBoardClient
-    n2k_client: N2KClient = N2KClient()
+    n2k_client: N2KClient
+    n2k_broker: Optional[N2KBrokerServer] = None
     location_service: LocationService
+    key_router: KeyRouter
     rpc_handler_service: RpcHandlerService = None
     telemetry_consent: bool = True
+    config_upload_format: ConfigUploadFormat = ConfigUploadFormat(CONFIG_UPLOAD_FORMAT)
 
     _service_init_disposables: list[rx.abc.DisposableBase]
 
@@ -55,6 +75,10 @@ class EmpowerService:
         self._logger = logging.getLogger("EmpowerService")
         self.thingsboard_client = ThingsBoardClient()
         self.n2k_client = N2KClient()
+        # Shares the state of the client with the other services, e.g. the BLE service
+        self.n2k_broker = (
+            N2KBrokerServer(self.n2k_client) if BrokerProtocol.enabled else None
+        )
         self.rpc_handler_service = RpcHandlerService(self.n2k_client)
         self._service_init_disposables = []
         self._engine_list = {}
@@ -62,6 +86,11 @@ class EmpowerService:
         self._engine_alarms = {}
         self.sync_service = SyncService()
         self.location_service = LocationService(self.n2k_client)
+        self.key_router = KeyRouter(
+            telemetry_patterns=telemetry_filter_patterns,
+            location_pattern=location_filter_pattern,
+            state_dependent_patterns=[bilge_pump_power_filter_pattern],
+        )
 
         self.__setup_subscriptions()
 
@@ -80,17 +109,21 @@ class EmpowerService:
     def _reconcile_active_alarms(self, alarm_list: AlarmList):
         latest_cloud_alarms = self._active_alarms
         alarm_timeseries = []
-        for [id, alarm] in alarm_list.alarm.items():
+        for [id, alarm] in list(alarm_list.alarm.items()):
             if id in latest_cloud_alarms:
                 cloud_state = latest_cloud_alarms[id][Constants.currentState]
                 cloud_date_active = latest_cloud_alarms[id][Constants.dateActive]
                 if alarm.current_state == AlarmState.ENABLED:
                     if cloud_state == AlarmState.ENABLED:
-                        alarm.date_active = cloud_date_active
+                        # Alarms are immutable, keep the cloud date in the shared list
+                        alarm_list.alarm[id] = alarm.replace(
+                            date_active=cloud_date_active
+                        )
                     else:
                         alarm_timeseries.append(alarm)
                 elif alarm.current_state == AlarmState.ACKNOWLEDGED:
-                    alarm.date_active = cloud_date_active
+                    alarm = alarm.replace(date_active=cloud_date_active)
+                    alarm_list.alarm[id] = alarm
                     if cloud_state != AlarmState.ACKNOWLEDGED:
                         alarm_timeseries.append(alarm)
             else:
@@ -148,30 +181,17 @@ class EmpowerService:
             self._logger.debug("Telemetry consent not granted, skipping device state changes.")
             return
 
-        mobile_dict = devices.to_mobile_dict()
+        with pipeline_tracer.stage("route"):
+            routed_attrs = self.key_router.route(devices.to_mobile_dict())
 
-        telemetry_attrs = {
-            key: value
-            for key, value in mobile_dict.items()
-            if any(re.match(pattern, key) for pattern in telemetry_filter_patterns)
-        }
+        telemetry_attrs = routed_attrs[KeyCategory.TELEMETRY]
 
-        state_attrs = {
-            key: value
-            for key, value in mobile_dict.items()
-            if not any(re.match(pattern, key) for pattern in telemetry_filter_patterns)
-               and not re.match(location_filter_pattern, key)
-               and not re.match(bilge_pump_power_filter_pattern, key)
-        }
+        state_attrs = routed_attrs[KeyCategory.STATE]
 
         # Telemetry values that have state associated with them so
         # we can keep track and sync with cloud on startup and avoid
         # sending push notifications each time.
-        telemetry_state_attrs = {
-            key: value
-            for key, value in mobile_dict.items()
-            if re.match(bilge_pump_power_filter_pattern, key)
-        }
+        telemetry_state_attrs = routed_attrs[KeyCategory.STATE_DEPENDENT]
 
         # TODO: Handle location attributes
         # elif re.match(location_filter_pattern, key):
@@ -180,15 +200,18 @@ class EmpowerService:
         # Send telemetry updates
         if telemetry_attrs:
             print("Sending telemetry updates:", telemetry_attrs)
-            self.thingsboard_client.send_telemetry(telemetry_attrs)
+            with pipeline_tracer.stage("send_telemetry"):
+                self.thingsboard_client.send_telemetry(telemetry_attrs)
 
         # Send state updates
         if state_attrs:
             print("Sending state updates:", state_attrs)
-            self.thingsboard_client.update_attributes(state_attrs)
+            with pipeline_tracer.stage("update_attributes"):
+                self.thingsboard_client.update_attributes(state_attrs)
 
         if telemetry_state_attrs:
-            self.__handle_state_dependent_telemetry(telemetry_state_attrs)
+            with pipeline_tracer.stage("state_dependent_telemetry"):
+                self.__handle_state_dependent_telemetry(telemetry_state_attrs)
 
     def __handle_state_dependent_telemetry(self, attrs: dict):
         """
@@ -268,6 +291,10 @@ class EmpowerService:
             dispose = behavior_subject.subscribe(self._set_engine_list)
             self._service_init_disposables.append(dispose)
         # ======= N2K Client Subscriptions =======
+        # Reset the cached key classifications whenever the configuration changes
+        disposable = (self.n2k_client.get_empower_system_observable()
+                      .subscribe(self.key_router.invalidate))
+        self._service_init_disposables.append(disposable)
         # Subscribe to mobile friendly engine configuration
         disposable = (self.n2k_client.get_engine_list_observable()
                       .subscribe(self._update_engine_configuration))
@@ -348,9 +375,11 @@ class EmpowerService:
         config_dict = config.to_config_dict()
         # Get the checksum of the config, don't attempt to udpate if the config
         # is the same
-        hashed_string = hashlib.new("sha256")
-        hashed_string.update(json.dumps(config.to_config_dict()).encode())
-        checksum_value = hashed_string.hexdigest()
+        checksum_value = self._get_checksum(config_dict)
+
+        if self.config_upload_format != ConfigUploadFormat.JSON:
+            self._upload_configuration_with_manifest(config_dict, checksum_value)
+            return
 
         prev_value = self.thingsboard_client.last_attributes.get(
             Constants.CONFIG_CHECKSUM_KEY, None
@@ -370,6 +399,95 @@ class EmpowerService:
             )
 
 
+    def _upload_configuration_with_manifest(
+        self, config_dict: dict[str, Any], checksum_value: str
+    ):
+        """
+        Upload the configuration compressed or sharded per thing, along with the manifest
+        describing it (doc/ConfigurationUpload.md). The new manifest is compared to the one
+        uploaded last, requested from the cloud after a restart, so an unchanged configuration
+        is not uploaded and only the changed things are uploaded when sharded.
+        """
+        previous_manifest = self.thingsboard_client.last_attributes.get(
+            Constants.CONFIG_MANIFEST_KEY, None
+        )
+        if previous_manifest is not None:
+            self._send_configuration(config_dict, checksum_value, previous_manifest)
+            return
+
+        manifest_subject = rx.Subject()
+        manifest_subject.subscribe(
+            lambda value: self._send_configuration(
+                config_dict,
+                checksum_value,
+                value.get(Constants.CONFIG_MANIFEST_KEY, None),
+            )
+        )
+        self.thingsboard_client.request_attributes_state(
+            subject=manifest_subject,
+            client_attributes=[Constants.CONFIG_MANIFEST_KEY],
+        )
+
+    def _send_configuration(
+        self,
+        config_dict: dict[str, Any],
+        checksum_value: str,
+        previous_manifest: Optional[dict[str, Any]],
+    ):
+        """
+        Send the configuration attributes that changed since the previous manifest,
+        then the new manifest and checksum.
+        """
+        if not isinstance(previous_manifest, dict):
+            previous_manifest = {}
+        if (
+            previous_manifest.get("format") == self.config_upload_format.value
+            and previous_manifest.get("checksum") == checksum_value
+        ):
+            self._logger.debug(
+                "Cloud configuration is up to date, no changes detected."
+            )
+            return
+
+        attributes = {}
+        manifest = {
+            "version": CONFIG_MANIFEST_VERSION,
+            "format": self.config_upload_format.value,
+            "checksum": checksum_value,
+        }
+        if self.config_upload_format == ConfigUploadFormat.GZIP:
+            payload = json.dumps(config_dict, separators=(",", ":")).encode()
+            # No timestamp in the header, the same configuration compresses the same
+            attributes[Constants.CONFIG_GZIP_KEY] = base64.b64encode(
+                gzip.compress(payload, mtime=0)
+            ).decode()
+        else:
+            previous_things = {}
+            if previous_manifest.get("format") == ConfigUploadFormat.SHARDED.value:
+                previous_things = previous_manifest.get("things", {})
+            thing_hashes = {}
+            for thing_id, thing in config_dict["things"].items():
+                thing_hashes[thing_id] = self._get_checksum(thing)
+                if previous_things.get(thing_id) != thing_hashes[thing_id]:
+                    attributes[Constants.CONFIG_THING_KEY_PREFIX + thing_id] = thing
+            manifest["things"] = thing_hashes
+            manifest["metadata"] = config_dict["metadata"]
+        # The manifest after the attributes it describes, the app reads it first
+        attributes[Constants.CONFIG_MANIFEST_KEY] = manifest
+        attributes[Constants.CONFIG_CHECKSUM_KEY] = checksum_value
+        self._logger.info(
+            "Uploading %s cloud configuration, %d attributes",
+            self.config_upload_format.value,
+            len(attributes),
+        )
+        self.thingsboard_client.publish_attributes(attributes)
+
+    @staticmethod
+    def _get_checksum(value: dict[str, Any]) -> str:
+        hashed_string = hashlib.new("sha256")
+        hashed_string.update(json.dumps(value).encode())
+        return hashed_string.hexdigest()
+
     def _update_engine_configuration(self, config: EngineList):
         """
         Update the cloud configuration with the provided config.
@@ -475,5 +593,11 @@ class EmpowerService:
         self.thingsboard_client.connect()
         self._logger.debug("Starting location service")
         self.location_service.start()
+        if self.n2k_broker is not None:
+            self._logger.debug("Starting N2K broker")
+            try:
+                self.n2k_broker.start()
+            except Exception as e:
+                self._logger.error("Failed to start N2K broker: %s", e)
         self._logger.debug("Starting N2K Client")
         self.n2k_client.start()
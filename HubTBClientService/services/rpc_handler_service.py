@@ -100,6 +100,12 @@ class RpcHandlerService:
         self.thingsboard_client.set_rpc_handler(
             "factoryReset", self.__factory_reset_rpc_handler
         )
+        self.thingsboard_client.set_rpc_handler(
+            "getAlarmHistory", self.__get_alarm_history_rpc_handler
+        )
+        self.thingsboard_client.set_rpc_handler(
+            "acknowledgeAlarms", self.__acknowledge_alarms_handler
+        )
 
     def __refreshAlarms_rpc_handler(self, body: dict[str, any]):
         self._logger.info("Received refreshAlarm command")
@@ -149,22 +155,60 @@ class RpcHandlerService:
             if not "alarmId" in body:
                 raise Exception("Invalid acknowledge command: alarmId is missing")
 
-            alarm_id_segments = str(body["alarmId"]).split(".")
+            alarm_id = self._parse_alarm_id(body["alarmId"])
+            result = self._acknowledge_alarm(alarm_id)
+            return result.to_json()
 
-            if len(alarm_id_segments) < 2 or not (alarm_id_segments[1]).isdigit():
-                raise Exception(
-                    "Invalid acknowledge command: alarmId is not of the format alarm.###"
-                )
+        except Exception as error:
+            self._logger.error("Failed to acknowledge command")
+            self._logger.error(error)
+            response = ControlResult(False, str(error))
+            return response.to_json()
 
-            alarm_id = alarm_id_segments[1]
-            if alarm_id not in self.thingsboard_client.last_attributes[Constants.ACTIVE_ALARMS_KEY]:
-                raise Exception(f"Active alarms with ID {alarm_id} not found")
+    def _parse_alarm_id(self, alarm_id: any) -> int:
+        alarm_id_segments = str(alarm_id).split(".")
 
-            result = self._acknowledge_alarm(int(alarm_id))
-            return result.to_json()
+        if len(alarm_id_segments) < 2 or not (alarm_id_segments[1]).isdigit():
+            raise Exception(
+                "Invalid acknowledge command: alarmId is not of the format alarm.###"
+            )
+
+        alarm_id = alarm_id_segments[1]
+        if alarm_id not in self.thingsboard_client.last_attributes[Constants.ACTIVE_ALARMS_KEY]:
+            raise Exception(f"Active alarms with ID {alarm_id} not found")
+        return int(alarm_id)
+
+    def __acknowledge_alarms_handler(self, body: dict[str, any]):
+        self._logger.info("Received acknowledge alarms command: %s", body)
+        try:
+            if not isinstance(body.get("alarmIds", None), list):
+                raise Exception("Invalid acknowledge command: alarmIds is missing")
+
+            results = {}
+            alarm_ids = {}
+            for alarm_id in body["alarmIds"]:
+                try:
+                    alarm_ids[alarm_id] = self._parse_alarm_id(alarm_id)
+                except Exception as error:
+                    results[alarm_id] = ControlResult(False, str(error)).to_json()
+
+            if len(alarm_ids) > 0:
+                acknowledged = self.n2k_client.acknowledge_alarms(
+                    list(alarm_ids.values())
+                )
+                for alarm_id, parsed_alarm_id in alarm_ids.items():
+                    successful = acknowledged.get(parsed_alarm_id, False)
+                    results[alarm_id] = ControlResult(
+                        successful, None if successful else "Failed to acknowledge alarm"
+                    ).to_json()
+
+            return {
+                "successful": all(result["successful"] for result in results.values()),
+                "results": results,
+            }
 
         except Exception as error:
-            self._logger.error("Failed to acknowledge command")
+            self._logger.error("Failed to acknowledge alarms")
             self._logger.error(error)
             response = ControlResult(False, str(error))
             return response.to_json()
@@ -181,6 +225,26 @@ class RpcHandlerService:
             self._logger.error(error)
             return ControlResult(False, "Failed to acknowledge alarm")
 
+    def __get_alarm_history_rpc_handler(self, body: dict[str, any]):
+        self._logger.info("Received getAlarmHistory command: %s", body)
+        try:
+            start = body.get("from", None)
+            end = body.get("to", None)
+            thing_id = body.get("thingId", None)
+            transitions = self.n2k_client.get_alarm_history(
+                start=int(start) if start is not None else None,
+                end=int(end) if end is not None else None,
+                thing_id=thing_id,
+            )
+            return {
+                "successful": True,
+                "history": [transition.to_dict() for transition in transitions],
+            }
+        except Exception as error:
+            self._logger.error("Failed to get alarm history")
+            self._logger.error(error)
+            return ControlResult(False, str(error)).to_json()
+
     def __control_rpc_handler(self, body: dict[str, any]):
         self._logger.info("Received control command: %s", body)
         try:
@@ -12,6 +12,9 @@ class Constants:
     CONFIG_KEY = "configuration"
     CONFIG_CHECKSUM_KEY = "configuration.checksum"
     ENGINE_CONFIG_KEY = "configuration.engine"
+    CONFIG_GZIP_KEY = "configuration.gzip"
+    CONFIG_MANIFEST_KEY = "configuration.manifest"
+    CONFIG_THING_KEY_PREFIX = "configuration.things."
     LOCATION_CONSENT_ENABLED_KEY = "locationConsentEnabled"
     TELEMETRY_CONSENT_ENABLED_KEY = "telemetryConsentEnabled"
     GEOFENCE_ENABLED_KEY = "geofenceEnabled"
@@ -38,6 +41,17 @@ class Constants:
     LONG = "long"
     THINGSBOARD_SETTINGS_KEY = "ThingsboardSettings"
     GNSS = "GNSS"
+    TELEMETRY = "TELEMETRY"
+    COALESCE_WINDOW = "COALESCE_WINDOW"
+    OFFLINE_QUEUE_PATH = "OFFLINE_QUEUE_PATH"
+    OFFLINE_QUEUE_MAX_SIZE = "OFFLINE_QUEUE_MAX_SIZE"
+    OFFLINE_QUEUE_SEGMENT_SIZE = "OFFLINE_QUEUE_SEGMENT_SIZE"
+    TELEMETRY_OFFLINE_BATCH_SIZE = "TELEMETRY_OFFLINE_BATCH_SIZE"
+    MQTT = "MQTT"
+    MAX_INFLIGHT = "MAX_INFLIGHT"
+    PUBLISH_ACK_TIMEOUT = "PUBLISH_ACK_TIMEOUT"
+    CONFIGURATION = "CONFIGURATION"
+    UPLOAD_FORMAT = "UPLOAD_FORMAT"
     CLOUD_PUBLISH_INTERVAL = "CLOUD_PUBLISH_INTERVAL"
     FLUSH_MAX_UPDATES = "FLUSH_MAX_UPDATES"
     GPSD_UPDATE_INTERVAL = "GPSD_UPDATE_INTERVAL"
@@ -0,0 +1,375 @@
+"""
+Offline telemetry queue
+This module keeps the telemetry produced while the hub is offline on disk, so it
+survives service restarts and is uploaded once the connection is back.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+#pylint: disable=import-error
+from tb_utils.constants import Constants
+from n2kclient.util.settings_util import SettingsUtil
+
+# Position in the queue, as (segment number, byte offset in the segment)
+Position = tuple[int, int]
+
+
+class OfflineTelemetryQueue:
+    """
+    Append-only queue of telemetry persisted in segment files.
+    Items are appended as one compact JSON object per line to the newest segment, a new
+    segment is started once it reaches the segment size. The read position is committed to
+    an offset file replaced atomically, after the items read were sent, so a restart resumes
+    from the last sent batch and at worst sends that batch again. The segment an offset points
+    into is synced before the offset is saved, so the offset never points past its durable end. Segments fully read are
+    deleted, and once the queue is over its maximum size the oldest segment is dropped.
+    Attributes:
+        path: Directory of the segment and offset files.
+        max_size: Maximum size of the segments in bytes.
+        segment_size: Size in bytes after which a new segment is started.
+        _segments: Size in bytes of each segment, by segment number.
+        _read_position: Position of the next item to read.
+    Methods:
+        put: Append an item.
+        peek: Read items from the read position, without removing them.
+        commit: Remove the items before a position returned by peek.
+        empty: Whether all the items were read.
+        size: Size of the queue in bytes.
+        close: Sync and close the segment being written.
+    """
+
+    _logger = logging.getLogger("OfflineTelemetryQueue")
+    _default_path = SettingsUtil.get_setting(
+        Constants.THINGSBOARD_SETTINGS_KEY,
+        Constants.TELEMETRY,
+        Constants.OFFLINE_QUEUE_PATH,
+        default_value="/data/hub/telemetry_queue",
+    )
+    _default_max_size = SettingsUtil.get_setting(
+        Constants.THINGSBOARD_SETTINGS_KEY,
+        Constants.TELEMETRY,
+        Constants.OFFLINE_QUEUE_MAX_SIZE,
+        default_value=64 * 1024 * 1024,
+    )
+    _default_segment_size = SettingsUtil.get_setting(
+        Constants.THINGSBOARD_SETTINGS_KEY,
+        Constants.TELEMETRY,
+        Constants.OFFLINE_QUEUE_SEGMENT_SIZE,
+        default_value=1024 * 1024,
+    )
+
+    OFFSET_FILE = "offset.json"
+    SEGMENT_SUFFIX = ".log"
+    # Seconds between syncs of the appended items to the disk
+    SYNC_INTERVAL = 1
+
+    path: str
+    max_size: int
+    segment_size: int
+    _segments: dict[int, int]
+    _read_position: Position
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_size: Optional[int] = None,
+        segment_size: Optional[int] = None,
+    ):
+        self.path = path if path is not None else self._default_path
+        self.max_size = max_size if max_size is not None else self._default_max_size
+        self.segment_size = (
+            segment_size if segment_size is not None else self._default_segment_size
+        )
+        self._segments = {}
+        self._read_position = (0, 0)
+        self._write_file = None
+        self._last_sync = 0
+        # Whether items were appended since the segment being written was last synced
+        self._unsynced = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def put(self, item: dict[str, Any]):
+        """
+        Append an item, dropping the oldest segment if the queue gets over its maximum size.
+        """
+        line = (json.dumps(item, separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            try:
+                segment = self._write_segment()
+                size = self._segments[segment]
+                if size > 0 and size + len(line) > self.segment_size:
+                    segment = self._open_segment(segment + 1)
+                self._write_file.write(line)
+                self._write_file.flush()
+                self._segments[segment] += len(line)
+                self._unsynced = True
+                if time.monotonic() - self._last_sync >= self.SYNC_INTERVAL:
+                    self._sync_write_file()
+            except Exception as error:
+                self._logger.error(
+                    "Failed to queue telemetry in %s: %s", self.path, error
+                )
+                return
+            while self.size() > self.max_size and len(self._segments) > 1:
+                self._drop_oldest_segment()
+
+    def peek(self, max_bytes: int) -> tuple[list[dict[str, Any]], Position]:
+        """
+        Read items from the read position, oldest first, as many as fit in max_bytes once
+        encoded as a compact JSON array. At least one item is read, however large.
+
+        Returns:
+            The items, and the position after them to commit once they were sent.
+        """
+        items = []
+        # The brackets of the array, each item takes the size of its line with the separator
+        budget = max_bytes - 2
+        with self._lock:
+            segment, offset = self._read_position
+            for number in sorted(s for s in self._segments if s >= segment):
+                if number > segment:
+                    segment, offset = number, 0
+                offset, budget = self._read_segment(segment, offset, budget, items)
+                if budget <= 0:
+                    break
+            return items, self._normalize((segment, offset))
+
+    def commit(self, position: Position):
+        """
+        Remove the items before a position returned by peek, deleting the segments fully read.
+        """
+        with self._lock:
+            if position <= self._read_position:
+                return
+            self._read_position = position
+            for segment in sorted(self._segments):
+                if segment >= position[0] or segment == max(self._segments):
+                    break
+                self._delete_segment(segment)
+            if self._unsynced and position[0] >= max(self._segments, default=0):
+                try:
+                    self._sync_write_file()
+                except Exception as error:
+                    self._logger.error(
+                        "Failed to sync offline telemetry in %s: %s", self.path, error
+                    )
+                    return
+            self._save_offset()
+
+    def empty(self) -> bool:
+        """
+        Whether all the items were read.
+        """
+        with self._lock:
+            segment, offset = self._read_position
+            return all(
+                size <= (offset if number == segment else 0)
+                for number, size in self._segments.items()
+                if number >= segment
+            )
+
+    def size(self) -> int:
+        """
+        Size of the queue in bytes, including the part of the oldest segment already read.
+        """
+        return sum(self._segments.values())
+
+    def close(self):
+        """
+        Sync and close the segment being written.
+        """
+        with self._lock:
+            if self._write_file is not None:
+                try:
+                    self._write_file.flush()
+                    self._sync_write_file()
+                    self._write_file.close()
+                except Exception as error:
+                    self._logger.error("Failed to close %s: %s", self.path, error)
+                self._write_file = None
+
+    def _load(self):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            for name in os.listdir(self.path):
+                if name.endswith(self.SEGMENT_SUFFIX):
+                    segment = int(name[: -len(self.SEGMENT_SUFFIX)])
+                    self._segments[segment] = os.path.getsize(
+                        self._segment_path(segment)
+                    )
+            self._read_position = self._load_offset()
+            for segment in sorted(self._segments):
+                if segment >= self._read_position[0]:
+                    break
+                self._delete_segment(segment)
+            if len(self._segments) > 0:
+                self._repair_segment(max(self._segments))
+                self._read_position = self._normalize(self._clamp(self._read_position))
+            if not self.empty():
+                self._logger.info(
+                    "Loaded %d bytes of offline telemetry from %s", self.size(), self.path
+                )
+        except Exception as error:
+            self._logger.error(
+                "Failed to load offline telemetry from %s: %s", self.path, error
+            )
+
+    def _load_offset(self) -> Position:
+        offset_path = os.path.join(self.path, self.OFFSET_FILE)
+        if not os.path.exists(offset_path):
+            return (min(self._segments, default=0), 0)
+        try:
+            with open(offset_path, "r") as file:
+                offset = json.load(file)
+            return (int(offset["segment"]), int(offset["offset"]))
+        except (ValueError, TypeError, KeyError) as error:
+            self._logger.warning(
+                "Invalid offline telemetry offset, reading from the oldest segment: %s",
+                error,
+            )
+            return (min(self._segments, default=0), 0)
+
+    def _save_offset(self):
+        offset_path = os.path.join(self.path, self.OFFSET_FILE)
+        temp_path = f"{offset_path}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump(
+                    {
+                        "segment": self._read_position[0],
+                        "offset": self._read_position[1],
+                    },
+                    file,
+                )
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, offset_path)
+        except Exception as error:
+            self._logger.error("Failed to save offline telemetry offset: %s", error)
+
+    def _clamp(self, position: Position) -> Position:
+        """
+        Move a position past the end of its segment, e.g. saved before the segment was synced, back to the end.
+        """
+        segment, offset = position
+        size = self._segments.get(segment, offset)
+        if offset > size:
+            self._logger.warning(
+                "Offline telemetry offset %d is past the end of segment %d, reading from %d",
+                offset,
+                segment,
+                size,
+            )
+            return (segment, size)
+        return position
+
+    def _repair_segment(self, segment: int):
+        """
+        Truncate a line cut short by a power loss while appending to the newest segment.
+        """
+        size = self._segments[segment]
+        if size == 0:
+            return
+        with open(self._segment_path(segment), "rb+") as file:
+            data = file.read()
+            end = data.rfind(b"\n") + 1
+            if end < size:
+                self._logger.warning(
+                    "Truncating %d bytes of incomplete telemetry in segment %d",
+                    size - end,
+                    segment,
+                )
+                file.truncate(end)
+                self._segments[segment] = end
+
+    def _read_segment(
+        self, segment: int, offset: int, budget: int, items: list
+    ) -> tuple[int, int]:
+        """
+        Read items of a segment from an offset into items while they fit in the budget.
+
+        Returns:
+            The offset after the last line read, and the budget left, 0 once the next item does not fit.
+        """
+        with open(self._segment_path(segment), "rb") as file:
+            file.seek(offset)
+            while offset < self._segments[segment]:
+                line = file.readline()
+                if not line.endswith(b"\n"):
+                    break
+                if len(line) > budget and len(items) > 0:
+                    return offset, 0
+                budget -= len(line)
+                offset += len(line)
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    self._logger.warning(
+                        "Skipping invalid telemetry in segment %d", segment
+                    )
+        return offset, budget
+
+    def _write_segment(self) -> int:
+        """
+        Number of the segment appended to, opening it if needed.
+        """
+        if len(self._segments) == 0:
+            return self._open_segment(self._read_position[0])
+        segment = max(self._segments)
+        if self._write_file is None:
+            self._write_file = open(self._segment_path(segment), "ab")
+        return segment
+
+    def _sync_write_file(self):
+        """
+        Sync the items appended to the segment being written to the disk.
+        """
+        os.fsync(self._write_file.fileno())
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+
+    def _open_segment(self, segment: int) -> int:
+        if self._write_file is not None:
+            self._write_file.flush()
+            self._sync_write_file()
+            self._write_file.close()
+        self._write_file = open(self._segment_path(segment), "ab")
+        self._segments[segment] = 0
+        return segment
+
+    def _drop_oldest_segment(self):
+        segment = min(self._segments)
+        self._logger.warning(
+            "Offline telemetry queue is full, dropping segment %d of %d bytes",
+            segment,
+            self._segments[segment],
+        )
+        self._delete_segment(segment)
+        if self._read_position[0] <= segment:
+            self._read_position = (min(self._segments), 0)
+            self._save_offset()
+
+    def _delete_segment(self, segment: int):
+        try:
+            os.remove(self._segment_path(segment))
+        except FileNotFoundError:
+            pass
+        del self._segments[segment]
+
+    def _normalize(self, position: Position) -> Position:
+        """
+        Move a position at the end of a segment to the start of the next one, so it can be committed.
+        """
+        segment, offset = position
+        if offset >= self._segments.get(segment, 0):
+            later = [s for s in self._segments if s > segment]
+            if len(later) > 0:
+                return (min(later), 0)
+        return position
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"{segment:010d}{self.SEGMENT_SUFFIX}")
@@ -0,0 +1,226 @@
+"""
+Publish window
+This module limits the number of MQTT messages published to Thingsboard that were not
+acknowledged yet, so large uploads go as fast as the broker acknowledges them.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+#pylint: disable=import-error
+from tb_utils.constants import Constants
+from n2kclient.util.settings_util import SettingsUtil
+
+
+class PublishWindow:
+    """
+    Window of the MQTT messages in flight, published but not acknowledged by the broker.
+    A publisher acquires a slot before publishing, then tracks the message ids of the publish.
+    The slots are released by the paho on_publish callback, which also measures the latency
+    of the acknowledgements. Messages not acknowledged within the ack timeout are given up on,
+    so a lost acknowledgement cannot stall the publisher.
+    Attributes:
+        max_inflight: Maximum number of messages in flight.
+        ack_timeout: Seconds after which a message in flight is given up on.
+        _inflight: Time each message in flight was published, by message id.
+        _early_acks: Ids of the messages acknowledged before they were tracked.
+        _resets: Number of resets, to detect a disconnect while waiting.
+    Methods:
+        acquire: Block until a message may be published.
+        track: Track the messages of a publish.
+        wait_published: Block until the messages of a publish were acknowledged.
+        on_publish: Release the slot of an acknowledged message.
+        reset: Release all the slots, on disconnect.
+        get_latency_stats: Get the acknowledgement latencies since the last report.
+    """
+
+    _logger = logging.getLogger("PublishWindow")
+    _default_max_inflight = SettingsUtil.get_setting(
+        Constants.THINGSBOARD_SETTINGS_KEY,
+        Constants.MQTT,
+        Constants.MAX_INFLIGHT,
+        default_value=20,
+    )
+    _default_ack_timeout = SettingsUtil.get_setting(
+        Constants.THINGSBOARD_SETTINGS_KEY,
+        Constants.MQTT,
+        Constants.PUBLISH_ACK_TIMEOUT,
+        default_value=10,
+    )
+
+    # Seconds between the reports of the acknowledgement latency
+    REPORT_INTERVAL = 60
+    # Seconds between checks of the published state, paho sets it after on_publish
+    PUBLISHED_POLL_INTERVAL = 0.1
+
+    max_inflight: int
+    ack_timeout: float
+    _inflight: dict[int, float]
+    _early_acks: deque[int]
+    _resets: int
+
+    def __init__(
+        self,
+        max_inflight: Optional[int] = None,
+        ack_timeout: Optional[float] = None,
+    ):
+        self.max_inflight = (
+            max_inflight if max_inflight is not None else self._default_max_inflight
+        )
+        self.ack_timeout = (
+            ack_timeout if ack_timeout is not None else self._default_ack_timeout
+        )
+        self._inflight = {}
+        # Also holds the ids of messages published without the window, bounded
+        self._early_acks = deque(maxlen=4 * self.max_inflight)
+        self._resets = 0
+        self._condition = threading.Condition()
+        self._reset_latency_stats()
+
+    def acquire(self):
+        """
+        Block until fewer than max_inflight messages are in flight.
+        """
+        with self._condition:
+            while len(self._inflight) >= self.max_inflight:
+                self._expire()
+                if len(self._inflight) < self.max_inflight:
+                    break
+                oldest = min(self._inflight.values())
+                self._condition.wait(
+                    max(oldest + self.ack_timeout - time.monotonic(), 0.01)
+                )
+
+    def track(self, publish_info: Any):
+        """
+        Track the messages of a publish, a TBPublishInfo of one or more paho messages.
+        Messages that failed to be queued by paho are not tracked.
+        """
+        now = time.monotonic()
+        with self._condition:
+            for message_info in self._message_infos(publish_info):
+                if not self._is_queued(message_info):
+                    continue
+                if message_info.mid in self._early_acks:
+                    self._early_acks.remove(message_info.mid)
+                    continue
+                self._inflight[message_info.mid] = now
+
+    def wait_published(
+        self, publish_info: Any, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Block until all the messages of a publish were acknowledged by the broker.
+
+        Returns:
+            True if they all were, False if one failed to be queued by paho, the client
+            disconnected, or they were not all acknowledged within the timeout, the ack
+            timeout by default.
+        """
+        message_infos = self._message_infos(publish_info)
+        deadline = time.monotonic() + (
+            timeout if timeout is not None else self.ack_timeout
+        )
+        with self._condition:
+            resets = self._resets
+            while True:
+                if not all(self._is_queued(info) for info in message_infos):
+                    return False
+                if all(info.is_published() for info in message_infos):
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._resets != resets:
+                    return False
+                self._condition.wait(min(remaining, self.PUBLISHED_POLL_INTERVAL))
+
+    def on_publish(self, mid: int):
+        """
+        Release the slot of a message acknowledged by the broker, to be called by paho on_publish.
+        """
+        now = time.monotonic()
+        with self._condition:
+            self._condition.notify_all()
+            published_time = self._inflight.pop(mid, None)
+            if published_time is None:
+                self._early_acks.append(mid)
+                return
+            latency = now - published_time
+            self._ack_count += 1
+            self._ack_latency_total += latency
+            self._ack_latency_max = max(self._ack_latency_max, latency)
+            if now - self._last_report >= self.REPORT_INTERVAL:
+                stats = self._latency_stats()
+                self._reset_latency_stats()
+            else:
+                stats = None
+        if stats is not None:
+            self._logger.info(
+                "Publish acknowledgements: %d, average latency %.1f ms, max %.1f ms",
+                stats["count"],
+                stats["average_ms"],
+                stats["max_ms"],
+            )
+
+    def reset(self):
+        """
+        Release all the slots. The messages in flight are dropped by the client on disconnect.
+        """
+        with self._condition:
+            self._inflight.clear()
+            self._early_acks.clear()
+            self._resets += 1
+            self._condition.notify_all()
+
+    def get_latency_stats(self) -> dict[str, float]:
+        """
+        Get the count, average and max latency in milliseconds of the acknowledgements since the last report.
+        """
+        with self._condition:
+            return self._latency_stats()
+
+    def _latency_stats(self) -> dict[str, float]:
+        average = (
+            self._ack_latency_total / self._ack_count if self._ack_count > 0 else 0
+        )
+        return {
+            "count": self._ack_count,
+            "average_ms": average * 1000,
+            "max_ms": self._ack_latency_max * 1000,
+        }
+
+    def _reset_latency_stats(self):
+        self._ack_count = 0
+        self._ack_latency_total = 0.0
+        self._ack_latency_max = 0.0
+        self._last_report = time.monotonic()
+
+    @staticmethod
+    def _message_infos(publish_info: Any) -> list[Any]:
+        message_infos = publish_info.message_info
+        if not isinstance(message_infos, list):
+            message_infos = [message_infos]
+        return message_infos
+
+    @staticmethod
+    def _is_queued(message_info: Any) -> bool:
+        """
+        Whether paho queued the message, a message it failed to queue is never acknowledged.
+        """
+        result_code = getattr(message_info.rc, "value", message_info.rc)
+        return result_code == 0 and message_info.mid is not None
+
+    def _expire(self):
+        """
+        Give up on the messages in flight for longer than the ack timeout.
+        """
+        deadline = time.monotonic() - self.ack_timeout
+        expired = [mid for mid, sent in self._inflight.items() if sent <= deadline]
+        for mid in expired:
+            del self._inflight[mid]
+        if len(expired) > 0:
+            self._logger.warning(
+                "No acknowledgement for %d messages after %s seconds",
+                len(expired),
+                self.ack_timeout,
+            )
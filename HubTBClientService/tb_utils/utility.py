@@ -30,6 +30,14 @@ class MessageType(str, enum.Enum):
     ATTRIBUTE = "Attribute"
     TELEMETRY = "Telemetry"
 
+class ConfigUploadFormat(str, enum.Enum):
+    """
+    Enum for the format the configuration is uploaded in, see doc/ConfigurationUpload.md.
+    """
+    JSON = "json"
+    GZIP = "gzip"
+    SHARDED = "sharded"
+
 class ControlResult:
     """
     Class to represent the result of a control operation.
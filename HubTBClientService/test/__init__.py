@@ -0,0 +1,12 @@
+import os
+import sys
+
+# The modules of the service import each other from the service directory, and n2kclient
+# from the N2KClient package, as when the service is run from its directory
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+for _path in (
+    os.path.join(_ROOT, "HubTBClientService"),
+    os.path.join(_ROOT, "N2KClient"),
+):
+    if _path not in sys.path:
+        sys.path.append(_path)
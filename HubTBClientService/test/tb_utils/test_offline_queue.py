@@ -0,0 +1,152 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tb_utils import offline_queue
+from tb_utils.offline_queue import OfflineTelemetryQueue
+
+
+class OfflineTelemetryQueueTest(unittest.TestCase):
+    """
+    Unit tests for the OfflineTelemetryQueue, persisted in a temporary directory.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        self.queue = self._open()
+
+    def tearDown(self):
+        self.queue.close()
+        self.directory.cleanup()
+
+    def _open(self, **kwargs) -> OfflineTelemetryQueue:
+        kwargs.setdefault("max_size", 1024 * 1024)
+        kwargs.setdefault("segment_size", 1024)
+        return OfflineTelemetryQueue(self.path, **kwargs)
+
+    def _reopen(self, **kwargs) -> OfflineTelemetryQueue:
+        self.queue.close()
+        self.queue = self._open(**kwargs)
+        return self.queue
+
+    def _segment_files(self) -> list[str]:
+        return sorted(
+            name
+            for name in os.listdir(self.path)
+            if name.endswith(OfflineTelemetryQueue.SEGMENT_SUFFIX)
+        )
+
+    def test_put_peek_commit(self):
+        self.assertTrue(self.queue.empty())
+        for value in range(3):
+            self.queue.put({"ts": value})
+        self.assertFalse(self.queue.empty())
+
+        items, position = self.queue.peek(1024)
+        self.assertEqual(items, [{"ts": 0}, {"ts": 1}, {"ts": 2}])
+        # Peeking again reads the same items until they are committed
+        self.assertEqual(self.queue.peek(1024), (items, position))
+
+        self.queue.commit(position)
+        self.assertTrue(self.queue.empty())
+        self.assertEqual(self.queue.peek(1024)[0], [])
+
+    def test_peek_budget(self):
+        for value in range(3):
+            self.queue.put({"ts": value})
+        line_size = len(b'{"ts":0}\n')
+
+        items, position = self.queue.peek(2 + 2 * line_size)
+        self.assertEqual(items, [{"ts": 0}, {"ts": 1}])
+        self.queue.commit(position)
+        # At least one item, however large
+        self.assertEqual(self.queue.peek(1)[0], [{"ts": 2}])
+
+    def test_restart_resumes_from_commit(self):
+        for value in range(4):
+            self.queue.put({"ts": value})
+        items, position = self.queue.peek(2 + 2 * len(b'{"ts":0}\n'))
+        self.assertEqual(len(items), 2)
+        self.queue.commit(position)
+
+        queue = self._reopen()
+        self.assertEqual(queue.peek(1024)[0], [{"ts": 2}, {"ts": 3}])
+        queue.put({"ts": 4})
+        self.assertEqual(queue.peek(1024)[0], [{"ts": 2}, {"ts": 3}, {"ts": 4}])
+
+    def test_segments_rotated_and_deleted(self):
+        self.queue = self._reopen(segment_size=20)
+        for value in range(4):
+            self.queue.put({"ts": value})
+        self.assertEqual(len(self._segment_files()), 2)
+
+        items, position = self.queue.peek(1024)
+        self.assertEqual(items, [{"ts": value} for value in range(4)])
+        self.queue.commit(position)
+        # The segment being written is kept
+        self.assertEqual(len(self._segment_files()), 1)
+        self.assertTrue(self.queue.empty())
+
+    def test_torn_line_repaired(self):
+        self.queue.put({"ts": 0})
+        self.queue.close()
+        segment_path = os.path.join(self.path, self._segment_files()[0])
+        with open(segment_path, "ab") as file:
+            file.write(b'{"ts":')
+
+        queue = self._reopen()
+        self.assertEqual(queue.size(), len(b'{"ts":0}\n'))
+        queue.put({"ts": 1})
+        self.assertEqual(queue.peek(1024)[0], [{"ts": 0}, {"ts": 1}])
+
+    def test_oldest_segment_dropped(self):
+        self.queue = self._reopen(segment_size=20, max_size=40)
+        for value in range(6):
+            self.queue.put({"ts": value})
+        self.assertLessEqual(self.queue.size(), 40)
+        self.assertEqual(len(self._segment_files()), 2)
+
+        items, _ = self.queue.peek(1024)
+        self.assertEqual(items, [{"ts": value} for value in range(2, 6)])
+        # The moved read position survives a restart
+        self.assertEqual(self._reopen(segment_size=20, max_size=40).peek(1024)[0], items)
+
+    def test_commit_syncs_segment_before_offset(self):
+        self.queue.put({"ts": 0})
+        # Within the sync interval, the second item is not synced by put
+        self.queue.put({"ts": 1})
+        calls = []
+        with patch.object(
+            offline_queue.os, "fsync", side_effect=lambda _: calls.append("fsync")
+        ), patch.object(
+            offline_queue.os,
+            "replace",
+            side_effect=lambda *args: calls.append("replace"),
+        ):
+            _, position = self.queue.peek(1024)
+            self.queue.commit(position)
+        # The segment, then the temporary offset file, before it replaces the offset
+        self.assertEqual(calls, ["fsync", "fsync", "replace"])
+
+    def test_offset_past_segment_end_clamped(self):
+        for value in range(2):
+            self.queue.put({"ts": value})
+        self.queue.close()
+        # An offset saved before the segment was synced, then cut short by a power loss
+        segment = int(self._segment_files()[0].split(".")[0])
+        with open(
+            os.path.join(self.path, OfflineTelemetryQueue.OFFSET_FILE), "w"
+        ) as file:
+            json.dump({"segment": segment, "offset": 1000}, file)
+
+        queue = self._reopen()
+        self.assertTrue(queue.empty())
+        queue.put({"ts": 2})
+        self.assertEqual(queue.peek(1024)[0], [{"ts": 2}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import threading
+import time
+import unittest
+from enum import IntEnum
+
+from tb_utils.publish_window import PublishWindow
+
+
+class FakeResultCode(IntEnum):
+    SUCCESS = 0
+    NO_CONN = 4
+
+
+class FakeMessageInfo:
+    """
+    Stand-in for a paho MQTTMessageInfo, published once the test says so.
+    """
+
+    def __init__(self, mid, rc=0):
+        self.mid = mid
+        self.rc = rc
+        self.published = False
+
+    def is_published(self):
+        return self.published
+
+
+class FakePublishInfo:
+    """
+    Stand-in for a TBPublishInfo, holding one or a list of message infos.
+    """
+
+    def __init__(self, message_info):
+        self.message_info = message_info
+
+
+class PublishWindowTest(unittest.TestCase):
+    """
+    Unit tests for the PublishWindow.
+    """
+
+    def setUp(self):
+        self.window = PublishWindow(max_inflight=2, ack_timeout=5)
+
+    def _publish(self, *message_infos) -> FakePublishInfo:
+        self.window.acquire()
+        publish_info = FakePublishInfo(list(message_infos))
+        self.window.track(publish_info)
+        return publish_info
+
+    def _ack(self, message_info: FakeMessageInfo):
+        # Paho calls on_publish before it sets the published state
+        self.window.on_publish(message_info.mid)
+        message_info.published = True
+
+    def _acquire_in_thread(self) -> threading.Event:
+        acquired = threading.Event()
+
+        def acquire():
+            self.window.acquire()
+            acquired.set()
+
+        threading.Thread(target=acquire, daemon=True).start()
+        return acquired
+
+    def test_acquire_blocks_until_ack(self):
+        first = FakeMessageInfo(1)
+        self._publish(first)
+        self._publish(FakeMessageInfo(2))
+
+        acquired = self._acquire_in_thread()
+        self.assertFalse(acquired.wait(0.1))
+        self._ack(first)
+        self.assertTrue(acquired.wait(5))
+
+    def test_track_single_message_info(self):
+        self.window.track(FakePublishInfo(FakeMessageInfo(1)))
+        self.assertEqual(list(self.window._inflight), [1])
+
+    def test_track_skips_messages_not_queued(self):
+        self.window.track(
+            FakePublishInfo(
+                [
+                    FakeMessageInfo(1, rc=FakeResultCode.NO_CONN),
+                    FakeMessageInfo(None),
+                    FakeMessageInfo(3, rc=FakeResultCode.SUCCESS),
+                ]
+            )
+        )
+        self.assertEqual(list(self.window._inflight), [3])
+
+    def test_early_ack(self):
+        message_info = FakeMessageInfo(1)
+        # Acknowledged before the publisher tracked it
+        self._ack(message_info)
+        self.window.track(FakePublishInfo([message_info]))
+        self.assertEqual(self.window._inflight, {})
+        self.assertTrue(self.window.wait_published(FakePublishInfo([message_info])))
+
+    def test_expired_messages_release_slots(self):
+        self.window = PublishWindow(max_inflight=1, ack_timeout=0.05)
+        self._publish(FakeMessageInfo(1))
+        start = time.monotonic()
+        self.window.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        self.assertEqual(self.window._inflight, {})
+
+    def test_wait_published(self):
+        messages = [FakeMessageInfo(1), FakeMessageInfo(2)]
+        publish_info = self._publish(*messages)
+        for message_info in messages:
+            threading.Timer(0.05, self._ack, (message_info,)).start()
+        self.assertTrue(self.window.wait_published(publish_info))
+        self.assertEqual(self.window._inflight, {})
+        self.assertEqual(self.window.get_latency_stats()["count"], 2)
+
+    def test_wait_published_not_queued(self):
+        publish_info = self._publish(FakeMessageInfo(1, rc=FakeResultCode.NO_CONN))
+        start = time.monotonic()
+        self.assertFalse(self.window.wait_published(publish_info))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_wait_published_timeout(self):
+        publish_info = self._publish(FakeMessageInfo(1))
+        start = time.monotonic()
+        self.assertFalse(self.window.wait_published(publish_info, timeout=0.1))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_reset_during_wait(self):
+        publish_info = self._publish(FakeMessageInfo(1))
+        self._publish(FakeMessageInfo(2))
+        threading.Timer(0.05, self.window.reset).start()
+        start = time.monotonic()
+        self.assertFalse(self.window.wait_published(publish_info))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self.window._inflight, {})
+        # The slots are free again
+        self.assertTrue(self._acquire_in_thread().wait(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,18 @@
 import logging
 import threading
-from typing import List
+from typing import Any, List, Optional
 import dbus
 from dbus.mainloop.glib import DBusGMainLoop
 import dbus.service
 import reactivex as rx
 from .models.empower_system.engine_alarm_list import EngineAlarmList
-from .models.devices import N2kDevices
+from .models.devices import ChangeSet, N2kDevices
 from .models.constants import Constants
 from reactivex import operators as ops
 from gi.repository import GLib
 from .models.common_enums import ConnectionStatus
 from .services.alarm_service.alarm_service import AlarmService
+from .services.alarm_service.alarm_history import AlarmHistory, AlarmTransition
 from .models.n2k_configuration.n2k_configuation import N2kConfiguration
 from .models.empower_system.empower_system import EmpowerSystem
 from .models.n2k_configuration.engine_configuration import EngineConfiguration
@@ -22,7 +23,9 @@ from .models.empower_system.alarm import Alarm
 from .models.empower_system.alarm_list import AlarmList
 from .models.dbus_connection_status import DBUSConnectionStatus
 from .util.time_util import TimeUtil
+from .util.tracing import pipeline_tracer
 from .services.dbus_proxy_service.dbus_proxy import DbusProxyService
+from .services.dbus_proxy_service.async_dbus_proxy import AsyncDbusProxyService
 from .services.config_service.config_service import ConfigService
 from .services.snapshot_service.snapshot_service import SnapshotService
 from .services.event_service.event_service import EventService
@@ -34,12 +37,16 @@ class N2KClient(dbus.service.Object):
     This class is responsible for managing the lifecycle of the client, including connecting to DBus, initializing managing services,
     subscribing to signals, and providing a unified interface for interacting with the various
     components of the N2K system.
+    The alarm history file is recorded by a single process on the hub, clients of the other processes
+    are created with record_alarm_history=False.
     """
 
     _logger = logging.getLogger(Constants.DBUS_N2K_CLIENT)
     _disposable_list: List[rx.abc.DisposableBase]
     _latest_devices: N2kDevices
     _devices: rx.subject.BehaviorSubject
+    _device_changes: rx.subject.Subject
+    _mobile_changes: rx.subject.Subject
     _config: rx.subject.BehaviorSubject
     _empower_system: rx.subject.BehaviorSubject
     _engine_config: rx.subject.BehaviorSubject
@@ -48,6 +55,8 @@ class N2KClient(dbus.service.Object):
     _n2k_dbus_connection_status: rx.subject.BehaviorSubject
 
     devices: rx.subject.BehaviorSubject
+    device_changes: rx.subject.Subject
+    mobile_changes: rx.subject.Subject
     config: rx.subject.BehaviorSubject
     empower_system: rx.subject.BehaviorSubject
     engine_config: rx.subject.BehaviorSubject
@@ -66,12 +75,13 @@ class N2KClient(dbus.service.Object):
     _config_service: ConfigService
     _control_service: ControlService
     _alarm_service: AlarmService
+    _alarm_history: Optional[AlarmHistory]
     _snapshot_service: SnapshotService
     _event_service: EventService
 
     lock: threading.Lock
 
-    def __init__(self):
+    def __init__(self, record_alarm_history: bool = True):
         DBusGMainLoop(set_as_default=True)
         self.lock = threading.Lock()
         self._disposable_list = []
@@ -81,6 +91,8 @@ class N2KClient(dbus.service.Object):
         self._latest_engine_config = EngineConfiguration()
 
         self._devices = rx.subject.BehaviorSubject(N2kDevices())
+        self._device_changes = rx.subject.Subject()
+        self._mobile_changes = rx.subject.Subject()
         self._config = rx.subject.BehaviorSubject(N2kConfiguration())
         self._empower_system = rx.subject.BehaviorSubject(EmpowerSystem(None))
         self._engine_config = rx.subject.BehaviorSubject(EngineConfiguration())
@@ -107,6 +119,12 @@ class N2KClient(dbus.service.Object):
         self._latest_engine_alarms = EngineAlarmList()
         # Pipes
         self.devices = self._devices.pipe(ops.publish(), ops.ref_count())
+        self.device_changes = self._device_changes.pipe(
+            ops.publish(), ops.ref_count()
+        )
+        self.mobile_changes = self._mobile_changes.pipe(
+            ops.publish(), ops.ref_count()
+        )
         self.config = self._config.pipe(ops.publish(), ops.ref_count())
         self.empower_system = self._empower_system.pipe(ops.publish(), ops.ref_count())
         self.engine_config = self._engine_config.pipe(ops.publish(), ops.ref_count())
@@ -126,12 +144,14 @@ class N2KClient(dbus.service.Object):
         self._dbus_proxy = DbusProxyService(
             status_callback=self._n2k_dbus_connection_status.on_next,
         )
+        self._async_dbus_proxy = AsyncDbusProxyService(self._dbus_proxy)
 
         self.control_service = ControlService(
             get_config_func=self.get_latest_config,
             get_devices_func=self.get_latest_devices,
             send_control_func=self._dbus_proxy.control,
         )
+        self._alarm_history = AlarmHistory() if record_alarm_history else None
         self._alarm_service = AlarmService(
             alarm_list_func=self._dbus_proxy.alarm_list,
             get_latest_alarms_func=self.get_latest_alarms,
@@ -143,6 +163,8 @@ class N2KClient(dbus.service.Object):
             acknowledge_alarm_func=self._dbus_proxy.alarm_acknowledge,
             get_latest_empower_system_func=self.get_latest_empower_system,
             get_latest_engine_list_func=self.get_latest_engine_list,
+            alarm_history=self._alarm_history,
+            acknowledge_alarms_func=self._async_dbus_proxy.alarm_acknowledge_batch,
         )
 
         self._config_service = ConfigService(
@@ -159,6 +181,7 @@ class N2KClient(dbus.service.Object):
             set_engine_list=self.set_engine_list,
             set_factory_metadata=self.set_factory_metadata,
             request_state_snapshot=self.request_state_snapshot,
+            async_dbus_proxy=self._async_dbus_proxy,
         )
         self._snapshot_service = SnapshotService(
             dbus_proxy=self._dbus_proxy,
@@ -167,6 +190,8 @@ class N2KClient(dbus.service.Object):
             set_devices=self.set_devices,
             get_latest_engine_config=self.get_latest_engine_config,
             process_engine_alarms_from_snapshot=self._alarm_service.process_engine_alarm_from_snapshots,
+            set_device_changes=self.set_device_changes,
+            set_mobile_changes=self.set_mobile_changes,
         )
 
         self._event_service = EventService(
@@ -336,6 +361,15 @@ class N2KClient(dbus.service.Object):
         )
         return self._alarm_service.acknowledge_alarm(alarm_id)
 
+    def acknowledge_alarms(self, alarm_ids: list[int]) -> dict[int, bool]:
+        """
+        Acknowledge several alarms by their IDs in one round trip, returning whether each was acknowledged
+        """
+        self._logger.info(
+            f"Acknowledge Alarms Command received for Alarm IDs: {alarm_ids}"
+        )
+        return self._alarm_service.acknowledge_alarms(alarm_ids)
+
     def refresh_active_alarms(self) -> tuple[bool, str]:
         """
         Refresh the active alarms by requesting them from the DBus service.
@@ -402,6 +436,21 @@ class N2KClient(dbus.service.Object):
         """
         return self.devices
 
+    def get_device_changes_observable(self) -> rx.Observable:
+        """
+        Get the observable for per-snapshot ChangeSet updates.
+        Each emission lists only the device channels whose value changed in that snapshot.
+        """
+        return self.device_changes
+
+    def get_mobile_changes_observable(self) -> rx.Observable:
+        """
+        Get the observable for mobile channel deltas.
+        Each emission is a {mobile_key: value} dictionary holding only the channels changed by one snapshot.
+        Use get_latest_devices().to_mobile_dict() for the full state.
+        """
+        return self.mobile_changes
+
     def get_latest_config(self) -> N2kConfiguration:
         """
         Get the latest N2kConfiguration object.
@@ -469,6 +518,21 @@ class N2KClient(dbus.service.Object):
         """
         return self._active_alarms
 
+    def get_alarm_history(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        thing_id: Optional[str] = None,
+    ) -> list[AlarmTransition]:
+        """
+        Get the recorded alarm transitions between start and end (milliseconds since epoch, inclusive),
+        optionally only those of alarms associated with thing_id, oldest first.
+        Empty if this client does not record the alarm history.
+        """
+        if self._alarm_history is None:
+            return []
+        return self._alarm_history.query(start, end, thing_id)
+
     def get_latest_engine_config(self) -> EngineConfiguration:
         """
         Get the latest EngineConfiguration object.
@@ -481,6 +545,18 @@ class N2KClient(dbus.service.Object):
         """
         return self._engine_alarms
 
+    def get_signal_queue_metrics(self) -> dict[str, int]:
+        """
+        Get the DBus signal queue depth and the counts of dropped and processed signals.
+        """
+        return self._dbus_proxy.get_signal_queue_metrics()
+
+    def get_pipeline_latency_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Get the latency of each stage of the snapshot to cloud pipeline, empty unless tracing is enabled in settings.
+        """
+        return pipeline_tracer.get_stats()
+
     # === Setters ===
     def set_devices(self, devices: N2kDevices):
         """
@@ -488,6 +564,18 @@ class N2KClient(dbus.service.Object):
         """
         self._devices.on_next(devices)
 
+    def set_device_changes(self, change_set: ChangeSet):
+        """
+        Publish the ChangeSet produced by the latest snapshot merge.
+        """
+        self._device_changes.on_next(change_set)
+
+    def set_mobile_changes(self, mobile_changes: dict[str, Any]):
+        """
+        Publish the mobile channel deltas produced by the latest snapshot merge.
+        """
+        self._mobile_changes.on_next(mobile_changes)
+
     def set_config(self, config: N2kConfiguration):
         """
         Set the latest N2kConfiguration object.
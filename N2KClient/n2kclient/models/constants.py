@@ -188,6 +188,7 @@ class JsonKeys:
     CONTENT = "Content"
     ALARM_ITEM = "AlarmItem"
     TIMESTAMP = "Timestamp"
+    SENT_TIME = "SentTime"
 
     DISCRETE_STATUS_1 = "DiscreteStatus1"
     DISCRETE_STATUS_2 = "DiscreteStatus2"
@@ -523,8 +524,35 @@ class Constants:
     N2K_CONFIG_SERVICE = "N2K_CONFIG_SERVICE"
     DBUS_RETRY_DELAY_KEY = "DBUS_RETRY_DELAY"
     CONTROL_DBUS_MAX_ATTEMPTS_KEY = "CONTROL_DBUS_MAX_ATTEMPTS"
+    CONTROL_DBUS_RECONNECT_GRACE_KEY = "CONTROL_DBUS_RECONNECT_GRACE"
     SNAPSHOT_INTERVAL_KEY = "SNAPSHOT_INTERVAL"
     SNAPSHOT_TIMER_THREAD_NAME = "SnapshotTimer"
+    ALARM_RELOAD_WINDOW_KEY = "ALARM_RELOAD_WINDOW"
+    ALARM_RELOAD_TIMER_THREAD_NAME = "AlarmReloadTimer"
+    SIGNAL_QUEUE_SIZE_KEY = "SIGNAL_QUEUE_SIZE"
+    SIGNAL_WORKER_THREAD_NAME = "SignalWorker"
+    DBUS_RECONNECT_BASE_DELAY_KEY = "DBUS_RECONNECT_BASE_DELAY"
+    DBUS_RECONNECT_MAX_DELAY_KEY = "DBUS_RECONNECT_MAX_DELAY"
+    DBUS_RECONNECT_THREAD_NAME = "DbusReconnect"
+    DBUS_ASYNC_TIMEOUT_KEY = "DBUS_ASYNC_TIMEOUT"
+    DBUS_BUS_ADDRESS_KEY = "DBUS_BUS_ADDRESS"
+    ALARM_HISTORY_KEY = "ALARM_HISTORY"
+    ALARM_HISTORY_SIZE_KEY = "SIZE"
+    ALARM_HISTORY_PATH_KEY = "PATH"
+    TRACING_KEY = "TRACING"
+    TRACING_ENABLED_KEY = "ENABLED"
+    TRACING_DUMP_INTERVAL_KEY = "DUMP_INTERVAL"
+    CAPTURE_KEY = "CAPTURE"
+    CAPTURE_ENABLED_KEY = "ENABLED"
+    CAPTURE_PATH_KEY = "PATH"
+    CAPTURE_MAX_SIZE_KEY = "MAX_SIZE"
+    BROKER_KEY = "BROKER"
+    BROKER_ENABLED_KEY = "ENABLED"
+    BROKER_SOCKET_PATH_KEY = "SOCKET_PATH"
+    BROKER_REQUEST_TIMEOUT_KEY = "REQUEST_TIMEOUT"
+    BROKER_QUEUE_SIZE_KEY = "QUEUE_SIZE"
+    BROKER_RECONNECT_DELAY_KEY = "RECONNECT_DELAY"
+    BROKER_MAX_FRAME_SIZE_KEY = "MAX_FRAME_SIZE"
     alarm = "alarm"
 
     starboardEngine = "Starboard Engine"
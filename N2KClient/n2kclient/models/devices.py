@@ -1,5 +1,7 @@
 import json
-from typing import Any, Dict
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
 import reactivex as rx
 from reactivex.subject import BehaviorSubject
 
@@ -17,7 +19,7 @@ class N2kDevice:
         channels (Dict[str, Any]): Dictionary of channel keys to their current values.
         _channel_subjects (Dict[str, BehaviorSubject]): Internal map of channel keys to their BehaviorSubjects.
     Methods:
-        update_channel: Update the value of a channel and notify observers.
+        update_channel: Update the value of a channel and notify observers if the value changed.
         get_channel_subject: Get the BehaviorSubject for a channel.
         dispose: Dispose of all channel subjects and clear channel values.
         to_dict: Return a dictionary representation of the device.
@@ -35,11 +37,18 @@ class N2kDevice:
         # Channel subjects for reactive programming
         self._channel_subjects = {}
 
-    def update_channel(self, channel_key: str, value: Any):
+    def update_channel(self, channel_key: str, value: Any) -> bool:
         """
         Update the value of a channel and notify any observers.
+        Observers are only notified when the value differs from the stored value.
         If the channel does not have a subject, one is created.
+
+        Returns:
+            bool: True if the channel value changed, False otherwise.
         """
+        if channel_key in self.channels and self.channels[channel_key] == value:
+            return False
+
         # Update raw value
         self.channels[channel_key] = value
 
@@ -48,6 +57,7 @@ class N2kDevice:
             self._channel_subjects[channel_key].on_next(value)
         else:
             self._channel_subjects[channel_key] = BehaviorSubject(value)
+        return True
 
     def get_channel_subject(self, channel_key: str) -> BehaviorSubject:
         """
@@ -89,6 +99,56 @@ class N2kDevice:
         return self.to_dict() == other.to_dict()
 
 
+class ChangeSet:
+    """
+    Channels whose values changed while merging a single snapshot into N2kDevices.
+    Attributes:
+        changes (Dict[str, Set[str]]): Map of device id to the keys of the channels that changed.
+    Methods:
+        add: Record a changed channel for a device.
+        is_empty: Return True if no channel changed.
+        to_dict: Return a dictionary representation of the change set.
+    """
+
+    changes: Dict[str, Set[str]]
+
+    def __init__(self):
+        self.changes = {}
+
+    def add(self, device_id: str, channel_key: str):
+        """
+        Record a changed channel for a device.
+
+        Args:
+            device_id (str): The unique key for the device.
+            channel_key (str): The channel key within the device.
+        """
+        self.changes.setdefault(device_id, set()).add(channel_key)
+
+    def is_empty(self) -> bool:
+        """
+        Return True if no channel changed.
+        """
+        return len(self.changes) == 0
+
+    def to_dict(self) -> Dict[str, list[str]]:
+        """
+        Return a dictionary representation of the change set, with sorted channel keys.
+        """
+        return {
+            device_id: sorted(channel_keys)
+            for device_id, channel_keys in self.changes.items()
+        }
+
+    def __len__(self):
+        return sum(len(channel_keys) for channel_keys in self.changes.values())
+
+    def __eq__(self, other):
+        if not isinstance(other, ChangeSet):
+            return False
+        return self.changes == other.changes
+
+
 class N2kDevices:
     """
     Collection of N2K devices, separated into engine and non-engine devices.
@@ -98,6 +158,8 @@ class N2kDevices:
         engine_devices (Dict[str, N2kDevice]): Engine N2K devices.
         mobile_channels (Dict[str, Any]): Current values of non-engine mobile channels.
         engine_mobile_channels (Dict[str, Any]): Current values of engine mobile channels.
+        _pending_mobile_changes (Dict[str, Any]): Mobile channel values changed since the last call to pop_mobile_changes.
+        _pending_lock (threading.Lock): Guards _pending_mobile_changes, as sampled pipes emit from timer threads.
         _pipe_subscriptions (Dict[str, Disposable]): Subscriptions for non-engine device observables.
         _engine_pipe_subscriptions (Dict[str, Disposable]): Subscriptions for engine device observables.
     Methods:
@@ -105,7 +167,9 @@ class N2kDevices:
         add: Add a device to the appropriate collection (engine or non-engine).
         get_channel_subject: Get the BehaviorSubject for a device's channel.
         set_subscription: Subscribe to an observable and update mobile-ready channel on new values.
-        _update_mobile_channel: Update the value of a mobile-ready channel.
+        remove_subscriptions: Dispose the subscriptions of non-engine mobile channels and remove their values.
+        _update_mobile_channel: Update the value of a mobile-ready channel and record it as a pending change.
+        pop_mobile_changes: Return and clear the mobile channel changes recorded since the last call.
         to_mobile_dict: Return a dictionary containing all mobile-ready channel values.
         dispose: Dispose and remove all non-engine devices, subscriptions, and mobile channels.
     """
@@ -114,6 +178,8 @@ class N2kDevices:
     engine_devices: Dict[str, N2kDevice]
     mobile_channels: Dict[str, Any]
     engine_mobile_channels: Dict[str, Any]
+    _pending_mobile_changes: Dict[str, Any]
+    _pending_lock: threading.Lock
     _pipe_subscriptions: Dict[str, Disposable]
     _engine_pipe_subscriptions: Dict[str, Disposable]
 
@@ -123,9 +189,14 @@ class N2kDevices:
         # Mobile channel values
         self.mobile_channels = {}
         self.engine_mobile_channels = {}
+        # Mobile channel values changed since the last pop_mobile_changes
+        self._pending_mobile_changes = {}
+        self._pending_lock = threading.Lock()
         # Subscriptions for pipes
         self._pipe_subscriptions = {}
         self._engine_pipe_subscriptions = {}
+        # Non-engine device keys requested while record_device_keys is active
+        self._recorded_device_keys: Optional[Set[str]] = None
 
     def dispose_devices(self, is_engine: bool = False):
         """
@@ -152,6 +223,7 @@ class N2kDevices:
         for device in devices.values():
             device.dispose()
         devices.clear()
+        self._discard_pending_mobile_changes(channels)
         channels.clear()
 
     def add(self, key: str, device: N2kDevice):
@@ -191,8 +263,29 @@ class N2kDevices:
         )
         if device_key not in device_dict:
             device_dict[device_key] = N2kDevice(type=device_type)
+        if (
+            self._recorded_device_keys is not None
+            and device_type != N2kDeviceType.ENGINE
+        ):
+            self._recorded_device_keys.add(device_key)
         return device_dict[device_key].get_channel_subject(channel_key)
 
+    @contextmanager
+    def record_device_keys(self) -> Iterator[Set[str]]:
+        """
+        Collect the keys of the non-engine devices requested through get_channel_subject
+        while the context is active, e.g. the devices a thing subscribes to while it is created.
+
+        Yields:
+            Set[str]: The set the requested device keys are added to.
+        """
+        device_keys = set()
+        self._recorded_device_keys = device_keys
+        try:
+            yield device_keys
+        finally:
+            self._recorded_device_keys = None
+
     def set_subscription(
         self, mobile_key: str, observable: rx.Observable, is_engine: bool = False
     ):
@@ -223,11 +316,48 @@ class N2kDevices:
         # Store the new subscription
         pipe_subscriptions[mobile_key] = subscription
 
+    def remove_subscriptions(self, mobile_keys: Iterable[str]):
+        """
+        Dispose the subscriptions of the given non-engine mobile channels and remove their values.
+        Used when the things owning these channels are removed from the Empower system,
+        while the devices and the remaining subscriptions are kept.
+
+        Args:
+            mobile_keys (Iterable[str]): The keys of the mobile channels to remove.
+        Returns:
+            None
+        """
+        removed_channels = {}
+        for mobile_key in mobile_keys:
+            subscription = self._pipe_subscriptions.pop(mobile_key, None)
+            if subscription is not None:
+                subscription.dispose()
+            if mobile_key in self.mobile_channels:
+                removed_channels[mobile_key] = self.mobile_channels.pop(mobile_key)
+        self._discard_pending_mobile_changes(removed_channels)
+
+    def remove_devices(self, device_keys: Iterable[str]):
+        """
+        Dispose and remove the given non-engine devices.
+        Used when no thing of the Empower system refers to these devices anymore,
+        so that their state is no longer decoded from snapshots.
+
+        Args:
+            device_keys (Iterable[str]): The keys of the devices to remove.
+        Returns:
+            None
+        """
+        for device_key in device_keys:
+            device = self.devices.pop(device_key, None)
+            if device is not None:
+                device.dispose()
+
     def _update_mobile_channel(
         self, mobile_key: str, value: Any, is_engine: bool = False
     ):
         """
         Update the value of a mobile channel.
+        If the value differs from the current one, it is recorded as a pending change.
 
         Args:
             mobile_key (str): The key for the mobile channel to update.
@@ -236,10 +366,32 @@ class N2kDevices:
         Returns:
             None
         """
-        if is_engine:
-            self.engine_mobile_channels[mobile_key] = value
-        else:
-            self.mobile_channels[mobile_key] = value
+        channels = self.engine_mobile_channels if is_engine else self.mobile_channels
+        if mobile_key in channels and channels[mobile_key] == value:
+            return
+        channels[mobile_key] = value
+        with self._pending_lock:
+            self._pending_mobile_changes[mobile_key] = value
+
+    def pop_mobile_changes(self) -> Dict[str, Any]:
+        """
+        Return the mobile channel values changed since the last call, and clear them.
+
+        Returns:
+            Dict[str, Any]: A dictionary of mobile keys to their latest values.
+        """
+        with self._pending_lock:
+            changes = self._pending_mobile_changes
+            self._pending_mobile_changes = {}
+        return changes
+
+    def _discard_pending_mobile_changes(self, channels: Dict[str, Any]):
+        """
+        Drop pending changes for mobile channels that are about to be removed.
+        """
+        with self._pending_lock:
+            for mobile_key in channels:
+                self._pending_mobile_changes.pop(mobile_key, None)
 
     def to_mobile_dict(self) -> Dict[str, Any]:
         """
@@ -264,6 +416,7 @@ class N2kDevices:
         self._pipe_subscriptions.clear()
         for device in self.devices.values():
             device.dispose()
+        self._discard_pending_mobile_changes(self.mobile_channels)
         self.mobile_channels.clear()
         self.devices.clear()
 
@@ -45,6 +45,8 @@ class Alarm:
     severity, current state, unique ID, fault action, date active, context, and associated
     things (components).
 
+    Alarms are immutable, so alarm lists can share them between reloads instead of copying them.
+    Use replace to get an alarm with some fields changed.
     It provides methods to convert the alarm instance to a dictionary representation for serialization.
     Attributes:
         id: The unique identifier of the alarm.
@@ -58,11 +60,28 @@ class Alarm:
         date_active: The date when the alarm was activated.
         context: Additional context information related to the alarm.
         things: A list of things (components) associated with the alarm.
+        fingerprint: The content of the alarm that is reported, for cheap change detection.
     Methods:
         to_dict: Converts the Alarm instance to a dictionary representation.
+        replace: Returns a copy of the alarm with the given fields changed.
         __init__: Initializes the Alarm instance with the provided parameters or from a Dbus_Alarm instance.
     """
 
+    __slots__ = (
+        "id",
+        "title",
+        "name",
+        "description",
+        "fault_action",
+        "severity",
+        "current_state",
+        "unique_id",
+        "date_active",
+        "context",
+        "things",
+        "_fingerprint",
+    )
+
     id: str
     title: str
     name: str
@@ -71,7 +90,6 @@ class Alarm:
     severity: AlarmSeverity
     current_state: AlarmState
     unique_id: int
-    fault_action: str
 
     date_active: int
     context: dict[str, Union[str, int, float, bool]]
@@ -92,31 +110,100 @@ class Alarm:
         context: Optional[dict[str, Union[str, int, float, bool]]] = None,
     ):
         if alarm:
-            self.id = f"{Constants.alarm}.{alarm.unique_id}"
-            self.title = alarm.title
-            self.name = alarm.name
-            self.description = alarm.description
-            self.unique_id = alarm.unique_id
-            self.date_active = date_active
-            self.fault_action = alarm.fault_action
-
-            self.current_state = state
-            self.context = {}
-            self.things = things or []
-            self.severity = severity_map.get(alarm.severity, AlarmSeverity.NONE)
-
+            self._set(
+                id=f"{Constants.alarm}.{alarm.unique_id}",
+                title=alarm.title,
+                name=alarm.name,
+                description=alarm.description,
+                unique_id=alarm.unique_id,
+                date_active=date_active,
+                fault_action=alarm.fault_action,
+                current_state=state,
+                context={},
+                things=things or [],
+                severity=severity_map.get(alarm.severity, AlarmSeverity.NONE),
+            )
         else:
-            self.id = f"{Constants.alarm}.{unique_id}"
-            self.title = title
-            self.name = name
-            self.description = description
-            self.unique_id = unique_id
-            self.date_active = date_active
-            self.fault_action = fault_action
-            self.current_state = state
-            self.context = context or {}
-            self.things = things or []
-            self.severity = severity
+            self._set(
+                id=f"{Constants.alarm}.{unique_id}",
+                title=title,
+                name=name,
+                description=description,
+                unique_id=unique_id,
+                date_active=date_active,
+                fault_action=fault_action,
+                current_state=state,
+                context=context or {},
+                things=things or [],
+                severity=severity,
+            )
+
+    def _set(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_fingerprint", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            f"{type(self).__name__} is immutable, use replace() to change {name}"
+        )
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getstate__(self):
+        return {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if name != "_fingerprint"
+        }
+
+    def __setstate__(self, state):
+        # Unpickling, e.g. alarms shared by the N2K broker, bypasses the immutability like _set
+        self._set(**state)
+
+    def replace(self, **changes) -> "Alarm":
+        """
+        Return a copy of the alarm with the given fields changed. Fields that are not changed are shared.
+        Args:
+            changes: New values of alarm fields, by attribute name.
+        Returns:
+            A new alarm of the same type.
+        """
+        alarm = object.__new__(type(self))
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if name != "_fingerprint":
+                    object.__setattr__(alarm, name, getattr(self, name))
+        alarm._set(**changes)
+        return alarm
+
+    def _fingerprint_fields(self) -> tuple:
+        return (
+            self.title,
+            self.name,
+            self.description,
+            self.severity,
+            self.current_state,
+            tuple(self.things),
+            self.date_active,
+            self.fault_action,
+            frozenset(self.context.items()),
+        )
+
+    @property
+    def fingerprint(self) -> tuple:
+        """The reported content of the alarm. Equal fingerprints mean equal to_dict representations."""
+        if self._fingerprint is None:
+            object.__setattr__(self, "_fingerprint", self._fingerprint_fields())
+        return self._fingerprint
 
     def to_dict(self) -> dict[str, Any]:
         """Convert the Alarm instance to a dictionary representation."""
@@ -135,4 +222,6 @@ class Alarm:
     def __eq__(self, other):
         if not isinstance(other, Alarm):
             return False
-        return self.to_dict() == other.to_dict()
+        return self is other or (
+            type(self) is type(other) and self.fingerprint == other.fingerprint
+        )
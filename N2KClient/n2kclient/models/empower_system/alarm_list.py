@@ -21,6 +21,9 @@ class AlarmList:
         return {alarm_id: alarm.to_dict() for [alarm_id, alarm] in self.alarm.items()}
 
     def __eq__(self, other):
+        """Compare alarm fingerprints, alarms shared by both lists are not compared field by field."""
         if not isinstance(other, AlarmList):
             return False
-        return self.to_alarm_dict() == other.to_alarm_dict()
+        return self.alarm.keys() == other.alarm.keys() and all(
+            alarm == other.alarm[alarm_id] for alarm_id, alarm in self.alarm.items()
+        )
@@ -17,10 +17,19 @@ class EngineAlarm(Alarm):
         to_dict: Converts the EngineAlarm instance to a dictionary representation.
     """
 
-    current_discrete_status1: Optional[int] = None
-    current_discrete_status2: Optional[int] = None
-    prev_discrete_status1: Optional[int] = None
-    prev_discrete_status2: Optional[int] = None
+    __slots__ = (
+        "current_discrete_status1",
+        "current_discrete_status2",
+        "prev_discrete_status1",
+        "prev_discrete_status2",
+        "alarm_id",
+    )
+
+    current_discrete_status1: Optional[int]
+    current_discrete_status2: Optional[int]
+    prev_discrete_status1: Optional[int]
+    prev_discrete_status2: Optional[int]
+    alarm_id: str
 
     def __init__(
         self,
@@ -35,12 +44,6 @@ class EngineAlarm(Alarm):
     ):
         engine_name = engine.name_utf8
 
-        self.current_discrete_status1 = current_discrete_status1
-        self.current_discrete_status2 = current_discrete_status2
-        self.prev_discrete_status1 = prev_discrete_status1
-        self.prev_discrete_status2 = prev_discrete_status2
-        self.alarm_id = alarm_id
-
         # use constant below
         thing_id = f"marineEngine.{engine.id}"
         super().__init__(
@@ -55,6 +58,21 @@ class EngineAlarm(Alarm):
             context={},
             fault_action="",
         )
+        self._set(
+            current_discrete_status1=current_discrete_status1,
+            current_discrete_status2=current_discrete_status2,
+            prev_discrete_status1=prev_discrete_status1,
+            prev_discrete_status2=prev_discrete_status2,
+            alarm_id=alarm_id,
+        )
+
+    def _fingerprint_fields(self) -> tuple:
+        return super()._fingerprint_fields() + (
+            self.current_discrete_status1,
+            self.current_discrete_status2,
+            self.prev_discrete_status1,
+            self.prev_discrete_status2,
+        )
 
     def to_dict(self):
         """
@@ -75,4 +93,4 @@ class EngineAlarm(Alarm):
     def __eq__(self, other):
         if not isinstance(other, EngineAlarm):
             return False
-        return self.to_dict() == other.to_dict()
+        return super().__eq__(other)
@@ -29,6 +29,9 @@ class EngineAlarmList:
         }
 
     def __eq__(self, other):
+        """Compare alarm fingerprints, alarms shared by both lists are not compared field by field."""
         if not isinstance(other, EngineAlarmList):
             return False
-        return self.to_alarm_dict() == other.to_alarm_dict()
+        return self.engine_alarms.keys() == other.engine_alarms.keys() and all(
+            alarm == other.engine_alarms[alarm_id] for alarm_id, alarm in self.engine_alarms.items()
+        )
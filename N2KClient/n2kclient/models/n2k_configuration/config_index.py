@@ -0,0 +1,110 @@
+from typing import Any
+
+from .ac_meter import ACMeter
+from .binary_logic_state import BinaryLogicState
+from .circuit import Circuit
+from .dc import DC
+from .tank import Tank
+from .ui_relationship_msg import ItemType, UiRelationShipMsg
+
+
+class N2kConfigurationIndex:
+    """
+    Secondary indexes over an N2kConfiguration, so relationship and component queries are
+    dictionary lookups rather than scans of the whole configuration.
+    Hidden circuits are already keyed by id value in the configuration itself.
+    The index is built once the configuration is parsed, and is not updated if the configuration is modified afterwards.
+    Attributes:
+        relationships_by_primary: UI relationships keyed by (primary_type, primary_id), in configuration order.
+        relationships_by_secondary: UI relationships keyed by (secondary_type, secondary_id), in configuration order.
+        relationships_by_primary_address: UI relationships keyed by (primary_type, primary_config_address), in configuration order.
+        relationships_by_secondary_address: UI relationships keyed by (secondary_type, secondary_config_address), in configuration order.
+        circuit_by_control_id: Circuits keyed by control id.
+        hidden_circuit_by_control_id: Hidden circuits keyed by control id.
+        ac_line_by_id: (ACMeter, line number) keyed by AC line id.
+        dc_by_id: DC meters keyed by id.
+        tank_by_id: Tanks keyed by id.
+        bls_by_address: Binary logic states keyed by address.
+    Methods:
+        of: Return the index of a configuration, building it if the configuration has none.
+    """
+
+    relationships_by_primary: dict[tuple[ItemType, int], list[UiRelationShipMsg]]
+    relationships_by_secondary: dict[tuple[ItemType, int], list[UiRelationShipMsg]]
+    relationships_by_primary_address: dict[
+        tuple[ItemType, int], list[UiRelationShipMsg]
+    ]
+    relationships_by_secondary_address: dict[
+        tuple[ItemType, int], list[UiRelationShipMsg]
+    ]
+    circuit_by_control_id: dict[int, Circuit]
+    hidden_circuit_by_control_id: dict[int, Circuit]
+    ac_line_by_id: dict[int, tuple[ACMeter, int]]
+    dc_by_id: dict[int, DC]
+    tank_by_id: dict[int, Tank]
+    bls_by_address: dict[int, BinaryLogicState]
+
+    def __init__(self, config: Any):
+        self.relationships_by_primary = {}
+        self.relationships_by_secondary = {}
+        self.relationships_by_primary_address = {}
+        self.relationships_by_secondary_address = {}
+        for rel in config.ui_relationships:
+            self.relationships_by_primary.setdefault(
+                (rel.primary_type, rel.primary_id), []
+            ).append(rel)
+            self.relationships_by_secondary.setdefault(
+                (rel.secondary_type, rel.secondary_id), []
+            ).append(rel)
+            self.relationships_by_primary_address.setdefault(
+                (rel.primary_type, rel.primary_config_address), []
+            ).append(rel)
+            self.relationships_by_secondary_address.setdefault(
+                (rel.secondary_type, rel.secondary_config_address), []
+            ).append(rel)
+
+        # First match wins, as with the scans these indexes replace
+        self.circuit_by_control_id = {}
+        for circuit in config.circuit.values():
+            self.circuit_by_control_id.setdefault(circuit.control_id, circuit)
+
+        self.hidden_circuit_by_control_id = {}
+        for circuit in config.hidden_circuit.values():
+            self.hidden_circuit_by_control_id.setdefault(circuit.control_id, circuit)
+
+        self.ac_line_by_id = {}
+        for ac_meter in config.ac.values():
+            for key, ac_line in ac_meter.line.items():
+                self.ac_line_by_id.setdefault(ac_line.id, (ac_meter, key))
+
+        self.dc_by_id = {}
+        for dc in config.dc.values():
+            self.dc_by_id.setdefault(dc.id, dc)
+
+        self.tank_by_id = {}
+        for tank in config.tank.values():
+            self.tank_by_id.setdefault(tank.id, tank)
+
+        self.bls_by_address = {}
+        for bls in config.binary_logic_state.values():
+            self.bls_by_address.setdefault(bls.address, bls)
+
+    @classmethod
+    def of(cls, config: Any) -> "N2kConfigurationIndex":
+        """
+        Return the index of a configuration.
+        The index built after parsing is returned if there is one, otherwise an index is built
+        and kept on the configuration for the next queries.
+
+        Args:
+            config: The N2kConfiguration to index.
+        Returns:
+            N2kConfigurationIndex: The index of the configuration.
+        """
+        index = getattr(config, "index", None)
+        if isinstance(index, cls):
+            return index
+        built_index = cls(config)
+        if index is None:
+            config.index = built_index
+        return built_index
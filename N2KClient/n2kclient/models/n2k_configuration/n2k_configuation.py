@@ -1,5 +1,5 @@
 import json
-from typing import Any
+from typing import Any, Optional
 
 from ..n2k_configuration.bls_alarm_mapping import (
     BLSAlarmMapping,
@@ -19,6 +19,7 @@ from ..constants import AttrNames
 from .category_item import CategoryItem
 from .ac_meter import ACMeter
 from .config_metadata import ConfigMetadata
+from .config_index import N2kConfigurationIndex
 
 
 class N2kConfiguration:
@@ -42,6 +43,7 @@ class N2kConfiguration:
     bls_alarm_mappings: dict[int, BLSAlarmMapping]
 
     config_metadata: ConfigMetadata
+    index: Optional[N2kConfigurationIndex]
 
     def __init__(self):
         self.gnss = {}
@@ -62,6 +64,15 @@ class N2kConfiguration:
         self.category = []
         self.config_metadata = ConfigMetadata()
         self.bls_alarm_mappings = {}
+        self.index = None
+
+    def build_indexes(self) -> N2kConfigurationIndex:
+        """
+        Build the secondary indexes used for relationship and component lookups.
+        Must be called again if the configuration is modified after it was indexed.
+        """
+        self.index = N2kConfigurationIndex(self)
+        return self.index
 
     def __del__(self):
         self.gnss.clear()
@@ -82,6 +93,7 @@ class N2kConfiguration:
         self.category = []
         self.config_metadata = ConfigMetadata()
         self.bls_alarm_mappings.clear()
+        self.index = None
 
     def to_dict(self) -> dict[str, Any]:
         try:
@@ -0,0 +1,258 @@
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Optional, Union
+
+from ...models.constants import Constants
+from ...models.empower_system.alarm import Alarm
+from ...util.settings_util import SettingsUtil
+from ...util.time_util import TimeUtil
+
+# State recorded when an alarm is no longer part of the active alarms
+CLEARED_STATE = "cleared"
+
+
+class AlarmTransition:
+    """
+    A change of state of an alarm, as recorded in the alarm history.
+    Attributes:
+        unique_id: The unique ID of the alarm.
+        state: The state the alarm changed to, an AlarmState value or "cleared".
+        timestamp: Time of the change in milliseconds since epoch.
+        things: The things associated with the alarm.
+    Methods:
+        to_dict: Converts the AlarmTransition instance to a dictionary representation.
+        to_record: Converts the AlarmTransition instance to its compact persisted form.
+        from_record: Creates an AlarmTransition instance from its compact persisted form.
+    """
+
+    __slots__ = ("unique_id", "state", "timestamp", "things")
+
+    unique_id: Union[int, str]
+    state: str
+    timestamp: int
+    things: tuple[str, ...]
+
+    def __init__(
+        self,
+        unique_id: Union[int, str],
+        state: str,
+        timestamp: int,
+        things: tuple[str, ...] = (),
+    ):
+        self.unique_id = unique_id
+        self.state = state
+        self.timestamp = timestamp
+        self.things = tuple(things)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the AlarmTransition to a dictionary representation.
+        """
+        return {
+            "id": self.unique_id,
+            "state": self.state,
+            "timestamp": self.timestamp,
+            "things": list(self.things),
+        }
+
+    def to_record(self) -> list:
+        """
+        Convert the AlarmTransition to the [timestamp, id, state, things] list persisted in the history file.
+        """
+        return [self.timestamp, self.unique_id, self.state, list(self.things)]
+
+    @classmethod
+    def from_record(cls, record: list) -> "AlarmTransition":
+        """
+        Create an AlarmTransition from a list persisted in the history file.
+        """
+        timestamp, unique_id, state, things = record
+        return cls(unique_id, state, timestamp, things)
+
+    def __eq__(self, other):
+        if not isinstance(other, AlarmTransition):
+            return False
+        return self.to_record() == other.to_record()
+
+    def __repr__(self):
+        return f"AlarmTransition({self.to_dict()})"
+
+
+class AlarmHistory:
+    """
+    Fixed size history of alarm transitions, kept in memory and persisted to an append-only file.
+    Transitions are appended to the file as one compact JSON array per line. Once the file holds twice the
+    capacity it is rewritten with the transitions in memory, so it stays bounded without rewriting on each append.
+    On startup the last transitions of the file are loaded back, skipping lines that cannot be parsed.
+    Attributes:
+        capacity: Maximum number of transitions kept.
+        path: Path of the history file, None if the history is not persisted.
+        _transitions: The transitions kept, oldest first.
+        _file_records: Number of lines in the history file.
+    Methods:
+        record: Record transitions.
+        record_changes: Record the transitions between two alarm dictionaries.
+        query: Return the transitions in a time range, optionally only those of a thing.
+    """
+
+    _logger = logging.getLogger(
+        f"{Constants.DBUS_N2K_CLIENT}.{Constants.Alarm_Service}"
+    )
+    _default_capacity = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.ALARM_HISTORY_KEY,
+        Constants.ALARM_HISTORY_SIZE_KEY,
+        default_value=1000,
+    )
+    _default_path = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.ALARM_HISTORY_KEY,
+        Constants.ALARM_HISTORY_PATH_KEY,
+        default_value="/data/hub/alarm_history/alarm_history.log",
+    )
+
+    capacity: int
+    path: Optional[str]
+    _transitions: deque[AlarmTransition]
+    _file_records: int
+
+    def __init__(self, capacity: Optional[int] = None, path: Optional[str] = None):
+        self.capacity = capacity if capacity is not None else self._default_capacity
+        self.path = (path if path is not None else self._default_path) or None
+        self._transitions = deque(maxlen=self.capacity)
+        self._file_records = 0
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._load()
+
+    def record(self, transitions: list[AlarmTransition]):
+        """
+        Record transitions, dropping the oldest ones beyond the capacity.
+
+        Args:
+            transitions: The transitions to record, oldest first.
+        """
+        if len(transitions) == 0:
+            return
+        with self._lock:
+            self._transitions.extend(transitions)
+            if self.path is None:
+                return
+            if self._file_records + len(transitions) > 2 * self.capacity:
+                self._compact()
+            else:
+                self._append(transitions)
+
+    def record_changes(
+        self,
+        previous_alarms: dict[Any, Alarm],
+        current_alarms: dict[Any, Alarm],
+        timestamp: Optional[int] = None,
+    ):
+        """
+        Record the alarms that were raised, changed state or cleared between two alarm dictionaries.
+
+        Args:
+            previous_alarms: Alarms keyed by id before the change.
+            current_alarms: Alarms keyed by id after the change.
+            timestamp: Time of the change, the current time if not given.
+        """
+        if timestamp is None:
+            timestamp = TimeUtil.current_time()
+        transitions = []
+        for alarm_id, alarm in current_alarms.items():
+            previous = previous_alarms.get(alarm_id)
+            if previous is alarm or (
+                previous is not None and previous.current_state == alarm.current_state
+            ):
+                continue
+            transitions.append(
+                AlarmTransition(
+                    alarm.unique_id, alarm.current_state.value, timestamp, alarm.things
+                )
+            )
+        for alarm_id, alarm in previous_alarms.items():
+            if alarm_id not in current_alarms:
+                transitions.append(
+                    AlarmTransition(
+                        alarm.unique_id, CLEARED_STATE, timestamp, alarm.things
+                    )
+                )
+        self.record(transitions)
+
+    def query(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        thing_id: Optional[str] = None,
+    ) -> list[AlarmTransition]:
+        """
+        Return the recorded transitions in a time range, oldest first.
+
+        Args:
+            start: Earliest timestamp included, in milliseconds since epoch.
+            end: Latest timestamp included, in milliseconds since epoch.
+            thing_id: Only return transitions of alarms associated with this thing.
+        Returns:
+            list[AlarmTransition]: The matching transitions.
+        """
+        with self._lock:
+            transitions = list(self._transitions)
+        return [
+            transition
+            for transition in transitions
+            if (start is None or transition.timestamp >= start)
+            and (end is None or transition.timestamp <= end)
+            and (thing_id is None or thing_id in transition.things)
+        ]
+
+    def _load(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            if not os.path.exists(self.path):
+                return
+            skipped = 0
+            with open(self.path, "r") as file:
+                for line in file:
+                    self._file_records += 1
+                    try:
+                        self._transitions.append(
+                            AlarmTransition.from_record(json.loads(line))
+                        )
+                    except (ValueError, TypeError):
+                        # A line cut short by a power loss while appending
+                        skipped += 1
+            if skipped > 0:
+                self._logger.warning(
+                    "Skipped %d invalid alarm history records in %s", skipped, self.path
+                )
+                self._compact()
+        except Exception as e:
+            self._logger.error("Failed to load alarm history from %s: %s", self.path, e)
+
+    def _append(self, transitions: list[AlarmTransition]):
+        try:
+            with open(self.path, "a") as file:
+                file.writelines(
+                    json.dumps(transition.to_record(), separators=(",", ":")) + "\n"
+                    for transition in transitions
+                )
+            self._file_records += len(transitions)
+        except Exception as e:
+            self._logger.error("Failed to append alarm history to %s: %s", self.path, e)
+
+    def _compact(self):
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                file.writelines(
+                    json.dumps(transition.to_record(), separators=(",", ":")) + "\n"
+                    for transition in self._transitions
+                )
+            os.replace(temp_path, self.path)
+            self._file_records = len(self._transitions)
+        except Exception as e:
+            self._logger.error("Failed to write alarm history to %s: %s", self.path, e)
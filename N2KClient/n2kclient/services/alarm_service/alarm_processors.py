@@ -5,16 +5,12 @@ from ...models.common_enums import (
 
 from typing import List, Optional
 from ...models.empower_system.component_reference import ComponentReference
-from ...models.n2k_configuration.device import DeviceType
-from ...models.n2k_configuration.ui_relationship_msg import (
-    ItemType,
-    RelationshipType,
-)
 
 from ...models.n2k_configuration.n2k_configuation import N2kConfiguration
 from ...models.n2k_configuration.engine_configuration import EngineConfiguration
 from ...models.n2k_configuration.alarm import Alarm
 from .alarm_helpers import get_inverter_charger_alarm_title
+from .alarm_resolution_index import AlarmResolutionIndex, EngineAlarmResolutionIndex
 from ...models.constants import Constants
 from logging import Logger
 
@@ -26,6 +22,7 @@ def process_device_alarms(
     affected_components: List[ComponentReference],
     alarm: Optional[Alarm] = None,
     is_dc_alarm: Optional[bool] = None,
+    index: Optional[AlarmResolutionIndex] = None,
 ) -> List[ComponentReference]:
     """
     Process device alarms and update affected components.
@@ -38,6 +35,7 @@ def process_device_alarms(
         affected_components: List to which affected components will be added.
         alarm: Optional Alarm object that may contain additional information.
         is_dc_alarm: Optional boolean indicating if the alarm is related to DC.
+        index: Optional AlarmResolutionIndex of the configuration, built if not given.
     Returns:
         List of affected components with device references added if applicable.
     """
@@ -48,118 +46,63 @@ def process_device_alarms(
         logger.warning("Invalid Alarm")
         return affected_components
 
+    index = AlarmResolutionIndex.of(config, index)
     if alarm_device_dipswitch is not None:
         # Circuit and circuit loads
-        for [_, circuit] in config.circuit.items():
-            if circuit.circuit_loads is not None:
-                for load in circuit.circuit_loads:
-                    if load.channel_address is None:
-                        continue
-                    if not any(
-                        c.component_type == ComponentType.CIRCUIT
-                        and c.thing.id.value == circuit.id.value
-                        for c in affected_components
-                    ):
-                        load_channel = load.channel_address >> 8
-                        if load_channel == alarm_device_dipswitch:
-                            component_reference = ComponentReference(
-                                ComponentType.CIRCUIT,
-                                thing=circuit,
-                            )
-                            affected_components.append(component_reference)
+        for reference in index.device_circuits.get(alarm_device_dipswitch, []):
+            if not any(
+                c.component_type == ComponentType.CIRCUIT
+                and c.thing.id.value == reference.thing.id.value
+                for c in affected_components
+            ):
+                affected_components.append(reference)
         # AC Meters
-        for [_, ac_meter] in config.ac.items():
-            for [_, ac_line] in ac_meter.line.items():
-                if ac_line is not None and ac_line.address is not None:
-                    if not any(
-                        c.component_type == ComponentType.ACMETER
-                        and c.thing.instance.instance == ac_line.instance.instance
-                        for c in affected_components
-                    ):
-                        address = ac_line.address >> 8
-                        if address == alarm_device_dipswitch:
-                            component_reference = ComponentReference(
-                                ComponentType.ACMETER, thing=ac_meter.line[1]
-                            )
-                            affected_components.append(component_reference)
+        for ac_line, reference in index.device_ac_lines.get(
+            alarm_device_dipswitch, []
+        ):
+            if not any(
+                c.component_type == ComponentType.ACMETER
+                and c.thing.instance.instance == ac_line.instance.instance
+                for c in affected_components
+            ):
+                affected_components.append(reference)
 
         # DC Meters
-        for [_, dc_meter] in config.dc.items():
+        for reference in index.device_dc_meters.get(alarm_device_dipswitch, []):
             if not any(
                 c.component_type == ComponentType.DCMETER
-                and c.thing.address == dc_meter.address
+                and c.thing.address == reference.thing.address
                 for c in affected_components
             ):
-                if dc_meter.address is None:
-                    continue
-                address = dc_meter.address >> 8
-                if address == alarm_device_dipswitch:
-                    component_reference = ComponentReference(
-                        ComponentType.DCMETER, thing=dc_meter
-                    )
-                    affected_components.append(component_reference)
+                affected_components.append(reference)
 
     # Inverter Chargers
-    for [_, inverter_charger] in config.inverter_charger.items():
+    for reference in index.inverter_chargers.get(
+        (resolved_alarm_channel_id >> 8, resolved_alarm_channel_id & 0xFF), []
+    ):
+        inverter_charger = reference.thing
         if not any(
             c.component_type == ComponentType.INVERTERCHARGER
             and c.thing.inverter_ac_id == inverter_charger.inverter_ac_id
             and c.thing.charger_ac_id == inverter_charger.charger_ac_id
             for c in affected_components
         ):
-            if (resolved_alarm_channel_id >> 8) == inverter_charger.dipswitch and (
-                resolved_alarm_channel_id & 0xFF
-            ) == inverter_charger.channel_index:
-                if inverter_charger.inverter_ac_id.enabled:
-                    title = get_inverter_charger_alarm_title(
-                        config, inverter_charger.inverter_ac_id.id
-                    )
-                    if title:
-                        alarm.title = title
-                component_reference = ComponentReference(
-                    ComponentType.INVERTERCHARGER, thing=inverter_charger
+            if inverter_charger.inverter_ac_id.enabled:
+                title = get_inverter_charger_alarm_title(
+                    config, inverter_charger.inverter_ac_id.id
                 )
-                affected_components.append(component_reference)
+                if title:
+                    alarm.title = title
+            affected_components.append(reference)
 
     # Battery Device Alarms
-    for [_, device] in config.device.items():
-        if (
-            device.dipswitch is None
-            or device.device_type is not DeviceType.Battery
-            or (resolved_alarm_channel_id >> 8) != device.dipswitch
+    for reference in index.battery_dc_meters.get(resolved_alarm_channel_id >> 8, []):
+        if not any(
+            c.component_type == ComponentType.DCMETER
+            and c.thing.address == reference.thing.address
+            for c in affected_components
         ):
-            continue
-        address = device.dipswitch
-
-        relationship = next(
-            (
-                rel
-                for rel in config.ui_relationships
-                if rel.primary_type == ItemType.DcMeter
-                and rel.secondary_type == ItemType.DcMeter
-                and (rel.secondary_config_address >> 8) == device.dipswitch
-                and rel.relationship_type == RelationshipType.Normal
-            ),
-            None,
-        )
-        if relationship is not None:
-            dc = next(
-                (
-                    dc
-                    for [_, dc] in config.dc.items()
-                    if dc.id == relationship.primary_id
-                ),
-                None,
-            )
-            if dc is not None and not any(
-                c.component_type == ComponentType.DCMETER
-                and c.thing.address == dc.address
-                for c in affected_components
-            ):
-                component_reference = ComponentReference(
-                    ComponentType.DCMETER, thing=dc
-                )
-                affected_components.append(component_reference)
+            affected_components.append(reference)
 
     # If no component reference was added and is_dc_alarm is True, try again with resolved_alarm_channel_id -= 3
     # This addresses edge case where Combi reports incorrect ChannelIndex,
@@ -172,6 +115,7 @@ def process_device_alarms(
             affected_components,
             alarm,
             False,
+            index,
         )
     return affected_components
 
@@ -183,6 +127,7 @@ def process_dc_meter_alarms(
     affected_components: List[ComponentReference],
     alarm: Optional[Alarm] = None,
     is_dc_alarm: Optional[bool] = None,
+    index: Optional[AlarmResolutionIndex] = None,
 ) -> List[ComponentReference]:
     """
     Process DC meter alarms and update affected components.
@@ -197,31 +142,21 @@ def process_dc_meter_alarms(
         affected_components: List to which affected components will be added.
         alarm: Optional Alarm object that may contain additional information.
         is_dc_alarm: Optional boolean indicating if the alarm is related to DC.
+        index: Optional AlarmResolutionIndex of the configuration, built if not given.
     Returns:
         List of affected components with DC meter references added if applicable.
     """
-    for [_, dc] in config.dc.items():
-        if any(
-            alarm_config is not None
-            and alarm_config.enabled
-            and alarm_config.id > 0
-            and alarm_config.id == alarm.unique_id
-            for alarm_config in [
-                dc.high_voltage,
-                dc.low_voltage,
-                dc.very_low_voltage,
-                dc.high_limit,
-                dc.very_high_limit,
-                dc.low_limit,
-                dc.very_low_limit,
-            ]
-        ) or (
-            resolved_alarm_channel_id is not None
-            and is_dc_alarm
-            and dc.address == resolved_alarm_channel_id
-        ):
-            component_reference = ComponentReference(ComponentType.DCMETER, thing=dc)
-            affected_components.append(component_reference)
+    index = AlarmResolutionIndex.of(config, index)
+    matched_by_address = []
+    if resolved_alarm_channel_id is not None and is_dc_alarm:
+        matched_by_address = index.dc_meters_by_address.get(
+            resolved_alarm_channel_id, []
+        )
+    affected_components.extend(
+        index.in_config_order(
+            index.dc_meters_by_alarm_id.get(alarm.unique_id, []), matched_by_address
+        )
+    )
     return affected_components
 
 
@@ -232,6 +167,7 @@ def process_ac_meter_alarms(
     affected_components: List[ComponentReference],
     alarm: Optional[Alarm] = None,
     is_dc_alarm: Optional[bool] = None,
+    index: Optional[AlarmResolutionIndex] = None,
 ) -> List[ComponentReference]:
     """
     Process AC meter alarms and update affected components.
@@ -244,31 +180,21 @@ def process_ac_meter_alarms(
         affected_components: List to which affected components will be added.
         alarm: Optional Alarm object that may contain additional information.
         is_dc_alarm: Optional boolean indicating if the alarm is related to DC.
+        index: Optional AlarmResolutionIndex of the configuration, built if not given.
     Returns:
         List of affected components with AC meter references added if applicable.
     """
-    for [_, ac] in config.ac.items():
-        for [_, line] in ac.line.items():
-            if any(
-                alarm_config is not None
-                and alarm_config.enabled
-                and alarm_config.id == alarm.unique_id
-                for alarm_config in [
-                    line.high_limit,
-                    line.low_limit,
-                    line.very_high_limit,
-                    line.high_voltage,
-                    line.frequency,
-                ]
-            ) or (
-                resolved_alarm_channel_id is not None
-                and not is_dc_alarm
-                and line.address == resolved_alarm_channel_id
-            ):
-                component_reference = ComponentReference(
-                    ComponentType.ACMETER, thing=line
-                )
-                affected_components.append(component_reference)
+    index = AlarmResolutionIndex.of(config, index)
+    matched_by_address = []
+    if resolved_alarm_channel_id is not None and not is_dc_alarm:
+        matched_by_address = index.ac_lines_by_address.get(
+            resolved_alarm_channel_id, []
+        )
+    affected_components.extend(
+        index.in_config_order(
+            index.ac_lines_by_alarm_id.get(alarm.unique_id, []), matched_by_address
+        )
+    )
     return affected_components
 
 
@@ -279,6 +205,7 @@ def process_tank_alarms(
     affected_components: List[ComponentReference],
     alarm: Optional[Alarm] = None,
     is_dc_alarm: Optional[bool] = None,
+    index: Optional[AlarmResolutionIndex] = None,
 ) -> List[ComponentReference]:
     """
     Process tank alarms and update affected components.
@@ -291,29 +218,19 @@ def process_tank_alarms(
         affected_components: List to which affected components will be added.
         alarm: Optional Alarm object that may contain additional information.
         is_dc_alarm: Optional boolean indicating if the alarm is related to DC.
+        index: Optional AlarmResolutionIndex of the configuration, built if not given.
     Returns:
         List of affected components with tank references added if applicable.
     """
-    for [_, tank] in config.tank.items():
-        if any(
-            alarm_config is not None
-            and alarm_config.enabled
-            and alarm_config.id > 0
-            and alarm_config.id == alarm.unique_id
-            for alarm_config in [
-                tank.very_low_limit,
-                tank.low_limit,
-                tank.high_limit,
-                tank.very_high_limit,
-            ]
-        ) or (
-            (
-                resolved_alarm_channel_id is not None
-                and tank.address == resolved_alarm_channel_id
-            )
-        ):
-            component_reference = ComponentReference(ComponentType.TANK, thing=tank)
-            affected_components.append(component_reference)
+    index = AlarmResolutionIndex.of(config, index)
+    matched_by_address = []
+    if resolved_alarm_channel_id is not None:
+        matched_by_address = index.tanks_by_address.get(resolved_alarm_channel_id, [])
+    affected_components.extend(
+        index.in_config_order(
+            index.tanks_by_alarm_id.get(alarm.unique_id, []), matched_by_address
+        )
+    )
     return affected_components
 
 
@@ -324,6 +241,7 @@ def process_circuit_load_alarms(
     affected_components: List[ComponentReference],
     alarm: Optional[Alarm] = None,
     is_dc_alarm: Optional[bool] = None,
+    index: Optional[AlarmResolutionIndex] = None,
 ) -> List[ComponentReference]:
     """
     Process circuit load alarms and update affected components.
@@ -336,21 +254,15 @@ def process_circuit_load_alarms(
         affected_components: List to which affected components will be added.
         alarm: Optional Alarm object that may contain additional information.
         is_dc_alarm: Optional boolean indicating if the alarm is related to DC.
+        index: Optional AlarmResolutionIndex of the configuration, built if not given.
     Returns:
         List of affected components with circuit references added if applicable.
     """
     if resolved_alarm_channel_id is not None:
-        for [_, circuit] in config.circuit.items():
-            if circuit.circuit_loads is not None:
-                for load in circuit.circuit_loads:
-                    if (
-                        load.level > 0
-                        and load.channel_address == resolved_alarm_channel_id
-                    ):
-                        component_reference = ComponentReference(
-                            ComponentType.CIRCUIT, thing=circuit
-                        )
-                        affected_components.append(component_reference)
+        index = AlarmResolutionIndex.of(config, index)
+        affected_components.extend(
+            index.circuits_by_load_channel.get(resolved_alarm_channel_id, [])
+        )
     return affected_components
 
 
@@ -361,6 +273,7 @@ def process_bls_alarms(
     alarm: Optional[Alarm] = None,
     resolved_alarm_channel_id: Optional[int] = None,
     is_dc_alarm: Optional[bool] = None,
+    index: Optional[AlarmResolutionIndex] = None,
 ) -> List[ComponentReference]:
     """
     Process BLS (Binary Logic State) alarms and update affected components.
@@ -374,86 +287,12 @@ def process_bls_alarms(
         alarm: Optional Alarm object that may contain additional information.
         resolved_alarm_channel_id: Optional resolved channel ID for the alarm.
         is_dc_alarm: Optional boolean indicating if the alarm is related to DC.
+        index: Optional AlarmResolutionIndex of the configuration, built if not given.
     Returns:
         List of affected components with BLS and related references added if applicable.
     """
-    bls = next(
-        (
-            bls.bls
-            for [_, bls] in config.bls_alarm_mappings.items()
-            if bls.alarm_channel == alarm.channel_id
-        ),
-        None,
-    )
-    if bls is not None:
-        component_reference = ComponentReference(ComponentType.BINARYLOGICSTATE, bls)
-        affected_components.append(component_reference)
-        for rel in config.ui_relationships:
-            if (
-                rel.secondary_type == ItemType.BinaryLogicState
-                and rel.secondary_config_address == bls.address
-                and rel.relationship_type
-                in (
-                    RelationshipType.Normal,
-                    RelationshipType.Duplicates,
-                )
-            ):
-                if rel.primary_type == ItemType.AcMeter:
-                    ac_meter = next(
-                        (
-                            ac
-                            for [_, ac] in config.ac.items()
-                            if ac.line[1].id == rel.primary_id
-                        ),
-                        None,
-                    )
-                    if ac_meter is not None:
-                        component_reference = ComponentReference(
-                            ComponentType.ACMETER, ac_meter.line[1]
-                        )
-                        affected_components.append(component_reference)
-                elif rel.primary_type == ItemType.DcMeter:
-                    dc_meter = next(
-                        (
-                            dc
-                            for [_, dc] in config.dc.items()
-                            if dc.id == rel.primary_id
-                        ),
-                        None,
-                    )
-                    if dc_meter is not None:
-                        component_reference = ComponentReference(
-                            ComponentType.DCMETER, dc_meter
-                        )
-                        affected_components.append(component_reference)
-                elif rel.primary_type == ItemType.FluidLevel:
-                    tank = next(
-                        (
-                            tank
-                            for [_, tank] in config.tank.items()
-                            if tank.id == rel.primary_id
-                        ),
-                        None,
-                    )
-                    if tank is not None:
-                        component_reference = ComponentReference(
-                            ComponentType.TANK, tank
-                        )
-                        affected_components.append(component_reference)
-                elif rel.primary_type == ItemType.Circuit:
-                    circuit = next(
-                        (
-                            circuit
-                            for [_, circuit] in config.circuit.items()
-                            if circuit.control_id == rel.primary_config_address
-                        ),
-                        None,
-                    )
-                    if circuit is not None:
-                        component_reference = ComponentReference(
-                            ComponentType.CIRCUIT, circuit
-                        )
-                        affected_components.append(component_reference)
+    index = AlarmResolutionIndex.of(config, index)
+    affected_components.extend(index.bls_by_alarm_channel.get(alarm.channel_id, []))
     return affected_components
 
 
@@ -464,6 +303,7 @@ def process_smartcraft_alarms(
     affected_components: List[ComponentReference],
     alarm: Optional[Alarm] = None,
     is_dc_alarm: Optional[bool] = None,
+    index: Optional[EngineAlarmResolutionIndex] = None,
 ) -> List[ComponentReference]:
     """
     Process SmartCraft engine alarms and update affected components.
@@ -476,19 +316,15 @@ def process_smartcraft_alarms(
         affected_components: List to which affected components will be added.
         alarm: Optional Alarm object that may contain additional information.
         is_dc_alarm: Optional boolean indicating if the alarm is related to DC.
+        index: Optional EngineAlarmResolutionIndex of the engine configuration, built if not given.
     Returns:
         List of affected components with marine engine references added if applicable.
     """
     engine_instance = resolved_alarm_channel_id & 0x00FF
     engine_name = map_sc_engine_instance_to_engine_name(engine_instance)
     if engine_name is not None:
-        engine = next(
-            (
-                engine
-                for [_, engine] in config.devices.items()
-                if engine.name_utf8 == engine_name
-            ),
-            None,
+        engine = EngineAlarmResolutionIndex.of(config, index).engine_by_name.get(
+            engine_name
         )
         if not engine is None:
             component_reference = ComponentReference(
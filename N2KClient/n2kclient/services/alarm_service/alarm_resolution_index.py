@@ -0,0 +1,324 @@
+from typing import Any, Optional
+
+from ...models.common_enums import ComponentType
+from ...models.empower_system.component_reference import ComponentReference
+from ...models.n2k_configuration.ac import AC
+from ...models.n2k_configuration.config_index import N2kConfigurationIndex
+from ...models.n2k_configuration.device import DeviceType
+from ...models.n2k_configuration.engine import EngineDevice
+from ...models.n2k_configuration.ui_relationship_msg import ItemType, RelationshipType
+
+
+class AlarmResolutionIndex:
+    """
+    Component references of an N2kConfiguration keyed by the alarm fields they are resolved with,
+    so associating an alarm to components is dictionary lookups instead of scans of the whole configuration.
+    Each key maps to the references in configuration order. The alarm processors apply the matching and
+    de-duplication rules on top of these lookups.
+    The index is built for one configuration and is not updated if the configuration is modified afterwards.
+    Attributes:
+        config: The configuration the index was built from.
+        device_circuits: Circuit references keyed by the dipswitch of one of their load channel addresses.
+        device_ac_lines: (AC line, reference to line 1 of its meter) keyed by AC line address dipswitch.
+        device_dc_meters: DC meter references keyed by address dipswitch.
+        battery_dc_meters: DC meter references keyed by the dipswitch of a battery device related to them.
+        inverter_chargers: Inverter charger references keyed by (dipswitch, channel index).
+        dc_meters_by_alarm_id: DC meter references keyed by the id of their enabled alarm limits.
+        dc_meters_by_address: DC meter references keyed by address.
+        ac_lines_by_alarm_id: AC line references keyed by the id of their enabled alarm limits.
+        ac_lines_by_address: AC line references keyed by address.
+        tanks_by_alarm_id: Tank references keyed by the id of their enabled alarm limits.
+        tanks_by_address: Tank references keyed by address.
+        circuits_by_load_channel: Circuit references keyed by the channel address of their loads, once per load.
+        bls_by_alarm_channel: BLS reference, followed by the references of its related components, keyed by alarm channel.
+    Methods:
+        in_config_order: Merge lists of references of the index, in configuration order and without repetition.
+        of: Return the given index if it was built from the configuration, otherwise build one.
+    """
+
+    config: Any
+    device_circuits: dict[int, list[ComponentReference]]
+    device_ac_lines: dict[int, list[tuple[AC, ComponentReference]]]
+    device_dc_meters: dict[int, list[ComponentReference]]
+    battery_dc_meters: dict[int, list[ComponentReference]]
+    inverter_chargers: dict[tuple[int, int], list[ComponentReference]]
+    dc_meters_by_alarm_id: dict[int, list[ComponentReference]]
+    dc_meters_by_address: dict[int, list[ComponentReference]]
+    ac_lines_by_alarm_id: dict[int, list[ComponentReference]]
+    ac_lines_by_address: dict[int, list[ComponentReference]]
+    tanks_by_alarm_id: dict[int, list[ComponentReference]]
+    tanks_by_address: dict[int, list[ComponentReference]]
+    circuits_by_load_channel: dict[int, list[ComponentReference]]
+    bls_by_alarm_channel: dict[int, list[ComponentReference]]
+
+    def __init__(self, config: Any):
+        self.config = config
+        # Position of each reference in the configuration, to merge lookups in scan order
+        self._order: dict[int, int] = {}
+        config_index = N2kConfigurationIndex.of(config)
+
+        self.device_circuits = {}
+        self.circuits_by_load_channel = {}
+        for circuit in config.circuit.values():
+            reference = self._reference(ComponentType.CIRCUIT, circuit)
+            for load in circuit.circuit_loads or []:
+                if load.channel_address is None:
+                    continue
+                circuits = self.device_circuits.setdefault(
+                    load.channel_address >> 8, []
+                )
+                if reference not in circuits:
+                    circuits.append(reference)
+                if load.level is not None and load.level > 0:
+                    self.circuits_by_load_channel.setdefault(
+                        load.channel_address, []
+                    ).append(reference)
+
+        self.device_ac_lines = {}
+        self.ac_lines_by_alarm_id = {}
+        self.ac_lines_by_address = {}
+        for ac_meter in config.ac.values():
+            line_references = {
+                key: self._reference(ComponentType.ACMETER, line)
+                for key, line in ac_meter.line.items()
+                if line is not None
+            }
+            first_line_reference = line_references.get(1)
+            for reference in line_references.values():
+                line = reference.thing
+                if line.address is not None and first_line_reference is not None:
+                    self.device_ac_lines.setdefault(line.address >> 8, []).append(
+                        (line, first_line_reference)
+                    )
+                self._add_alarm_ids(
+                    self.ac_lines_by_alarm_id,
+                    reference,
+                    [
+                        line.high_limit,
+                        line.low_limit,
+                        line.very_high_limit,
+                        line.high_voltage,
+                        line.frequency,
+                    ],
+                    require_positive_id=False,
+                )
+                self.ac_lines_by_address.setdefault(line.address, []).append(
+                    reference
+                )
+
+        self.device_dc_meters = {}
+        self.dc_meters_by_alarm_id = {}
+        self.dc_meters_by_address = {}
+        dc_references: dict[int, ComponentReference] = {}
+        for dc in config.dc.values():
+            reference = self._reference(ComponentType.DCMETER, dc)
+            dc_references[id(dc)] = reference
+            if dc.address is not None:
+                self.device_dc_meters.setdefault(dc.address >> 8, []).append(
+                    reference
+                )
+            self._add_alarm_ids(
+                self.dc_meters_by_alarm_id,
+                reference,
+                [
+                    dc.high_voltage,
+                    dc.low_voltage,
+                    dc.very_low_voltage,
+                    dc.high_limit,
+                    dc.very_high_limit,
+                    dc.low_limit,
+                    dc.very_low_limit,
+                ],
+            )
+            self.dc_meters_by_address.setdefault(dc.address, []).append(reference)
+
+        self.tanks_by_alarm_id = {}
+        self.tanks_by_address = {}
+        for tank in config.tank.values():
+            reference = self._reference(ComponentType.TANK, tank)
+            self._add_alarm_ids(
+                self.tanks_by_alarm_id,
+                reference,
+                [
+                    tank.very_low_limit,
+                    tank.low_limit,
+                    tank.high_limit,
+                    tank.very_high_limit,
+                ],
+            )
+            self.tanks_by_address.setdefault(tank.address, []).append(reference)
+
+        self.inverter_chargers = {}
+        for inverter_charger in config.inverter_charger.values():
+            self.inverter_chargers.setdefault(
+                (inverter_charger.dipswitch, inverter_charger.channel_index), []
+            ).append(
+                self._reference(ComponentType.INVERTERCHARGER, inverter_charger)
+            )
+
+        self.battery_dc_meters = {}
+        for device in config.device.values():
+            if device.dipswitch is None or device.device_type is not DeviceType.Battery:
+                continue
+            relationship = next(
+                (
+                    rel
+                    for rel in config.ui_relationships
+                    if rel.primary_type == ItemType.DcMeter
+                    and rel.secondary_type == ItemType.DcMeter
+                    and (rel.secondary_config_address >> 8) == device.dipswitch
+                    and rel.relationship_type == RelationshipType.Normal
+                ),
+                None,
+            )
+            if relationship is None:
+                continue
+            dc = config_index.dc_by_id.get(relationship.primary_id)
+            if dc is not None:
+                self.battery_dc_meters.setdefault(device.dipswitch, []).append(
+                    dc_references[id(dc)]
+                )
+
+        self.bls_by_alarm_channel = {}
+        for mapping in config.bls_alarm_mappings.values():
+            if mapping.alarm_channel not in self.bls_by_alarm_channel:
+                self.bls_by_alarm_channel[mapping.alarm_channel] = (
+                    self._bls_references(mapping.bls, config_index)
+                )
+
+    def _reference(
+        self, component_type: ComponentType, thing: Any
+    ) -> ComponentReference:
+        reference = ComponentReference(component_type, thing=thing)
+        self._order[id(reference)] = len(self._order)
+        return reference
+
+    @staticmethod
+    def _add_alarm_ids(
+        references_by_alarm_id: dict[int, list[ComponentReference]],
+        reference: ComponentReference,
+        alarm_configs: list,
+        require_positive_id: bool = True,
+    ):
+        for alarm_config in alarm_configs:
+            if alarm_config is None or not alarm_config.enabled:
+                continue
+            if require_positive_id and not alarm_config.id > 0:
+                continue
+            references = references_by_alarm_id.setdefault(alarm_config.id, [])
+            if reference not in references:
+                references.append(reference)
+
+    @staticmethod
+    def _bls_references(
+        bls: Any, config_index: N2kConfigurationIndex
+    ) -> list[ComponentReference]:
+        references = [ComponentReference(ComponentType.BINARYLOGICSTATE, bls)]
+        for rel in config_index.relationships_by_secondary_address.get(
+            (ItemType.BinaryLogicState, bls.address), []
+        ):
+            if rel.relationship_type not in (
+                RelationshipType.Normal,
+                RelationshipType.Duplicates,
+            ):
+                continue
+            if rel.primary_type == ItemType.AcMeter:
+                ac_meter, line_key = config_index.ac_line_by_id.get(
+                    rel.primary_id, (None, None)
+                )
+                # Only meters whose first line is related to the BLS
+                if ac_meter is not None and line_key == 1:
+                    references.append(
+                        ComponentReference(ComponentType.ACMETER, ac_meter.line[1])
+                    )
+            elif rel.primary_type == ItemType.DcMeter:
+                dc_meter = config_index.dc_by_id.get(rel.primary_id)
+                if dc_meter is not None:
+                    references.append(
+                        ComponentReference(ComponentType.DCMETER, dc_meter)
+                    )
+            elif rel.primary_type == ItemType.FluidLevel:
+                tank = config_index.tank_by_id.get(rel.primary_id)
+                if tank is not None:
+                    references.append(ComponentReference(ComponentType.TANK, tank))
+            elif rel.primary_type == ItemType.Circuit:
+                circuit = config_index.circuit_by_control_id.get(
+                    rel.primary_config_address
+                )
+                if circuit is not None:
+                    references.append(
+                        ComponentReference(ComponentType.CIRCUIT, circuit)
+                    )
+        return references
+
+    def in_config_order(
+        self, *reference_lists: list[ComponentReference]
+    ) -> list[ComponentReference]:
+        """
+        Merge lists of references of the index, keeping configuration order and each reference once.
+
+        Args:
+            reference_lists: Lists of references looked up in this index.
+        Returns:
+            list[ComponentReference]: The merged references.
+        """
+        merged = {
+            id(reference): reference
+            for references in reference_lists
+            for reference in references
+        }
+        return sorted(merged.values(), key=lambda ref: self._order[id(ref)])
+
+    @classmethod
+    def of(
+        cls, config: Any, index: Optional["AlarmResolutionIndex"] = None
+    ) -> "AlarmResolutionIndex":
+        """
+        Return the given index if it was built from the configuration, otherwise build one.
+
+        Args:
+            config: The N2kConfiguration to resolve alarms against.
+            index: A previously built index, if any.
+        Returns:
+            AlarmResolutionIndex: An index of the configuration.
+        """
+        if index is not None and index.config is config:
+            return index
+        return cls(config)
+
+
+class EngineAlarmResolutionIndex:
+    """
+    Engine devices of an EngineConfiguration keyed by name, so SmartCraft alarms are resolved without scanning the engines.
+    Attributes:
+        config: The engine configuration the index was built from.
+        engine_by_name: First engine device with each name.
+    Methods:
+        of: Return the given index if it was built from the engine configuration, otherwise build one.
+    """
+
+    config: Any
+    engine_by_name: dict[str, EngineDevice]
+
+    def __init__(self, config: Any):
+        self.config = config
+        self.engine_by_name = {}
+        for engine in config.devices.values():
+            self.engine_by_name.setdefault(engine.name_utf8, engine)
+
+    @classmethod
+    def of(
+        cls, config: Any, index: Optional["EngineAlarmResolutionIndex"] = None
+    ) -> "EngineAlarmResolutionIndex":
+        """
+        Return the given index if it was built from the engine configuration, otherwise build one.
+
+        Args:
+            config: The EngineConfiguration to resolve alarms against.
+            index: A previously built index, if any.
+        Returns:
+            EngineAlarmResolutionIndex: An index of the engine configuration.
+        """
+        if index is not None and index.config is config:
+            return index
+        return cls(config)
@@ -1,6 +1,6 @@
-import copy
 import json
 import logging
+import threading
 from typing import Any, Callable, Optional, Union
 
 from ...models.empower_system.engine_list import EngineList
@@ -41,11 +41,10 @@ from ...models.n2k_configuration.tank import TankType
 from ...models.n2k_configuration.bls_alarm_mapping import BLSAlarmMapping
 from .field_maps import ALARM_FIELD_MAP, ALARM_ENUM_FIELD_MAP
 from .alarm_helpers import (
-    generate_alarms_from_discrete_status,
     get_combi_charger,
     get_combi_inverter,
 )
-from ...util.common_utils import send_and_validate_response
+from ...util.common_utils import send_and_validate_response, validate_response
 from .alarm_processors import (
     process_device_alarms,
     process_dc_meter_alarms,
@@ -55,6 +54,9 @@ from .alarm_processors import (
     process_bls_alarms,
     process_smartcraft_alarms,
 )
+from .alarm_resolution_index import AlarmResolutionIndex, EngineAlarmResolutionIndex
+from .discrete_status_alarm_engine import DiscreteStatusAlarmEngine
+from .alarm_history import AlarmHistory
 
 
 class AlarmService:
@@ -71,13 +73,22 @@ class AlarmService:
         set_alarm_list: Function to set the alarm list.
         set_engine_alarms: Function to set the engine alarms.
         acknowledge_alarm_func: Function to acknowledge an alarm.
+        acknowledge_alarms_func: Function to acknowledge several alarms in one round trip, returning the reply or error of each request.
+        alarm_history: History the alarm and engine alarm transitions are recorded to, if any.
+        _alarm_resolution_index: Alarm resolution index of the last configuration alarms were resolved against.
+        _engine_alarm_resolution_index: Alarm resolution index of the last engine configuration alarms were resolved against.
+        _discrete_status_alarm_engine: Engine alarm state derived from the discrete status words of engine snapshots.
+        _load_alarms_lock: Serializes the loads of the active alarms, which read and replace the latest alarms.
     """
 
     _logger = logging.getLogger(
         f"{Constants.DBUS_N2K_CLIENT}.{Constants.Alarm_Service}"
     )
-    _prev_discrete_status1: dict[Optional[int]]
-    _prev_discrete_status2: dict[Optional[int]]
+    _discrete_status_alarm_engine: DiscreteStatusAlarmEngine
+    alarm_history: Optional[AlarmHistory]
+    _alarm_resolution_index: Optional[AlarmResolutionIndex]
+    _engine_alarm_resolution_index: Optional[EngineAlarmResolutionIndex]
+    _load_alarms_lock: threading.RLock
 
     def __init__(
         self,
@@ -91,6 +102,8 @@ class AlarmService:
         acknowledge_alarm_func: Callable[[dict], None],
         get_latest_empower_system_func: Callable[[], EmpowerSystem],
         get_latest_engine_list_func: Callable[[], EngineList],
+        alarm_history: Optional[AlarmHistory] = None,
+        acknowledge_alarms_func: Optional[Callable[[list[str]], list]] = None,
     ):
         self.alarm_list = alarm_list_func
         self.get_latest_alarms = get_latest_alarms_func
@@ -102,9 +115,14 @@ class AlarmService:
         self.acknowledge_alarm_func = acknowledge_alarm_func
         self.get_latest_empower_system = get_latest_empower_system_func
         self.get_latest_engine_list = get_latest_engine_list_func
+        self.alarm_history = alarm_history
+        self.acknowledge_alarms_func = acknowledge_alarms_func
 
-        self._prev_discrete_status1 = {}
-        self._prev_discrete_status2 = {}
+        self._discrete_status_alarm_engine = DiscreteStatusAlarmEngine()
+        self._alarm_resolution_index = None
+        self._engine_alarm_resolution_index = None
+        # Reentrant, an alarm list subscriber may acknowledge alarms, which reloads them
+        self._load_alarms_lock = threading.RLock()
 
     ###############################
     # Public Methods
@@ -136,31 +154,89 @@ class AlarmService:
             self._logger.error("Failed to acknowledge alarm %s: %s", alarm_id, e)
             return False
 
-    def load_active_alarms(self, force: bool = False) -> tuple[bool, str]:
+    def acknowledge_alarms(self, alarm_ids: list[int]) -> dict[int, bool]:
         """
-        Load active alarms from the alarm list dbus method and update the latest alarms.
+        Acknowledge several active alarms in one round trip, then reload the active alarms once.
+        Alarms that are not active fail, alarms already acknowledged succeed without being sent.
+
+        Args:
+            alarm_ids: The ids of the alarms to acknowledge.
+        Returns:
+            dict[int, bool]: Whether each alarm was acknowledged, keyed by alarm id.
         """
-        try:
-            latest_alarms = self.get_latest_alarms()
-            alarm_list_str = self.alarm_list()
-            if alarm_list_str:
-                parsed_alarms = self.parse_alarm_list(alarm_list_str)
-                merged_alarm_list = self._merge_alarm_lists(
-                    parsed_alarms,
-                    latest_alarms,
-                    self.get_config(),
-                    self.get_engine_config(),
+        results = {}
+        requests = {}
+        latest_alarms = self.get_latest_alarms().alarm
+        for alarm_id in alarm_ids:
+            alarm = latest_alarms.get(alarm_id)
+            if alarm is None:
+                self._logger.error(
+                    f"Attempted to acknowledge alarm {alarm_id}. Alarm not found in active list."
+                )
+                results[alarm_id] = False
+            elif alarm.current_state == AlarmState.ACKNOWLEDGED:
+                results[alarm_id] = True
+            else:
+                requests[alarm_id] = json.dumps(
+                    {JsonKeys.ID: alarm.unique_id, JsonKeys.ACCEPTED: True}
                 )
-                if (
-                    merged_alarm_list.to_alarm_dict() != latest_alarms.to_alarm_dict()
-                    or force
-                ):
-                    merged_alarm_list = self._verify_alarm_things(merged_alarm_list)
-                    self.set_alarm_list(merged_alarm_list)
-            return True, ""
+        if len(requests) == 0:
+            return results
+
+        try:
+            if self.acknowledge_alarms_func is not None:
+                responses = self.acknowledge_alarms_func(list(requests.values()))
+            else:
+                responses = []
+                for request in requests.values():
+                    try:
+                        responses.append(self.acknowledge_alarm_func(request))
+                    except Exception as e:
+                        responses.append(e)
         except Exception as e:
-            self._logger.error("Failed to load active alarms: %s", e)
-            return False, str(e)
+            self._logger.error("Failed to acknowledge alarms %s: %s", list(requests), e)
+            responses = [e] * len(requests)
+
+        for alarm_id, response in zip(requests, responses):
+            if isinstance(response, Exception):
+                self._logger.error(
+                    "Failed to acknowledge alarm %s: %s", alarm_id, response
+                )
+                results[alarm_id] = False
+            else:
+                results[alarm_id] = validate_response(response, self._logger)
+        if any(results[alarm_id] for alarm_id in requests):
+            self.load_active_alarms()
+        return results
+
+    def load_active_alarms(self, force: bool = False) -> tuple[bool, str]:
+        """
+        Load active alarms from the alarm list dbus method and update the latest alarms.
+        Loads are serialized, they may run on the alarm reload timer and the caller threads at once.
+        """
+        with self._load_alarms_lock:
+            try:
+                latest_alarms = self.get_latest_alarms()
+                alarm_list_str = self.alarm_list()
+                if alarm_list_str:
+                    parsed_alarms = self.parse_alarm_list(alarm_list_str)
+                    merged_alarm_list = self._merge_alarm_lists(
+                        parsed_alarms,
+                        latest_alarms,
+                        self.get_config(),
+                        self.get_engine_config(),
+                    )
+                    if merged_alarm_list != latest_alarms or force:
+                        merged_alarm_list = self._verify_alarm_things(merged_alarm_list)
+                        self.set_alarm_list(merged_alarm_list)
+                        if self.alarm_history is not None:
+                            self.alarm_history.record_changes(
+                                latest_alarms.alarm, merged_alarm_list.alarm
+                            )
+                return True, ""
+            except Exception as e:
+                self._logger.error("Failed to load active alarms: %s", e)
+                return False, str(e)
 
     def _merge_alarm_lists(
         self,
@@ -187,24 +263,40 @@ class AlarmService:
     ):
         alarm_id = alarm.unique_id
         processed_alarm = None
-        date_active = TimeUtil.current_time()
+        # Alarms are immutable, so alarms that did not change are shared with the latest list
+        latest_alarm = None
+        if alarm_id in latest_alarms.alarm:
+            latest_alarm = latest_alarms.alarm[alarm_id]
         if alarm.current_state == eStateType.StateAcknowledged:
-            if alarm_id in latest_alarms.alarm:
-                processed_alarm = copy.deepcopy(latest_alarms.alarm[alarm_id])
-                processed_alarm.current_state = AlarmState.ACKNOWLEDGED
+            if latest_alarm is not None:
+                processed_alarm = latest_alarm
+                if latest_alarm.current_state != AlarmState.ACKNOWLEDGED:
+                    processed_alarm = latest_alarm.replace(
+                        current_state=AlarmState.ACKNOWLEDGED
+                    )
             else:
                 processed_alarm = self.build_reportable_alarm(
-                    alarm, AlarmState.ACKNOWLEDGED, date_active, config, engine_config
+                    alarm,
+                    AlarmState.ACKNOWLEDGED,
+                    TimeUtil.current_time(),
+                    config,
+                    engine_config,
                 )
         elif alarm.current_state == eStateType.StateEnabled:
-            if alarm_id in latest_alarms.alarm:
-                processed_alarm = copy.deepcopy(latest_alarms.alarm[alarm_id])
-                if processed_alarm.current_state != AlarmState.ENABLED:
-                    processed_alarm.current_state = AlarmState.ENABLED
-                    processed_alarm.date_active = date_active
+            if latest_alarm is not None:
+                processed_alarm = latest_alarm
+                if latest_alarm.current_state != AlarmState.ENABLED:
+                    processed_alarm = latest_alarm.replace(
+                        current_state=AlarmState.ENABLED,
+                        date_active=TimeUtil.current_time(),
+                    )
             else:
                 processed_alarm = self.build_reportable_alarm(
-                    alarm, AlarmState.ENABLED, date_active, config, engine_config
+                    alarm,
+                    AlarmState.ENABLED,
+                    TimeUtil.current_time(),
+                    config,
+                    engine_config,
                 )
         return alarm_id, processed_alarm
 
@@ -254,7 +346,11 @@ class AlarmService:
         """
         Given an alarm, configuration and previously processed bls_alarm id map build a list of
         Component References for any give alarm, to associate alarm to things.
+        The alarm resolution index is rebuilt only when the configuration changes.
         """
+        self._alarm_resolution_index = AlarmResolutionIndex.of(
+            config, self._alarm_resolution_index
+        )
 
         affected_components: list[ComponentReference] = []
         is_dc_alarm = self._is_dc_meter_alarm(alarm)
@@ -280,15 +376,20 @@ class AlarmService:
                 affected_components=affected_components,
                 alarm=alarm,
                 is_dc_alarm=is_dc_alarm,
+                index=self._alarm_resolution_index,
             )
 
         if alarm.external_alarm_id and alarm.external_alarm_id >= 0x4100:
+            self._engine_alarm_resolution_index = EngineAlarmResolutionIndex.of(
+                engine_config, self._engine_alarm_resolution_index
+            )
             affected_components = process_smartcraft_alarms(
                 logger=self._logger,
                 resolved_alarm_channel_id=resolved_alarm_channel_id,
                 config=engine_config,
                 affected_components=affected_components,
                 is_dc_alarm=is_dc_alarm,
+                index=self._engine_alarm_resolution_index,
             )
 
         return affected_components
@@ -432,34 +533,40 @@ class AlarmService:
     def _verify_alarm_things(self, alarm_list: AlarmList):
         """
         Verify each alarm contain thing that is part of reported system and remove any alarm that do not.
+        Alarms whose things are all part of the system are kept as they are.
         """
-        alarm_list_copy = copy.deepcopy(alarm_list)
+        verified_alarm_list = AlarmList()
         latest_system_things = self.get_latest_empower_system().things
-        for id, alarm in list(alarm_list_copy.alarm.items()):
-            valid_things = []
-            for thing in alarm.things:
-                if thing in latest_system_things:
-                    valid_things.append(thing)
-            alarm_list_copy.alarm[id].things = valid_things
-            if len(valid_things) == 0:
-                del alarm_list_copy.alarm[id]
-        return alarm_list_copy
+        for id, alarm in alarm_list.alarm.items():
+            verified_alarm = self._verify_things(alarm, latest_system_things)
+            if verified_alarm is not None:
+                verified_alarm_list.alarm[id] = verified_alarm
+        return verified_alarm_list
 
     def _verify_engine_alarm_things(self, engine_alarm_list: EngineAlarmList):
         """
         Verify each engine alarm contains things that are part of the latest engine list and remove any alarm that do not.
+        Alarms whose things are all part of the engine list are kept as they are.
         """
-        engine_alarm_list_copy = copy.deepcopy(engine_alarm_list)
+        verified_engine_alarm_list = EngineAlarmList()
         latest_engine_things = self.get_latest_engine_list().engines
-        for id, engine_alarm in list(engine_alarm_list_copy.engine_alarms.items()):
-            valid_things = []
-            for thing in engine_alarm.things:
-                if thing in latest_engine_things:
-                    valid_things.append(thing)
-            engine_alarm_list_copy.engine_alarms[id].things = valid_things
-            if len(valid_things) == 0:
-                del engine_alarm_list_copy.engine_alarms[id]
-        return engine_alarm_list_copy
+        for id, engine_alarm in engine_alarm_list.engine_alarms.items():
+            verified_alarm = self._verify_things(engine_alarm, latest_engine_things)
+            if verified_alarm is not None:
+                verified_engine_alarm_list.engine_alarms[id] = verified_alarm
+        return verified_engine_alarm_list
+
+    @staticmethod
+    def _verify_things(alarm: Alarm, latest_things) -> Optional[Alarm]:
+        """
+        Return the alarm restricted to the things in latest_things, or None if it has none of them.
+        """
+        valid_things = [thing for thing in alarm.things if thing in latest_things]
+        if len(valid_things) == 0:
+            return None
+        if len(valid_things) == len(alarm.things):
+            return alarm
+        return alarm.replace(things=valid_things)
 
     def post_process_alarm_configuration(
         self, alarm: N2KAlarm, bls_alarms: dict[int, BLSAlarmMapping]
@@ -509,7 +616,7 @@ class AlarmService:
                 An Alarm instance populated with the data from the JSON object.
         """
         try:
-            alarm = Alarm()
+            alarm = N2KAlarm()
             map_fields(alarm_json, alarm, ALARM_FIELD_MAP)
             map_enum_fields(self._logger, alarm_json, alarm, ALARM_ENUM_FIELD_MAP)
             return alarm
@@ -522,105 +629,40 @@ class AlarmService:
     ) -> None:
         """
         Processes engine alerts from a given snapshot and generates a merged list of engine alerts.
+        Only the discrete status bits that flipped since the previous snapshot are processed, and the engine
+        alarms are left untouched when none did.
 
         Args:
             snapshot (nmea2k.SnapshotInstanceIdMap): The snapshot containing engine data.
 
         """
 
+        if JsonKeys.ENGINES not in snapshot_dict:
+            return
+
         latest_engine_alarm_list = self.get_engine_alarms()
-        merged_engine_alarm_list = copy.deepcopy(latest_engine_alarm_list)
-
-        latest_engine_config = self.get_engine_config()
-        if JsonKeys.ENGINES in snapshot_dict:
-            for engine_id, engine_state in snapshot_dict[JsonKeys.ENGINES].items():
-                engine_id = int(engine_id.split(".")[1])
-                if engine_id in latest_engine_config.devices:
-                    prev_discrete_status1 = self._prev_discrete_status1.get(
-                        engine_id, None
-                    )
-                    prev_discrete_status2 = self._prev_discrete_status2.get(
-                        engine_id, None
-                    )
+        merged_engine_alarm_list = self._discrete_status_alarm_engine.process(
+            snapshot_dict[JsonKeys.ENGINES],
+            self.get_engine_config(),
+            latest_engine_alarm_list,
+        )
+        # No status bit flipped, the engine alarms are unchanged
+        if merged_engine_alarm_list is None:
+            return
 
-                    current_discrete_status1 = prev_discrete_status1
-                    current_discrete_status2 = prev_discrete_status2
-
-                    if JsonKeys.DISCRETE_STATUS_1 in engine_state:
-                        discrete_status_1 = engine_state[JsonKeys.DISCRETE_STATUS_1]
-                        self._prev_discrete_status1[engine_id] = discrete_status_1
-                        current_discrete_status1 = discrete_status_1
-
-                    if JsonKeys.DISCRETE_STATUS_2 in engine_state:
-                        discrete_status_2 = engine_state[JsonKeys.DISCRETE_STATUS_2]
-                        self._prev_discrete_status2[engine_id] = discrete_status_2
-                        current_discrete_status2 = discrete_status_2
-
-                    # Discrete Status 1
-                    if JsonKeys.DISCRETE_STATUS_1 in engine_state:
-                        status_alarms = [
-                            Constants.checkEngineAlarm,
-                            Constants.overTemperatureAlarm,
-                            Constants.lowOilPressureAlarm,
-                            Constants.lowOilLevelAlarm,
-                            Constants.lowFuelPressureAlarm,
-                            Constants.lowSystemVoltageAlarm,
-                            Constants.lowCoolantLevelAlarm,
-                            Constants.waterFlowAlarm,
-                            Constants.waterInFuelAlarm,
-                            Constants.chargeIndicatorAlarm,
-                            Constants.preheatIndicatorAlarm,
-                            Constants.highBoostPressureAlarm,
-                            Constants.revLimitExceededAlarm,
-                            Constants.egrSystemAlarm,
-                            Constants.throttlePositionSensorAlarm,
-                            # Constants.engineEmergencyStopAlarm
-                        ]
-
-                        generate_alarms_from_discrete_status(
-                            status_alarms=status_alarms,
-                            discrete_status=current_discrete_status1,
-                            merged_engine_alarm_list=merged_engine_alarm_list,
-                            prev_discrete_status1=prev_discrete_status1,
-                            prev_discrete_status2=prev_discrete_status2,
-                            current_discrete_status1=current_discrete_status1,
-                            current_discrete_status2=current_discrete_status2,
-                            prev_engine_alarm_list=latest_engine_alarm_list,
-                            engine_id=engine_id,
-                            engine_config=latest_engine_config.devices[engine_id],
-                            discrete_status_word=1,
-                        )
-                    if JsonKeys.DISCRETE_STATUS_2 in engine_state:
-                        status_alarms = [
-                            Constants.warningLevel1Alarm,
-                            Constants.warningLevel2Alarm,
-                            Constants.powerReductionAlarm,
-                            Constants.maintenanceNeededAlarm,
-                            Constants.engineCommErrorAlarm,
-                            Constants.subOrSecondaryThrottleAlarm,
-                            Constants.neutralStartProtectAlarm,
-                            Constants.engineShuttingDownAlarm,
-                            Constants.sensorMalfunctionAlarm,
-                        ]
-
-                        generate_alarms_from_discrete_status(
-                            status_alarms=status_alarms,
-                            discrete_status=current_discrete_status2,
-                            merged_engine_alarm_list=merged_engine_alarm_list,
-                            prev_discrete_status1=prev_discrete_status1,
-                            prev_discrete_status2=prev_discrete_status2,
-                            current_discrete_status1=current_discrete_status1,
-                            current_discrete_status2=current_discrete_status2,
-                            prev_engine_alarm_list=latest_engine_alarm_list,
-                            engine_id=engine_id,
-                            engine_config=latest_engine_config.devices[engine_id],
-                            discrete_status_word=2,
-                        )
+        verified_engine_alarm_list = self._verify_engine_alarm_things(
+            merged_engine_alarm_list
+        )
         if (
-            merged_engine_alarm_list.to_alarm_dict()
-            != latest_engine_alarm_list.to_alarm_dict()
+            verified_engine_alarm_list.engine_alarms.keys()
+            != merged_engine_alarm_list.engine_alarms.keys()
         ):
-            merged_engine_alarm_list = self._verify_engine_alarm_things(
-                merged_engine_alarm_list
-            )
-            self.set_engine_alarms(merged_engine_alarm_list)
+            # Alarms of engines missing from the engine list were dropped, raise them again once the engine is listed
+            self._discrete_status_alarm_engine.invalidate()
+        if verified_engine_alarm_list != latest_engine_alarm_list:
+            self.set_engine_alarms(verified_engine_alarm_list)
+            if self.alarm_history is not None:
+                self.alarm_history.record_changes(
+                    latest_engine_alarm_list.engine_alarms,
+                    verified_engine_alarm_list.engine_alarms,
+                )
@@ -0,0 +1,186 @@
+from typing import Any, Optional
+
+from ...models.constants import Constants, JsonKeys
+from ...models.empower_system.engine_alarm import EngineAlarm
+from ...models.empower_system.engine_alarm_list import EngineAlarmList
+from ...util.time_util import TimeUtil
+
+# Alarms raised by each bit of the engine discrete status words
+DISCRETE_STATUS_ALARMS = {
+    1: [
+        Constants.checkEngineAlarm,
+        Constants.overTemperatureAlarm,
+        Constants.lowOilPressureAlarm,
+        Constants.lowOilLevelAlarm,
+        Constants.lowFuelPressureAlarm,
+        Constants.lowSystemVoltageAlarm,
+        Constants.lowCoolantLevelAlarm,
+        Constants.waterFlowAlarm,
+        Constants.waterInFuelAlarm,
+        Constants.chargeIndicatorAlarm,
+        Constants.preheatIndicatorAlarm,
+        Constants.highBoostPressureAlarm,
+        Constants.revLimitExceededAlarm,
+        Constants.egrSystemAlarm,
+        Constants.throttlePositionSensorAlarm,
+        # Constants.engineEmergencyStopAlarm
+    ],
+    2: [
+        Constants.warningLevel1Alarm,
+        Constants.warningLevel2Alarm,
+        Constants.powerReductionAlarm,
+        Constants.maintenanceNeededAlarm,
+        Constants.engineCommErrorAlarm,
+        Constants.subOrSecondaryThrottleAlarm,
+        Constants.neutralStartProtectAlarm,
+        Constants.engineShuttingDownAlarm,
+        Constants.sensorMalfunctionAlarm,
+    ],
+}
+
+DISCRETE_STATUS_KEYS = {
+    1: JsonKeys.DISCRETE_STATUS_1,
+    2: JsonKeys.DISCRETE_STATUS_2,
+}
+
+
+class DiscreteStatusBitTable:
+    """
+    Precomputed bit to alarm definition table of one discrete status word.
+    Attributes:
+        word: The discrete status word number (1 or 2).
+        mask: Mask of every bit that raises an alarm.
+        bits: (bit mask, bit shift, alarm text) of each alarm, in definition order.
+    """
+
+    word: int
+    mask: int
+    bits: tuple[tuple[int, int, str], ...]
+
+    def __init__(self, word: int, status_alarms: list[tuple[int, str]]):
+        self.word = word
+        self.bits = tuple(
+            (1 << bit_shift, bit_shift, alarm_text)
+            for bit_shift, alarm_text in status_alarms
+        )
+        self.mask = 0
+        for bit_mask, _, _ in self.bits:
+            self.mask |= bit_mask
+
+
+class DiscreteStatusAlarmEngine:
+    """
+    Derives engine alarms from the discrete status words of engine snapshots.
+    The last status word of each engine is kept, and only the bits that flipped since are turned into
+    alarm additions or removals, so a snapshot whose status words did not change costs a dictionary lookup per word.
+    A word seen for the first time, or after invalidate, has every alarm bit evaluated.
+    Attributes:
+        tables: Bit to alarm definition table of each discrete status word.
+        _status_words: Last status word keyed by (engine id, word).
+        _stale_engines: Engines whose alarm bits are all evaluated on their next snapshot.
+    Methods:
+        process: Apply the status words of a snapshot to an engine alarm list.
+        invalidate: Evaluate every alarm bit of the known engines on their next snapshot.
+    """
+
+    tables: dict[int, DiscreteStatusBitTable]
+    _status_words: dict[tuple[int, int], int]
+    _stale_engines: set[int]
+
+    def __init__(self):
+        self.tables = {
+            word: DiscreteStatusBitTable(word, status_alarms)
+            for word, status_alarms in DISCRETE_STATUS_ALARMS.items()
+        }
+        self._status_words = {}
+        self._stale_engines = set()
+
+    def process(
+        self,
+        engine_states: dict[str, dict[str, Any]],
+        engine_config: Any,
+        engine_alarm_list: EngineAlarmList,
+    ) -> Optional[EngineAlarmList]:
+        """
+        Apply the discrete status words of the engines of a snapshot to the engine alarm list.
+
+        Args:
+            engine_states: Engine states of the snapshot keyed by engine thing id.
+            engine_config: The EngineConfiguration the engines are part of.
+            engine_alarm_list: The current engine alarm list, which is not modified.
+        Returns:
+            Optional[EngineAlarmList]: A new engine alarm list if an alarm was added or removed, otherwise None.
+        """
+        merged_engine_alarm_list = None
+        for engine_key, engine_state in engine_states.items():
+            engine_id = int(engine_key.split(".")[1])
+            if engine_id not in engine_config.devices:
+                continue
+
+            previous_words = {
+                word: self._status_words.get((engine_id, word)) for word in self.tables
+            }
+            current_words = dict(previous_words)
+            flipped_bits = {}
+            stale = engine_id in self._stale_engines
+            self._stale_engines.discard(engine_id)
+            for word, table in self.tables.items():
+                json_key = DISCRETE_STATUS_KEYS[word]
+                if json_key not in engine_state:
+                    continue
+                status = engine_state[json_key]
+                current_words[word] = status
+                self._status_words[(engine_id, word)] = status
+                previous = previous_words[word]
+                if previous is None or stale:
+                    flipped_bits[word] = table.mask
+                else:
+                    flipped_bits[word] = (previous ^ status) & table.mask
+
+            if not any(flipped_bits.values()):
+                continue
+
+            for word, flipped in flipped_bits.items():
+                status = current_words[word]
+                for bit_mask, bit_shift, alarm_text in self.tables[word].bits:
+                    if not flipped & bit_mask:
+                        continue
+                    alarm_id = f"engine.{engine_id}.discrete_status{word}.{bit_shift}"
+                    alarms = (
+                        merged_engine_alarm_list or engine_alarm_list
+                    ).engine_alarms
+                    if status & bit_mask:
+                        if alarm_id in engine_alarm_list.engine_alarms:
+                            continue
+                        alarm = EngineAlarm(
+                            date_active=TimeUtil.current_time(),
+                            alarm_text=alarm_text,
+                            engine=engine_config.devices[engine_id],
+                            prev_discrete_status1=previous_words[1],
+                            prev_discrete_status2=previous_words[2],
+                            current_discrete_status1=current_words[1],
+                            current_discrete_status2=current_words[2],
+                            alarm_id=alarm_id,
+                        )
+                    elif alarm_id in alarms:
+                        alarm = None
+                    else:
+                        continue
+
+                    if merged_engine_alarm_list is None:
+                        # Engine alarms are immutable, the merged list only needs its own dict
+                        merged_engine_alarm_list = EngineAlarmList()
+                        merged_engine_alarm_list.engine_alarms = dict(
+                            engine_alarm_list.engine_alarms
+                        )
+                    if alarm is None:
+                        merged_engine_alarm_list.engine_alarms.pop(alarm_id)
+                    else:
+                        merged_engine_alarm_list.engine_alarms[alarm_id] = alarm
+        return merged_engine_alarm_list
+
+    def invalidate(self):
+        """
+        Evaluate every alarm bit of the known engines on their next snapshot, instead of only the flipped ones.
+        """
+        self._stale_engines.update(engine_id for engine_id, _ in self._status_words)
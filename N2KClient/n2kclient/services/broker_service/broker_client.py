@@ -0,0 +1,524 @@
+import itertools
+import logging
+import os
+import socket
+import threading
+from typing import Any, List, Optional
+
+import reactivex as rx
+from reactivex import operators as ops
+
+from ...models.common_enums import ConnectionStatus
+from ...models.constants import Constants
+from ...models.dbus_connection_status import DBUSConnectionStatus
+from ...models.devices import N2kDevices
+from ...models.empower_system.alarm import Alarm
+from ...models.empower_system.alarm_list import AlarmList
+from ...models.empower_system.empower_system import EmpowerSystem
+from ...models.empower_system.engine_alarm_list import EngineAlarmList
+from ...models.empower_system.engine_list import EngineList
+from ...models.n2k_configuration.engine_configuration import EngineConfiguration
+from ...models.n2k_configuration.factory_metadata import FactoryMetadata
+from ...models.n2k_configuration.n2k_configuation import N2kConfiguration
+from ...util.time_util import TimeUtil
+from ..alarm_service.alarm_history import AlarmTransition
+from ..config_service.config_processor.config_processor import ConfigProcessor
+from .broker_protocol import BrokerProtocol
+
+
+class BrokerRequest:
+    """
+    A call sent to the N2K broker server, waiting for its result.
+    Attributes:
+        done: Set once the result or error was received, or the connection was lost.
+        result: The return value of the call.
+        error: The error of the call, None if it succeeded.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class N2KBrokerClient:
+    """
+    Drop-in replacement of the N2KClient, sharing the state of the N2KClient of another service through its
+    N2KBrokerServer instead of connecting to DBus.
+    The EmpowerSystem and EngineList are built locally from the configuration received, with the same
+    ConfigProcessor, so their things can be inspected as usual. Snapshots are not parsed: the mobile channel
+    values are received as deltas and set on the latest devices, whose things hold no state.
+    Alarms, factory metadata and the DBus connection status are those of the server. Commands are forwarded to
+    the server, and return their failure value if it cannot be reached.
+    While the server is unreachable the DBus connection status is DISCONNECTED, and the client reconnects.
+    Messages are only read from a server running as root or as the user of the client, as they are unpickled.
+    Attributes:
+        socket_path: Path of the Unix socket of the server.
+        request_timeout: Seconds to wait for the result of a command.
+        lock: Lock held while the devices and the EmpowerSystem are rebuilt or updated.
+        devices, mobile_changes, config, empower_system, engine_config, engine_list, factory_metadata,
+        active_alarms, engine_alarms, n2k_dbus_connection_status: Observables, as those of the N2KClient.
+    Methods:
+        start: Connect to the server in a separate thread.
+        stop: Disconnect from the server.
+        set_circuit_power_state, set_circuit_level, acknowledge_alarm, acknowledge_alarms,
+        refresh_active_alarms, scan_marine_engines, write_configuration, request_state_snapshot,
+        get_alarm_history: Commands, called on the N2KClient of the server.
+        get_*: Getters of the latest state and observables, as those of the N2KClient.
+    """
+
+    _logger = logging.getLogger(f"{Constants.DBUS_N2K_CLIENT}.BrokerClient")
+
+    _latest_devices: N2kDevices
+    _latest_config: N2kConfiguration
+    _latest_empower_system: EmpowerSystem
+    _latest_engine_config: EngineConfiguration
+    _latest_engine_list: EngineList
+    _latest_factory_metadata: Optional[FactoryMetadata]
+    _latest_alarms: AlarmList
+    _latest_engine_alarms: EngineAlarmList
+    _requests: dict[int, BrokerRequest]
+
+    lock: threading.Lock
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        request_timeout: Optional[float] = None,
+        reconnect_delay: Optional[float] = None,
+    ):
+        self.socket_path = (
+            socket_path if socket_path is not None else BrokerProtocol.socket_path
+        )
+        self.request_timeout = (
+            request_timeout
+            if request_timeout is not None
+            else BrokerProtocol.request_timeout
+        )
+        self._reconnect_delay = (
+            reconnect_delay
+            if reconnect_delay is not None
+            else BrokerProtocol.reconnect_delay
+        )
+        # Users the server may run as
+        self._trusted_uids = {0, os.getuid()}
+        self.lock = threading.Lock()
+        self._config_processor = ConfigProcessor()
+
+        self._latest_devices = N2kDevices()
+        self._latest_config = N2kConfiguration()
+        self._latest_empower_system = EmpowerSystem(None)
+        self._latest_engine_config = EngineConfiguration()
+        self._latest_engine_list = EngineList(False)
+        self._latest_factory_metadata = None
+        self._latest_alarms = AlarmList()
+        self._latest_engine_alarms = EngineAlarmList()
+
+        self._devices = rx.subject.BehaviorSubject(self._latest_devices)
+        self._mobile_changes = rx.subject.Subject()
+        self._config = rx.subject.BehaviorSubject(self._latest_config)
+        self._empower_system = rx.subject.BehaviorSubject(self._latest_empower_system)
+        self._engine_config = rx.subject.BehaviorSubject(self._latest_engine_config)
+        self._engine_list = rx.subject.BehaviorSubject(self._latest_engine_list)
+        self._factory_metadata = rx.subject.Subject()
+        self._active_alarms = rx.subject.BehaviorSubject(self._latest_alarms)
+        self._engine_alarms = rx.subject.BehaviorSubject(self._latest_engine_alarms)
+        self._n2k_dbus_connection_status = rx.subject.BehaviorSubject(
+            DBUSConnectionStatus(
+                connection_state=ConnectionStatus.IDLE,
+                reason="",
+                timestamp=TimeUtil.current_time(),
+            )
+        )
+
+        # Pipes
+        self.devices = self._devices.pipe(ops.publish(), ops.ref_count())
+        self.mobile_changes = self._mobile_changes.pipe(
+            ops.publish(), ops.ref_count()
+        )
+        self.config = self._config.pipe(ops.publish(), ops.ref_count())
+        self.empower_system = self._empower_system.pipe(ops.publish(), ops.ref_count())
+        self.engine_config = self._engine_config.pipe(ops.publish(), ops.ref_count())
+        self.engine_list = self._engine_list.pipe(ops.publish(), ops.ref_count())
+        self.factory_metadata = self._factory_metadata.pipe(
+            ops.publish(), ops.ref_count()
+        )
+        self.active_alarms = self._active_alarms.pipe(ops.publish(), ops.ref_count())
+        self.engine_alarms = self._engine_alarms.pipe(ops.publish(), ops.ref_count())
+        self.n2k_dbus_connection_status = self._n2k_dbus_connection_status.pipe(
+            ops.filter(lambda status: status is not None),
+            ops.distinct_until_changed(lambda state: state.connection_state),
+            ops.publish(),
+            ops.ref_count(),
+        )
+
+        self._socket = None
+        self._send_lock = threading.Lock()
+        self._requests = {}
+        self._requests_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    # === Lifecycle ===
+    def start(self):
+        """
+        Connect to the server in a separate thread, reconnecting whenever the connection is lost.
+        """
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Disconnect from the server.
+        """
+        self._stopped.set()
+        connection = self._socket
+        if connection is not None:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _run(self):
+        while not self._stopped.is_set():
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                connection.connect(self.socket_path)
+                server_uid = BrokerProtocol.get_peer_uid(connection)
+            except OSError as e:
+                connection.close()
+                self._logger.debug(
+                    f"N2K broker unavailable at {self.socket_path}: {e}"
+                )
+                self._stopped.wait(self._reconnect_delay)
+                continue
+            if server_uid not in self._trusted_uids:
+                connection.close()
+                self._logger.error(
+                    f"Refusing N2K broker at {self.socket_path}, it runs as untrusted uid {server_uid}"
+                )
+                self._stopped.wait(self._reconnect_delay)
+                continue
+            self._logger.info(f"Connected to N2K broker at {self.socket_path}")
+            self._socket = connection
+            try:
+                while True:
+                    self._handle_message(BrokerProtocol.read(connection))
+            except (OSError, ConnectionError) as e:
+                self._logger.warning(f"Lost connection to N2K broker: {e}")
+            except Exception as e:
+                self._logger.error(
+                    f"Error handling N2K broker message: {e}", exc_info=True
+                )
+            finally:
+                self._socket = None
+                connection.close()
+                self._fail_requests("Lost connection to N2K broker")
+            self._n2k_dbus_connection_status.on_next(
+                DBUSConnectionStatus(
+                    connection_state=ConnectionStatus.DISCONNECTED,
+                    reason="Lost connection to N2K broker",
+                    timestamp=TimeUtil.current_time(),
+                )
+            )
+            self._stopped.wait(self._reconnect_delay)
+
+    # === Message Handlers ===
+    def _handle_message(self, message: tuple):
+        message_type = message[0]
+        if message_type == BrokerProtocol.MOBILE:
+            self._apply_mobile_changes(message[1])
+        elif message_type == BrokerProtocol.MOBILE_STATE:
+            self._apply_mobile_state(message[1])
+        elif message_type == BrokerProtocol.STATE:
+            self._apply_state(message[1], message[2])
+        elif message_type in (BrokerProtocol.RESULT, BrokerProtocol.ERROR):
+            with self._requests_lock:
+                request = self._requests.pop(message[1], None)
+            if request is not None:
+                if message_type == BrokerProtocol.RESULT:
+                    request.result = message[2]
+                else:
+                    request.error = message[2]
+                request.done.set()
+        else:
+            self._logger.error(f"Unexpected N2K broker message type: {message_type}")
+
+    def _apply_state(self, name: str, value: Any):
+        if name == BrokerProtocol.CONFIG:
+            self._apply_config(value)
+        elif name == BrokerProtocol.ENGINE_CONFIG:
+            self._apply_engine_config(value)
+        elif name == BrokerProtocol.FACTORY_METADATA:
+            self._latest_factory_metadata = value
+            self._factory_metadata.on_next(value)
+        elif name == BrokerProtocol.ALARMS:
+            self._latest_alarms = value
+            self._active_alarms.on_next(value)
+        elif name == BrokerProtocol.ENGINE_ALARMS:
+            self._latest_engine_alarms = value
+            self._engine_alarms.on_next(value)
+        elif name == BrokerProtocol.CONNECTION_STATUS:
+            self._n2k_dbus_connection_status.on_next(value)
+
+    def _apply_config(self, config: N2kConfiguration):
+        """
+        Build the EmpowerSystem from the configuration, like the ConfigService of the server.
+        """
+        with self.lock:
+            incremental = self._config_processor.has_empower_system()
+            if not incremental:
+                self._latest_devices.dispose_devices(is_engine=False)
+                self._latest_empower_system.dispose()
+            empower_system = self._config_processor.build_empower_system(
+                config, self._latest_devices, incremental=incremental
+            )
+        self._latest_config = config
+        self._config.on_next(config)
+        self._latest_empower_system = empower_system
+        self._empower_system.on_next(empower_system)
+
+    def _apply_engine_config(self, engine_config: EngineConfiguration):
+        """
+        Build the EngineList from the engine configuration, like the ConfigService of the server.
+        """
+        with self.lock:
+            if engine_config.should_reset:
+                self._latest_devices.dispose_devices(True)
+                self._latest_engine_list.dispose()
+            engine_list = self._config_processor.build_engine_list(
+                engine_config, self._latest_devices
+            )
+        self._latest_engine_config = engine_config
+        self._engine_config.on_next(engine_config)
+        self._latest_engine_list = engine_list
+        self._engine_list.on_next(engine_list)
+
+    def _apply_mobile_changes(self, mobile_changes: dict[str, Any]):
+        with self.lock:
+            self._latest_devices.mobile_channels.update(mobile_changes)
+            self._devices.on_next(self._latest_devices)
+            self._mobile_changes.on_next(mobile_changes)
+
+    def _apply_mobile_state(self, mobile_channels: dict[str, Any]):
+        """
+        Replace the mobile channel values. The engine channels are held with the others,
+        to_mobile_dict merges them anyway.
+        """
+        with self.lock:
+            self._latest_devices.engine_mobile_channels.clear()
+            self._latest_devices.mobile_channels.clear()
+            self._latest_devices.mobile_channels.update(mobile_channels)
+            self._devices.on_next(self._latest_devices)
+
+    # === Requests ===
+    def _call(self, method_name: str, *args, default: Any = None) -> Any:
+        """
+        Call a method of the N2KClient of the server, and wait for its result.
+
+        Returns:
+            The result of the call, or default if it failed or the server could not be reached.
+        """
+        if threading.current_thread() is self._thread:
+            # The result would be read by this thread, a subscriber must not wait for it
+            self._logger.error(f"Cannot call {method_name} from an N2K broker update")
+            return default
+        connection = self._socket
+        if connection is None:
+            self._logger.error(f"Cannot call {method_name}, N2K broker unavailable")
+            return default
+        request = BrokerRequest()
+        with self._requests_lock:
+            request_id = next(self._request_ids)
+            self._requests[request_id] = request
+        try:
+            frame = BrokerProtocol.encode_command(
+                (BrokerProtocol.CALL, request_id, method_name, args)
+            )
+            with self._send_lock:
+                connection.sendall(frame)
+        except (OSError, TypeError) as e:
+            request.error = str(e)
+            request.done.set()
+        if not request.done.wait(self.request_timeout):
+            request.error = "timed out"
+        with self._requests_lock:
+            self._requests.pop(request_id, None)
+        if request.error is not None:
+            self._logger.error(f"N2K broker call {method_name} failed: {request.error}")
+            return default
+        return request.result
+
+    def _fail_requests(self, reason: str):
+        with self._requests_lock:
+            requests = list(self._requests.values())
+            self._requests.clear()
+        for request in requests:
+            request.error = reason
+            request.done.set()
+
+    # === Public API Methods ===
+    def write_configuration(self, config_hex: str) -> None:
+        """
+        Write the configuration to the host.
+        """
+        return self._call("write_configuration", config_hex)
+
+    def request_state_snapshot(self) -> None:
+        """
+        Request a snapshot of the current state.
+        """
+        self._call("request_state_snapshot")
+
+    def acknowledge_alarm(self, alarm_id: int) -> bool:
+        """
+        Acknowledge an alarm by its ID
+        """
+        return self._call("acknowledge_alarm", alarm_id, default=False)
+
+    def acknowledge_alarms(self, alarm_ids: list[int]) -> dict[int, bool]:
+        """
+        Acknowledge several alarms by their IDs in one round trip, returning whether each was acknowledged
+        """
+        return self._call(
+            "acknowledge_alarms",
+            alarm_ids,
+            default={alarm_id: False for alarm_id in alarm_ids},
+        )
+
+    def refresh_active_alarms(self) -> tuple[bool, str]:
+        """
+        Refresh the active alarms by requesting them from the DBus service.
+        """
+        return self._call(
+            "refresh_active_alarms", default=(False, "N2K broker unavailable")
+        )
+
+    def scan_marine_engines(self, should_clear: bool = True) -> bool:
+        """
+        Scan for marine engines and update the engine list.
+        """
+        return self._call("scan_marine_engines", should_clear, default=False)
+
+    def set_circuit_power_state(self, runtime_id: int, target_on: bool) -> bool:
+        """
+        Set the power state of a circuit by its runtime ID.
+        """
+        return self._call(
+            "set_circuit_power_state", runtime_id, target_on, default=False
+        )
+
+    def set_circuit_level(self, runtime_id: int, level: float) -> bool:
+        """
+        Set the dimming level of a circuit by its runtime ID.
+        """
+        return self._call("set_circuit_level", runtime_id, level, default=False)
+
+    def get_alarm_history(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        thing_id: Optional[str] = None,
+    ) -> List[AlarmTransition]:
+        """
+        Get the alarm transitions recorded by the server, see N2KClient.get_alarm_history.
+        """
+        return self._call("get_alarm_history", start, end, thing_id, default=[])
+
+    # === Getters ===
+    def get_latest_devices(self) -> N2kDevices:
+        """
+        Get the latest N2kDevices object, holding the mobile channel values only.
+        """
+        return self._latest_devices
+
+    def get_devices_observable(self) -> rx.Observable:
+        """
+        Get the observable for N2kDevices updates.
+        """
+        return self.devices
+
+    def get_mobile_changes_observable(self) -> rx.Observable:
+        """
+        Get the observable for mobile channel deltas.
+        """
+        return self.mobile_changes
+
+    def get_latest_config(self) -> N2kConfiguration:
+        """
+        Get the latest N2kConfiguration object.
+        """
+        return self._latest_config
+
+    def get_config_observable(self) -> rx.Observable:
+        """
+        Get the observable for N2kConfiguration updates.
+        """
+        return self.config
+
+    def get_latest_empower_system(self) -> EmpowerSystem:
+        """
+        Get the latest EmpowerSystem object.
+        """
+        return self._latest_empower_system
+
+    def get_empower_system_observable(self) -> rx.Observable:
+        """
+        Get the observable for EmpowerSystem updates.
+        """
+        return self.empower_system
+
+    def get_factory_metadata(self) -> Optional[FactoryMetadata]:
+        """
+        Get the latest FactoryMetadata object.
+        """
+        return self._latest_factory_metadata
+
+    def get_factory_metadata_observable(self) -> rx.Observable:
+        """
+        Get the observable for FactoryMetadata updates.
+        """
+        return self.factory_metadata
+
+    def get_latest_engine_list(self) -> EngineList:
+        """
+        Get the latest EngineList object.
+        """
+        return self._latest_engine_list
+
+    def get_engine_list_observable(self) -> rx.Observable:
+        """
+        Get the observable for EngineList updates.
+        """
+        return self.engine_list
+
+    def get_engine_alarms(self) -> EngineAlarmList:
+        """
+        Get the latest EngineAlarmList object.
+        """
+        return self._latest_engine_alarms
+
+    def get_latest_alarms(self) -> dict[int, Alarm]:
+        """
+        Get the latest active alarms.
+        """
+        return self._latest_alarms
+
+    def get_alarms_observable(self) -> rx.subject.BehaviorSubject:
+        """
+        Get the observable for AlarmList updates.
+        """
+        return self._active_alarms
+
+    def get_latest_engine_config(self) -> EngineConfiguration:
+        """
+        Get the latest EngineConfiguration object.
+        """
+        return self._latest_engine_config
+
+    def get_engine_alarms_observable(self) -> rx.subject.BehaviorSubject:
+        """
+        Get the observable for EngineAlarmList updates.
+        """
+        return self._engine_alarms
@@ -0,0 +1,167 @@
+import json
+import pickle
+import socket
+import struct
+from typing import Any
+
+from ...models.constants import Constants
+from ...util.settings_util import SettingsUtil
+
+
+class BrokerProtocol:
+    """
+    Settings and framing shared by the N2K broker server and its clients.
+    Messages are prefixed by their length as a 4 byte big endian integer.
+    Server to client messages are tuples of model classes, pickled. Client to server commands
+    are JSON arrays, so the server never unpickles data from a peer of the socket. Clients only
+    unpickle messages of a server running as root or as their own user, see get_peer_uid.
+    Frames larger than max_frame_size are refused before they are read.
+    Server to client messages:
+        (STATE, name, value): The latest value of a shared state, e.g. (STATE, ALARMS, AlarmList).
+        (MOBILE, changes): Mobile channel values changed by a snapshot.
+        (MOBILE_STATE, channels): All mobile channel values, replacing the previous ones.
+        (RESULT, request_id, value): The return value of a call.
+        (ERROR, request_id, message): The error raised by a call.
+    Client to server messages:
+        [CALL, request_id, method_name, args]: Call a method of the N2KClient owned by the server,
+            with JSON serializable arguments.
+    Attributes:
+        enabled: Whether the services share one N2KClient through the broker.
+        socket_path: Path of the Unix socket the server listens on.
+        request_timeout: Seconds a client waits for the result of a call.
+        queue_size: Messages queued for a client at most, a client falling further behind is disconnected.
+        reconnect_delay: Seconds a client waits before reconnecting to the server.
+        max_frame_size: Bytes a frame may announce at most.
+    Methods:
+        encode: Encode a server message into a frame.
+        read: Read a server message from a socket.
+        encode_command: Encode a client command into a frame.
+        read_command: Read a client command from a socket.
+        get_peer_uid: Get the user id of the process at the other end of a socket.
+    """
+
+    enabled = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.BROKER_KEY,
+        Constants.BROKER_ENABLED_KEY,
+        default_value=False,
+    )
+    socket_path = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.BROKER_KEY,
+        Constants.BROKER_SOCKET_PATH_KEY,
+        default_value="/run/n2kclient/broker.sock",
+    )
+    request_timeout = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.BROKER_KEY,
+        Constants.BROKER_REQUEST_TIMEOUT_KEY,
+        default_value=30,
+    )
+    queue_size = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.BROKER_KEY,
+        Constants.BROKER_QUEUE_SIZE_KEY,
+        default_value=1024,
+    )
+    reconnect_delay = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.BROKER_KEY,
+        Constants.BROKER_RECONNECT_DELAY_KEY,
+        default_value=2,
+    )
+    max_frame_size = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.BROKER_KEY,
+        Constants.BROKER_MAX_FRAME_SIZE_KEY,
+        default_value=16 * 1024 * 1024,
+    )
+
+    # Message types
+    STATE = "state"
+    MOBILE = "mobile"
+    MOBILE_STATE = "mobile_state"
+    CALL = "call"
+    RESULT = "result"
+    ERROR = "error"
+
+    # Shared states, sent in this order to a new client
+    CONNECTION_STATUS = "connection_status"
+    FACTORY_METADATA = "factory_metadata"
+    CONFIG = "config"
+    ENGINE_CONFIG = "engine_config"
+    ALARMS = "alarms"
+    ENGINE_ALARMS = "engine_alarms"
+
+    _HEADER = struct.Struct("!I")
+    # struct ucred of SO_PEERCRED: pid, uid, gid
+    _CREDENTIALS = struct.Struct("3i")
+
+    @staticmethod
+    def encode(message: tuple) -> bytes:
+        """
+        Encode a server message into a frame, to be sent with socket.sendall.
+        """
+        data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        return BrokerProtocol._HEADER.pack(len(data)) + data
+
+    @staticmethod
+    def read(connection: socket.socket) -> Any:
+        """
+        Read the next server message from a socket.
+
+        Raises:
+            ConnectionError: If the socket was closed.
+            ValueError: If the frame is larger than max_frame_size.
+        """
+        return pickle.loads(BrokerProtocol._read_frame(connection))
+
+    @staticmethod
+    def encode_command(message: tuple) -> bytes:
+        """
+        Encode a client command into a frame, to be sent with socket.sendall.
+        """
+        data = json.dumps(message).encode()
+        return BrokerProtocol._HEADER.pack(len(data)) + data
+
+    @staticmethod
+    def read_command(connection: socket.socket) -> Any:
+        """
+        Read the next client command from a socket.
+
+        Raises:
+            ConnectionError: If the socket was closed.
+            ValueError: If the command is not JSON, or the frame is larger than max_frame_size.
+        """
+        return json.loads(BrokerProtocol._read_frame(connection))
+
+    @staticmethod
+    def get_peer_uid(connection: socket.socket) -> int:
+        """
+        Get the user id of the process at the other end of a connected Unix socket.
+        """
+        credentials = connection.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, BrokerProtocol._CREDENTIALS.size
+        )
+        _, uid, _ = BrokerProtocol._CREDENTIALS.unpack(credentials)
+        return uid
+
+    @staticmethod
+    def _read_frame(connection: socket.socket) -> bytes:
+        header = BrokerProtocol._read_exactly(connection, BrokerProtocol._HEADER.size)
+        (length,) = BrokerProtocol._HEADER.unpack(header)
+        if length > BrokerProtocol.max_frame_size:
+            raise ValueError(
+                f"N2K broker frame of {length} bytes exceeds {BrokerProtocol.max_frame_size} bytes"
+            )
+        return BrokerProtocol._read_exactly(connection, length)
+
+    @staticmethod
+    def _read_exactly(connection: socket.socket, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = connection.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("N2K broker connection closed")
+            data += chunk
+        return bytes(data)
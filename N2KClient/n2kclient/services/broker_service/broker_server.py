@@ -0,0 +1,377 @@
+import logging
+import os
+import queue
+import socket
+import stat
+import threading
+from typing import Any, Callable, Optional
+
+import reactivex as rx
+
+from ...models.constants import Constants
+from .broker_protocol import BrokerProtocol
+
+
+class BrokerSubscriber:
+    """
+    Connection of a client to the N2K broker server.
+    Messages are queued and written by a dedicated thread, so a slow client never blocks the pipeline
+    of the N2KClient. A client whose queue is full is disconnected, it gets the full state again when it reconnects.
+    Attributes:
+        connection: The socket connected to the client.
+        _queue: Frames waiting to be written.
+        _closed: Set once the connection is closed.
+    Methods:
+        start: Start the threads writing to and reading from the client.
+        send: Queue a frame to be written.
+        close: Close the connection.
+    """
+
+    _logger = logging.getLogger(f"{Constants.DBUS_N2K_CLIENT}.BrokerSubscriber")
+
+    def __init__(
+        self,
+        connection: socket.socket,
+        queue_size: int,
+        handle_request: Callable[["BrokerSubscriber", tuple], None],
+        on_close: Callable[["BrokerSubscriber"], None],
+    ):
+        self.connection = connection
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._handle_request = handle_request
+        self._on_close = on_close
+        self._closed = threading.Event()
+
+    def start(self):
+        """
+        Start the threads writing to and reading from the client.
+        """
+        threading.Thread(target=self._write_loop, daemon=True).start()
+        threading.Thread(target=self._read_loop, daemon=True).start()
+
+    def send(self, frame: bytes):
+        """
+        Queue a frame to be written, disconnecting the client if it fell too far behind.
+        """
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            self._logger.warning("N2K broker client is too slow, disconnecting it")
+            self.close()
+
+    def close(self):
+        """
+        Close the connection. The client is removed from the server once.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.connection.close()
+        # Wake up the writer
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._on_close(self)
+
+    def _write_loop(self):
+        while not self._closed.is_set():
+            frame = self._queue.get()
+            if frame is None:
+                break
+            try:
+                self.connection.sendall(frame)
+            except OSError:
+                self.close()
+
+    def _read_loop(self):
+        while not self._closed.is_set():
+            try:
+                message = BrokerProtocol.read_command(self.connection)
+            except (OSError, ConnectionError):
+                self.close()
+                return
+            except Exception as e:
+                self._logger.error(f"Invalid message from N2K broker client: {e}")
+                self.close()
+                return
+            self._handle_request(self, message)
+
+
+class N2KBrokerServer:
+    """
+    Shares the state of an N2KClient with the other services of the hub over a local Unix socket,
+    so only one process of the hub connects to DBus, parses the snapshots and holds the processed state.
+    Clients (N2KBrokerClient) receive the configuration, engine configuration, factory metadata, alarms and
+    DBus connection status whenever they change, and the mobile channel values as per snapshot deltas.
+    Their commands are called on the N2KClient and the results sent back.
+    Must be started before the N2KClient, so no configuration is missed.
+    Attributes:
+        socket_path: Path of the Unix socket.
+        CALLABLE_METHODS: The methods of the N2KClient clients may call.
+        _client: The N2KClient whose state is shared.
+        _state: Latest frame of each shared state, sent to new clients.
+        _subscribers: The connected clients.
+        _lock: Lock guarding the state and the clients, held while a frame is queued to every client.
+    Methods:
+        start: Subscribe to the N2KClient and start accepting clients.
+        stop: Stop accepting clients and disconnect them.
+        get_subscriber_count: Get the number of connected clients.
+    """
+
+    _logger = logging.getLogger(f"{Constants.DBUS_N2K_CLIENT}.Broker")
+
+    CALLABLE_METHODS = frozenset(
+        {
+            "set_circuit_power_state",
+            "set_circuit_level",
+            "acknowledge_alarm",
+            "acknowledge_alarms",
+            "refresh_active_alarms",
+            "scan_marine_engines",
+            "write_configuration",
+            "request_state_snapshot",
+            "get_alarm_history",
+        }
+    )
+
+    socket_path: str
+    _state: dict[str, bytes]
+    _subscribers: list[BrokerSubscriber]
+    _disposable_list: list[rx.abc.DisposableBase]
+
+    def __init__(
+        self,
+        client: Any,
+        socket_path: Optional[str] = None,
+        queue_size: Optional[int] = None,
+    ):
+        self._client = client
+        self.socket_path = (
+            socket_path if socket_path is not None else BrokerProtocol.socket_path
+        )
+        self._queue_size = (
+            queue_size if queue_size is not None else BrokerProtocol.queue_size
+        )
+        self._state = {}
+        self._subscribers = []
+        self._disposable_list = []
+        # Reentrant, a client disconnected while a frame is queued is removed under the lock
+        self._lock = threading.RLock()
+        self._server_socket = None
+
+    def start(self):
+        """
+        Subscribe to the N2KClient and start accepting clients on the socket.
+        A missing socket directory is created, reachable by the user and group of the service only.
+
+        Raises:
+            FileExistsError: If something other than a socket exists at the socket path.
+        """
+        self._setup_subscriptions()
+        directory = os.path.dirname(self.socket_path) or "."
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+            # makedirs applies the umask
+            os.chmod(directory, 0o750)
+        # A socket left behind by a previous run refuses the bind
+        if os.path.lexists(self.socket_path):
+            if not stat.S_ISSOCK(os.lstat(self.socket_path).st_mode):
+                raise FileExistsError(
+                    f"N2K broker socket path {self.socket_path} is not a socket"
+                )
+            os.unlink(self.socket_path)
+        self._server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server_socket.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        self._server_socket.listen()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        self._logger.info(f"N2K broker listening on {self.socket_path}")
+
+    def stop(self):
+        """
+        Stop accepting clients, disconnect them and unsubscribe from the N2KClient.
+        """
+        if self._server_socket is not None:
+            # Wakes up the accept loop, closing alone does not
+            try:
+                self._server_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server_socket.close()
+            self._server_socket = None
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.close()
+        for disposable in self._disposable_list:
+            disposable.dispose()
+        self._disposable_list = []
+
+    def get_subscriber_count(self) -> int:
+        """
+        Get the number of connected clients.
+        """
+        with self._lock:
+            return len(self._subscribers)
+
+    def _setup_subscriptions(self):
+        client = self._client
+        # The raw subject, the clients filter the distinct states themselves
+        # pylint: disable=protected-access
+        self._disposable_list.append(
+            client._n2k_dbus_connection_status.subscribe(
+                lambda status: self._set_state(
+                    BrokerProtocol.CONNECTION_STATUS, status
+                )
+            )
+        )
+        self._disposable_list.append(
+            client.get_factory_metadata_observable().subscribe(
+                lambda metadata: self._set_state(
+                    BrokerProtocol.FACTORY_METADATA, metadata
+                )
+            )
+        )
+        # Clients build their EmpowerSystem and EngineList from the configuration they were built from
+        self._disposable_list.append(
+            client.get_empower_system_observable().subscribe(
+                lambda _: self._set_state(
+                    BrokerProtocol.CONFIG,
+                    client.get_latest_config(),
+                    send_mobile_state=True,
+                )
+            )
+        )
+        self._disposable_list.append(
+            client.get_engine_list_observable().subscribe(
+                lambda _: self._set_state(
+                    BrokerProtocol.ENGINE_CONFIG,
+                    client.get_latest_engine_config(),
+                    send_mobile_state=True,
+                )
+            )
+        )
+        self._disposable_list.append(
+            client.get_alarms_observable().subscribe(
+                lambda alarms: self._set_state(BrokerProtocol.ALARMS, alarms)
+            )
+        )
+        self._disposable_list.append(
+            client.get_engine_alarms_observable().subscribe(
+                lambda alarms: self._set_state(BrokerProtocol.ENGINE_ALARMS, alarms)
+            )
+        )
+        self._disposable_list.append(
+            client.get_mobile_changes_observable().subscribe(self._send_mobile_changes)
+        )
+
+    def _set_state(self, name: str, value: Any, send_mobile_state: bool = False):
+        """
+        Record the latest value of a shared state and send it to the clients.
+        A rebuilt configuration disposes devices, so the mobile channels are sent again in full.
+        """
+        try:
+            frame = BrokerProtocol.encode((BrokerProtocol.STATE, name, value))
+        except Exception as e:
+            self._logger.error(f"Failed to encode N2K broker state {name}: {e}")
+            return
+        with self._lock:
+            self._state[name] = frame
+            self._broadcast(frame)
+        if send_mobile_state:
+            with self._client.lock:
+                frame = self._mobile_state_frame()
+                with self._lock:
+                    self._broadcast(frame)
+
+    def _send_mobile_changes(self, mobile_changes: dict[str, Any]):
+        frame = BrokerProtocol.encode((BrokerProtocol.MOBILE, mobile_changes))
+        with self._lock:
+            self._broadcast(frame)
+
+    def _mobile_state_frame(self) -> bytes:
+        """
+        Encode all mobile channel values. Must be called with the lock of the client held, like the
+        snapshot merge, so a client receives every delta merged after the values it starts from.
+        """
+        return BrokerProtocol.encode(
+            (
+                BrokerProtocol.MOBILE_STATE,
+                self._client.get_latest_devices().to_mobile_dict(),
+            )
+        )
+
+    def _broadcast(self, frame: bytes):
+        """
+        Queue a frame to every client. Must be called with the lock held.
+        """
+        for subscriber in list(self._subscribers):
+            subscriber.send(frame)
+
+    def _accept_loop(self):
+        server_socket = self._server_socket
+        while True:
+            try:
+                connection, _ = server_socket.accept()
+            except OSError:
+                # Closed by stop
+                return
+            self._add_subscriber(connection)
+
+    def _add_subscriber(self, connection: socket.socket):
+        subscriber = BrokerSubscriber(
+            connection,
+            self._queue_size,
+            handle_request=self._handle_request,
+            on_close=self._remove_subscriber,
+        )
+        with self._client.lock:
+            mobile_state = self._mobile_state_frame()
+            with self._lock:
+                self._subscribers.append(subscriber)
+                for frame in self._state.values():
+                    subscriber.send(frame)
+                subscriber.send(mobile_state)
+        subscriber.start()
+        self._logger.info("N2K broker client connected")
+
+    def _remove_subscriber(self, subscriber: BrokerSubscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+                self._logger.info("N2K broker client disconnected")
+
+    def _handle_request(self, subscriber: BrokerSubscriber, message: list):
+        """
+        Call the N2KClient method requested by a client, and send back its result or error.
+        """
+        try:
+            message_type, request_id, method_name, args = message
+        except (TypeError, ValueError):
+            self._logger.error(f"Invalid N2K broker request: {message}")
+            return
+        if not isinstance(method_name, str) or not isinstance(args, list):
+            self._logger.error(f"Invalid N2K broker request: {message}")
+            return
+        if message_type != BrokerProtocol.CALL:
+            self._logger.error(f"Unexpected N2K broker message type: {message_type}")
+            return
+        if method_name not in self.CALLABLE_METHODS:
+            reply = (
+                BrokerProtocol.ERROR,
+                request_id,
+                f"{method_name} cannot be called through the N2K broker",
+            )
+        else:
+            try:
+                result = getattr(self._client, method_name)(*args)
+                reply = (BrokerProtocol.RESULT, request_id, result)
+            except Exception as e:
+                self._logger.error(f"N2K broker call {method_name} failed: {e}")
+                reply = (BrokerProtocol.ERROR, request_id, str(e))
+        subscriber.send(BrokerProtocol.encode(reply))
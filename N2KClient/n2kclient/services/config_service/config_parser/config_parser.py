@@ -717,6 +717,8 @@ class ConfigParser:
                 if channel is not None:
                     bls_alarm_mapping = BLSAlarmMapping(alarm_channel=channel, bls=bls)
                     n2k_configuration.bls_alarm_mappings[bls.id] = bls_alarm_mapping
+
+            n2k_configuration.build_indexes()
             return n2k_configuration
 
         except Exception as e:
@@ -1,5 +1,7 @@
 import logging
+from typing import Any, Optional
 from ....models.n2k_configuration.n2k_configuation import N2kConfiguration
+from ....models.n2k_configuration.config_index import N2kConfigurationIndex
 from ....models.empower_system.empower_system import EmpowerSystem
 from ....models.empower_system.thing import Thing
 from ....models.n2k_configuration.device import DeviceType
@@ -72,6 +74,18 @@ class ConfigProcessor:
             Tracks component status for inverter/charger and shorepower relationships.
         _associated_circuit_instances (list[str]):
             List of circuit instance IDs whose status is tracked by other components (so they are not created as independent circuits).
+        _empower_system (Optional[EmpowerSystem]):
+            The EmpowerSystem of the last successful build, used as the base of an incremental rebuild.
+        _n2k_devices (Optional[N2kDevices]):
+            The N2kDevices the things of the last build are subscribed to.
+        _built_things (dict[tuple, Thing]):
+            Things of the last build, keyed by the signature of the class and config they were created from.
+        _reusable_things (dict[tuple, Thing]):
+            During an incremental rebuild, things of the previous build that have not been reused yet.
+        _thing_device_keys (dict[int, set[str]]):
+            Keys of the non-engine devices each thing of the last build subscribed to, keyed by the id of the thing.
+        _removed_device_keys (set[str]):
+            Keys of the devices no thing refers to anymore after the last incremental rebuild.
 
     Methods:
         process_devices(config, n2k_devices):
@@ -98,8 +112,17 @@ class ConfigProcessor:
             Processes HVAC configurations and adds Climate objects.
         process_circuits(...):
             Processes circuit configurations and adds CircuitLight, CircuitBilgePump, CircuitWaterPump, or CircuitPowerSwitch objects.
-        build_empower_system(config, devices):
-            Builds and returns the EmpowerSystem from all processed things.
+        build_empower_system(config, devices, incremental):
+            Builds and returns the EmpowerSystem from all processed things, optionally reusing unchanged things of the previous build.
+        has_empower_system():
+            Returns True if a previous build is available for an incremental rebuild.
+        pop_removed_device_keys():
+            Returns and clears the keys of the devices the last incremental rebuild stopped referring to.
+        _create_thing(thing_type, *args, **kwargs):
+            Creates a Thing, or reuses the Thing of the previous build created from the same config.
+        _release_previous_things(previous_system, system, devices):
+            Disposes the things of the previous build that were not reused, and their mobile channel subscriptions,
+            and records the devices no thing refers to anymore.
         build_engine_list(config, devices):
             Builds and returns an EngineList from engine configuration.
     """
@@ -120,12 +143,114 @@ class ConfigProcessor:
     # when we create all circuit things
     _associated_circuit_instances: list[str]
 
+    # Things of the last build keyed by the signature of the config they were created from,
+    # so that a rebuild only re-creates (and re-subscribes) things whose source config changed
+    _empower_system: Optional[EmpowerSystem]
+    _n2k_devices: Optional[N2kDevices]
+    _built_things: dict[tuple, Thing]
+    _reusable_things: dict[tuple, Thing]
+    _thing_device_keys: dict[int, set[str]]
+    _removed_device_keys: set[str]
+
+    # Fields identifying the config object a Thing was created from
+    _IDENTITY_FIELDS = ("id", "control_id")
+
     def __init__(self):
         self._things = []
         self._acMeter_inverter_instances = []
         self._dcMeter_charger_instances = []
         self._ic_component_status = {}
         self._associated_circuit_instances = []
+        self._empower_system = None
+        self._n2k_devices = None
+        self._built_things = {}
+        self._reusable_things = {}
+        self._thing_device_keys = {}
+        self._removed_device_keys = set()
+
+    # ###################################################
+    #     Thing Reuse
+    # ###################################################
+    @classmethod
+    def _freeze(cls, value: Any) -> Any:
+        """
+        Convert a Thing constructor argument to a hashable value that compares equal
+        as long as the config it was derived from is unchanged.
+        Config objects are keyed by their type, their id and control id, and all their fields,
+        including the unset ones their serialized form leaves out. Other objects (e.g. observables)
+        are compared by identity.
+        The N2kDevices argument is left out, reuse is only allowed when it is the same instance.
+        Raises:
+            ValueError: If a config object cannot be serialized, it must not be reused.
+        """
+        if isinstance(value, N2kDevices):
+            return N2kDevices
+        if isinstance(value, (list, tuple)):
+            return tuple(cls._freeze(item) for item in value)
+        if isinstance(value, dict):
+            return tuple((key, cls._freeze(item)) for key, item in value.items())
+        for serializer in ("to_dict", "to_json"):
+            if hasattr(value, serializer):
+                serialized = getattr(value, serializer)()
+                if not isinstance(serialized, dict):
+                    continue
+                # to_dict returns an empty dict when serialization fails
+                if len(serialized) == 0:
+                    raise ValueError(f"{type(value).__name__} could not be serialized")
+                identity = tuple(
+                    cls._freeze(getattr(value, field, None))
+                    for field in cls._IDENTITY_FIELDS
+                )
+                fields = vars(value) if hasattr(value, "__dict__") else serialized
+                return (
+                    type(value),
+                    identity,
+                    tuple(
+                        (key, cls._freeze(item)) for key, item in sorted(fields.items())
+                    ),
+                )
+        return value
+
+    def _create_thing(self, thing_type: type, *args, **kwargs) -> Thing:
+        """
+        Create a Thing, or reuse the Thing of the previous build that was created from the same config.
+        A reused Thing keeps its channels and N2kDevices subscriptions untouched.
+        The keys of the devices a new Thing subscribes to are recorded, so that the devices can be
+        removed once no Thing refers to them anymore.
+        Args:
+            thing_type (type): The Thing class to create.
+            *args: Positional arguments of the Thing constructor.
+            **kwargs: Keyword arguments of the Thing constructor.
+        Returns:
+            Thing: The reused or newly created Thing.
+        """
+        try:
+            signature = (thing_type, self._freeze(args), self._freeze(kwargs))
+            hash(signature)
+        except Exception:
+            signature = None
+
+        thing = None
+        if signature is not None:
+            thing = self._reusable_things.pop(signature, None)
+        if thing is None:
+            devices = next(
+                (
+                    value
+                    for value in (*args, *kwargs.values())
+                    if isinstance(value, N2kDevices)
+                ),
+                None,
+            )
+            if devices is not None:
+                with devices.record_device_keys() as device_keys:
+                    thing = thing_type(*args, **kwargs)
+                self._thing_device_keys[id(thing)] = device_keys
+            else:
+                thing = thing_type(*args, **kwargs)
+        if signature is not None:
+            self._built_things[signature] = thing
+        return thing
 
     # ###################################################
     #     Devices
@@ -141,7 +266,7 @@ class ConfigProcessor:
         """
         for device in config.device.values():
             if device.device_type == DeviceType.Europa:
-                hub = Hub(device, n2k_devices)
+                hub = self._create_thing(Hub, device, n2k_devices)
                 self._things.append(hub)
 
     # ###################################################
@@ -245,17 +370,13 @@ class ConfigProcessor:
             inverter_charger, config
         )
 
-        if inverter_charger.inverter_ac_id is not None:
-            ac_meter, inverter_associated_ac_line = next(
-                (
-                    (meter, key)
-                    for meter in config.ac.values()
-                    for key, value in meter.line.items()
-                    if value.id == inverter_charger.inverter_ac_id.id
-                    and inverter_charger.inverter_ac_id.enabled
-                ),
-                (None, None),
-            )
+        if (
+            inverter_charger.inverter_ac_id is not None
+            and inverter_charger.inverter_ac_id.enabled
+        ):
+            ac_meter, inverter_associated_ac_line = N2kConfigurationIndex.of(
+                config
+            ).ac_line_by_id.get(inverter_charger.inverter_ac_id.id, (None, None))
 
         if ac_meter is not None:
             categories = next(
@@ -273,7 +394,8 @@ class ConfigProcessor:
                 ),
                 [],
             )
-        inverter_thing = CombiInverter(
+        inverter_thing = self._create_thing(
+            CombiInverter,
             inverter_charger=inverter_charger,
             ac_line1=ac_meter.line[1] if ac_meter and 1 in ac_meter.line else None,
             ac_line2=ac_meter.line[2] if ac_meter and 2 in ac_meter.line else None,
@@ -308,46 +430,27 @@ class ConfigProcessor:
             instance (int): The instance number for the charger.
         """
         charger_visible_circuit = self.process_charger_circuit(inverter_charger, config)
+        index = N2kConfigurationIndex.of(config)
 
         dc_meter1 = None
         if inverter_charger.battery_bank_1_id.enabled is not None:
-            dc_meter1 = next(
-                (
-                    meter
-                    for meter in config.dc.values()
-                    if meter.id == inverter_charger.battery_bank_1_id.id
-                ),
-                None,
-            )
+            dc_meter1 = index.dc_by_id.get(inverter_charger.battery_bank_1_id.id)
             if dc_meter1 is not None:
                 self._dcMeter_charger_instances.append(dc_meter1.instance.instance)
 
         dc_meter2 = None
         if inverter_charger.battery_bank_2_id.enabled is not None:
-            dc_meter2 = next(
-                (
-                    meter
-                    for meter in config.dc.values()
-                    if meter.id == inverter_charger.battery_bank_2_id.id
-                ),
-                None,
-            )
+            dc_meter2 = index.dc_by_id.get(inverter_charger.battery_bank_2_id.id)
             if dc_meter2 is not None:
                 self._dcMeter_charger_instances.append(dc_meter2.instance.instance)
 
         dc_meter3 = None
         if inverter_charger.battery_bank_3_id.enabled is not None:
-            dc_meter3 = next(
-                (
-                    meter
-                    for meter in config.dc.values()
-                    if meter.id == inverter_charger.battery_bank_3_id.id
-                ),
-                None,
-            )
+            dc_meter3 = index.dc_by_id.get(inverter_charger.battery_bank_3_id.id)
             if dc_meter3 is not None:
                 self._dcMeter_charger_instances.append(dc_meter3.instance.instance)
-        charger_thing = CombiCharger(
+        charger_thing = self._create_thing(
+            CombiCharger,
             inverter_charger=inverter_charger,
             dc1=dc_meter1 if dc_meter1 is not None else None,
             dc2=dc_meter2 if dc_meter2 is not None else None,
@@ -361,14 +464,8 @@ class ConfigProcessor:
         shorepower = None
         shore_key = None
         if inverter_charger.charger_ac_id.enabled:
-            shorepower, shore_key = next(
-                (
-                    (meter, key)
-                    for meter in config.ac.values()
-                    for key, value in meter.line.items()
-                    if value.id == inverter_charger.charger_ac_id.id
-                ),
-                (None, None),
+            shorepower, shore_key = index.ac_line_by_id.get(
+                inverter_charger.charger_ac_id.id, (None, None)
             )
 
         if (
@@ -440,7 +537,8 @@ class ConfigProcessor:
                 if circuit is not None:
                     self._associated_circuit_instances.append(circuit.control_id)
 
-                dc_thing = Battery(
+                dc_thing = self._create_thing(
+                    Battery,
                     battery=dc_meter,
                     categories=categories,
                     battery_circuit=circuit,
@@ -461,7 +559,7 @@ class ConfigProcessor:
             n2k_devices (N2kDevices): The N2k devices object.
         """
         for gnss in config.gnss.values():
-            gnss_thing = GNSS(gnss, n2k_devices)
+            gnss_thing = self._create_thing(GNSS, gnss, n2k_devices)
             self._things.append(gnss_thing)
 
     # ###################################################
@@ -544,7 +642,8 @@ class ConfigProcessor:
             ac_bls = get_ac_meter_associated_bls(ac_meter=ac_meter, config=config)
 
             if ac_type == ACType.ShorePower:
-                thing = ShorePower(
+                thing = self._create_thing(
+                    ShorePower,
                     ac_meter.line[1] if 1 in ac_meter.line else None,
                     ac_meter.line[2] if 2 in ac_meter.line else None,
                     ac_meter.line[3] if 3 in ac_meter.line else None,
@@ -557,7 +656,8 @@ class ConfigProcessor:
                 )
 
             if ac_type == ACType.Inverter:
-                thing = AcMeterInverter(
+                thing = self._create_thing(
+                    AcMeterInverter,
                     ac_meter.line[1] if 1 in ac_meter.line else None,
                     ac_meter.line[2] if 2 in ac_meter.line else None,
                     ac_meter.line[3] if 3 in ac_meter.line else None,
@@ -566,7 +666,8 @@ class ConfigProcessor:
                     circuit=circuit,
                 )
             if ac_type == ACType.Charger:
-                thing = ACMeterCharger(
+                thing = self._create_thing(
+                    ACMeterCharger,
                     ac_meter.line[1] if 1 in ac_meter.line else None,
                     ac_meter.line[2] if 2 in ac_meter.line else None,
                     ac_meter.line[3] if 3 in ac_meter.line else None,
@@ -592,7 +693,9 @@ class ConfigProcessor:
             links = []
             # Fuel tanks
             if tank.tank_type == TankType.Fuel or tank.tank_type == TankType.Oil:
-                tank_thing = FuelTank(tank=tank, n2k_devices=n2k_devices)
+                tank_thing = self._create_thing(
+                    FuelTank, tank=tank, n2k_devices=n2k_devices
+                )
                 self._things.append(tank_thing)
             # Water tanks (have associated circuits (pumps))
             else:
@@ -611,7 +714,8 @@ class ConfigProcessor:
                     self._associated_circuit_instances.append(circuit.control_id)
 
                 if tank.tank_type == TankType.FreshWater:
-                    tank_thing = FreshWaterTank(
+                    tank_thing = self._create_thing(
+                        FreshWaterTank,
                         tank=tank,
                         links=links,
                         n2k_devices=n2k_devices,
@@ -619,7 +723,8 @@ class ConfigProcessor:
                     self._things.append(tank_thing)
 
                 if tank.tank_type == TankType.WasteWater:
-                    tank_thing = WasteWaterTank(
+                    tank_thing = self._create_thing(
+                        WasteWaterTank,
                         tank=tank,
                         links=links,
                         n2k_devices=n2k_devices,
@@ -627,7 +732,8 @@ class ConfigProcessor:
                     self._things.append(tank_thing)
 
                 if tank.tank_type == TankType.BlackWater:
-                    tank_thing = BlackWaterTank(
+                    tank_thing = self._create_thing(
+                        BlackWaterTank,
                         tank=tank,
                         links=links,
                         n2k_devices=n2k_devices,
@@ -647,7 +753,8 @@ class ConfigProcessor:
         """
         for hvac in config.hvac.values():
             categories = get_category_list(ItemType.Temperature, hvac.id, config)
-            climate_thing = Climate(
+            climate_thing = self._create_thing(
+                Climate,
                 hvac=hvac,
                 categories=categories,
                 n2k_devices=n2k_devices,
@@ -683,7 +790,8 @@ class ConfigProcessor:
                         ThingType.LIGHT, ThingType.LIGHT, child.control_id
                     )
                     links.append(link)
-                circuit_thing = CircuitLight(
+                circuit_thing = self._create_thing(
+                    CircuitLight,
                     circuit=circuit,
                     links=links,
                     bls=bls,
@@ -696,7 +804,9 @@ class ConfigProcessor:
                 if circuit.control_id in self._associated_circuit_instances:
                     continue
 
-                circuit_thing = CircuitBilgePump(circuit, links, n2k_devices, bls)
+                circuit_thing = self._create_thing(
+                    CircuitBilgePump, circuit, links, n2k_devices, bls
+                )
                 circuit_thing.circuit = circuit
                 self._things.append(circuit_thing)
 
@@ -709,30 +819,68 @@ class ConfigProcessor:
                         associated_tank.instance.instance,
                     )
                     links.append(link)
-                circuit_thing = CircuitWaterPump(circuit, links, n2k_devices, bls)
+                circuit_thing = self._create_thing(
+                    CircuitWaterPump, circuit, links, n2k_devices, bls
+                )
                 self._things.append(circuit_thing)
             if (
                 is_in_category(circuit.categories, Constants.Power)
                 and circuit.control_id not in self._associated_circuit_instances
             ):
-                circuit_thing = CircuitPowerSwitch(circuit, links, n2k_devices, bls)
+                circuit_thing = self._create_thing(
+                    CircuitPowerSwitch, circuit, links, n2k_devices, bls
+                )
                 self._things.append(circuit_thing)
 
+    def has_empower_system(self) -> bool:
+        """
+        Return True if a previous build is available, so build_empower_system can rebuild incrementally.
+        """
+        return self._empower_system is not None
+
+    def pop_removed_device_keys(self) -> set[str]:
+        """
+        Return the keys of the devices no thing refers to anymore after the last incremental rebuild,
+        and clear them. The caller removes them from N2kDevices, see N2kDevices.remove_devices.
+        """
+        device_keys = self._removed_device_keys
+        self._removed_device_keys = set()
+        return device_keys
+
     def build_empower_system(
-        self, config: N2kConfiguration, devices: N2kDevices
+        self, config: N2kConfiguration, devices: N2kDevices, incremental: bool = False
     ) -> EmpowerSystem:
         """
         Builds and returns the EmpowerSystem from all processed things.
         This method processes all device configurations, inverter/charger combos, DC meters, GNSS,
         AC meters, tanks, HVAC systems, and circuits, and adds them to the EmpowerSystem.
+        When incremental, things whose source config is unchanged since the previous build are reused,
+        together with their subscriptions, and only the remaining things are created. Things of the
+        previous build that were not reused are disposed, so the previous system must not be disposed by the caller.
+        The devices only the disposed things referred to are left in place, the caller removes them
+        under its lock after the rebuild, see pop_removed_device_keys.
         Args:
             config (N2kConfiguration): The N2k configuration object.
             devices (N2kDevices): The N2k devices object.
+            incremental (bool): Reuse unchanged things of the previous build. Defaults to False.
         Returns:
             EmpowerSystem: The constructed EmpowerSystem containing all processed things, holding processed configuration.
         """
         logger = logging.getLogger("Config Processor")
+        previous_system = self._empower_system if incremental else None
         self._things.clear()
+        self._acMeter_inverter_instances.clear()
+        self._dcMeter_charger_instances.clear()
+        self._ic_component_status.clear()
+        self._associated_circuit_instances.clear()
+        if previous_system is not None and devices is self._n2k_devices:
+            self._reusable_things = self._built_things
+        else:
+            self._reusable_things = {}
+        if previous_system is None:
+            self._thing_device_keys = {}
+        self._built_things = {}
+        self._removed_device_keys = set()
         try:
             self.process_devices(config, devices)
             self.process_inverter_chargers(config, devices)
@@ -745,11 +893,69 @@ class ConfigProcessor:
 
             system = EmpowerSystem(config.config_metadata)
             [system.add_thing(thing) for thing in self._things]
+            if previous_system is not None:
+                self._release_previous_things(previous_system, system, devices)
+            self._empower_system = system
+            self._n2k_devices = devices
             return system
 
         except Exception as error:
             logger.error(error, exc_info=True)
+            # Subscriptions may be half replaced, the next build must start from scratch
+            self._empower_system = None
+            self._built_things = {}
+            self._thing_device_keys = {}
             raise
+        finally:
+            self._reusable_things = {}
+
+    def _release_previous_things(
+        self,
+        previous_system: EmpowerSystem,
+        system: EmpowerSystem,
+        devices: N2kDevices,
+    ) -> None:
+        """
+        Dispose the things of the previous build that were not reused by the new system.
+        Their mobile channel subscriptions are removed from N2kDevices, unless a new thing
+        subscribed the same channel. Reused things are moved to the new system, so
+        disposing the previous system afterwards does not affect them.
+        The devices the disposed things subscribed to that no thing of the new system
+        refers to are recorded for removal, see pop_removed_device_keys.
+        Args:
+            previous_system (EmpowerSystem): The EmpowerSystem of the previous build.
+            system (EmpowerSystem): The newly built EmpowerSystem.
+            devices (N2kDevices): The N2k devices object.
+        """
+        logger = logging.getLogger("Config Processor")
+        kept_things = {id(thing) for thing in system.things.values()}
+        channel_ids = {
+            channel_id
+            for thing in system.things.values()
+            for channel_id in thing.channels
+        }
+        device_keys = set()
+        for thing in system.things.values():
+            device_keys.update(self._thing_device_keys.get(id(thing), ()))
+        stale_channel_ids = set()
+        stale_device_keys = set()
+        reused_count = 0
+        for thing in previous_system.things.values():
+            if id(thing) in kept_things:
+                reused_count += 1
+                continue
+            stale_channel_ids.update(thing.channels.keys() - channel_ids)
+            stale_device_keys.update(
+                self._thing_device_keys.pop(id(thing), set()) - device_keys
+            )
+            thing.dispose()
+        # Replace rather than clear, readers may still hold the previous dict
+        previous_system.things = {}
+        devices.remove_subscriptions(stale_channel_ids)
+        self._removed_device_keys = stale_device_keys
+        logger.info(
+            f"Incremental rebuild reused {reused_count} of {len(system.things)} things"
+        )
 
     def build_engine_list(
         self, config: EngineConfiguration, devices: N2kDevices
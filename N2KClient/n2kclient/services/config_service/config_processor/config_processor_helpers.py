@@ -1,4 +1,5 @@
 from ....models.n2k_configuration.n2k_configuation import N2kConfiguration
+from ....models.n2k_configuration.config_index import N2kConfigurationIndex
 from ....models.n2k_configuration.category_item import CategoryItem
 from ....models.n2k_configuration.ui_relationship_msg import (
     ItemType,
@@ -28,7 +29,9 @@ def get_category_list(
     """
     category_relationships = filter(
         lambda rel: rel.secondary_type == ItemType.Category,
-        config.ui_relationships,
+        N2kConfigurationIndex.of(config).relationships_by_primary.get(
+            (item_type, primary_id), []
+        ),
     )
 
     categories = []
@@ -64,22 +67,18 @@ def get_primary_dc_meter(id: int, config: N2kConfiguration):
         config: The N2kConfiguration containing relationships and DC meters.
     Returns:
         The primary DC meter if found, None otherwise."""
+    index = N2kConfigurationIndex.of(config)
     rel = next(
         (
             rel
-            for rel in config.ui_relationships
+            for rel in index.relationships_by_secondary.get((ItemType.DcMeter, id), [])
             if rel.primary_type == ItemType.DcMeter
-            and rel.secondary_type == ItemType.DcMeter
             and rel.relationship_type == RelationshipType.Duplicates
-            and rel.secondary_id == id
         ),
         None,
     )
     if rel is not None:
-        dc = next(
-            (dc for dc in config.dc.values() if dc.id == rel.primary_id),
-            None,
-        )
+        dc = index.dc_by_id.get(rel.primary_id)
 
         if dc is not None:
             return dc
@@ -97,22 +96,18 @@ def get_fallback_dc_meter(id: int, config: N2kConfiguration):
     Returns:
         The fallback DC meter if found, None otherwise.
     """
+    index = N2kConfigurationIndex.of(config)
     rel = next(
         (
             rel
-            for rel in config.ui_relationships
-            if rel.primary_type == ItemType.DcMeter
-            and rel.secondary_type == ItemType.DcMeter
+            for rel in index.relationships_by_primary.get((ItemType.DcMeter, id), [])
+            if rel.secondary_type == ItemType.DcMeter
             and rel.relationship_type == RelationshipType.Duplicates
-            and rel.primary_id == id
         ),
         None,
     )
     if rel is not None:
-        dc = next(
-            (dc for dc in config.dc.values() if dc.id == rel.secondary_id),
-            None,
-        )
+        dc = index.dc_by_id.get(rel.secondary_id)
 
         if dc is not None:
             return dc
@@ -128,23 +123,13 @@ def get_ac_meter_associated_bls(ac_meter: ACMeter, config: N2kConfiguration):
     Returns:
         The associated BinaryLogicState if found, None otherwise.
     """
+    index = N2kConfigurationIndex.of(config)
     for ac_line in ac_meter.line.values():
-        for relationship in config.ui_relationships:
-            if (
-                relationship.secondary_type == ItemType.BinaryLogicState
-                and relationship.primary_type == ItemType.AcMeter
-            ):
-                if relationship.primary_id == ac_line.id:
-                    bls_address = relationship.secondary_config_address
-                    bls = next(
-                        (
-                            bls
-                            for _, bls in config.binary_logic_state.items()
-                            if bls.address == bls_address
-                        ),
-                        None,
-                    )
-                    return bls
+        for relationship in index.relationships_by_primary.get(
+            (ItemType.AcMeter, ac_line.id), []
+        ):
+            if relationship.secondary_type == ItemType.BinaryLogicState:
+                return index.bls_by_address.get(relationship.secondary_config_address)
     return None
 
 
@@ -157,28 +142,20 @@ def get_circuit_associated_bls(circuit: Circuit, config: N2kConfiguration):
     Returns:
         The associated BinaryLogicState if found, None otherwise.
     """
+    index = N2kConfigurationIndex.of(config)
     relationship = next(
         (
             relationship
-            for relationship in config.ui_relationships
+            for relationship in index.relationships_by_primary_address.get(
+                (ItemType.Circuit, circuit.control_id), []
+            )
             if relationship.secondary_type == ItemType.BinaryLogicState
-            and relationship.primary_type == ItemType.Circuit
-            and relationship.primary_config_address == circuit.control_id
         ),
         None,
     )
 
     if relationship is not None:
-        bls_address = relationship.secondary_config_address
-        bls = next(
-            (
-                bls
-                for _, bls in config.binary_logic_state.items()
-                if bls.address == bls_address
-            ),
-            None,
-        )
-        return bls
+        return index.bls_by_address.get(relationship.secondary_config_address)
     return None
 
 
@@ -216,30 +193,18 @@ def get_child_circuits(id: int, config: N2kConfiguration) -> list[Circuit]:
 
     child_circuits = []
 
-    for rel in config.ui_relationships:
+    index = N2kConfigurationIndex.of(config)
+    for rel in index.relationships_by_primary.get((ItemType.Circuit, id), []):
         if (
-            rel.primary_type == ItemType.Circuit
-            and rel.secondary_type == ItemType.Circuit
+            rel.secondary_type == ItemType.Circuit
             and rel.relationship_type == RelationshipType.Normal
-            and rel.primary_id == id
         ):
-            hidden_circuit = next(
-                (
-                    circuit
-                    for circuit in config.hidden_circuit.values()
-                    if circuit.id.value == rel.secondary_id
-                ),
-                None,
-            )
+            # Hidden circuits are keyed by id value
+            hidden_circuit = config.hidden_circuit.get(rel.secondary_id)
 
             if hidden_circuit is not None:
-                child_circuit = next(
-                    (
-                        circuit
-                        for circuit in config.circuit.values()
-                        if circuit.control_id == hidden_circuit.control_id
-                    ),
-                    None,
+                child_circuit = index.circuit_by_control_id.get(
+                    hidden_circuit.control_id
                 )
                 if child_circuit is not None:
                     child_circuits.append(child_circuit)
@@ -255,35 +220,21 @@ def get_associated_tank(id: int, config: N2kConfiguration):
     Returns:
         The associated tank if found, None otherwise
     """
-    hidden_circuit = next(
-        (
-            circuit
-            for circuit in config.hidden_circuit.values()
-            if circuit.control_id == id
-        ),
-        None,
-    )
+    index = N2kConfigurationIndex.of(config)
+    hidden_circuit = index.hidden_circuit_by_control_id.get(id)
 
     if hidden_circuit is not None:
         tank_pump_relationship = next(
             (
                 rel
-                for rel in config.ui_relationships
+                for rel in index.relationships_by_secondary.get(
+                    (ItemType.Circuit, hidden_circuit.id.value), []
+                )
                 if rel.primary_type == ItemType.FluidLevel
-                and rel.secondary_type == ItemType.Circuit
-                and rel.secondary_id == hidden_circuit.id.value
             ),
             None,
         )
 
         if tank_pump_relationship is not None:
-            tank = next(
-                (
-                    tank
-                    for tank in config.tank.values()
-                    if tank.id == tank_pump_relationship.primary_id
-                ),
-                None,
-            )
-            return tank
+            return index.tank_by_id.get(tank_pump_relationship.primary_id)
     return None
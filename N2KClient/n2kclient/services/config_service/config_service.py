@@ -6,6 +6,7 @@ from ...models.n2k_configuration.engine_configuration import EngineConfiguration
 from .config_parser.config_parser import ConfigParser
 from .config_processor.config_processor import ConfigProcessor
 from ..dbus_proxy_service.dbus_proxy import DbusProxyService
+from ..dbus_proxy_service.async_dbus_proxy import AsyncDbusProxyService
 from ...models.constants import Constants, JsonKeys
 from ...models.devices import N2kDevices
 from ...models.common_enums import ConfigOperationType
@@ -43,12 +44,14 @@ class ConfigService:
         set_engine_list: Function to update engine list.
         set_factory_metadata: Function to update factory metadata.
         request_state_snapshot: Function to trigger a state update/snapshot.
+        async_dbus_proxy: Optional AsyncDbusProxyService used to fetch the configuration in parallel.
     Methods:
         write_configuration: Writes the configuration to the host.
         scan_factory_metadata: Scans and updates factory metadata.
         get_configuration: Retrieves the current configuration from the host.
         scan_marine_engine_config: Scans the marine configuration and updates the engine configuration.
         _scan_config_metadata: Scans and retrieves configuration metadata.
+        _fetch_configuration: Fetches the categories, configuration and configuration metadata.
     """
 
     _logger = logging.getLogger(Constants.N2K_CONFIG_SERVICE)
@@ -72,6 +75,8 @@ class ConfigService:
         set_factory_metadata: Callable[[dict], None] = None,
         # --- State update trigger ---
         request_state_snapshot: Callable[[], None] = None,
+        # --- Parallel DBus calls ---
+        async_dbus_proxy: AsyncDbusProxyService = None,
     ):
         """
         ConfigService constructor.
@@ -92,9 +97,11 @@ class ConfigService:
             set_engine_list: Function to update engine list.
             set_factory_metadata: Function to update factory metadata.
             request_state_snapshot: Function to trigger a state update/snapshot.
+            async_dbus_proxy: Optional AsyncDbusProxyService used to fetch the configuration in parallel.
         """
         # Core dependencies
         self._dbus_proxy = dbus_proxy
+        self._async_dbus_proxy = async_dbus_proxy
         self._config_parser = ConfigParser()
         self._config_processor = ConfigProcessor()
         self._lock = lock
@@ -170,27 +177,42 @@ class ConfigService:
         Retrieves the current configuration from the host.
         This method fetches the configuration from the DBus proxy, parses it using the ConfigParser,
         and updates the N2kConfiguration and EmpowerSystem in the service.
-        It also disposes of the current nonengine devices and requests a state snapshot.
+        On the first load it disposes of the current nonengine devices and builds the EmpowerSystem from scratch.
+        Once an EmpowerSystem was built, it is rebuilt incrementally: devices are kept, except those of
+        removed components, and only things whose source config changed are re-created. A state snapshot is requested in both cases.
         """
         # Raw Czone Config
         try:
+            incremental = self._config_processor.has_empower_system()
             with self._lock:
                 latest_devices = self._get_latest_devices()
-                latest_devices.dispose_devices(is_engine=False)
-                self._set_devices(latest_devices)
-            categories_json = self._dbus_proxy.get_categories()
-            config_json = self._dbus_proxy.get_config_all()
-            config_metadata_json = self._dbus_proxy.get_setting(Constants.Config)
+                if not incremental:
+                    latest_devices.dispose_devices(is_engine=False)
+                    self._set_devices(latest_devices)
+            categories_json, config_json, config_metadata_json = (
+                self._fetch_configuration()
+            )
             raw_config = self._config_parser.parse_config(
                 config_json, categories_json, config_metadata_json
             )
             self._set_config(raw_config)
 
             # Empower System
-            self._dispose_empower_system()
-            processed_config = self._config_processor.build_empower_system(
-                raw_config, latest_devices
-            )
+            if incremental:
+                # Unchanged things are moved to the new system, the rest is disposed by the processor
+                processed_config = self._config_processor.build_empower_system(
+                    raw_config, latest_devices, incremental=True
+                )
+                # Devices of removed components must not be decoded from snapshots anymore
+                with self._lock:
+                    latest_devices.remove_devices(
+                        self._config_processor.pop_removed_device_keys()
+                    )
+            else:
+                self._dispose_empower_system()
+                processed_config = self._config_processor.build_empower_system(
+                    raw_config, latest_devices
+                )
             self._set_empower_system(processed_config)
             self._request_state_snapshot()
         except Exception as e:
@@ -198,6 +220,35 @@ class ConfigService:
                 f"Error reading dbus Get Config response: {e}", exc_info=True
             )
 
+    def _fetch_configuration(self) -> tuple[str, str, str]:
+        """
+        Fetch the categories, configuration and configuration metadata from the host.
+        With an AsyncDbusProxyService the three calls are in flight at the same time.
+        If any of them fails, or there is no async proxy, they are sent one after the other
+        through the DbusProxyService, which retries until they succeed.
+
+        Returns:
+            Tuple of the categories, configuration and configuration metadata JSON strings.
+        """
+        if self._async_dbus_proxy is not None:
+            try:
+                categories_json, config_json, config_metadata_json = (
+                    self._async_dbus_proxy.gather(
+                        self._async_dbus_proxy.get_categories(),
+                        self._async_dbus_proxy.get_config_all(),
+                        self._async_dbus_proxy.get_setting(Constants.Config),
+                    )
+                )
+                return categories_json, config_json, config_metadata_json
+            except Exception as e:
+                self._logger.warning(
+                    f"Parallel configuration fetch failed, fetching sequentially: {e}"
+                )
+        categories_json = self._dbus_proxy.get_categories()
+        config_json = self._dbus_proxy.get_config_all()
+        config_metadata_json = self._dbus_proxy.get_setting(Constants.Config)
+        return categories_json, config_json, config_metadata_json
+
     def scan_marine_engine_config(self, should_reset: bool = False) -> bool:
         """
         Scans the marine configuration and updates the engine configuration.
@@ -0,0 +1,272 @@
+import logging
+from concurrent.futures import Future, wait
+from time import monotonic
+
+from gi.repository import GLib
+
+from .dbus_proxy import DbusNotConnectedError, DbusProxyService
+from ...models.constants import Constants
+from ...util.settings_util import SettingsUtil
+
+
+class AsyncDbusProxyService:
+    """
+    Non-blocking variant of DbusProxyService.
+    Each method sends the DBus call with reply_handler/error_handler and immediately returns a
+    concurrent.futures.Future resolved with the reply, so several calls can be in flight at once.
+    The connection, DBus methods and reconnect supervisor are shared with the DbusProxyService.
+    Calls are not retried: a failed call fails its future and asks the supervisor to reconnect,
+    and callers that need retries fall back to the DbusProxyService.
+    Attributes:
+        _dbus_proxy: The DbusProxyService owning the DBus connection.
+        _logger: Logger instance for logging messages.
+        _dbus_timeout: Timeout in seconds of each DBus call, read from settings.
+    Methods:
+        get_config: Retrieves specific component type N2K configuration via DBus.
+        get_config_all: Retrieves full N2K configurations via DBus.
+        get_categories: Retrieves categories via DBus.
+        get_setting: Retrieves setting via DBus.
+        control: Sends control command via DBus.
+        alarm_list: Retrieves full alarm list via DBus.
+        alarm_acknowledge: Acknowledges an alarm via DBus.
+        alarm_acknowledge_batch: Acknowledges several alarms with all calls in flight at once.
+        single_snapshot: Retrieves full single snapshot via DBus.
+        put_file: Sends a file to the host via DBus.
+        operation: Performs an operation on the host via DBus.
+        gather: Waits for several futures and returns their results in order.
+    """
+
+    _logger = logging.getLogger("DBUS Async Proxy Helper")
+    _dbus_timeout = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.WORKER_KEY,
+        Constants.DBUS_ASYNC_TIMEOUT_KEY,
+        default_value=25,
+    )
+
+    def __init__(self, dbus_proxy: DbusProxyService):
+        self._dbus_proxy = dbus_proxy
+
+    def _call_async(self, method_name: str, *args) -> Future:
+        """
+        Send a DBus method call without waiting for the reply.
+
+        Args:
+            method_name (str): The name of the DBus method attribute on the DbusProxyService.
+            *args: Positional arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the reply, or failed with the DBus error.
+        """
+        future = Future()
+        # pylint: disable=protected-access
+        supervisor = self._dbus_proxy._reconnect_supervisor
+        if supervisor.is_reconnecting():
+            future.set_exception(
+                DbusNotConnectedError(f"DBus is reconnecting, {method_name} not sent")
+            )
+            return future
+
+        def on_reply(*reply):
+            result = reply[0] if len(reply) > 0 else None
+            self._dbus_proxy.capture_response(method_name, args, result)
+            future.set_result(result)
+
+        def on_error(error: Exception):
+            self._logger.warning(f"Async DBus call {method_name} failed: {error}")
+            supervisor.request_reconnect(str(error))
+            future.set_exception(error)
+
+        try:
+            method = getattr(self._dbus_proxy, method_name)
+            method(
+                *args,
+                reply_handler=on_reply,
+                error_handler=on_error,
+                timeout=self._dbus_timeout,
+            )
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def gather(self, *futures: Future, return_exceptions: bool = False) -> list:
+        """
+        Wait for all futures and return their results, in order.
+        Replies are dispatched by the GLib main loop. If the main loop is not running yet
+        (e.g. during startup), the default main context is iterated here until the replies arrive.
+
+        Args:
+            *futures: The futures to wait for.
+            return_exceptions (bool): Return the error of a failed or timed out future in place of its result instead of raising it.
+
+        Returns:
+            list: The result of each future.
+
+        Raises:
+            Exception: The error of the first failed future, unless return_exceptions is set.
+            TimeoutError: If the replies did not arrive within the DBus timeout, unless return_exceptions is set.
+        """
+        deadline = monotonic() + self._dbus_timeout
+        context = GLib.MainContext.default()
+        if context.acquire():
+            try:
+                while not all(future.done() for future in futures):
+                    if monotonic() > deadline:
+                        break
+                    context.iteration(True)
+            finally:
+                context.release()
+        else:
+            wait(futures, timeout=self._dbus_timeout)
+        timeout_error = TimeoutError("Timed out waiting for async DBus replies")
+        if return_exceptions:
+            results = []
+            for future in futures:
+                if not future.done():
+                    results.append(timeout_error)
+                elif future.exception() is not None:
+                    results.append(future.exception())
+                else:
+                    results.append(future.result())
+            return results
+        if not all(future.done() for future in futures):
+            raise timeout_error
+        return [future.result() for future in futures]
+
+    def get_config(self, *args) -> Future:
+        """
+        Get N2K configuration via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_get_config", *args)
+
+    def get_config_all(self, *args) -> Future:
+        """
+        Get all N2K configurations via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_get_config_all", *args)
+
+    def get_categories(self, *args) -> Future:
+        """
+        Get N2K categories via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_get_categories", *args)
+
+    def get_setting(self, *args) -> Future:
+        """
+        Get N2K setting via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_get_setting", *args)
+
+    def control(self, *args) -> Future:
+        """
+        Send control command via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_control", *args)
+
+    def alarm_list(self, *args) -> Future:
+        """
+        Get alarm list via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_alarm_list", *args)
+
+    def alarm_acknowledge(self, *args) -> Future:
+        """
+        Acknowledge alarm via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_alarm_acknowledge", *args)
+
+    def alarm_acknowledge_batch(self, requests: list[str]) -> list:
+        """
+        Acknowledge several alarms in one round trip.
+        The lock of the DbusProxyService alarm acknowledge method is held once for the whole batch,
+        and every acknowledge call is sent before waiting for the replies.
+
+        Args:
+            requests (list[str]): The acknowledge request of each alarm.
+
+        Returns:
+            list: The reply of each request, or the error of the requests that failed, in order.
+        """
+        # pylint: disable=protected-access
+        method_lock = self._dbus_proxy._get_method_lock("_dbus_alarm_acknowledge")
+        with method_lock:
+            futures = [self.alarm_acknowledge(request) for request in requests]
+            return self.gather(*futures, return_exceptions=True)
+
+    def single_snapshot(self, *args) -> Future:
+        """
+        Get single snapshot via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_single_snapshot", *args)
+
+    def put_file(self, *args) -> Future:
+        """
+        Send a file to the host via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_put_file", *args)
+
+    def operation(self, *args) -> Future:
+        """
+        Perform an operation on the host via DBus.
+
+        Args:
+            *args: Arguments to pass to the DBus method.
+
+        Returns:
+            Future: Resolved with the result of the DBus method call.
+        """
+        return self._call_async("_dbus_operation", *args)
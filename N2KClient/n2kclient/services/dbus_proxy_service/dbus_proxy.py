@@ -4,7 +4,7 @@ import logging
 import threading
 from typing import Callable
 import dbus
-from time import sleep
+from time import monotonic, sleep
 
 from ...util.settings_util import SettingsUtil
 from ...models.constants import Constants
@@ -12,6 +12,15 @@ from ...models.dbus_connection_status import DBUSConnectionStatus
 from ...util.time_util import TimeUtil
 import platform
 from ...models.common_enums import ConnectionStatus
+from .signal_dispatcher import SignalDispatcher
+from .reconnect_supervisor import ReconnectSupervisor
+from .traffic_capture import TrafficCapture
+
+
+class DbusNotConnectedError(Exception):
+    """
+    Raised by bounded DBus calls while the connection is being re-established.
+    """
 
 
 class DbusProxyService:
@@ -23,17 +32,26 @@ class DbusProxyService:
         event_handler: Optional handler function for DBus events.
         snapshot_handler: Optional handler function for DBus snapshots.
         control_max_attempts: Maximum number of retry attempts for control operations.
-        lock: Threading lock to ensure thread-safe DBus access.
+        lock: Threading lock guarding the per-method locks.
+        _method_locks: Per-method locks, so independent DBus methods can be called concurrently.
+        _reconnect_supervisor: Re-establishes the DBus connection in the background after a failed call.
         _logger: Logger instance for logging messages.
         _dbus_retry_delay: Delay in seconds between DBus retry attempts, read from settings
+        _control_reconnect_grace: Seconds a bounded call waits in total for a reconnect it triggered, read from settings
+        _signal_queue_size: Maximum number of queued signals, read from settings
+        _signal_dispatcher: Queues Event and Snapshot signals and processes them on a worker thread.
+        _capture: Capture of the signals and method responses received, None unless enabled in settings.
     Methods:
         __init__: Initializes the DBus proxy service with optional callbacks and settings.
         connect: Establishes the DBus connection with retry logic.
         _connect_dbus: Internal method to set up the DBus connection and register handlers.
         _register_signal_handlers: Registers signal handlers (Event + Snapshot) for DBus events and snapshots.
+        get_signal_queue_metrics: Returns the signal queue depth and drop counters.
+        capture_response: Records a method response in the capture, if enabled.
         _register_methods: Maps DBus service methods to instance attributes.
         _report_status: Helper to report connection status via callback.
-        _call_with_retry: Calls a DBus method with retry logic and status reporting.
+        _call_with_retry: Calls a DBus method with retry logic, failing fast with DbusNotConnectedError
+            for bounded calls while reconnecting.
         get_config: Retrieves specific component type N2K configuration via DBus.
         get_config_all: Retrieves full N2K configurations via DBus.
         get_categories: Retrieves categories via DBus.
@@ -53,6 +71,44 @@ class DbusProxyService:
         Constants.DBUS_RETRY_DELAY_KEY,
         default_value=5,
     )
+    _control_reconnect_grace = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.WORKER_KEY,
+        Constants.CONTROL_DBUS_RECONNECT_GRACE_KEY,
+        default_value=1,
+    )
+    _signal_queue_size = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.WORKER_KEY,
+        Constants.SIGNAL_QUEUE_SIZE_KEY,
+        default_value=256,
+    )
+    _dbus_reconnect_base_delay = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.WORKER_KEY,
+        Constants.DBUS_RECONNECT_BASE_DELAY_KEY,
+        default_value=0.5,
+    )
+    _dbus_reconnect_max_delay = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.WORKER_KEY,
+        Constants.DBUS_RECONNECT_MAX_DELAY_KEY,
+        default_value=30,
+    )
+    # Address of a private bus to connect to instead of the system bus, e.g. for load testing
+    _dbus_bus_address = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.WORKER_KEY,
+        Constants.DBUS_BUS_ADDRESS_KEY,
+        default_value="",
+    )
+
+    _capture_enabled = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.CAPTURE_KEY,
+        Constants.CAPTURE_ENABLED_KEY,
+        default_value=False,
+    )
 
     # Class-level constant for DBus method name mapping
     DBUS_METHOD_MAP = [
@@ -67,6 +123,20 @@ class DbusProxyService:
         ("_dbus_put_file", Constants.PUT_FILE_SERVICE_METHOD_NAME),
         ("_dbus_operation", Constants.OPERATION_SERVICE_METHOD_NAME),
     ]
+    # Methods whose responses are captured, the ones a replay needs to rebuild the client state
+    CAPTURED_METHODS = {
+        attr: method
+        for attr, method in DBUS_METHOD_MAP
+        if method
+        in (
+            Constants.GET_CONFIG_SERVICE_METHOD_NAME,
+            Constants.GET_CONFIG_ALL_SERVICE_METHOD_NAME,
+            Constants.GET_CATEGORIES_SERVICE_METHOD_NAME,
+            Constants.GET_SETTING_SERVICE_METHOD_NAME,
+            Constants.ALARM_LIST_SERVICE_METHOD_NAME,
+            Constants.SINGLE_SNAPSHOT_SERVICE_METHOD_NAME,
+        )
+    }
 
     def __init__(
         self,
@@ -80,7 +150,20 @@ class DbusProxyService:
         self.event_handler = event_handler
         self.control_max_attempts = control_max_attempts
         self.lock = threading.Lock()
+        self._method_locks = {}
         self.snapshot_handler = snapshot_handler
+        self._reconnect_supervisor = ReconnectSupervisor(
+            connect=self._connect_dbus,
+            report_status=self._report_status,
+            base_delay=self._dbus_reconnect_base_delay,
+            max_delay=self._dbus_reconnect_max_delay,
+        )
+        self._signal_dispatcher = SignalDispatcher(
+            event_handler=self._dispatch_event,
+            snapshot_handler=self._dispatch_snapshot,
+            max_queue_size=self._signal_queue_size,
+        )
+        self._capture = TrafficCapture() if self._capture_enabled else None
 
     def connect(self):
         """
@@ -105,14 +188,17 @@ class DbusProxyService:
 
     def _connect_dbus(self):
         """
-        Establish a connection to the DBus (SessionBus on macOS, SystemBus on Linux).
+        Establish a connection to the DBus (SessionBus on macOS, SystemBus on Linux), or to the bus
+        at the configured address if any.
         Registers signal handlers and DBus methods.
 
         Returns:
             None
         """
+        if self._dbus_bus_address:
+            self.bus = dbus.bus.BusConnection(self._dbus_bus_address)
         # Mac uses SessionBus, Linux uses SystemBus
-        if platform.system() == "Darwin":
+        elif platform.system() == "Darwin":
             self.bus = dbus.SessionBus()
         else:
             self.bus = dbus.SystemBus()
@@ -129,23 +215,83 @@ class DbusProxyService:
     def _register_signal_handlers(self):
         """
         Register signal handlers for DBus events and snapshots.
+        The receivers only queue the payload, the handlers run on the signal worker thread
+        so the GLib main loop is never blocked by signal processing.
+        While capturing, the payloads are recorded before being queued, so dropped snapshots are captured too.
 
         Returns:
             None
         """
+        event_receiver = self._signal_dispatcher.enqueue_event
+        snapshot_receiver = self._signal_dispatcher.enqueue_snapshot
+        if self._capture is not None:
+            event_receiver = self._capture_event
+            snapshot_receiver = self._capture_snapshot
         self.bus.add_signal_receiver(
-            self.event_handler,
+            event_receiver,
             dbus_interface=Constants.N2K_INTERFACE_NAME,
             signal_name=Constants.EVENT_SIGNAL_NAME,
             path=Constants.N2K_OBJECT_PATH,
         )
         self.bus.add_signal_receiver(
-            self.snapshot_handler,
+            snapshot_receiver,
             dbus_interface=Constants.N2K_INTERFACE_NAME,
             signal_name=Constants.SNAPSHOT_SIGNAL_NAME,
             path=Constants.N2K_OBJECT_PATH,
         )
 
+    def _capture_event(self, event_json: str):
+        """
+        Record a received Event payload in the capture, then queue it.
+        """
+        self._capture.record_signal(Constants.EVENT_SIGNAL_NAME, event_json)
+        self._signal_dispatcher.enqueue_event(event_json)
+
+    def _capture_snapshot(self, snapshot_json: str):
+        """
+        Record a received Snapshot payload in the capture, then queue it.
+        """
+        self._capture.record_signal(Constants.SNAPSHOT_SIGNAL_NAME, snapshot_json)
+        self._signal_dispatcher.enqueue_snapshot(snapshot_json)
+
+    def capture_response(self, method_name: str, args: tuple, response: object):
+        """
+        Record the response of a DBus method in the capture, if capturing and the method is captured.
+
+        Args:
+            method_name (str): The name of the DBus method attribute called.
+            args (tuple): The arguments the method was called with.
+            response (object): The response received.
+        """
+        if self._capture is None:
+            return
+        captured_method = self.CAPTURED_METHODS.get(method_name)
+        if captured_method is not None:
+            self._capture.record_response(captured_method, args, response)
+
+    def _dispatch_event(self, event_json: str):
+        """
+        Hand a queued Event payload to the event handler, if one is set.
+        """
+        if self.event_handler:
+            self.event_handler(event_json)
+
+    def _dispatch_snapshot(self, snapshot_json: str):
+        """
+        Hand a queued Snapshot payload to the snapshot handler, if one is set.
+        """
+        if self.snapshot_handler:
+            self.snapshot_handler(snapshot_json)
+
+    def get_signal_queue_metrics(self) -> dict[str, int]:
+        """
+        Get the signal queue depth and the counts of dropped and processed signals.
+
+        Returns:
+            dict[str, int]: queue_depth, dropped_snapshots, dropped_events and processed_signals.
+        """
+        return self._signal_dispatcher.get_metrics()
+
     def _register_methods(self):
         """
         Initialize N2k dbus Service Methods.
@@ -181,11 +327,33 @@ class DbusProxyService:
                 )
             )
 
+    def _get_method_lock(self, method_name: str) -> threading.Lock:
+        """
+        Get the lock serializing calls to a single DBus method, creating it if needed.
+
+        Args:
+            method_name (str): The name of the DBus method attribute.
+
+        Returns:
+            threading.Lock: The lock for the method.
+        """
+        with self.lock:
+            if method_name not in self._method_locks:
+                self._method_locks[method_name] = threading.Lock()
+            return self._method_locks[method_name]
+
     def _call_with_retry(
         self, method_name: str, *args, max_attempts: int = None, **kwargs
     ) -> object:
         """
-        Call a DBus method with retry logic and status reporting.
+        Call a DBus method with retry logic.
+        Calls to the same method are serialized, calls to different methods run concurrently.
+        A failed call hands reconnection to the reconnect supervisor instead of reconnecting inline,
+        the supervisor reports the disconnected status.
+        While it reconnects, unbounded calls wait for the connection to come back before retrying.
+        Bounded calls (max_attempts set) fail fast with DbusNotConnectedError if a reconnect is in progress
+        when they are made. After a failed attempt they wait for the reconnect it triggered at most
+        _control_reconnect_grace seconds over the whole call, so their latency stays bounded.
 
         Args:
             method_name (str): The name of the DBus method attribute to call.
@@ -197,33 +365,41 @@ class DbusProxyService:
             object: The result of the DBus method call.
 
         Raises:
-            dbus.exceptions.DBusException: If the call fails after max_attempts.
+            dbus.exceptions.DBusException: If the last of max_attempts failed.
+            DbusNotConnectedError: If max_attempts is set and the connection is being re-established.
         """
         attempt = 0
+        method_lock = self._get_method_lock(method_name)
+        deadline = monotonic() + self._control_reconnect_grace
         while True:
-            with self.lock:
+            if not max_attempts:
+                self._reconnect_supervisor.wait_connected()
+            elif self._reconnect_supervisor.is_reconnecting():
+                remaining = deadline - monotonic()
+                if (
+                    attempt == 0
+                    or remaining <= 0
+                    or not self._reconnect_supervisor.wait_connected(remaining)
+                ):
+                    raise DbusNotConnectedError(
+                        f"DBus is reconnecting, {method_name} not sent"
+                    )
+            with method_lock:
                 method = getattr(self, method_name)
                 try:
                     result = method(*args, **kwargs)
                     self._report_status(True)
+                    self.capture_response(method_name, args, result)
                     return result
                 except dbus.exceptions.DBusException as e:
                     attempt += 1
                     self._logger.warning(f"DBus call failed (attempt {attempt}): {e}")
-                    self._report_status(False, str(e))
+                    self._reconnect_supervisor.request_reconnect(str(e))
                     if max_attempts and attempt >= max_attempts:
                         self._logger.error(
                             f"DBus call failed after {attempt} attempts. Giving up."
                         )
                         raise
-            sleep(self._dbus_retry_delay)
-            while True:
-                try:
-                    self._connect_dbus()
-                    break
-                except Exception as conn_exc:
-                    self._logger.error(f"DBus reconnect failed: {conn_exc}")
-                    sleep(self._dbus_retry_delay)
 
     def get_config(self, *args, **kwargs) -> object:
         """
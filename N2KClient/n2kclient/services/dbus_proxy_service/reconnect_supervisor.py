@@ -0,0 +1,109 @@
+import logging
+import random
+import threading
+from time import sleep
+from typing import Callable
+
+from ...models.constants import Constants
+
+
+class ReconnectSupervisor:
+    """
+    Owns reconnection to DBus after a failed call.
+    A single background thread reconnects with exponential backoff and jitter, so callers never
+    sleep or reconnect themselves. While it is reconnecting, callers can check is_reconnecting
+    to fail fast, or wait_connected to block until the connection is back.
+    Attributes:
+        _connect: Callable establishing the DBus connection, raises on failure.
+        _report_status: Callable reporting the connection status (connected, reason).
+        _base_delay: Delay in seconds before the first reconnect attempt.
+        _max_delay: Upper bound in seconds of the delay between reconnect attempts.
+        _connected: Event set while not reconnecting.
+        _thread: The reconnect thread, None when not reconnecting.
+        reconnect_count: Number of successful reconnects.
+    Methods:
+        is_reconnecting: Return True while a reconnect is in progress.
+        wait_connected: Block until the reconnect completes, or the timeout expires.
+        request_reconnect: Start reconnecting, unless a reconnect is already in progress.
+    """
+
+    _logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        connect: Callable[[], None],
+        report_status: Callable[[bool, str], None],
+        base_delay: float,
+        max_delay: float,
+    ):
+        self._connect = connect
+        self._report_status = report_status
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._connected.set()
+        self._thread = None
+        self.reconnect_count = 0
+
+    def is_reconnecting(self) -> bool:
+        """
+        Return True while a reconnect is in progress.
+        """
+        return not self._connected.is_set()
+
+    def wait_connected(self, timeout: float = None) -> bool:
+        """
+        Block until no reconnect is in progress.
+        Args:
+            timeout: Maximum number of seconds to wait, None to wait indefinitely.
+        Returns:
+            bool: True if connected, False if the timeout expired.
+        """
+        return self._connected.wait(timeout)
+
+    def request_reconnect(self, reason: str = ""):
+        """
+        Start reconnecting in the background, unless a reconnect is already in progress.
+        Args:
+            reason: Reason for the reconnect, reported with the disconnected status.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._connected.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=Constants.DBUS_RECONNECT_THREAD_NAME,
+                daemon=True,
+            )
+            self._thread.start()
+        self._report_status(False, reason)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Return the delay before the given reconnect attempt, doubling each attempt up to
+        the maximum delay, with jitter so clients restarting together do not reconnect in lockstep.
+        """
+        delay = min(self._max_delay, self._base_delay * (2**attempt))
+        return random.uniform(delay / 2, delay)
+
+    def _run(self):
+        """
+        Reconnect loop, runs until the connection is re-established.
+        """
+        attempt = 0
+        while True:
+            sleep(self._backoff_delay(attempt))
+            try:
+                self._connect()
+                break
+            except Exception as e:
+                attempt += 1
+                self._logger.error(f"DBus reconnect attempt {attempt} failed: {e}")
+        with self._lock:
+            self._thread = None
+            self.reconnect_count += 1
+            self._connected.set()
+        self._logger.info(f"DBus reconnected after {attempt + 1} attempts")
+        self._report_status(True, "")
@@ -0,0 +1,150 @@
+import logging
+import threading
+from collections import deque
+from typing import Callable
+
+from ...models.constants import Constants
+
+
+class SignalDispatcher:
+    """
+    Moves DBus signal processing off the GLib main loop onto a dedicated worker thread.
+    Signal receivers only enqueue the raw payload, so a slow handler (e.g. a configuration
+    rebuild) no longer blocks the delivery of other signals.
+    Events are processed in the order they were received. Only the newest snapshot matters,
+    so a snapshot that is still queued when a newer one arrives is dropped, and the newer one
+    is queued after the events received before it.
+    Attributes:
+        _event_handler: Handler for Event signal payloads.
+        _snapshot_handler: Handler for Snapshot signal payloads.
+        _max_queue_size: Maximum number of queued signals. Events received when the queue is full are dropped.
+        _queue: Queued signals, in order. Snapshots are queued as a marker resolved to the newest payload.
+        _pending_snapshot: Newest snapshot payload not yet processed, None if no snapshot is queued.
+        _condition: Condition guarding the queue, used to wake the worker.
+        _worker: The worker thread, started on the first signal.
+        dropped_snapshots: Number of snapshots replaced by a newer snapshot before being processed.
+        dropped_events: Number of events dropped because the queue was full.
+        processed_signals: Number of signals handed to a handler.
+    Methods:
+        enqueue_event: Queue an Event signal payload.
+        enqueue_snapshot: Queue a Snapshot signal payload, replacing any queued snapshot.
+        get_metrics: Return the queue depth and drop counters.
+        stop: Stop the worker thread.
+    """
+
+    _SNAPSHOT = object()
+
+    _logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        event_handler: Callable[[str], None],
+        snapshot_handler: Callable[[str], None],
+        max_queue_size: int,
+    ):
+        self._event_handler = event_handler
+        self._snapshot_handler = snapshot_handler
+        self._max_queue_size = max_queue_size
+        self._queue = deque()
+        self._pending_snapshot = None
+        self._condition = threading.Condition()
+        self._worker = None
+        self._running = True
+        self.dropped_snapshots = 0
+        self.dropped_events = 0
+        self.processed_signals = 0
+
+    def enqueue_event(self, payload: str):
+        """
+        Queue an Event signal payload. Called from the GLib main loop.
+        """
+        with self._condition:
+            if len(self._queue) >= self._max_queue_size:
+                self.dropped_events += 1
+                self._logger.error(
+                    f"Signal queue full ({self._max_queue_size}), dropping event"
+                )
+                return
+            self._queue.append(payload)
+            self._start_worker()
+            self._condition.notify()
+
+    def enqueue_snapshot(self, payload: str):
+        """
+        Queue a Snapshot signal payload. Called from the GLib main loop.
+        If a snapshot is already queued, it is dropped and the new one is queued last, so it is
+        never applied before the events received ahead of it.
+        """
+        with self._condition:
+            if self._pending_snapshot is not None:
+                self._queue.remove(self._SNAPSHOT)
+                self.dropped_snapshots += 1
+            self._pending_snapshot = payload
+            self._queue.append(self._SNAPSHOT)
+            self._start_worker()
+            self._condition.notify()
+
+    def get_metrics(self) -> dict[str, int]:
+        """
+        Return the current queue depth and the drop and processed counters.
+        """
+        with self._condition:
+            return {
+                "queue_depth": len(self._queue),
+                "dropped_snapshots": self.dropped_snapshots,
+                "dropped_events": self.dropped_events,
+                "processed_signals": self.processed_signals,
+            }
+
+    def stop(self):
+        """
+        Stop the worker thread once it finishes the signal it is processing.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    def _start_worker(self):
+        """
+        Start the worker thread if it is not running. Must be called with the condition held.
+        """
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run,
+                name=Constants.SIGNAL_WORKER_THREAD_NAME,
+                daemon=True,
+            )
+            self._worker.start()
+
+    def _next_signal(self):
+        """
+        Wait for the next queued signal and return its handler and payload.
+        Returns None when the dispatcher is stopped.
+        """
+        with self._condition:
+            while self._running and len(self._queue) == 0:
+                self._condition.wait()
+            if not self._running:
+                return None
+            item = self._queue.popleft()
+            if item is self._SNAPSHOT:
+                payload = self._pending_snapshot
+                self._pending_snapshot = None
+                return self._snapshot_handler, payload
+            return self._event_handler, item
+
+    def _run(self):
+        """
+        Worker loop, hands each queued signal to its handler.
+        """
+        while True:
+            next_signal = self._next_signal()
+            if next_signal is None:
+                return
+            handler, payload = next_signal
+            try:
+                handler(payload)
+            except Exception as e:
+                self._logger.error(f"Failed to process signal: {e}")
+            with self._condition:
+                self.processed_signals += 1
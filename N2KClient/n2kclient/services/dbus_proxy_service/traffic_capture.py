@@ -0,0 +1,172 @@
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from typing import Any, Iterator, Optional
+
+from ...models.constants import Constants
+from ...util.settings_util import SettingsUtil
+from ...util.time_util import TimeUtil
+
+# Record written at the start of each capture file, holding the wall clock time the capture started at
+CAPTURE_START = "CaptureStart"
+
+
+class TrafficCapture:
+    """
+    Compressed, size bounded capture of the DBus traffic received, to reproduce a workload offline.
+    Records are appended to a gzip file, one json object per line:
+        {"t": seconds since the capture started, "signal": name, "payload": json string}
+    which is the stream format replayed by the simulator load generator. Signals are named after the
+    DBus signal, method responses after the DBus method and its argument if any, e.g. GetConfig.Engines.
+    Once the compressed file reaches half the maximum size it is rotated to <path>.1, replacing the
+    previous one, and the last response of each method is written again at the start of the new file,
+    so each file can be replayed on its own. The file is flushed at most once a second, a capture cut
+    short by a crash is readable up to the last flush.
+    Attributes:
+        path: Path of the capture file.
+        max_size: Maximum size in bytes of the capture file and its rotated file together.
+        _responses: Last response recorded for each method.
+        _file: The open capture file, None once closed or after a write error.
+        _start: Monotonic time the capture started at.
+        _last_flush: Monotonic time of the last flush.
+    Methods:
+        record_signal: Record a received signal.
+        record_response: Record the response of a method.
+        close: Flush and close the capture file.
+        read: Read the records of a capture file.
+    """
+
+    _logger = logging.getLogger(f"{Constants.DBUS_N2K_CLIENT}.Capture")
+    _default_path = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.CAPTURE_KEY,
+        Constants.CAPTURE_PATH_KEY,
+        default_value="/data/hub/capture/dbus_capture.jsonl.gz",
+    )
+    _default_max_size = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.CAPTURE_KEY,
+        Constants.CAPTURE_MAX_SIZE_KEY,
+        default_value=20 * 1024 * 1024,
+    )
+
+    FLUSH_INTERVAL = 1.0
+
+    path: str
+    max_size: int
+    _responses: dict[str, str]
+
+    def __init__(self, path: Optional[str] = None, max_size: Optional[int] = None):
+        self.path = path if path is not None else self._default_path
+        self.max_size = max_size if max_size is not None else self._default_max_size
+        self._responses = {}
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._last_flush = self._start
+        self._file = None
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._open()
+        except Exception as e:
+            self._logger.error(f"Failed to open capture file {self.path}: {e}")
+
+    def record_signal(self, signal_name: str, payload: str):
+        """
+        Record a received signal.
+
+        Args:
+            signal_name: The name of the DBus signal, e.g. Snapshot.
+            payload: The json string received.
+        """
+        with self._lock:
+            self._write(signal_name, payload)
+
+    def record_response(self, method_name: str, args: tuple, response: Any):
+        """
+        Record the response of a method.
+
+        Args:
+            method_name: The name of the DBus method, e.g. GetConfigAll.
+            args: The arguments the method was called with, appended to the name.
+            response: The response received.
+        """
+        name = ".".join([method_name, *(str(arg) for arg in args)])
+        payload = str(response) if response is not None else ""
+        with self._lock:
+            self._responses[name] = payload
+            self._write(name, payload)
+
+    def close(self):
+        """
+        Flush and close the capture file.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def read(path: str) -> Iterator[dict[str, Any]]:
+        """
+        Read the records of a capture file, stopping at the end of the data flushed if it was cut short.
+
+        Args:
+            path: Path of the capture file.
+        Returns:
+            Iterator[dict[str, Any]]: The records, with their t, signal and payload.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    yield json.loads(line)
+            except (EOFError, zlib.error, json.JSONDecodeError):
+                return
+
+    def _open(self):
+        self._file = gzip.open(self.path, "wb")
+        self._last_flush = time.monotonic()
+        self._write(CAPTURE_START, json.dumps({"Time": TimeUtil.current_time()}))
+        for name, payload in self._responses.items():
+            self._write(name, payload)
+        self._flush()
+
+    def _rotate(self):
+        self._file.close()
+        os.replace(self.path, f"{self.path}.1")
+        self._open()
+
+    def _flush(self):
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def _write(self, name: str, payload: str):
+        """
+        Write a record, flushing and rotating the file as needed. Must be called with the lock held.
+        A write error stops the capture rather than failing the caller.
+        """
+        if self._file is None:
+            return
+        try:
+            now = time.monotonic()
+            record = {
+                "t": round(now - self._start, 6),
+                "signal": name,
+                "payload": payload,
+            }
+            self._file.write(json.dumps(record).encode() + b"\n")
+            if now - self._last_flush >= self.FLUSH_INTERVAL:
+                self._flush()
+                # Compressed bytes written, up to the last flush
+                if self._file.fileobj.tell() >= self.max_size // 2:
+                    self._rotate()
+        except Exception as e:
+            self._logger.error(f"Failed to write capture file {self.path}: {e}")
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
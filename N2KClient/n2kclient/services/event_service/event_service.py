@@ -1,5 +1,8 @@
 import json
+import threading
 from ...models.common_enums import eEventType
+from ...models.constants import Constants
+from ...util.settings_util import SettingsUtil
 import logging
 from ..alarm_service.alarm_service import AlarmService
 from ..config_service.config_service import ConfigService
@@ -14,15 +17,31 @@ class EventService:
         _config_service: Instance of ConfigService for managing configuration.
         _logger: Logger instance for logging events.
         _event_parser: Instance of EventParser for parsing event JSON data.
+        _alarm_reload_window: Seconds to wait after an alarm event, so a burst of alarm events triggers a single reload.
+        _alarm_reload_timer: Timer for the pending alarm reload, None if no reload is pending.
+        _pending_alarm_events: Number of alarm events waiting on the pending reload.
+        coalesced_alarm_events: Total number of alarm events that were merged into another event's reload.
     Methods:
         event_handler: Handles incoming event JSON strings, parses them, and triggers appropriate actions
+        get_coalesced_alarm_event_count: Returns the number of alarm events that did not need their own reload.
     """
 
+    _alarm_reload_window = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.WORKER_KEY,
+        Constants.ALARM_RELOAD_WINDOW_KEY,
+        default_value=0.5,
+    )
+
     def __init__(self, alarm_service: AlarmService, config_service: ConfigService):
         self._alarm_service = alarm_service
         self._config_service = config_service
         self._logger = logging.getLogger(__name__)
         self._event_parser = EventParser()
+        self._alarm_reload_lock = threading.Lock()
+        self._alarm_reload_timer = None
+        self._pending_alarm_events = 0
+        self.coalesced_alarm_events = 0
 
     def event_handler(self, event_json: str):
         """
@@ -48,9 +67,51 @@ class EventService:
                 eEventType.AlarmDeactivated,
             ]:
                 self._logger.info("Received Alarm event")
-                self._alarm_service.load_active_alarms()
+                self._schedule_alarm_reload()
             self._logger.debug("Event received and processed")
 
         except Exception as e:
             self._logger.error(f"Failed to handle Event: {e}, raw: {event_json}")
             return
+
+    def get_coalesced_alarm_event_count(self) -> int:
+        """
+        Get the number of alarm events that were merged into another event's reload.
+        """
+        return self.coalesced_alarm_events
+
+    def _schedule_alarm_reload(self):
+        """
+        Schedule a reload of the active alarms.
+        The first alarm event starts a timer of _alarm_reload_window seconds, and any alarm
+        events received before it fires share its reload. A window of 0 reloads immediately.
+        """
+        if self._alarm_reload_window <= 0:
+            self._alarm_service.load_active_alarms()
+            return
+        with self._alarm_reload_lock:
+            self._pending_alarm_events += 1
+            if self._alarm_reload_timer is not None:
+                return
+            self._alarm_reload_timer = threading.Timer(
+                self._alarm_reload_window, self._reload_alarms
+            )
+            self._alarm_reload_timer.name = Constants.ALARM_RELOAD_TIMER_THREAD_NAME
+            self._alarm_reload_timer.daemon = True
+            self._alarm_reload_timer.start()
+
+    def _reload_alarms(self):
+        """
+        Reload the active alarms for all alarm events received during the window.
+        Alarm events received while the reload runs schedule a new reload.
+        """
+        with self._alarm_reload_lock:
+            event_count = self._pending_alarm_events
+            self._pending_alarm_events = 0
+            self._alarm_reload_timer = None
+            self.coalesced_alarm_events += max(event_count - 1, 0)
+        try:
+            self._logger.debug(f"Reloading active alarms for {event_count} alarm events")
+            self._alarm_service.load_active_alarms()
+        except Exception as e:
+            self._logger.error(f"Failed to reload active alarms: {e}")
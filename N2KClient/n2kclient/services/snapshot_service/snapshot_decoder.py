@@ -0,0 +1,63 @@
+from collections.abc import Iterator, Set
+from typing import Any
+
+from ...models.constants import JsonKeys
+
+
+class SnapshotDecoder:
+    """
+    Decodes a parsed snapshot into (device_id, channel, value) tuples for configured devices only.
+    Sections that are not device state, and device ids that are not configured, are skipped
+    without copying their state into an intermediate structure.
+    Attributes:
+        SECTIONS (tuple[str]): Snapshot sections that hold device state.
+        AC_LINES_KEY (str): Key of the per line state within an AC device.
+    Methods:
+        decode: Yield (device_id, channel, value) tuples for configured devices.
+    """
+
+    SECTIONS = (
+        JsonKeys.CIRCUITS,
+        JsonKeys.TANKS,
+        JsonKeys.ENGINES,
+        JsonKeys.AC,
+        JsonKeys.DC,
+        JsonKeys.HVACS,
+        JsonKeys.INVERTER_CHARGERS,
+        JsonKeys.GNSS,
+        JsonKeys.BINARY_LOGIC_STATE,
+    )
+    AC_LINES_KEY = "AClines"
+
+    @staticmethod
+    def decode(
+        snapshot_dict: dict[str, dict[str, Any]], configured_ids: Set[str]
+    ) -> Iterator[tuple[str, str, Any]]:
+        """
+        Yield (device_id, channel, value) tuples for the configured devices in the snapshot.
+        AC devices contain multiple AC lines, whose channels are yielded as {channel_id}.{line_id}
+        so each line's data stays within the same device.
+        Args:
+            snapshot_dict: The parsed snapshot.
+            configured_ids: The ids of the devices to decode, all other ids are skipped.
+        Returns:
+            An iterator of (device_id, channel, value) tuples.
+        """
+        for section in SnapshotDecoder.SECTIONS:
+            section_dict = snapshot_dict.get(section)
+            if not section_dict:
+                continue
+            for device_id in section_dict.keys() & configured_ids:
+                state = section_dict[device_id]
+                if not state:
+                    continue
+                if section == JsonKeys.AC:
+                    lines = state.get(SnapshotDecoder.AC_LINES_KEY)
+                    if lines is None:
+                        continue
+                    for line_id, line_state in lines.items():
+                        for channel_id, value in line_state.items():
+                            yield device_id, f"{channel_id}.{int(line_id)}", value
+                else:
+                    for channel_id, value in state.items():
+                        yield device_id, channel_id, value
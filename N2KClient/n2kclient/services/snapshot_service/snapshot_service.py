@@ -2,17 +2,21 @@ from collections.abc import Callable
 import json
 import logging
 import threading
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
 
-from ...models.common_enums import N2kDeviceType
-
-from ...models.devices import N2kDevices
+from ...models.devices import ChangeSet, N2kDevices
 
 from ...models.n2k_configuration.engine_configuration import EngineConfiguration
 
-from ..dbus_proxy_service.dbus_proxy import DbusProxyService
+from .snapshot_decoder import SnapshotDecoder
 from ...models.constants import Constants, JsonKeys
 from ...util.settings_util import SettingsUtil
+from ...util.tracing import pipeline_tracer
+
+if TYPE_CHECKING:
+    # Only needed for annotations, so the snapshot pipeline can be driven without the dbus bindings
+    from ..dbus_proxy_service.dbus_proxy import DbusProxyService
 
 
 class SnapshotService:
@@ -29,12 +33,14 @@ class SnapshotService:
 
     def __init__(
         self,
-        dbus_proxy: DbusProxyService,
+        dbus_proxy: "DbusProxyService",
         lock: threading.Lock,
         get_latest_devices: Callable[[], N2kDevices],
         set_devices: Callable[[N2kDevices], None],
         get_latest_engine_config: Callable[[], EngineConfiguration],
         process_engine_alarms_from_snapshot: Callable[[dict[str, Any]], None],
+        set_device_changes: Callable[[ChangeSet], None] = None,
+        set_mobile_changes: Callable[[dict[str, Any]], None] = None,
     ):
         """
         Initialize the SnapshotService.
@@ -46,6 +52,8 @@ class SnapshotService:
         self._get_latest_engine_config = get_latest_engine_config
         self._set_devices = set_devices
         self._process_engine_alarms_from_snapshot = process_engine_alarms_from_snapshot
+        self._set_device_changes = set_device_changes
+        self._set_mobile_changes = set_mobile_changes
 
         self._set_periodic_snapshot_timer()
 
@@ -54,119 +62,76 @@ class SnapshotService:
         Handle a received snapshot JSON string.
         Parse the JSON and update device states accordingly. Also processes engine alarms from the snapshot.
         Also restarts the periodic snapshot timer.
+        While tracing, snapshots stamped with the wall clock time they were sent at, e.g. by the load
+        generating simulator, also record the transport and end to end latency.
         Args:
             snapshot_json: JSON string representing the snapshot.
         """
+        received_ns = time.time_ns() if pipeline_tracer.enabled else None
+        pipeline_tracer.begin()
         try:
             self._logger.info("Received snapshot")
             self._start_snapshot_timer()
-            snapshot_dict: dict[str, dict[str, Any]] = json.loads(snapshot_json)
+            with pipeline_tracer.stage("decode"):
+                snapshot_dict: dict[str, dict[str, Any]] = json.loads(snapshot_json)
+            sent_ns = (
+                snapshot_dict.get(JsonKeys.SENT_TIME)
+                if received_ns is not None
+                else None
+            )
+            if sent_ns is not None:
+                pipeline_tracer.record("transport", received_ns - sent_ns)
 
             latest_engine_config = self._get_latest_engine_config()
             if latest_engine_config:
-                self._process_engine_alarms_from_snapshot(snapshot_dict)
+                with pipeline_tracer.stage("engine_alarms"):
+                    self._process_engine_alarms_from_snapshot(snapshot_dict)
 
-            state_update = self._process_state_from_snapshot(snapshot_dict)
-            self._merge_state_update(state_update)
+            self._merge_snapshot(snapshot_dict)
+            if sent_ns is not None:
+                pipeline_tracer.record("end_to_end", time.time_ns() - sent_ns)
         except Exception as e:
             self._logger.error(f"Failed to handle snapshot: {e}")
             return
+        finally:
+            pipeline_tracer.end()
 
-    def _process_state_from_snapshot(self, snapshot_dict: dict[str, dict[str, Any]]):
+    def _merge_snapshot(self, snapshot_dict: dict[str, dict[str, Any]]):
         """
-        Process state information from the snapshot dictionary.
-        Extracts state updates for various device types from the snapshot dictionary.
+        Merge the state in a snapshot into the current device list. Engine and non-engine devices are updated in separate lists.
+        Only state for configured devices is decoded, everything else in the snapshot is skipped.
+        Only channels whose value differs from the stored value notify observers. The changed channels are
+        collected in a ChangeSet, which is published alongside the device list.
+        Mobile channel values that changed as a result are published as a single batch per snapshot.
         Args:
             snapshot_dict: The snapshot dictionary containing state information.
-
-        Returns:
-            A dictionary mapping device IDs to their state updates.
-        """
-        state_update = {}
-        # Circuits
-        if JsonKeys.CIRCUITS in snapshot_dict:
-            for circuit_id, circuit_state in snapshot_dict[JsonKeys.CIRCUITS].items():
-                state_update[circuit_id] = circuit_state
-
-        # Tanks
-        if JsonKeys.TANKS in snapshot_dict:
-            for tank_id, tank_state in snapshot_dict[JsonKeys.TANKS].items():
-                state_update[tank_id] = tank_state
-
-        # Engines
-        if JsonKeys.ENGINES in snapshot_dict:
-            for engine_id, engine_state in snapshot_dict[JsonKeys.ENGINES].items():
-                state_update[engine_id] = engine_state
-        # AC
-        if JsonKeys.AC in snapshot_dict:
-            for ac_id, ac_state in snapshot_dict[JsonKeys.AC].items():
-                state_update[ac_id] = ac_state
-
-        # DC
-        if JsonKeys.DC in snapshot_dict:
-            for dc_id, dc_state in snapshot_dict[JsonKeys.DC].items():
-                state_update[dc_id] = dc_state
-
-        # Hvacs
-        if JsonKeys.HVACS in snapshot_dict:
-            for hvac_id, hvac_state in snapshot_dict[JsonKeys.HVACS].items():
-                state_update[hvac_id] = hvac_state
-
-        # InverterChargers
-        if JsonKeys.INVERTER_CHARGERS in snapshot_dict:
-            for inverter_charger_id, inverter_state in snapshot_dict[
-                JsonKeys.INVERTER_CHARGERS
-            ].items():
-                state_update[inverter_charger_id] = inverter_state
-
-        # GNSS
-        if JsonKeys.GNSS in snapshot_dict:
-            for gnss_id, gnss_state in snapshot_dict[JsonKeys.GNSS].items():
-                state_update[gnss_id] = gnss_state
-
-        # Binary Logic State
-        if JsonKeys.BINARY_LOGIC_STATE in snapshot_dict:
-            for bls_id, logic_state in snapshot_dict[
-                JsonKeys.BINARY_LOGIC_STATE
-            ].items():
-                state_update[bls_id] = logic_state
-        return state_update
-
-    def _merge_state_update(self, state_updates: dict[str, dict[str, Any]]):
-        """
-        Merge state updates into the current device list. State updates for engine devices and non-engine devices update separate lists.
-        ACLines within AC devices are handled specially to keep line data together.
-        Args:
-            state_updates: A dictionary mapping device IDs to their state updates.
         """
+        change_set = ChangeSet()
         with self.lock:
             device_list_copy = self._get_latest_devices()
-            for id, state_update in state_updates.items():
-                if id in device_list_copy.devices:
-                    # Devices of type AC contain multiple AC Lines,
-                    # We want to keep ACLine data together within same device, but each lines data accessable by knowing the line ID
-                    # For this reason, we are creating channels within the AC device named as {channel_id}.{line_id}
-                    if device_list_copy.devices[id].type == N2kDeviceType.AC:
-                        lines: dict[int, dict[str, any]] = state_update.get(
-                            "AClines", {}
-                        )
-                        if lines is not None:
-                            for line_id, line_value in lines.items():
-                                for channel_id, value in line_value.items():
-                                    device_list_copy.devices[id].update_channel(
-                                        f"{channel_id}.{int(line_id)}", value
-                                    )
-                    else:
-                        for channel_id, value in state_update.items():
-                            device_list_copy.devices[id].update_channel(
-                                channel_id, value
-                            )
-                elif id in device_list_copy.engine_devices:
-                    for channel_id, value in state_update.items():
-                        device_list_copy.engine_devices[id].update_channel(
-                            channel_id, value
-                        )
-            self._set_devices(device_list_copy)
+            devices = device_list_copy.devices
+            engine_devices = device_list_copy.engine_devices
+            configured_ids = devices.keys() | engine_devices.keys()
+            # Includes the Rx chains of the things subscribed to the updated channels
+            with pipeline_tracer.stage("merge"):
+                for id, channel_key, value in SnapshotDecoder.decode(
+                    snapshot_dict, configured_ids
+                ):
+                    device = devices.get(id)
+                    if device is None:
+                        device = engine_devices[id]
+                    if device.update_channel(channel_key, value):
+                        change_set.add(id, channel_key)
+            # Includes the subscribers of the devices, e.g. publishing to the cloud
+            with pipeline_tracer.stage("publish"):
+                self._set_devices(device_list_copy)
+                if self._set_device_changes is not None:
+                    self._set_device_changes(change_set)
+                if self._set_mobile_changes is not None:
+                    mobile_changes = device_list_copy.pop_mobile_changes()
+                    if len(mobile_changes) > 0:
+                        self._set_mobile_changes(mobile_changes)
+        self._logger.debug(f"Merged snapshot with {len(change_set)} changed channels")
 
     def _set_periodic_snapshot_timer(self):
         """
@@ -1,6 +1,7 @@
 import logging
 from typing import Any
 from ..models.n2k_configuration.n2k_configuation import N2kConfiguration
+from ..models.n2k_configuration.config_index import N2kConfigurationIndex
 from ..models.n2k_configuration.ui_relationship_msg import ItemType
 from ..models.n2k_configuration.inverter_charger import InverterChargerDevice
 from ..models.n2k_configuration.category_item import CategoryItem
@@ -65,34 +66,21 @@ def get_associated_circuit(
     association_relationship = next(
         (
             rel
-            for rel in config.ui_relationships
-            if rel.primary_type == item_type
-            and rel.secondary_type == ItemType.Circuit
-            and rel.primary_id == primary_id
-            and rel.secondary_id is not None
+            for rel in N2kConfigurationIndex.of(config).relationships_by_primary.get(
+                (item_type, primary_id), []
+            )
+            if rel.secondary_type == ItemType.Circuit and rel.secondary_id is not None
         ),
         None,
     )
 
     if association_relationship is not None:
-        hidden_circuit = next(
-            (
-                circuit
-                for id, circuit in config.hidden_circuit.items()
-                if id == association_relationship.secondary_id
-            ),
-            None,
+        # Hidden circuits are keyed by id value, circuits by control id
+        hidden_circuit = config.hidden_circuit.get(
+            association_relationship.secondary_id
         )
         if hidden_circuit is not None:
-            associated_circuit = next(
-                (
-                    circuit
-                    for id, circuit in config.circuit.items()
-                    if id == hidden_circuit.control_id
-                ),
-                None,
-            )
-            return associated_circuit
+            return config.circuit.get(hidden_circuit.control_id)
     return None
 
 
@@ -182,6 +170,20 @@ def send_and_validate_response(dbus_command, request: dict, logger=None) -> bool
         True if the response indicates success, False otherwise
     """
     response = dbus_command(json.dumps(request))
+    return validate_response(response, logger)
+
+
+def validate_response(response: Any, logger=None) -> bool:
+    """
+    Check if a response indicates success (result == "OK").
+
+    Args:
+        response: JSON string returned by a DBus command
+        logger: Optional logger for error reporting
+
+    Returns:
+        True if the response indicates success, False otherwise
+    """
     try:
         response_json: dict = json.loads(response)
         result = response_json.get(JsonKeys.Result)
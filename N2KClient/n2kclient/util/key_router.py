@@ -0,0 +1,91 @@
+import re
+from enum import Enum
+from typing import Any, Optional
+
+
+class KeyCategory(str, Enum):
+    TELEMETRY = "telemetry"
+    STATE = "state"
+    STATE_DEPENDENT = "state_dependent"
+    LOCATION = "location"
+
+
+class KeyRouter:
+    """
+    Classifies mobile channel keys into telemetry, state, state-dependent telemetry or location.
+    Patterns are compiled once, and the category of each key is cached the first time it is seen,
+    so classification is a dictionary lookup per key. The cache must be invalidated when the
+    EmpowerSystem configuration changes, since the set of mobile keys changes with it.
+    Attributes:
+        _telemetry_patterns (list[re.Pattern]): Patterns of keys sent as telemetry.
+        _location_pattern (re.Pattern): Pattern of location keys.
+        _state_dependent_patterns (list[re.Pattern]): Patterns of telemetry keys that also carry state.
+        _categories (dict[str, KeyCategory]): Cache of key to category.
+    Methods:
+        classify: Return the category of a mobile key.
+        route: Split a dictionary of mobile values by category.
+        invalidate: Clear the cached classifications.
+    """
+
+    _telemetry_patterns: list[re.Pattern]
+    _location_pattern: Optional[re.Pattern]
+    _state_dependent_patterns: list[re.Pattern]
+    _categories: dict[str, KeyCategory]
+
+    def __init__(
+        self,
+        telemetry_patterns: list[str],
+        location_pattern: Optional[str] = None,
+        state_dependent_patterns: Optional[list[str]] = None,
+    ):
+        self._telemetry_patterns = [re.compile(p) for p in telemetry_patterns]
+        self._location_pattern = (
+            re.compile(location_pattern) if location_pattern is not None else None
+        )
+        self._state_dependent_patterns = [
+            re.compile(p) for p in (state_dependent_patterns or [])
+        ]
+        self._categories = {}
+
+    def classify(self, key: str) -> KeyCategory:
+        """
+        Return the category of a mobile key, evaluating the patterns only on the first lookup.
+        Args:
+            key: The mobile channel key.
+        Returns:
+            KeyCategory: The category of the key.
+        """
+        category = self._categories.get(key)
+        if category is None:
+            category = self._match(key)
+            self._categories[key] = category
+        return category
+
+    def route(self, mobile_dict: dict[str, Any]) -> dict[KeyCategory, dict[str, Any]]:
+        """
+        Split a dictionary of mobile values by category.
+        Args:
+            mobile_dict: Dictionary of mobile channel keys to values.
+        Returns:
+            dict[KeyCategory, dict[str, Any]]: The values grouped by category. Every category is present.
+        """
+        routed = {category: {} for category in KeyCategory}
+        for key, value in mobile_dict.items():
+            routed[self.classify(key)][key] = value
+        return routed
+
+    def invalidate(self, *_):
+        """
+        Clear the cached classifications. Accepts and ignores any arguments so it can be
+        subscribed directly to a configuration observable.
+        """
+        self._categories = {}
+
+    def _match(self, key: str) -> KeyCategory:
+        if any(pattern.match(key) for pattern in self._telemetry_patterns):
+            return KeyCategory.TELEMETRY
+        if self._location_pattern is not None and self._location_pattern.match(key):
+            return KeyCategory.LOCATION
+        if any(pattern.match(key) for pattern in self._state_dependent_patterns):
+            return KeyCategory.STATE_DEPENDENT
+        return KeyCategory.STATE
@@ -0,0 +1,273 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from ..models.constants import Constants
+from .settings_util import SettingsUtil
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations in power of two microsecond buckets, so recording is constant time and memory.
+    Percentiles are estimated as the upper bound of the bucket they fall in, capped by the maximum.
+    Attributes:
+        counts: Number of durations in each bucket, bucket i holds durations below 2**i microseconds.
+        count: Number of durations recorded.
+        total_ns: Sum of the durations recorded, in nanoseconds.
+        max_ns: Longest duration recorded, in nanoseconds.
+    Methods:
+        add: Record a duration.
+        percentile: Estimate a percentile of the recorded durations.
+        to_dict: Summarize the histogram in milliseconds.
+    """
+
+    BUCKET_COUNT = 32
+
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, duration_ns: int):
+        """
+        Record a duration in nanoseconds.
+        """
+        bucket = min((duration_ns // 1000).bit_length(), self.BUCKET_COUNT - 1)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimate a percentile of the recorded durations.
+
+        Args:
+            fraction: The percentile as a fraction, e.g. 0.99.
+        Returns:
+            float: The estimated duration in milliseconds, 0 if nothing was recorded.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = fraction * self.count
+        cumulative = 0
+        for bucket, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(2**bucket * 1000, self.max_ns) / 1e6
+        return self.max_ns / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarize the histogram with its count, and mean, p50, p99 and max in milliseconds.
+        """
+        return {
+            "count": self.count,
+            "mean_ms": (self.total_ns / self.count / 1e6) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+class _Stage:
+    """
+    Context manager timing one stage of the current trace.
+    """
+
+    __slots__ = ("_tracer", "_name", "_start")
+
+    def __init__(self, tracer: "PipelineTracer", name: str):
+        self._tracer = tracer
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._tracer.record(self._name, time.monotonic_ns() - self._start)
+        return False
+
+
+class _NullStage:
+    """
+    Context manager used for stages while tracing is disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class PipelineTracer:
+    """
+    Latency tracing of the snapshot to cloud pipeline.
+    A trace is started when a snapshot is received and gets a sequence number. The stages it goes through
+    on the same thread record their duration, with monotonic timestamps, into one histogram per stage.
+    Stages recorded outside of a trace only update their histogram.
+    While disabled, begin returns None and stage returns a shared no-op context manager.
+    Attributes:
+        enabled: Whether durations are recorded, read from settings.
+        dump_interval: Seconds between two summary log lines, 0 to only log on demand, read from settings.
+        _histograms: Histogram of each stage.
+        _sequence: Sequence number generator of the traces.
+        _local: Thread local trace in progress, its sequence number, start and stage durations.
+        _last_dump: Monotonic time of the last summary log line.
+    Methods:
+        begin: Start a trace on the current thread.
+        stage: Time a stage of the pipeline.
+        record: Record the duration of a stage.
+        end: End the trace of the current thread.
+        get_stats: Summarize the histogram of each stage.
+        dump: Log the summary of each stage.
+        reset: Clear the histograms.
+    """
+
+    _logger = logging.getLogger(f"{Constants.DBUS_N2K_CLIENT}.Tracing")
+    _default_enabled = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.TRACING_KEY,
+        Constants.TRACING_ENABLED_KEY,
+        default_value=False,
+    )
+    _default_dump_interval = SettingsUtil.get_setting(
+        Constants.N2K_SETTINGS_KEY,
+        Constants.TRACING_KEY,
+        Constants.TRACING_DUMP_INTERVAL_KEY,
+        default_value=60,
+    )
+
+    TOTAL_STAGE = "total"
+
+    enabled: bool
+    dump_interval: float
+    _histograms: dict[str, LatencyHistogram]
+
+    def __init__(
+        self, enabled: Optional[bool] = None, dump_interval: Optional[float] = None
+    ):
+        self.enabled = enabled if enabled is not None else self._default_enabled
+        self.dump_interval = (
+            dump_interval if dump_interval is not None else self._default_dump_interval
+        )
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._local = threading.local()
+        self._last_dump = time.monotonic()
+
+    def begin(self) -> Optional[int]:
+        """
+        Start a trace on the current thread.
+
+        Returns:
+            Optional[int]: The sequence number of the trace, None if tracing is disabled.
+        """
+        if not self.enabled:
+            return None
+        sequence = next(self._sequence)
+        self._local.trace = (sequence, time.monotonic_ns(), [])
+        return sequence
+
+    def stage(self, name: str):
+        """
+        Time a stage of the pipeline, to be used as a context manager.
+
+        Args:
+            name: The name of the stage.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name: str, duration_ns: int):
+        """
+        Record the duration of a stage, and attach it to the trace of the current thread if any.
+
+        Args:
+            name: The name of the stage.
+            duration_ns: The duration of the stage in nanoseconds.
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.add(duration_ns)
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            trace[2].append((name, duration_ns))
+
+    def end(self):
+        """
+        End the trace of the current thread, recording its total duration.
+        Logs the summary of each stage if dump_interval elapsed since the last one.
+        """
+        trace = getattr(self._local, "trace", None)
+        if trace is None:
+            return
+        self._local.trace = None
+        sequence, start, stages = trace
+        self.record(self.TOTAL_STAGE, time.monotonic_ns() - start)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(
+                "Trace %d: %s",
+                sequence,
+                " ".join(f"{name}={duration / 1e6:.3f}ms" for name, duration in stages),
+            )
+        if self.dump_interval > 0 and (
+            time.monotonic() - self._last_dump >= self.dump_interval
+        ):
+            self.dump()
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Summarize the histogram of each stage.
+
+        Returns:
+            dict[str, dict[str, Any]]: Count, mean, p50, p99 and max milliseconds keyed by stage name.
+        """
+        with self._lock:
+            return {
+                name: histogram.to_dict() for name, histogram in self._histograms.items()
+            }
+
+    def dump(self) -> str:
+        """
+        Log the summary of each stage on one line.
+
+        Returns:
+            str: The logged line.
+        """
+        self._last_dump = time.monotonic()
+        line = "Pipeline latency: " + "; ".join(
+            f"{name} n={stats['count']} p50={stats['p50_ms']:.3f}ms"
+            f" p99={stats['p99_ms']:.3f}ms max={stats['max_ms']:.3f}ms"
+            for name, stats in self.get_stats().items()
+        )
+        self._logger.info(line)
+        return line
+
+    def reset(self):
+        """
+        Clear the histograms of every stage.
+        """
+        with self._lock:
+            self._histograms = {}
+
+
+# Tracer shared by the N2KClient services and the cloud publishing services
+pipeline_tracer = PipelineTracer()
@@ -0,0 +1,162 @@
+"""
+Replay a DBus traffic capture into an N2KClient, to reproduce and profile a recorded workload offline.
+
+Run from the N2KClient directory:
+    python replay.py <capture.jsonl.gz> [--speed 1] [--trace]
+
+The client is not connected to DBus. Its DBus methods return the responses recorded in the capture up
+to the point being replayed, and the recorded Snapshot and Event signals are queued to its signal
+dispatcher with their original spacing divided by --speed. With --speed 0 each signal is queued as soon
+as the previous one was picked up, so the client processes the whole capture as fast as it can.
+Captures are written by the DbusProxyService when CAPTURE is enabled in the settings.
+"""
+
+import argparse
+import json
+import logging
+import time
+from typing import Any
+
+from n2kclient.client import N2KClient
+from n2kclient.models.constants import Constants
+from n2kclient.services.dbus_proxy_service.dbus_proxy import DbusProxyService
+from n2kclient.services.dbus_proxy_service.traffic_capture import TrafficCapture
+from n2kclient.util.logging import configure_logging
+from n2kclient.util.tracing import pipeline_tracer
+
+# Response of the methods that change the host state, which are not captured
+OK_RESPONSE = '{"Result": "Ok"}'
+
+
+class ReplayMethod:
+    """
+    Stand-in for a DBus method, returning the latest response recorded for it.
+    Called like the dbus-python method, synchronously or with reply and error handlers.
+    """
+
+    def __init__(self, responses: dict[str, str], method_name: str):
+        self._responses = responses
+        self._method_name = method_name
+
+    def __call__(self, *args, reply_handler=None, error_handler=None, timeout=None):
+        name = ".".join([self._method_name, *(str(arg) for arg in args)])
+        response = self._responses.get(name, OK_RESPONSE)
+        if reply_handler is not None:
+            reply_handler(response)
+            return None
+        return response
+
+
+class Main:
+    logger = logging.getLogger("DBUS N2k Client: Replay")
+
+    def __init__(self):
+        configure_logging()
+
+    def run(self, args: argparse.Namespace):
+        records = list(TrafficCapture.read(args.capture))
+        self.logger.info(f"Replaying {len(records)} records of {args.capture}")
+        # Never capture the replay, it could overwrite the capture being replayed
+        DbusProxyService._capture_enabled = False
+        pipeline_tracer.enabled = args.trace
+        pipeline_tracer.dump_interval = 0
+
+        responses = {}
+        client = N2KClient(record_alarm_history=False)
+        # pylint: disable=protected-access
+        dbus_proxy = client._dbus_proxy
+        for attr, method in DbusProxyService.DBUS_METHOD_MAP:
+            setattr(dbus_proxy, attr, ReplayMethod(responses, method))
+
+        signals = self._load_initial_responses(records, responses)
+        client._config_service.scan_factory_metadata()
+        client._config_service.get_configuration()
+        client._config_service.scan_marine_engine_config(should_reset=False)
+
+        start = time.monotonic()
+        first_t = signals[0]["t"] if signals else 0
+        counts = {Constants.SNAPSHOT_SIGNAL_NAME: 0, Constants.EVENT_SIGNAL_NAME: 0}
+        for record in signals:
+            if args.speed > 0:
+                delay = start + (record["t"] - first_t) / args.speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                while client.get_signal_queue_metrics()["queue_depth"] > 0:
+                    time.sleep(0.001)
+            signal = record["signal"]
+            if signal == Constants.SNAPSHOT_SIGNAL_NAME:
+                dbus_proxy._signal_dispatcher.enqueue_snapshot(record["payload"])
+            elif signal == Constants.EVENT_SIGNAL_NAME:
+                dbus_proxy._signal_dispatcher.enqueue_event(record["payload"])
+            else:
+                responses[signal] = record["payload"]
+                continue
+            counts[signal] += 1
+
+        # Every signal queued is either processed or dropped once the queue drained
+        queued = sum(counts.values())
+        while True:
+            metrics = client.get_signal_queue_metrics()
+            handled = (
+                metrics["processed_signals"]
+                + metrics["dropped_snapshots"]
+                + metrics["dropped_events"]
+            )
+            if handled >= queued:
+                break
+            time.sleep(0.01)
+        elapsed = time.monotonic() - start
+        self._report(counts, elapsed, metrics)
+
+    @staticmethod
+    def _load_initial_responses(
+        records: list[dict[str, Any]], responses: dict[str, str]
+    ) -> list[dict[str, Any]]:
+        """
+        Load the responses recorded before the first signal, which the client starts from.
+
+        Returns:
+            list[dict[str, Any]]: The records from the first signal on.
+        """
+        for index, record in enumerate(records):
+            if record["signal"] in (
+                Constants.SNAPSHOT_SIGNAL_NAME,
+                Constants.EVENT_SIGNAL_NAME,
+            ):
+                return records[index:]
+            responses[record["signal"]] = record["payload"]
+        return []
+
+    def _report(self, counts: dict[str, int], elapsed: float, metrics: dict[str, int]):
+        summary = {
+            "snapshots": counts[Constants.SNAPSHOT_SIGNAL_NAME],
+            "events": counts[Constants.EVENT_SIGNAL_NAME],
+            "elapsed_s": round(elapsed, 3),
+            "snapshots_per_s": round(
+                counts[Constants.SNAPSHOT_SIGNAL_NAME] / elapsed if elapsed else 0.0, 1
+            ),
+            **metrics,
+        }
+        print(json.dumps(summary, indent=2))
+        if pipeline_tracer.enabled:
+            print(json.dumps(pipeline_tracer.get_stats(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("capture", help="capture file to replay")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="replay speed relative to the capture, 0 for as fast as the client keeps up",
+    )
+    parser.add_argument(
+        "--trace", action="store_true", help="report the pipeline stage latencies"
+    )
+    Main().run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
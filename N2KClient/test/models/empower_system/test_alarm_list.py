@@ -0,0 +1,72 @@
+import pickle
+import unittest
+
+from N2KClient.n2kclient.models.empower_system.alarm import (
+    Alarm,
+    AlarmSeverity,
+    AlarmState,
+)
+from N2KClient.n2kclient.models.empower_system.alarm_list import AlarmList
+
+
+class AlarmListTest(unittest.TestCase):
+    """Unit tests for AlarmList"""
+
+    def _alarm(self, **kwargs):
+        return Alarm(
+            unique_id=1,
+            title="Title",
+            name="Name",
+            description="Description",
+            state=AlarmState.ENABLED,
+            severity=AlarmSeverity.CRITICAL,
+            date_active=100,
+            things=["dcMeter.1"],
+            **kwargs,
+        )
+
+    def test_alarm_immutable(self):
+        alarm = self._alarm()
+        with self.assertRaises(AttributeError):
+            alarm.current_state = AlarmState.ACKNOWLEDGED
+
+    def test_alarm_replace(self):
+        alarm = self._alarm()
+        acknowledged = alarm.replace(current_state=AlarmState.ACKNOWLEDGED)
+        self.assertEqual(alarm.current_state, AlarmState.ENABLED)
+        self.assertEqual(acknowledged.current_state, AlarmState.ACKNOWLEDGED)
+        self.assertIs(acknowledged.things, alarm.things)
+        self.assertNotEqual(alarm.fingerprint, acknowledged.fingerprint)
+        self.assertEqual(
+            acknowledged.to_dict(),
+            {**alarm.to_dict(), "currentState": AlarmState.ACKNOWLEDGED.value},
+        )
+
+    def test_alarm_pickle(self):
+        alarm = self._alarm()
+        alarm_list = AlarmList()
+        alarm_list.alarm[1] = alarm
+        restored = pickle.loads(pickle.dumps(alarm_list))
+        self.assertEqual(restored, alarm_list)
+        self.assertEqual(restored.alarm[1].to_dict(), alarm.to_dict())
+        with self.assertRaises(AttributeError):
+            restored.alarm[1].current_state = AlarmState.ACKNOWLEDGED
+
+    def test_alarm_fingerprint(self):
+        self.assertEqual(self._alarm().fingerprint, self._alarm().fingerprint)
+        self.assertEqual(self._alarm(), self._alarm())
+        self.assertNotEqual(self._alarm(), self._alarm().replace(date_active=200))
+
+    def test_eq(self):
+        alarm = self._alarm()
+        alarm_list1 = AlarmList()
+        alarm_list2 = AlarmList()
+        alarm_list1.alarm[1] = alarm
+        self.assertNotEqual(alarm_list1, alarm_list2)
+        alarm_list2.alarm[1] = alarm
+        self.assertEqual(alarm_list1, alarm_list2)
+        alarm_list2.alarm[1] = self._alarm()
+        self.assertEqual(alarm_list1, alarm_list2)
+        alarm_list2.alarm[1] = alarm.replace(things=["dcMeter.2"])
+        self.assertNotEqual(alarm_list1, alarm_list2)
+        self.assertNotEqual(alarm_list1, "not an AlarmList")
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import MagicMock
+
+from N2KClient.n2kclient.models.n2k_configuration.ac import AC
+from N2KClient.n2kclient.models.n2k_configuration.ac_meter import ACMeter
+from N2KClient.n2kclient.models.n2k_configuration.circuit import Circuit
+from N2KClient.n2kclient.models.n2k_configuration.config_index import (
+    N2kConfigurationIndex,
+)
+from N2KClient.n2kclient.models.n2k_configuration.dc import DC
+from N2KClient.n2kclient.models.n2k_configuration.n2k_configuation import (
+    N2kConfiguration,
+)
+from N2KClient.n2kclient.models.n2k_configuration.ui_relationship_msg import (
+    ItemType,
+    UiRelationShipMsg,
+)
+
+
+class TestN2kConfigurationIndex(unittest.TestCase):
+    def _config(self):
+        config = N2kConfiguration()
+        config.ui_relationships = [
+            UiRelationShipMsg(
+                primary_type=ItemType.DcMeter,
+                primary_id=1,
+                secondary_type=ItemType.Circuit,
+                secondary_id=2,
+                primary_config_address=10,
+                secondary_config_address=20,
+            ),
+            UiRelationShipMsg(
+                primary_type=ItemType.DcMeter,
+                primary_id=1,
+                secondary_type=ItemType.Category,
+                secondary_id=8,
+            ),
+        ]
+        config.circuit[5] = Circuit(control_id=5)
+        config.hidden_circuit[2] = Circuit(control_id=5)
+        config.dc[0] = DC(id=1)
+        config.ac[0] = ACMeter(line={1: AC(id=3), 2: AC(id=4)})
+        return config
+
+    def test_index(self):
+        config = self._config()
+        index = N2kConfigurationIndex(config)
+        self.assertEqual(
+            index.relationships_by_primary[(ItemType.DcMeter, 1)],
+            config.ui_relationships,
+        )
+        self.assertEqual(
+            index.relationships_by_secondary[(ItemType.Circuit, 2)],
+            config.ui_relationships[:1],
+        )
+        self.assertEqual(
+            index.relationships_by_primary_address[(ItemType.DcMeter, 10)],
+            config.ui_relationships[:1],
+        )
+        self.assertEqual(
+            index.relationships_by_secondary_address[(ItemType.Circuit, 20)],
+            config.ui_relationships[:1],
+        )
+        self.assertIs(index.circuit_by_control_id[5], config.circuit[5])
+        self.assertIs(index.hidden_circuit_by_control_id[5], config.hidden_circuit[2])
+        self.assertIs(index.dc_by_id[1], config.dc[0])
+        self.assertEqual(index.ac_line_by_id[4], (config.ac[0], 2))
+
+    def test_of_uses_built_index(self):
+        config = self._config()
+        index = config.build_indexes()
+        self.assertIs(N2kConfigurationIndex.of(config), index)
+
+    def test_of_builds_and_keeps_index(self):
+        config = self._config()
+        index = N2kConfigurationIndex.of(config)
+        self.assertIs(config.index, index)
+        self.assertIs(N2kConfigurationIndex.of(config), index)
+
+    def test_of_without_index_attribute(self):
+        config = MagicMock(
+            ui_relationships=[], circuit={}, hidden_circuit={}, dc={}, tank={}
+        )
+        config.ac = {0: ACMeter(line={1: AC(id=3)})}
+        index = N2kConfigurationIndex.of(config)
+        self.assertEqual(index.ac_line_by_id[3], (config.ac[0], 1))
+        self.assertIsNot(config.index, index)
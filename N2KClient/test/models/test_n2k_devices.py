@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, call, patch, ANY
 
-from N2KClient.n2kclient.models.devices import N2kDevice, N2kDevices
+from N2KClient.n2kclient.models.devices import ChangeSet, N2kDevice, N2kDevices
 from N2KClient.n2kclient.models.common_enums import (
     ChannelType,
     N2kDeviceType,
@@ -34,6 +34,19 @@ class TestN2KDevices(unittest.TestCase):
         self.assertEqual(dev.channels["test_channel"], "new_value")
         mock_subject.on_next.assert_called_once_with("new_value")
 
+    def test_update_channel_returns_changed(self):
+        dev = N2kDevice(type=N2kDeviceType.AC)
+        self.assertTrue(dev.update_channel("test_channel", "value"))
+        self.assertTrue(dev.update_channel("test_channel", "new_value"))
+
+    def test_update_channel_unchanged_value(self):
+        dev = N2kDevice(type=N2kDeviceType.AC)
+        dev.channels["test_channel"] = "value"
+        mock_subject = MagicMock()
+        dev._channel_subjects["test_channel"] = mock_subject
+        self.assertFalse(dev.update_channel("test_channel", "value"))
+        mock_subject.on_next.assert_not_called()
+
     def test_del(self):
         dev = N2kDevice(type=N2kDeviceType.AC)
         dev.channels["test_channel"] = "value"
@@ -133,6 +146,42 @@ class TestN2KDevices(unittest.TestCase):
         self.assertIn("esub1", devices._engine_pipe_subscriptions)
         self.assertEqual(devices._engine_pipe_subscriptions["esub1"], result)
 
+    def test_remove_subscriptions(self):
+        devices = N2kDevices()
+        sub1 = MagicMock()
+        sub2 = MagicMock()
+        devices.set_subscription("chan1", sub1)
+        devices.set_subscription("chan2", sub2)
+        devices._update_mobile_channel("chan1", 1)
+        devices._update_mobile_channel("chan2", 2)
+        devices.remove_subscriptions(["chan1", "missing"])
+        sub1.subscribe.return_value.dispose.assert_called_once()
+        sub2.subscribe.return_value.dispose.assert_not_called()
+        self.assertEqual(list(devices._pipe_subscriptions.keys()), ["chan2"])
+        self.assertEqual(devices.mobile_channels, {"chan2": 2})
+        self.assertEqual(devices.pop_mobile_changes(), {"chan2": 2})
+
+    def test_record_device_keys(self):
+        devices = N2kDevices()
+        devices.get_channel_subject("dev0", "chan")
+        with devices.record_device_keys() as device_keys:
+            devices.get_channel_subject("dev1", "chan")
+            devices.get_channel_subject("eng1", "chan", N2kDeviceType.ENGINE)
+        devices.get_channel_subject("dev2", "chan")
+        self.assertEqual(device_keys, {"dev1"})
+
+    def test_remove_devices(self):
+        devices = N2kDevices()
+        devices.get_channel_subject("dev1", "chan")
+        devices.get_channel_subject("dev2", "chan")
+        devices.get_channel_subject("dev1", "chan", N2kDeviceType.ENGINE)
+        device1 = devices.devices["dev1"]
+        device1.update_channel("chan", 1)
+        devices.remove_devices(["dev1", "missing"])
+        self.assertEqual(list(devices.devices.keys()), ["dev2"])
+        self.assertIn("dev1", devices.engine_devices)
+        self.assertEqual(device1.channels, {})
+
     def test_update_mobile_channel(self):
         devices = N2kDevices()
         subject = MagicMock()
@@ -147,6 +196,29 @@ class TestN2KDevices(unittest.TestCase):
         self.assertIn("echan1", devices.engine_mobile_channels)
         self.assertEqual(devices.engine_mobile_channels["echan1"], subject)
 
+    def test_update_mobile_channel_pending_changes(self):
+        devices = N2kDevices()
+        devices._update_mobile_channel("chan1", 1)
+        devices._update_mobile_channel("echan1", 2, is_engine=True)
+        self.assertEqual(devices.pop_mobile_changes(), {"chan1": 1, "echan1": 2})
+        self.assertEqual(devices.pop_mobile_changes(), {})
+
+    def test_update_mobile_channel_unchanged_not_pending(self):
+        devices = N2kDevices()
+        devices._update_mobile_channel("chan1", 1)
+        devices.pop_mobile_changes()
+        devices._update_mobile_channel("chan1", 1)
+        self.assertEqual(devices.pop_mobile_changes(), {})
+        devices._update_mobile_channel("chan1", 3)
+        self.assertEqual(devices.pop_mobile_changes(), {"chan1": 3})
+
+    def test_dispose_discards_pending_mobile_changes(self):
+        devices = N2kDevices()
+        devices._update_mobile_channel("chan1", 1)
+        devices._update_mobile_channel("echan1", 2, is_engine=True)
+        devices.dispose()
+        self.assertEqual(devices.pop_mobile_changes(), {"echan1": 2})
+
     def test_to_mobile_dict(self):
         devices = N2kDevices()
         subject1 = MagicMock()
@@ -179,3 +251,28 @@ class TestN2KDevices(unittest.TestCase):
     def test_eq_not_n2kdevices(self):
         devices = N2kDevices()
         self.assertNotEqual(devices, "not a N2kDevices instance")
+
+    # ChangeSet
+    def test_change_set_add(self):
+        change_set = ChangeSet()
+        self.assertTrue(change_set.is_empty())
+        change_set.add("dc.1", "voltage")
+        change_set.add("dc.1", "current")
+        change_set.add("dc.1", "voltage")
+        change_set.add("ac.1", "voltage.1")
+        self.assertFalse(change_set.is_empty())
+        self.assertEqual(len(change_set), 3)
+        self.assertEqual(
+            change_set.to_dict(),
+            {"dc.1": ["current", "voltage"], "ac.1": ["voltage.1"]},
+        )
+
+    def test_change_set_eq(self):
+        change_set1 = ChangeSet()
+        change_set2 = ChangeSet()
+        self.assertEqual(change_set1, change_set2)
+        change_set1.add("dc.1", "voltage")
+        self.assertNotEqual(change_set1, change_set2)
+        change_set2.add("dc.1", "voltage")
+        self.assertEqual(change_set1, change_set2)
+        self.assertNotEqual(change_set1, "not a ChangeSet instance")
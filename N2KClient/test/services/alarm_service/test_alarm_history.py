@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+
+from N2KClient.n2kclient.models.empower_system.alarm import (
+    Alarm,
+    AlarmSeverity,
+    AlarmState,
+)
+from N2KClient.n2kclient.services.alarm_service.alarm_history import (
+    CLEARED_STATE,
+    AlarmHistory,
+    AlarmTransition,
+)
+
+
+class AlarmHistoryTest(unittest.TestCase):
+    """
+    Unit tests for the AlarmHistory class.
+    """
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "history", "alarm_history.log")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _alarm(self, unique_id, state=AlarmState.ENABLED, things=("dcMeter.1",)):
+        return Alarm(
+            unique_id=unique_id,
+            title="Title",
+            name="Name",
+            description="Description",
+            state=state,
+            severity=AlarmSeverity.CRITICAL,
+            date_active=100,
+            things=list(things),
+        )
+
+    def test_record_changes(self):
+        """
+        Should record raised, acknowledged and cleared alarms, and skip unchanged ones.
+        """
+        history = AlarmHistory(capacity=10, path="")
+        alarm1 = self._alarm(1)
+        alarm2 = self._alarm(2)
+        history.record_changes({}, {1: alarm1, 2: alarm2}, timestamp=10)
+        history.record_changes(
+            {1: alarm1, 2: alarm2},
+            {1: alarm1.replace(current_state=AlarmState.ACKNOWLEDGED)},
+            timestamp=20,
+        )
+        history.record_changes({1: alarm1}, {1: alarm1}, timestamp=30)
+
+        self.assertEqual(
+            [(t.unique_id, t.state, t.timestamp) for t in history.query()],
+            [
+                (1, "enabled", 10),
+                (2, "enabled", 10),
+                (1, "acknowledged", 20),
+                (2, CLEARED_STATE, 20),
+            ],
+        )
+
+    def test_query(self):
+        """
+        Should filter transitions by time range and thing id.
+        """
+        history = AlarmHistory(capacity=10, path="")
+        history.record(
+            [
+                AlarmTransition(1, "enabled", 10, ("dcMeter.1",)),
+                AlarmTransition(2, "enabled", 20, ("tank.1",)),
+                AlarmTransition(1, CLEARED_STATE, 30, ("dcMeter.1",)),
+            ]
+        )
+        self.assertEqual(
+            [t.unique_id for t in history.query(start=15, end=30)], [2, 1]
+        )
+        self.assertEqual(
+            [t.timestamp for t in history.query(thing_id="dcMeter.1")], [10, 30]
+        )
+        self.assertEqual(history.query(end=5), [])
+
+    def test_capacity(self):
+        """
+        Should only keep the most recent transitions.
+        """
+        history = AlarmHistory(capacity=2, path="")
+        history.record([AlarmTransition(i, "enabled", i) for i in range(5)])
+        self.assertEqual([t.unique_id for t in history.query()], [3, 4])
+
+    def test_persistence(self):
+        """
+        Should load the transitions appended to the history file back.
+        """
+        history = AlarmHistory(capacity=10, path=self.path)
+        history.record([AlarmTransition(1, "enabled", 10, ("dcMeter.1",))])
+        history.record([AlarmTransition(1, CLEARED_STATE, 20, ("dcMeter.1",))])
+
+        loaded = AlarmHistory(capacity=10, path=self.path)
+        self.assertEqual(loaded.query(), history.query())
+
+    def test_compaction(self):
+        """
+        Should rewrite the history file with the kept transitions once it holds twice the capacity.
+        """
+        history = AlarmHistory(capacity=2, path=self.path)
+        for i in range(5):
+            history.record([AlarmTransition(i, "enabled", i)])
+        with open(self.path) as file:
+            self.assertLessEqual(len(file.readlines()), 4)
+        self.assertEqual(
+            [t.unique_id for t in AlarmHistory(capacity=2, path=self.path).query()],
+            [3, 4],
+        )
+
+    def test_load_invalid_record(self):
+        """
+        Should skip a truncated record and rewrite the history file without it.
+        """
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as file:
+            file.write('[10,1,"enabled",[]]\n[20,1,"clea')
+        history = AlarmHistory(capacity=10, path=self.path)
+        self.assertEqual([t.timestamp for t in history.query()], [10])
+        with open(self.path) as file:
+            self.assertEqual(file.read(), '[10,1,"enabled",[]]\n')
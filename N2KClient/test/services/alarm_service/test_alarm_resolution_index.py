@@ -0,0 +1,118 @@
+import unittest
+
+from N2KClient.n2kclient.models.common_enums import ComponentType
+from N2KClient.n2kclient.models.n2k_configuration.alarm_limit import AlarmLimit
+from N2KClient.n2kclient.models.n2k_configuration.binary_logic_state import (
+    BinaryLogicState,
+)
+from N2KClient.n2kclient.models.n2k_configuration.bls_alarm_mapping import (
+    BLSAlarmMapping,
+)
+from N2KClient.n2kclient.models.n2k_configuration.circuit import Circuit, CircuitLoad
+from N2KClient.n2kclient.models.n2k_configuration.dc import DC
+from N2KClient.n2kclient.models.n2k_configuration.engine import EngineDevice
+from N2KClient.n2kclient.models.n2k_configuration.engine_configuration import (
+    EngineConfiguration,
+)
+from N2KClient.n2kclient.models.n2k_configuration.n2k_configuation import (
+    N2kConfiguration,
+)
+from N2KClient.n2kclient.models.n2k_configuration.tank import Tank
+from N2KClient.n2kclient.models.n2k_configuration.ui_relationship_msg import (
+    ItemType,
+    RelationshipType,
+    UiRelationShipMsg,
+)
+from N2KClient.n2kclient.services.alarm_service.alarm_resolution_index import (
+    AlarmResolutionIndex,
+    EngineAlarmResolutionIndex,
+)
+
+
+class AlarmResolutionIndexTest(unittest.TestCase):
+    """Unit tests for the alarm resolution index"""
+
+    def _config(self):
+        config = N2kConfiguration()
+        config.circuit[1] = Circuit(
+            control_id=1,
+            circuit_loads=[
+                CircuitLoad(channel_address=0x0102, level=1),
+                CircuitLoad(channel_address=0x0103, level=0),
+            ],
+        )
+        config.dc[0] = DC(
+            id=10,
+            address=0x0201,
+            low_voltage=AlarmLimit(id=7, enabled=True),
+            high_voltage=AlarmLimit(id=8, enabled=False),
+        )
+        config.dc[1] = DC(
+            id=11, address=0x0202, low_limit=AlarmLimit(id=7, enabled=True)
+        )
+        config.tank[0] = Tank(id=20, address=0x0301)
+        bls = BinaryLogicState(address=40)
+        config.binary_logic_state[0] = bls
+        config.bls_alarm_mappings[0] = BLSAlarmMapping(alarm_channel=5, bls=bls)
+        config.ui_relationships = [
+            UiRelationShipMsg(
+                primary_type=ItemType.DcMeter,
+                primary_id=10,
+                secondary_type=ItemType.BinaryLogicState,
+                secondary_config_address=40,
+                relationship_type=RelationshipType.Normal,
+            )
+        ]
+        return config
+
+    def test_index(self):
+        config = self._config()
+        index = AlarmResolutionIndex(config)
+
+        self.assertEqual(
+            [ref.thing for ref in index.device_circuits[0x01]], [config.circuit[1]]
+        )
+        self.assertEqual(list(index.circuits_by_load_channel.keys()), [0x0102])
+        self.assertEqual(
+            [ref.thing for ref in index.device_dc_meters[0x02]],
+            [config.dc[0], config.dc[1]],
+        )
+        self.assertEqual(
+            [ref.thing for ref in index.dc_meters_by_alarm_id[7]],
+            [config.dc[0], config.dc[1]],
+        )
+        self.assertNotIn(8, index.dc_meters_by_alarm_id)
+        self.assertEqual(
+            [ref.component_type for ref in index.tanks_by_address[0x0301]],
+            [ComponentType.TANK],
+        )
+        self.assertEqual(
+            [(ref.component_type, ref.thing) for ref in index.bls_by_alarm_channel[5]],
+            [
+                (ComponentType.BINARYLOGICSTATE, config.binary_logic_state[0]),
+                (ComponentType.DCMETER, config.dc[0]),
+            ],
+        )
+
+    def test_in_config_order(self):
+        config = self._config()
+        index = AlarmResolutionIndex(config)
+        merged = index.in_config_order(
+            index.dc_meters_by_address[0x0202], index.dc_meters_by_alarm_id[7]
+        )
+        self.assertEqual([ref.thing for ref in merged], [config.dc[0], config.dc[1]])
+
+    def test_of(self):
+        config = self._config()
+        index = AlarmResolutionIndex.of(config)
+        self.assertIs(AlarmResolutionIndex.of(config, index), index)
+        self.assertIsNot(AlarmResolutionIndex.of(self._config(), index), index)
+
+    def test_engine_index(self):
+        engine = EngineDevice(name_utf8="Port")
+        engine_config = EngineConfiguration(
+            devices={0: engine, 1: EngineDevice(name_utf8="Port")}
+        )
+        index = EngineAlarmResolutionIndex.of(engine_config)
+        self.assertIs(index.engine_by_name["Port"], engine)
+        self.assertIs(EngineAlarmResolutionIndex.of(engine_config, index), index)
@@ -1,4 +1,5 @@
 import json
+import threading
 import unittest
 from N2KClient.n2kclient.models.constants import Constants
 from N2KClient.n2kclient.models.empower_system.alarm import Alarm, AlarmState
@@ -19,8 +20,16 @@ from N2KClient.n2kclient.models.common_enums import (
     eStateType,
     eAlarmType,
 )
+from N2KClient.n2kclient.models.n2k_configuration.n2k_configuation import (
+    N2kConfiguration,
+)
 from N2KClient.n2kclient.models.n2k_configuration.tank import TankType
 from N2KClient.n2kclient.models.empower_system.engine_alarm_list import EngineAlarmList
+from N2KClient.n2kclient.models.empower_system.engine_list import EngineList
+from N2KClient.n2kclient.models.n2k_configuration.engine import EngineDevice
+from N2KClient.n2kclient.models.n2k_configuration.engine_configuration import (
+    EngineConfiguration,
+)
 
 
 class AlarmServiceTest(unittest.TestCase):
@@ -63,8 +72,7 @@ class AlarmServiceTest(unittest.TestCase):
             "N2KClient.n2kclient.services.alarm_service.alarm_service.send_and_validate_response"
         ) as mock_send:
             mock_latest_alarms = AlarmList()
-            mock_latest_alarms.alarm[0] = Alarm()
-            mock_latest_alarms.alarm[0].current_state = AlarmState.ENABLED
+            mock_latest_alarms.alarm[0] = Alarm(state=AlarmState.ENABLED)
             alarm_list_func = MagicMock()
             get_latest_alarms_func = MagicMock()
             get_latest_alarms_func.return_value = mock_latest_alarms
@@ -94,6 +102,74 @@ class AlarmServiceTest(unittest.TestCase):
             self.assertTrue(res)
             mock_send.assert_called_once()
 
+    def _acknowledge_alarms_service(self, acknowledge_alarms_func=None):
+        latest_alarms = AlarmList()
+        latest_alarms.alarm[1] = Alarm(unique_id=1, state=AlarmState.ENABLED)
+        latest_alarms.alarm[2] = Alarm(unique_id=2, state=AlarmState.ACKNOWLEDGED)
+        latest_alarms.alarm[3] = Alarm(unique_id=3, state=AlarmState.ENABLED)
+        return AlarmService(
+            MagicMock(),
+            MagicMock(return_value=latest_alarms),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(return_value='{"Result": "Ok"}'),
+            MagicMock(),
+            MagicMock(),
+            acknowledge_alarms_func=acknowledge_alarms_func,
+        )
+
+    def test_acknowledge_alarms(self):
+        """
+        Test the acknowledge_alarms method sends the active alarms in one batch and reloads the alarms once
+        """
+        acknowledge_alarms_func = MagicMock(
+            return_value=['{"Result": "Ok"}', Exception("fail")]
+        )
+        alarm_service = self._acknowledge_alarms_service(acknowledge_alarms_func)
+
+        with patch.object(alarm_service, "load_active_alarms") as mock_load:
+            res = alarm_service.acknowledge_alarms([1, 2, 3, 4])
+
+        self.assertEqual(res, {1: True, 2: True, 3: False, 4: False})
+        acknowledge_alarms_func.assert_called_once_with(
+            [
+                json.dumps({"Id": 1, "Accepted": True}),
+                json.dumps({"Id": 3, "Accepted": True}),
+            ]
+        )
+        alarm_service.acknowledge_alarm_func.assert_not_called()
+        mock_load.assert_called_once()
+
+    def test_acknowledge_alarms_without_batch(self):
+        """
+        Test the acknowledge_alarms method sends each alarm when no batch function is given
+        """
+        alarm_service = self._acknowledge_alarms_service()
+
+        with patch.object(alarm_service, "load_active_alarms") as mock_load:
+            res = alarm_service.acknowledge_alarms([1, 3])
+
+        self.assertEqual(res, {1: True, 3: True})
+        self.assertEqual(alarm_service.acknowledge_alarm_func.call_count, 2)
+        mock_load.assert_called_once()
+
+    def test_acknowledge_alarms_none_sent(self):
+        """
+        Test the acknowledge_alarms method does not reload the alarms if nothing was sent
+        """
+        acknowledge_alarms_func = MagicMock()
+        alarm_service = self._acknowledge_alarms_service(acknowledge_alarms_func)
+
+        with patch.object(alarm_service, "load_active_alarms") as mock_load:
+            res = alarm_service.acknowledge_alarms([2, 4])
+
+        self.assertEqual(res, {2: True, 4: False})
+        acknowledge_alarms_func.assert_not_called()
+        mock_load.assert_not_called()
+
     def test_acknowledge_alarm_not_found(self):
         """
         Test the acknowledge_alarm method. Alarm exists and is not acknowledged
@@ -102,8 +178,7 @@ class AlarmServiceTest(unittest.TestCase):
             "N2KClient.n2kclient.services.alarm_service.alarm_service.send_and_validate_response"
         ) as mock_send:
             mock_latest_alarms = AlarmList()
-            mock_latest_alarms.alarm[1] = Alarm()
-            mock_latest_alarms.alarm[1].current_state = AlarmState.ENABLED
+            mock_latest_alarms.alarm[1] = Alarm(state=AlarmState.ENABLED)
             alarm_list_func = MagicMock()
             get_latest_alarms_func = MagicMock()
             get_latest_alarms_func.return_value = mock_latest_alarms
@@ -172,6 +247,40 @@ class AlarmServiceTest(unittest.TestCase):
 
         set_alarm_list.assert_called_once()
 
+    def test_load_active_alarms_records_history(self):
+        """
+        Test the load_active_alarms method records the alarm transitions to the alarm history
+        """
+        alarm = Alarm(unique_id=1, state=AlarmState.ENABLED, things=["dcMeter.1"])
+        merged_alarm_list = AlarmList()
+        merged_alarm_list.alarm[1] = alarm
+        alarm_history = MagicMock()
+
+        alarm_service = AlarmService(
+            MagicMock(return_value="testStr"),
+            MagicMock(return_value=AlarmList()),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            alarm_history=alarm_history,
+        )
+
+        with patch.object(
+            alarm_service, "_merge_alarm_lists", return_value=merged_alarm_list
+        ), patch.object(
+            alarm_service, "_verify_alarm_things", return_value=merged_alarm_list
+        ), patch.object(
+            alarm_service, "parse_alarm_list", return_value=[MagicMock()]
+        ):
+            alarm_service.load_active_alarms()
+
+        alarm_history.record_changes.assert_called_once_with({}, {1: alarm})
+
     def test_load_active_alarms_invalid_str(self):
         """
         Test the load_active_alarms method with an invalid string input.
@@ -216,9 +325,10 @@ class AlarmServiceTest(unittest.TestCase):
         """
         alarm_list_func = MagicMock(return_value="testStr")
         set_alarm_list = MagicMock()
-        # Mock latest_alarms with to_alarm_dict returning something different from merged
-        mock_latest_alarms = MagicMock()
-        mock_latest_alarms.to_alarm_dict.return_value = {"foo": "bar"}
+        # Merged list shares the unchanged alarm of the latest list
+        alarm = Alarm(unique_id=1, state=AlarmState.ENABLED, things=["thing1"])
+        mock_latest_alarms = AlarmList()
+        mock_latest_alarms.alarm[1] = alarm
         get_latest_alarms_func = MagicMock(return_value=mock_latest_alarms)
 
         alarm_service = AlarmService(
@@ -235,8 +345,8 @@ class AlarmServiceTest(unittest.TestCase):
         )
 
         # Patch only what's needed to trigger the set_alarm_list call
-        mock_merged_alarm_list = MagicMock()
-        mock_merged_alarm_list.to_alarm_dict.return_value = {"foo": "bar"}
+        mock_merged_alarm_list = AlarmList()
+        mock_merged_alarm_list.alarm[1] = alarm
         with patch.object(
             alarm_service, "_merge_alarm_lists", return_value=mock_merged_alarm_list
         ), patch.object(
@@ -325,6 +435,37 @@ class AlarmServiceTest(unittest.TestCase):
         set_alarm_list.assert_not_called()
         self.assertFalse(res[0])
 
+    def test_load_active_alarms_serialized(self):
+        """
+        Test the load_active_alarms, loads from several threads do not overlap.
+        """
+        running = []
+        overlaps = []
+        first_started = threading.Event()
+        release_first = threading.Event()
+
+        def alarm_list_func():
+            overlaps.append(len(running))
+            running.append(True)
+            first_started.set()
+            release_first.wait(1)
+            running.pop()
+            return ""
+
+        alarm_service = AlarmService(alarm_list_func, *[MagicMock() for _ in range(9)])
+        threads = [
+            threading.Thread(target=alarm_service.load_active_alarms) for _ in range(2)
+        ]
+        threads[0].start()
+        first_started.wait(1)
+        threads[1].start()
+        threads[1].join(0.1)
+        release_first.set()
+        for thread in threads:
+            thread.join(1)
+
+        self.assertEqual(overlaps, [0, 0])
+
     def test_merge_alarm_lists(self):
         """
         Test the _merge_alarm_lists function. Add single alarm to merged list when processed alarm is not None.
@@ -525,6 +666,31 @@ class AlarmServiceTest(unittest.TestCase):
         self.assertEqual(res[1], mock_build_reportable_alarm.return_value)
         mock_build_reportable_alarm.assert_called_once()
 
+    def test_process_and_merge_alarm_shares_unchanged_alarm(self):
+        """
+        Test the _process_and_merge_alarm function. Unchanged alarms are shared with the latest list, changed alarms are replaced
+        """
+        alarm_service = AlarmService(*[MagicMock() for _ in range(10)])
+        latest_alarms = AlarmList()
+        latest_alarms.alarm[1] = Alarm(unique_id=1, state=AlarmState.ENABLED)
+
+        res = alarm_service._process_and_merge_alarm(
+            MagicMock(unique_id=1, current_state=eStateType.StateEnabled),
+            latest_alarms,
+            MagicMock(),
+            MagicMock(),
+        )
+        self.assertIs(res[1], latest_alarms.alarm[1])
+
+        res = alarm_service._process_and_merge_alarm(
+            MagicMock(unique_id=1, current_state=eStateType.StateAcknowledged),
+            latest_alarms,
+            MagicMock(),
+            MagicMock(),
+        )
+        self.assertEqual(res[1].current_state, AlarmState.ACKNOWLEDGED)
+        self.assertEqual(latest_alarms.alarm[1].current_state, AlarmState.ENABLED)
+
     def test_build_reportable_alarm_valid_references_things_post_processing(self):
         """
         Test creating a reportable alarm with valid references and post-processing, thing links. Should return alarm
@@ -899,6 +1065,34 @@ class AlarmServiceTest(unittest.TestCase):
             mock_process_bls_alarms.assert_called_once()
             mock_process_smartcraft_alarms.assert_called_once()
 
+    def test_get_alarm_related_components_reuses_resolution_index(self):
+        """
+        Test get_alarm_related_components. The resolution index is built once per configuration
+        """
+        alarm_service = AlarmService(*[MagicMock() for _ in range(10)])
+        with patch(
+            "N2KClient.n2kclient.services.alarm_service.alarm_service.process_dc_meter_alarms"
+        ) as mock_process_dc_alarms, patch(
+            "N2KClient.n2kclient.services.alarm_service.alarm_service.AlarmResolutionIndex"
+        ) as mock_index_cls:
+            mock_index_cls.of.side_effect = lambda config, index: (
+                index
+                if index is not None and index.config is config
+                else MagicMock(config=config)
+            )
+            alarm = N2KAlarm(external_alarm_id=1, channel_id=1234)
+            config = N2kConfiguration()
+            alarm_service.get_alarm_related_components(alarm, config)
+            alarm_service.get_alarm_related_components(alarm, config)
+            first_index = mock_process_dc_alarms.call_args_list[0].kwargs["index"]
+            self.assertIs(
+                mock_process_dc_alarms.call_args_list[1].kwargs["index"], first_index
+            )
+            alarm_service.get_alarm_related_components(alarm, N2kConfiguration())
+            self.assertIsNot(
+                mock_process_dc_alarms.call_args_list[2].kwargs["index"], first_index
+            )
+
     def test_get_alarm_related_components_is_dc_alarm_alarm_channel_id(self):
         """
         Test get_alarm_related_components. ChannelId is reduced by 3 when it is a DC meter alarm
@@ -951,6 +1145,7 @@ class AlarmServiceTest(unittest.TestCase):
                 affected_components=ANY,
                 alarm=ANY,
                 is_dc_alarm=ANY,
+                index=ANY,
             )
             mock_process_device_alarms.assert_any_call(
                 logger=ANY,
@@ -959,6 +1154,7 @@ class AlarmServiceTest(unittest.TestCase):
                 affected_components=ANY,
                 alarm=ANY,
                 is_dc_alarm=ANY,
+                index=ANY,
             )
             mock_process_dc_alarms.assert_any_call(
                 logger=ANY,
@@ -967,6 +1163,7 @@ class AlarmServiceTest(unittest.TestCase):
                 affected_components=ANY,
                 alarm=ANY,
                 is_dc_alarm=ANY,
+                index=ANY,
             )
             mock_process_tank_alarms.assert_any_call(
                 logger=ANY,
@@ -975,6 +1172,7 @@ class AlarmServiceTest(unittest.TestCase):
                 affected_components=ANY,
                 alarm=ANY,
                 is_dc_alarm=ANY,
+                index=ANY,
             )
             mock_process_circuit_load_alarms.assert_any_call(
                 logger=ANY,
@@ -983,6 +1181,7 @@ class AlarmServiceTest(unittest.TestCase):
                 affected_components=ANY,
                 alarm=ANY,
                 is_dc_alarm=ANY,
+                index=ANY,
             )
             mock_process_bls_alarms.assert_any_call(
                 logger=ANY,
@@ -991,6 +1190,7 @@ class AlarmServiceTest(unittest.TestCase):
                 affected_components=ANY,
                 alarm=ANY,
                 is_dc_alarm=ANY,
+                index=ANY,
             )
             mock_process_smartcraft_alarms.assert_not_called()
 
@@ -1986,8 +2186,8 @@ class AlarmServiceTest(unittest.TestCase):
             MagicMock(),
         )
 
-        alarm_list = MagicMock()
-        alarm_list.alarm = {1: MagicMock(things=["thing1", "thing2"])}
+        alarm_list = AlarmList()
+        alarm_list.alarm = {1: Alarm(things=["thing1", "thing2"])}
         mock_get_latest_empower_system.return_value = MagicMock(
             things=["thing1", "thing2", "thing3"]
         )
@@ -1995,6 +2195,7 @@ class AlarmServiceTest(unittest.TestCase):
 
         mock_get_latest_empower_system.assert_called_once()
         self.assertEqual(alarm_list, res)
+        self.assertIs(res.alarm[1], alarm_list.alarm[1])
 
     def test_verify_alarm_things_remove_thing(self):
         """
@@ -2014,8 +2215,8 @@ class AlarmServiceTest(unittest.TestCase):
             MagicMock(),
         )
 
-        alarm_list = MagicMock()
-        alarm_list.alarm = {1: MagicMock(things=["thing1", "thing2"])}
+        alarm_list = AlarmList()
+        alarm_list.alarm = {1: Alarm(things=["thing1", "thing2"])}
         mock_get_latest_empower_system.return_value = MagicMock(
             things=["thing1", "thing3"]
         )
@@ -2023,6 +2224,7 @@ class AlarmServiceTest(unittest.TestCase):
 
         mock_get_latest_empower_system.assert_called_once()
         self.assertNotIn("thing2", res.alarm[1].things)
+        self.assertEqual(alarm_list.alarm[1].things, ["thing1", "thing2"])
 
     def test_verify_alarm_things_remove_alarm(self):
         """
@@ -2068,8 +2270,8 @@ class AlarmServiceTest(unittest.TestCase):
             mock_get_latest_engine_list,
         )
 
-        alarm_list = MagicMock()
-        alarm_list.engine_alarms = {1: MagicMock(things=["thing1", "thing2"])}
+        alarm_list = EngineAlarmList()
+        alarm_list.engine_alarms = {1: Alarm(things=["thing1", "thing2"])}
         mock_get_latest_engine_list.return_value = MagicMock(
             engines=["thing1", "thing2", "thing3"]
         )
@@ -2077,6 +2279,7 @@ class AlarmServiceTest(unittest.TestCase):
 
         mock_get_latest_engine_list.assert_called_once()
         self.assertEqual(alarm_list, res)
+        self.assertIs(res.engine_alarms[1], alarm_list.engine_alarms[1])
 
     def test_verify_engine_alarm_things_remove_thing(self):
         """
@@ -2096,8 +2299,8 @@ class AlarmServiceTest(unittest.TestCase):
             mock_get_latest_engine_list,
         )
 
-        alarm_list = MagicMock()
-        alarm_list.engine_alarms = {1: MagicMock(things=["thing1", "thing2"])}
+        alarm_list = EngineAlarmList()
+        alarm_list.engine_alarms = {1: Alarm(things=["thing1", "thing2"])}
         mock_get_latest_engine_list.return_value = MagicMock(
             engines=["thing2", "thing3"]
         )
@@ -2329,165 +2532,146 @@ class AlarmServiceTest(unittest.TestCase):
         except:
             pass
 
-    def test_process_engine_alarm_from_snapshots_discrete_status_1(self):
+    def test_parse_alarm_fields(self):
         """
-        Verify that engine alarms are properly generated from snapshots
+        Verify parse alarm maps the alarm list fields onto a N2K alarm
         """
-        mock_get_engine_alarm = MagicMock()
-        mock_get_engine_config = MagicMock()
-        mock_latest_engine_config = MagicMock()
-        mock_latest_engine_config.devices = {1: MagicMock()}
-        mock_get_engine_config.return_value = mock_latest_engine_config
-        mock_set_engine_alarms = MagicMock()
-        alarm_service = AlarmService(
+        alarm_service = AlarmService(*[MagicMock() for _ in range(10)])
+        alarm = alarm_service.parse_alarm(
+            {
+                "AlarmType": 0,
+                "Severity": 1,
+                "CurrentState": 2,
+                "ChannelId": 16404,
+                "ExternalAlarmId": 6,
+                "UniqueId": 29,
+                "Valid": True,
+                "Name": "DC High Voltage",
+                "Title": "Port Battery",
+            }
+        )
+        self.assertIsInstance(alarm, N2KAlarm)
+        self.assertEqual(alarm.channel_id, 16404)
+        self.assertEqual(alarm.unique_id, 29)
+        self.assertEqual(alarm.current_state, eStateType.StateAcknowledged)
+        self.assertEqual(alarm.alarm_type, eAlarmType.External)
+        self.assertEqual(alarm.title, "Port Battery")
+
+    def _engine_alarm_service(self, engine_alarm_list, engine_list=None):
+        engine = EngineDevice(name_utf8="Engine")
+        engine.id = 1
+        engine_config = EngineConfiguration(devices={1: engine})
+        if engine_list is None:
+            engine_list = EngineList(should_reset=False)
+            engine_list.engines["marineEngine.1"] = MagicMock()
+        return AlarmService(
             MagicMock(),
             MagicMock(),
             MagicMock(),
-            mock_get_engine_config,
-            mock_get_engine_alarm,
+            MagicMock(return_value=engine_config),
+            MagicMock(return_value=engine_alarm_list),
             MagicMock(),
-            mock_set_engine_alarms,
             MagicMock(),
             MagicMock(),
             MagicMock(),
+            MagicMock(return_value=engine_list),
         )
+
+    def test_process_engine_alarm_from_snapshots_discrete_status_1(self):
+        """
+        Verify that engine alarms are properly generated from snapshots
+        """
+        alarm_service = self._engine_alarm_service(EngineAlarmList())
         snapshot_dict = {"Engines": {"marineEngine.1": {"DiscreteStatus1": 1}}}
 
-        with patch(
-            "N2KClient.n2kclient.services.alarm_service.alarm_service.generate_alarms_from_discrete_status"
-        ) as mock_generate_alarms_from_discrete_status, patch.object(
-            alarm_service, "_verify_engine_alarm_things"
-        ) as mock_verify_engine_alarm_things:
-            alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
-            mock_generate_alarms_from_discrete_status.assert_called_once()
-            mock_verify_engine_alarm_things.assert_called_once()
-            mock_set_engine_alarms.assert_called_once()
+        alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
+        alarm_service.set_engine_alarms.assert_called_once()
+        engine_alarm_list = alarm_service.set_engine_alarms.call_args.args[0]
+        self.assertEqual(
+            list(engine_alarm_list.engine_alarms.keys()),
+            ["engine.1.discrete_status1.0"],
+        )
 
     def test_process_engine_alarm_from_snapshots_discrete_status_2(self):
         """
         Verify that engine alarms are properly generated from snapshots
         """
-        mock_get_engine_alarm = MagicMock()
-        mock_get_engine_config = MagicMock()
-        mock_latest_engine_config = MagicMock()
-        mock_latest_engine_config.devices = {1: MagicMock()}
-        mock_get_engine_config.return_value = mock_latest_engine_config
-        mock_set_engine_alarms = MagicMock()
-        alarm_service = AlarmService(
-            MagicMock(),
-            MagicMock(),
-            MagicMock(),
-            mock_get_engine_config,
-            mock_get_engine_alarm,
-            MagicMock(),
-            mock_set_engine_alarms,
-            MagicMock(),
-            MagicMock(),
-            MagicMock(),
-        )
+        alarm_service = self._engine_alarm_service(EngineAlarmList())
         snapshot_dict = {"Engines": {"marineEngine.1": {"DiscreteStatus2": 1}}}
 
-        with patch(
-            "N2KClient.n2kclient.services.alarm_service.alarm_service.generate_alarms_from_discrete_status"
-        ) as mock_generate_alarms_from_discrete_status, patch.object(
-            alarm_service, "_verify_engine_alarm_things"
-        ) as mock_verify_engine_alarm_things:
-            alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
-            mock_generate_alarms_from_discrete_status.assert_called_once()
-            mock_verify_engine_alarm_things.assert_called_once()
-            mock_set_engine_alarms.assert_called_once()
+        alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
+        alarm_service.set_engine_alarms.assert_called_once()
+        engine_alarm_list = alarm_service.set_engine_alarms.call_args.args[0]
+        self.assertEqual(
+            list(engine_alarm_list.engine_alarms.keys()),
+            ["engine.1.discrete_status2.0"],
+        )
 
     def test_process_engine_alarm_from_snapshots_discrete_status_both(self):
         """
         Verify that engine alarms are properly generated from snapshots
         """
-        mock_get_engine_alarm = MagicMock()
-        mock_get_engine_config = MagicMock()
-        mock_latest_engine_config = MagicMock()
-        mock_latest_engine_config.devices = {1: MagicMock()}
-        mock_get_engine_config.return_value = mock_latest_engine_config
-        mock_set_engine_alarms = MagicMock()
-        alarm_service = AlarmService(
-            MagicMock(),
-            MagicMock(),
-            MagicMock(),
-            mock_get_engine_config,
-            mock_get_engine_alarm,
-            MagicMock(),
-            mock_set_engine_alarms,
-            MagicMock(),
-            MagicMock(),
-            MagicMock(),
-        )
+        alarm_service = self._engine_alarm_service(EngineAlarmList())
         snapshot_dict = {
             "Engines": {"marineEngine.1": {"DiscreteStatus1": 1, "DiscreteStatus2": 1}}
         }
 
-        with patch(
-            "N2KClient.n2kclient.services.alarm_service.alarm_service.generate_alarms_from_discrete_status"
-        ) as mock_generate_alarms_from_discrete_status, patch.object(
+        alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
+        alarm_service.set_engine_alarms.assert_called_once()
+        engine_alarm_list = alarm_service.set_engine_alarms.call_args.args[0]
+        self.assertEqual(
+            list(engine_alarm_list.engine_alarms.keys()),
+            ["engine.1.discrete_status1.0", "engine.1.discrete_status2.0"],
+        )
+        alarm = engine_alarm_list.engine_alarms["engine.1.discrete_status2.0"]
+        self.assertEqual(alarm.current_discrete_status1, 1)
+        self.assertEqual(alarm.current_discrete_status2, 1)
+
+    def test_process_engine_alarm_from_snapshots_same_engine_list(self):
+        """
+        Verify that engine alarms not set or validated if alarm list doesn't change
+        """
+        alarm_service = self._engine_alarm_service(EngineAlarmList())
+        snapshot_dict = {"Engines": {"marineEngine.1": {}}}
+
+        with patch.object(
             alarm_service, "_verify_engine_alarm_things"
         ) as mock_verify_engine_alarm_things:
             alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
-            mock_verify_engine_alarm_things.assert_called_once()
-            mock_set_engine_alarms.assert_called_once()
-            discrete_status_1 = [
-                call.kwargs.get("current_discrete_status1")
-                for call in mock_generate_alarms_from_discrete_status.call_args_list
-            ]
-            assert 1 in discrete_status_1
-
-            discrete_status_2 = [
-                call.kwargs.get("current_discrete_status2")
-                for call in mock_generate_alarms_from_discrete_status.call_args_list
-            ]
-            assert 1 in discrete_status_2
-
-            engine_ids = [
-                call.kwargs.get("engine_id")
-                for call in mock_generate_alarms_from_discrete_status.call_args_list
-            ]
-            assert 1 in engine_ids
-
-            discrete_status_word = [
-                call.kwargs.get("discrete_status_word")
-                for call in mock_generate_alarms_from_discrete_status.call_args_list
-            ]
-            assert 1 in discrete_status_word
-            assert 2 in discrete_status_word
+            mock_verify_engine_alarm_things.assert_not_called()
+            alarm_service.set_engine_alarms.assert_not_called()
 
-    def test_process_engine_alarm_from_snapshots_same_engine_list(self):
+    def test_process_engine_alarm_from_snapshots_unchanged_status(self):
         """
-        Verify that engine alarms not set or validated if alarm list doesn't change
+        Verify that a snapshot with the same discrete status words does no work
         """
-        mock_get_engine_config = MagicMock()
-        mock_latest_engine_config = MagicMock()
-        mock_latest_engine_config.devices = {1: MagicMock()}
-        mock_get_engine_config.return_value = mock_latest_engine_config
-        mock_set_engine_alarms = MagicMock()
         engine_alarm_list = EngineAlarmList()
-        mock_get_engine_alarm = MagicMock(return_value=engine_alarm_list)
-        alarm_service = AlarmService(
-            MagicMock(),
-            MagicMock(),
-            MagicMock(),
-            mock_get_engine_config,
-            mock_get_engine_alarm,
-            MagicMock(),
-            mock_set_engine_alarms,
-            MagicMock(),
-            MagicMock(),
-            MagicMock(),
+        alarm_service = self._engine_alarm_service(engine_alarm_list)
+        snapshot_dict = {"Engines": {"marineEngine.1": {"DiscreteStatus1": 3}}}
+        alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
+        alarm_service.get_engine_alarms.return_value = (
+            alarm_service.set_engine_alarms.call_args.args[0]
         )
-        snapshot_dict = {"Engines": {"marineEngine.1": {}}}
+        alarm_service.set_engine_alarms.reset_mock()
 
-        with patch(
-            "N2KClient.n2kclient.services.alarm_service.alarm_service.generate_alarms_from_discrete_status"
-        ) as mock_generate_alarms_from_discrete_status, patch.object(
+        with patch.object(
             alarm_service, "_verify_engine_alarm_things"
         ) as mock_verify_engine_alarm_things:
-            mock_generate_alarms_from_discrete_status.return_value = engine_alarm_list
             alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
-            mock_generate_alarms_from_discrete_status.assert_not_called()
             mock_verify_engine_alarm_things.assert_not_called()
-            mock_set_engine_alarms.assert_not_called()
+            alarm_service.set_engine_alarms.assert_not_called()
+
+    def test_process_engine_alarm_from_snapshots_engine_not_listed(self):
+        """
+        Verify that alarms of an engine missing from the engine list are raised once it is listed
+        """
+        engine_list = EngineList(should_reset=False)
+        alarm_service = self._engine_alarm_service(EngineAlarmList(), engine_list)
+        snapshot_dict = {"Engines": {"marineEngine.1": {"DiscreteStatus1": 1}}}
+
+        alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
+        alarm_service.set_engine_alarms.assert_not_called()
+
+        engine_list.engines["marineEngine.1"] = MagicMock()
+        alarm_service.process_engine_alarm_from_snapshots(snapshot_dict)
+        alarm_service.set_engine_alarms.assert_called_once()
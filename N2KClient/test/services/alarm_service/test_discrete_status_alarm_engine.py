@@ -0,0 +1,110 @@
+import unittest
+
+from N2KClient.n2kclient.models.empower_system.engine_alarm_list import EngineAlarmList
+from N2KClient.n2kclient.models.n2k_configuration.engine import EngineDevice
+from N2KClient.n2kclient.models.n2k_configuration.engine_configuration import (
+    EngineConfiguration,
+)
+from N2KClient.n2kclient.services.alarm_service.discrete_status_alarm_engine import (
+    DiscreteStatusAlarmEngine,
+    DiscreteStatusBitTable,
+)
+
+
+class DiscreteStatusAlarmEngineTest(unittest.TestCase):
+    """
+    Unit tests for the DiscreteStatusAlarmEngine class.
+    """
+
+    def setUp(self):
+        engine = EngineDevice(name_utf8="TestEngine")
+        engine.id = 1
+        self.engine_config = EngineConfiguration(devices={1: engine})
+        self.engine = DiscreteStatusAlarmEngine()
+
+    def _process(self, engine_alarm_list, **engine_state):
+        return self.engine.process(
+            {"marineEngine.1": engine_state}, self.engine_config, engine_alarm_list
+        )
+
+    def test_bit_table(self):
+        """
+        Should precompute the mask of every alarm bit of a word.
+        """
+        table = DiscreteStatusBitTable(1, [(0, "Alarm0"), (2, "Alarm2")])
+        self.assertEqual(table.mask, 0b101)
+        self.assertEqual(table.bits, ((1, 0, "Alarm0"), (4, 2, "Alarm2")))
+
+    def test_process_add_alarms(self):
+        """
+        Should add an alarm for each set bit without modifying the given list.
+        """
+        engine_alarm_list = EngineAlarmList()
+        merged = self._process(engine_alarm_list, DiscreteStatus1=0b101)
+        self.assertEqual(
+            list(merged.engine_alarms.keys()),
+            ["engine.1.discrete_status1.0", "engine.1.discrete_status1.2"],
+        )
+        alarm = merged.engine_alarms["engine.1.discrete_status1.0"]
+        self.assertEqual(alarm.name, "Check Engine")
+        self.assertEqual(alarm.things, ["marineEngine.1"])
+        self.assertIsNone(alarm.prev_discrete_status1)
+        self.assertEqual(alarm.current_discrete_status1, 0b101)
+        self.assertEqual(engine_alarm_list.engine_alarms, {})
+
+    def test_process_no_alarm(self):
+        """
+        Should return None when no alarm bit is set.
+        """
+        self.assertIsNone(self._process(EngineAlarmList(), DiscreteStatus2=0))
+
+    def test_process_unchanged_status(self):
+        """
+        Should skip the engine when its status words did not change.
+        """
+        merged = self._process(EngineAlarmList(), DiscreteStatus1=1)
+        self.assertIsNone(self._process(merged, DiscreteStatus1=1))
+        self.assertIsNone(self._process(merged))
+
+    def test_process_flipped_bits(self):
+        """
+        Should add alarms for rising bits and remove alarms for falling bits only.
+        """
+        first = self._process(EngineAlarmList(), DiscreteStatus1=0b011)
+        second = self._process(first, DiscreteStatus1=0b110)
+        self.assertEqual(
+            list(second.engine_alarms.keys()),
+            ["engine.1.discrete_status1.1", "engine.1.discrete_status1.2"],
+        )
+        self.assertIs(
+            second.engine_alarms["engine.1.discrete_status1.1"],
+            first.engine_alarms["engine.1.discrete_status1.1"],
+        )
+        alarm = second.engine_alarms["engine.1.discrete_status1.2"]
+        self.assertEqual(alarm.prev_discrete_status1, 0b011)
+        self.assertEqual(alarm.current_discrete_status1, 0b110)
+
+    def test_process_unknown_engine(self):
+        """
+        Should ignore engines that are not part of the engine configuration.
+        """
+        merged = self.engine.process(
+            {"marineEngine.2": {"DiscreteStatus1": 1}},
+            self.engine_config,
+            EngineAlarmList(),
+        )
+        self.assertIsNone(merged)
+
+    def test_invalidate(self):
+        """
+        Should evaluate every alarm bit after invalidate, raising alarms missing from the list again.
+        """
+        self._process(EngineAlarmList(), DiscreteStatus1=1)
+        self.assertIsNone(self._process(EngineAlarmList(), DiscreteStatus1=1))
+        self.engine.invalidate()
+        merged = self._process(EngineAlarmList(), DiscreteStatus1=1)
+        self.assertEqual(
+            list(merged.engine_alarms.keys()), ["engine.1.discrete_status1.0"]
+        )
+        alarm = merged.engine_alarms["engine.1.discrete_status1.0"]
+        self.assertEqual(alarm.prev_discrete_status1, 1)
@@ -0,0 +1,202 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from N2KClient.n2kclient.models.common_enums import ConnectionStatus
+from N2KClient.n2kclient.models.dbus_connection_status import DBUSConnectionStatus
+from N2KClient.n2kclient.models.empower_system.alarm_list import AlarmList
+from N2KClient.n2kclient.models.n2k_configuration.engine_configuration import (
+    EngineConfiguration,
+)
+from N2KClient.n2kclient.models.n2k_configuration.n2k_configuation import (
+    N2kConfiguration,
+)
+from N2KClient.n2kclient.services.broker_service.broker_client import (
+    N2KBrokerClient,
+)
+from N2KClient.n2kclient.services.broker_service.broker_protocol import (
+    BrokerProtocol,
+)
+from N2KClient.n2kclient.services.broker_service.broker_server import (
+    N2KBrokerServer,
+)
+from N2KClient.test.services.broker_service.test_broker_server import make_client
+
+
+class N2KBrokerClientTest(unittest.TestCase):
+    """
+    Unit tests for the N2KBrokerClient.
+    """
+
+    def setUp(self):
+        self.client = N2KBrokerClient(
+            socket_path="/nonexistent/broker.sock", request_timeout=1
+        )
+        self.client._config_processor = MagicMock()
+
+    def test_config(self):
+        empower_system = MagicMock()
+        self.client._config_processor.has_empower_system.return_value = False
+        self.client._config_processor.build_empower_system.return_value = (
+            empower_system
+        )
+        received = []
+        self.client.get_empower_system_observable().subscribe(received.append)
+
+        config = N2kConfiguration()
+        self.client._handle_message(
+            (BrokerProtocol.STATE, BrokerProtocol.CONFIG, config)
+        )
+        self.client._config_processor.build_empower_system.assert_called_once_with(
+            config, self.client.get_latest_devices(), incremental=False
+        )
+        self.assertIs(self.client.get_latest_empower_system(), empower_system)
+        self.assertIs(self.client.get_latest_config(), config)
+        # After the empty system the client starts with
+        self.assertEqual(received[1:], [empower_system])
+
+    def test_engine_config_reset(self):
+        engine_list = MagicMock()
+        previous_engine_list = MagicMock()
+        self.client._latest_engine_list = previous_engine_list
+        self.client._config_processor.build_engine_list.return_value = engine_list
+
+        engine_config = EngineConfiguration()
+        engine_config.should_reset = True
+        self.client._handle_message(
+            (BrokerProtocol.STATE, BrokerProtocol.ENGINE_CONFIG, engine_config)
+        )
+        previous_engine_list.dispose.assert_called_once()
+        self.assertIs(self.client.get_latest_engine_list(), engine_list)
+        self.assertIs(self.client.get_latest_engine_config(), engine_config)
+
+    def test_mobile_changes(self):
+        devices = []
+        changes = []
+        self.client.devices.subscribe(devices.append)
+        self.client.get_mobile_changes_observable().subscribe(changes.append)
+
+        self.client._handle_message(
+            (
+                BrokerProtocol.MOBILE_STATE,
+                {"circuit.1.power": True, "tank.1.level": 5},
+            )
+        )
+        self.client._handle_message((BrokerProtocol.MOBILE, {"tank.1.level": 6}))
+        self.assertEqual(
+            self.client.get_latest_devices().to_mobile_dict(),
+            {"circuit.1.power": True, "tank.1.level": 6},
+        )
+        self.assertEqual(changes, [{"tank.1.level": 6}])
+        # The initial devices, then one update per message
+        self.assertEqual(len(devices), 3)
+
+        # A full state replaces the channels of disposed devices
+        self.client._handle_message(
+            (BrokerProtocol.MOBILE_STATE, {"tank.1.level": 7})
+        )
+        self.assertEqual(
+            self.client.get_latest_devices().to_mobile_dict(), {"tank.1.level": 7}
+        )
+
+    def test_alarms_and_status(self):
+        alarms = AlarmList()
+        statuses = []
+        self.client.n2k_dbus_connection_status.subscribe(statuses.append)
+
+        self.client._handle_message(
+            (BrokerProtocol.STATE, BrokerProtocol.ALARMS, alarms)
+        )
+        self.client._handle_message(
+            (
+                BrokerProtocol.STATE,
+                BrokerProtocol.CONNECTION_STATUS,
+                DBUSConnectionStatus(ConnectionStatus.CONNECTED, "", 0),
+            )
+        )
+        self.assertIs(self.client.get_latest_alarms(), alarms)
+        self.assertIs(self.client.get_alarms_observable().value, alarms)
+        self.assertEqual(
+            [status.connection_state for status in statuses],
+            [ConnectionStatus.IDLE, ConnectionStatus.CONNECTED],
+        )
+
+    def test_call_unavailable(self):
+        self.assertFalse(self.client.set_circuit_power_state(1, True))
+        self.assertEqual(
+            self.client.acknowledge_alarms([1, 2]), {1: False, 2: False}
+        )
+        self.assertEqual(self.client.get_alarm_history(), [])
+        self.assertEqual(self.client.refresh_active_alarms()[0], False)
+
+
+class N2KBrokerRoundTripTest(unittest.TestCase):
+    """
+    Tests of an N2KBrokerClient connected to an N2KBrokerServer.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        socket_path = os.path.join(self.directory.name, "broker.sock")
+        self.owner = make_client()
+        self.server = N2KBrokerServer(self.owner, socket_path=socket_path)
+        self.server.start()
+        self.client = N2KBrokerClient(
+            socket_path=socket_path, request_timeout=5, reconnect_delay=0.05
+        )
+
+    def tearDown(self):
+        self.client.stop()
+        self.server.stop()
+        self.directory.cleanup()
+
+    def _wait_for_status(self, connection_state: ConnectionStatus):
+        reached = threading.Event()
+        disposable = self.client.n2k_dbus_connection_status.subscribe(
+            lambda status: (
+                reached.set() if status.connection_state == connection_state else None
+            )
+        )
+        self.assertTrue(reached.wait(5))
+        disposable.dispose()
+
+    def test_round_trip(self):
+        mobile_changes = threading.Event()
+        self.client.get_mobile_changes_observable().subscribe(
+            lambda _: mobile_changes.set()
+        )
+        self.client.start()
+        self._wait_for_status(ConnectionStatus.CONNECTED)
+
+        self.owner.set_circuit_power_state.return_value = True
+        self.assertTrue(self.client.set_circuit_power_state(3, False))
+        self.owner.set_circuit_power_state.assert_called_once_with(3, False)
+
+        self.owner.mobile_changes_subject.on_next({"circuit.1.power": False})
+        self.assertTrue(mobile_changes.wait(5))
+        self.assertEqual(
+            self.client.get_latest_devices().to_mobile_dict(),
+            {"circuit.1.power": False},
+        )
+
+    def test_server_lost(self):
+        self.client.start()
+        self._wait_for_status(ConnectionStatus.CONNECTED)
+
+        self.server.stop()
+        self._wait_for_status(ConnectionStatus.DISCONNECTED)
+        self.assertFalse(self.client.set_circuit_level(3, 50))
+
+    def test_untrusted_server_refused(self):
+        self.client._trusted_uids = set()
+        refused = threading.Event()
+        with patch.object(self.client, "_logger") as mock_logger, patch.object(
+            self.client, "_handle_message"
+        ) as mock_handle_message:
+            mock_logger.error.side_effect = lambda _: refused.set()
+            self.client.start()
+            self.assertTrue(refused.wait(5))
+            self.client.stop()
+            mock_handle_message.assert_not_called()
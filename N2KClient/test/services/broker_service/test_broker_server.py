@@ -0,0 +1,326 @@
+import os
+import pickle
+import socket
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import reactivex as rx
+
+from N2KClient.n2kclient.models.common_enums import ConnectionStatus
+from N2KClient.n2kclient.models.dbus_connection_status import DBUSConnectionStatus
+from N2KClient.n2kclient.models.devices import N2kDevices
+from N2KClient.n2kclient.models.empower_system.alarm_list import AlarmList
+from N2KClient.n2kclient.models.empower_system.engine_alarm_list import (
+    EngineAlarmList,
+)
+from N2KClient.n2kclient.models.n2k_configuration.engine_configuration import (
+    EngineConfiguration,
+)
+from N2KClient.n2kclient.models.n2k_configuration.n2k_configuation import (
+    N2kConfiguration,
+)
+from N2KClient.n2kclient.services.broker_service.broker_protocol import (
+    BrokerProtocol,
+)
+from N2KClient.n2kclient.services.broker_service.broker_server import (
+    BrokerSubscriber,
+    N2KBrokerServer,
+)
+
+
+unpickled = threading.Event()
+
+
+def _mark_unpickled():
+    unpickled.set()
+
+
+class UnpickledCommand:
+    """
+    A command that records being unpickled.
+    """
+
+    def __reduce__(self):
+        return (_mark_unpickled, ())
+
+
+def make_client() -> MagicMock:
+    """
+    An N2KClient stand-in with the observables the broker server subscribes to.
+    """
+    client = MagicMock()
+    client.lock = threading.Lock()
+    client._n2k_dbus_connection_status = rx.subject.BehaviorSubject(
+        DBUSConnectionStatus(ConnectionStatus.CONNECTED, "", 0)
+    )
+    client.factory_metadata_subject = rx.subject.Subject()
+    client.get_factory_metadata_observable.return_value = (
+        client.factory_metadata_subject
+    )
+    client.empower_system_subject = rx.subject.Subject()
+    client.get_empower_system_observable.return_value = client.empower_system_subject
+    client.engine_list_subject = rx.subject.Subject()
+    client.get_engine_list_observable.return_value = client.engine_list_subject
+    client.get_alarms_observable.return_value = rx.subject.BehaviorSubject(
+        AlarmList()
+    )
+    client.get_engine_alarms_observable.return_value = rx.subject.BehaviorSubject(
+        EngineAlarmList()
+    )
+    client.mobile_changes_subject = rx.subject.Subject()
+    client.get_mobile_changes_observable.return_value = client.mobile_changes_subject
+    devices = N2kDevices()
+    devices.mobile_channels["circuit.1.power"] = True
+    client.get_latest_devices.return_value = devices
+    client.get_latest_config.return_value = N2kConfiguration()
+    client.get_latest_engine_config.return_value = EngineConfiguration()
+    return client
+
+
+class N2KBrokerServerTest(unittest.TestCase):
+    """
+    Unit tests for the N2KBrokerServer, with clients connected to its socket.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, "n2k", "broker.sock")
+        self.client = make_client()
+        self.server = N2KBrokerServer(self.client, socket_path=self.socket_path)
+        self.server.start()
+        self.connections = []
+
+    def tearDown(self):
+        for connection in self.connections:
+            connection.close()
+        self.server.stop()
+        self.directory.cleanup()
+
+    def _connect(self) -> socket.socket:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(5)
+        connection.connect(self.socket_path)
+        self.connections.append(connection)
+        return connection
+
+    def _read_initial_state(self, connection: socket.socket) -> dict:
+        """
+        Read the messages sent to a new client, up to the mobile channel values sent last.
+        """
+        states = {}
+        while True:
+            message = BrokerProtocol.read(connection)
+            if message[0] == BrokerProtocol.MOBILE_STATE:
+                states[BrokerProtocol.MOBILE_STATE] = message[1]
+                return states
+            self.assertEqual(message[0], BrokerProtocol.STATE)
+            states[message[1]] = message[2]
+
+    def test_new_client_receives_state(self):
+        self.client.empower_system_subject.on_next(MagicMock())
+
+        states = self._read_initial_state(self._connect())
+        self.assertEqual(
+            set(states),
+            {
+                BrokerProtocol.CONNECTION_STATUS,
+                BrokerProtocol.ALARMS,
+                BrokerProtocol.ENGINE_ALARMS,
+                BrokerProtocol.CONFIG,
+                BrokerProtocol.MOBILE_STATE,
+            },
+        )
+        self.assertEqual(
+            states[BrokerProtocol.CONNECTION_STATUS].connection_state,
+            ConnectionStatus.CONNECTED,
+        )
+        self.assertIsInstance(states[BrokerProtocol.CONFIG], N2kConfiguration)
+        self.assertEqual(
+            states[BrokerProtocol.MOBILE_STATE], {"circuit.1.power": True}
+        )
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o660)
+
+    def test_mobile_changes_sent(self):
+        connection = self._connect()
+        self._read_initial_state(connection)
+
+        self.client.mobile_changes_subject.on_next({"circuit.1.power": False})
+        self.assertEqual(
+            BrokerProtocol.read(connection),
+            (BrokerProtocol.MOBILE, {"circuit.1.power": False}),
+        )
+
+    def test_config_rebuilt_sends_mobile_state(self):
+        connection = self._connect()
+        self._read_initial_state(connection)
+
+        self.client.engine_list_subject.on_next(MagicMock())
+        message = BrokerProtocol.read(connection)
+        self.assertEqual(
+            message[:2], (BrokerProtocol.STATE, BrokerProtocol.ENGINE_CONFIG)
+        )
+        self.assertEqual(
+            BrokerProtocol.read(connection),
+            (BrokerProtocol.MOBILE_STATE, {"circuit.1.power": True}),
+        )
+
+    def test_call(self):
+        self.client.set_circuit_power_state.return_value = True
+        connection = self._connect()
+        self._read_initial_state(connection)
+
+        connection.sendall(
+            BrokerProtocol.encode_command(
+                (BrokerProtocol.CALL, 1, "set_circuit_power_state", (5, True))
+            )
+        )
+        self.assertEqual(
+            BrokerProtocol.read(connection), (BrokerProtocol.RESULT, 1, True)
+        )
+        self.client.set_circuit_power_state.assert_called_once_with(5, True)
+
+    def test_call_not_allowed(self):
+        connection = self._connect()
+        self._read_initial_state(connection)
+
+        connection.sendall(
+            BrokerProtocol.encode_command(
+                (BrokerProtocol.CALL, 2, "dispose_empower_system", ())
+            )
+        )
+        message = BrokerProtocol.read(connection)
+        self.assertEqual(message[:2], (BrokerProtocol.ERROR, 2))
+        self.client.dispose_empower_system.assert_not_called()
+
+    def test_call_error(self):
+        self.client.scan_marine_engines.side_effect = Exception("DBus error")
+        connection = self._connect()
+        self._read_initial_state(connection)
+
+        connection.sendall(
+            BrokerProtocol.encode_command(
+                (BrokerProtocol.CALL, 3, "scan_marine_engines", (True,))
+            )
+        )
+        self.assertEqual(
+            BrokerProtocol.read(connection), (BrokerProtocol.ERROR, 3, "DBus error")
+        )
+
+    def test_pickled_command_rejected(self):
+        connection = self._connect()
+        self._read_initial_state(connection)
+
+        data = pickle.dumps(UnpickledCommand())
+        connection.sendall(len(data).to_bytes(4, "big") + data)
+        with self.assertRaises(ConnectionError):
+            while True:
+                BrokerProtocol.read(connection)
+        self.assertFalse(unpickled.is_set())
+
+    def test_invalid_command_ignored(self):
+        self.client.request_state_snapshot.return_value = True
+        connection = self._connect()
+        self._read_initial_state(connection)
+
+        connection.sendall(
+            BrokerProtocol.encode_command(
+                (BrokerProtocol.CALL, 4, ["set_circuit_power_state"], [])
+            )
+        )
+        connection.sendall(
+            BrokerProtocol.encode_command(
+                (BrokerProtocol.CALL, 5, "request_state_snapshot", [])
+            )
+        )
+        self.assertEqual(
+            BrokerProtocol.read(connection), (BrokerProtocol.RESULT, 5, True)
+        )
+        self.client.set_circuit_power_state.assert_not_called()
+
+    def test_oversized_command_rejected(self):
+        connection = self._connect()
+        self._read_initial_state(connection)
+
+        connection.sendall((BrokerProtocol.max_frame_size + 1).to_bytes(4, "big"))
+        with self.assertRaises(ConnectionError):
+            while True:
+                BrokerProtocol.read(connection)
+
+    def test_socket_directory_mode(self):
+        directory = os.path.dirname(self.socket_path)
+        self.assertEqual(os.stat(directory).st_mode & 0o777, 0o750)
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o660)
+
+    def test_start_refuses_non_socket_path(self):
+        path = os.path.join(self.directory.name, "file")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("data")
+        server = N2KBrokerServer(make_client(), socket_path=path)
+        with self.assertRaises(FileExistsError):
+            server.start()
+        server.stop()
+        self.assertTrue(os.path.isfile(path))
+
+    def test_stop(self):
+        connection = self._connect()
+        self._read_initial_state(connection)
+        self.server.stop()
+
+        with self.assertRaises(ConnectionError):
+            while True:
+                BrokerProtocol.read(connection)
+        self.assertEqual(self.server.get_subscriber_count(), 0)
+
+
+class BrokerProtocolTest(unittest.TestCase):
+    """
+    Unit tests for the BrokerProtocol framing.
+    """
+
+    def setUp(self):
+        self.server_end, self.client_end = socket.socketpair()
+
+    def tearDown(self):
+        self.server_end.close()
+        self.client_end.close()
+
+    def test_round_trip(self):
+        self.server_end.sendall(BrokerProtocol.encode((BrokerProtocol.MOBILE, {})))
+        self.assertEqual(
+            BrokerProtocol.read(self.client_end), (BrokerProtocol.MOBILE, {})
+        )
+
+    def test_oversized_frame_refused(self):
+        self.server_end.sendall(
+            (BrokerProtocol.max_frame_size + 1).to_bytes(4, "big")
+        )
+        with self.assertRaises(ValueError):
+            BrokerProtocol.read(self.client_end)
+
+    def test_get_peer_uid(self):
+        self.assertEqual(BrokerProtocol.get_peer_uid(self.client_end), os.getuid())
+
+
+class BrokerSubscriberTest(unittest.TestCase):
+    """
+    Unit tests for the BrokerSubscriber.
+    """
+
+    def test_slow_client_disconnected(self):
+        connection = MagicMock()
+        on_close = MagicMock()
+        subscriber = BrokerSubscriber(
+            connection, queue_size=1, handle_request=MagicMock(), on_close=on_close
+        )
+        subscriber.send(b"frame1")
+        on_close.assert_not_called()
+
+        subscriber.send(b"frame2")
+        connection.close.assert_called_once()
+        on_close.assert_called_once_with(subscriber)
+
+        # Closed once
+        subscriber.close()
+        on_close.assert_called_once()
@@ -10,6 +10,10 @@ from N2KClient.n2kclient.models.empower_system.hub import Hub
 from N2KClient.n2kclient.models.n2k_configuration.dc import DCType
 from N2KClient.n2kclient.models.n2k_configuration.ac import ACType
 from N2KClient.n2kclient.models.n2k_configuration.tank import TankType
+from N2KClient.n2kclient.models.n2k_configuration.gnss import GNSSDevice
+from N2KClient.n2kclient.models.n2k_configuration.circuit import Circuit
+from N2KClient.n2kclient.models.n2k_configuration.instance import Instance
+from N2KClient.n2kclient.models.devices import N2kDevices
 
 
 class TestConfigProcessor(unittest.TestCase):
@@ -1210,6 +1214,161 @@ class TestConfigProcessor(unittest.TestCase):
             self.assertRaises(
                 Exception, config_processor.build_empower_system, config, n2k_devices
             )
+            self.assertFalse(config_processor.has_empower_system())
+
+    def _build_gnss_system(self, config_processor, gnss_configs, n2k_devices, **kwargs):
+        config = MagicMock(gnss=gnss_configs)
+        with patch.object(config_processor, "process_devices"), patch.object(
+            config_processor, "process_inverter_chargers"
+        ), patch.object(config_processor, "process_dc_meters"), patch.object(
+            config_processor, "process_ac_meters"
+        ), patch.object(
+            config_processor, "process_tanks"
+        ), patch.object(
+            config_processor, "process_hvac"
+        ), patch.object(
+            config_processor, "process_circuits"
+        ):
+            return config_processor.build_empower_system(config, n2k_devices, **kwargs)
+
+    def _gnss_config(self, name):
+        gnss = GNSSDevice()
+        gnss.id = 1
+        gnss.name_utf8 = name
+        return gnss
+
+    def test_build_empower_system_incremental(self):
+        def fake_gnss(gnss, n2k_devices):
+            name = gnss.name_utf8
+            return MagicMock(id=f"gnss.{name}", channels={f"gnss.{name}.cs": None})
+
+        config_processor = ConfigProcessor()
+        n2k_devices = MagicMock()
+        with patch(
+            "N2KClient.n2kclient.services.config_service.config_processor.config_processor.GNSS",
+            side_effect=fake_gnss,
+        ) as mock_gnss:
+            previous = self._build_gnss_system(
+                config_processor,
+                {1: self._gnss_config("a"), 2: self._gnss_config("b")},
+                n2k_devices,
+            )
+            self.assertTrue(config_processor.has_empower_system())
+            previous_a = previous.things["gnss.a"]
+            previous_b = previous.things["gnss.b"]
+
+            system = self._build_gnss_system(
+                config_processor,
+                {1: self._gnss_config("a"), 2: self._gnss_config("c")},
+                n2k_devices,
+                incremental=True,
+            )
+
+            self.assertEqual(mock_gnss.call_count, 3)
+            self.assertIs(system.things["gnss.a"], previous_a)
+            self.assertIn("gnss.c", system.things)
+            previous_a.dispose.assert_not_called()
+            previous_b.dispose.assert_called_once()
+            n2k_devices.remove_subscriptions.assert_called_once_with({"gnss.b.cs"})
+            self.assertEqual(previous.things, {})
+
+    def test_build_empower_system_incremental_devices_changed(self):
+        config_processor = ConfigProcessor()
+        with patch(
+            "N2KClient.n2kclient.services.config_service.config_processor.config_processor.GNSS"
+        ) as mock_gnss:
+            mock_gnss.side_effect = lambda gnss, n2k_devices: MagicMock(
+                id="gnss.a", channels={}
+            )
+            previous = self._build_gnss_system(
+                config_processor, {1: self._gnss_config("a")}, MagicMock()
+            )
+            previous_thing = previous.things["gnss.a"]
+            system = self._build_gnss_system(
+                config_processor,
+                {1: self._gnss_config("a")},
+                MagicMock(),
+                incremental=True,
+            )
+            self.assertEqual(mock_gnss.call_count, 2)
+            self.assertIsNot(system.things["gnss.a"], previous_thing)
+            previous_thing.dispose.assert_called_once()
+
+    def test_build_empower_system_incremental_removes_devices(self):
+        def gnss_config(id, instance):
+            gnss = GNSSDevice(instance=Instance(enabled=True, instance=instance))
+            gnss.id = id
+            gnss.name_utf8 = f"gnss {id}"
+            return gnss
+
+        config_processor = ConfigProcessor()
+        n2k_devices = N2kDevices()
+        self._build_gnss_system(
+            config_processor, {1: gnss_config(1, 0), 2: gnss_config(2, 1)}, n2k_devices
+        )
+        self.assertEqual(set(n2k_devices.devices.keys()), {"GNSS.0", "GNSS.1"})
+        self.assertEqual(config_processor.pop_removed_device_keys(), set())
+
+        system = self._build_gnss_system(
+            config_processor, {1: gnss_config(1, 0)}, n2k_devices, incremental=True
+        )
+
+        self.assertEqual(list(system.things.keys()), ["gnss.0"])
+        removed_device_keys = config_processor.pop_removed_device_keys()
+        self.assertEqual(removed_device_keys, {"GNSS.1"})
+        self.assertEqual(config_processor.pop_removed_device_keys(), set())
+        n2k_devices.remove_devices(removed_device_keys)
+        self.assertEqual(list(n2k_devices.devices.keys()), ["GNSS.0"])
+
+    def _rebuild_things(self, config_processor, thing_type, circuits, n2k_devices):
+        config_processor._reusable_things = config_processor._built_things
+        config_processor._built_things = {}
+        return [
+            config_processor._create_thing(thing_type, circuit, n2k_devices)
+            for circuit in circuits
+        ]
+
+    def test_create_thing_not_reused_when_serialization_fails(self):
+        # Circuits without a single throw id fail to serialize to anything but {}
+        circuit_a = Circuit(name_utf8="a", control_id=1)
+        circuit_b = Circuit(name_utf8="b", control_id=2)
+        self.assertEqual(circuit_a.to_dict(), circuit_b.to_dict())
+        config_processor = ConfigProcessor()
+        n2k_devices = MagicMock()
+        thing_type = MagicMock(side_effect=lambda circuit, devices: MagicMock())
+
+        previous = self._rebuild_things(
+            config_processor, thing_type, [circuit_a, circuit_b], n2k_devices
+        )
+        things = self._rebuild_things(
+            config_processor, thing_type, [circuit_b, circuit_a], n2k_devices
+        )
+
+        self.assertEqual(thing_type.call_count, 4)
+        self.assertNotIn(things[0], previous)
+        self.assertNotIn(things[1], previous)
+
+    def test_create_thing_not_swapped_when_serialized_the_same(self):
+        circuit_a = Circuit(name_utf8="a", control_id=1)
+        circuit_b = Circuit(name_utf8="b", control_id=2)
+        config_processor = ConfigProcessor()
+        n2k_devices = MagicMock()
+        thing_type = MagicMock(side_effect=lambda circuit, devices: MagicMock())
+
+        with patch.object(Circuit, "to_dict", return_value={"name": "circuit"}):
+            previous = self._rebuild_things(
+                config_processor, thing_type, [circuit_a, circuit_b], n2k_devices
+            )
+            things = self._rebuild_things(
+                config_processor,
+                thing_type,
+                [circuit_b, Circuit(name_utf8="a", control_id=1)],
+                n2k_devices,
+            )
+
+        self.assertEqual(thing_type.call_count, 2)
+        self.assertIs(things[0], previous[1])
+        self.assertIs(things[1], previous[0])
 
     def test_build_engine_list(self):
         config_processor = ConfigProcessor()
@@ -312,7 +312,9 @@ class TestConfigProcessorHelper(unittest.TestCase):
                     relationship_type=RelationshipType.Normal,
                 )
             ],
-            hidden_circuit={2: MagicMock(id=MagicMock(value=1234), control_id=444)},
+            hidden_circuit={
+                1234: MagicMock(id=MagicMock(value=1234), control_id=444)
+            },
             circuit={1: MagicMock(id=MagicMock(value=555), control_id=444)},
         )
         child_circuits = get_child_circuits(1, config)
@@ -352,6 +352,55 @@ class TestConfigService(unittest.TestCase):
             )
             mock_request_state_snapshot.assert_called_once()
 
+    def test_get_configuration_incremental(self):
+        """
+        Ensures devices and the empower system are kept once a system was built,
+        and the empower system is rebuilt incrementally
+        """
+        mock_get_latest_devices = MagicMock()
+        mock_set_devices = MagicMock()
+        mock_set_empower_system = MagicMock()
+        mock_dispose_empower_system = MagicMock()
+        mock_request_state_snapshot = MagicMock()
+        service = ConfigService(
+            MagicMock(),
+            MagicMock(),
+            mock_get_latest_devices,
+            set_devices=mock_set_devices,
+            set_config=MagicMock(),
+            set_empower_system=mock_set_empower_system,
+            dispose_empower_system=mock_dispose_empower_system,
+            request_state_snapshot=mock_request_state_snapshot,
+        )
+        mock_devices = MagicMock()
+        mock_get_latest_devices.return_value = mock_devices
+        with patch.object(
+            service, "_fetch_configuration", return_value=("", "", "")
+        ), patch.object(
+            service._config_parser, "parse_config"
+        ) as mock_parse_configuration, patch.object(
+            service._config_processor, "has_empower_system", return_value=True
+        ), patch.object(
+            service._config_processor, "build_empower_system"
+        ) as mock_build_empower_system, patch.object(
+            service._config_processor,
+            "pop_removed_device_keys",
+            return_value={"GNSS.1"},
+        ):
+            service.get_configuration()
+
+            mock_devices.dispose_devices.assert_not_called()
+            mock_devices.remove_devices.assert_called_once_with({"GNSS.1"})
+            mock_set_devices.assert_not_called()
+            mock_dispose_empower_system.assert_not_called()
+            mock_build_empower_system.assert_called_once_with(
+                mock_parse_configuration.return_value, mock_devices, incremental=True
+            )
+            mock_set_empower_system.assert_called_once_with(
+                mock_build_empower_system.return_value
+            )
+            mock_request_state_snapshot.assert_called_once()
+
     def test_get_configuration_exception(self):
         """
         Test exception handling in get_configuration
@@ -790,3 +839,45 @@ class TestConfigService(unittest.TestCase):
         res = service._scan_config_metadata()
         mock_dbus_proxy.get_setting.assert_called_once_with("Config")
         self.assertEqual(res, {})
+
+    def test_fetch_configuration_parallel(self):
+        """
+        Ensures the configuration is fetched through the async proxy when available
+        """
+        mock_dbus_proxy = MagicMock()
+        mock_async_dbus_proxy = MagicMock()
+        service = ConfigService(
+            mock_dbus_proxy,
+            MagicMock(),
+            MagicMock(),
+            async_dbus_proxy=mock_async_dbus_proxy,
+        )
+        mock_async_dbus_proxy.gather.return_value = ["categories", "config", "metadata"]
+        res = service._fetch_configuration()
+
+        self.assertEqual(res, ("categories", "config", "metadata"))
+        mock_async_dbus_proxy.get_categories.assert_called_once()
+        mock_async_dbus_proxy.get_config_all.assert_called_once()
+        mock_async_dbus_proxy.get_setting.assert_called_once_with("Config")
+        mock_dbus_proxy.get_categories.assert_not_called()
+
+    def test_fetch_configuration_parallel_fallback(self):
+        """
+        Ensures the configuration is fetched sequentially if the parallel fetch fails
+        """
+        mock_dbus_proxy = MagicMock()
+        mock_async_dbus_proxy = MagicMock()
+        service = ConfigService(
+            mock_dbus_proxy,
+            MagicMock(),
+            MagicMock(),
+            async_dbus_proxy=mock_async_dbus_proxy,
+        )
+        mock_async_dbus_proxy.gather.side_effect = Exception("Test error")
+        mock_dbus_proxy.get_categories.return_value = "categories"
+        mock_dbus_proxy.get_config_all.return_value = "config"
+        mock_dbus_proxy.get_setting.return_value = "metadata"
+        res = service._fetch_configuration()
+
+        self.assertEqual(res, ("categories", "config", "metadata"))
+        mock_dbus_proxy.get_setting.assert_called_once_with("Config")
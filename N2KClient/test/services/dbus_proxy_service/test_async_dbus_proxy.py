@@ -0,0 +1,165 @@
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+from N2KClient.n2kclient.services.dbus_proxy_service.async_dbus_proxy import (
+    AsyncDbusProxyService,
+)
+from N2KClient.n2kclient.services.dbus_proxy_service.dbus_proxy import (
+    DbusNotConnectedError,
+    DbusProxyService,
+)
+
+
+class TestAsyncDbusProxyService(unittest.TestCase):
+    """Unit test for the Async DBUS Proxy Service"""
+
+    def setUp(self):
+        self.dbus_proxy = DbusProxyService()
+        self.async_proxy = AsyncDbusProxyService(self.dbus_proxy)
+
+    def test_call_async_reply(self):
+        """
+        The future resolves with the reply passed to reply_handler
+        """
+
+        def method(*args, reply_handler, error_handler, timeout):
+            reply_handler("result")
+
+        self.dbus_proxy._dbus_get_config_all = MagicMock(side_effect=method)
+        future = self.async_proxy.get_config_all()
+        self.assertEqual(future.result(timeout=0), "result")
+        self.dbus_proxy._dbus_get_config_all.assert_called_once()
+
+    def test_call_async_reply_captured(self):
+        """
+        The reply is recorded in the capture while capturing
+        """
+
+        def method(*args, reply_handler, error_handler, timeout):
+            reply_handler("config")
+
+        self.dbus_proxy._capture = MagicMock()
+        self.dbus_proxy._dbus_get_setting = MagicMock(side_effect=method)
+        self.async_proxy.get_setting("Config").result(timeout=0)
+        self.dbus_proxy._capture.record_response.assert_called_once_with(
+            "GetSetting", ("Config",), "config"
+        )
+
+    def test_call_async_error(self):
+        """
+        The future fails with the error passed to error_handler, and a reconnect is requested
+        """
+        error = Exception("fail")
+
+        def method(*args, reply_handler, error_handler, timeout):
+            error_handler(error)
+
+        self.dbus_proxy._dbus_get_categories = MagicMock(side_effect=method)
+        with patch.object(
+            self.dbus_proxy._reconnect_supervisor, "request_reconnect"
+        ) as mock_request_reconnect:
+            future = self.async_proxy.get_categories()
+            self.assertIs(future.exception(timeout=0), error)
+            mock_request_reconnect.assert_called_once_with("fail")
+
+    def test_call_async_reconnecting(self):
+        """
+        The future fails fast with DbusNotConnectedError while reconnecting
+        """
+        self.dbus_proxy._dbus_control = MagicMock()
+        with patch.object(
+            self.dbus_proxy._reconnect_supervisor, "is_reconnecting", return_value=True
+        ):
+            future = self.async_proxy.control("{}")
+        self.assertIsInstance(future.exception(timeout=0), DbusNotConnectedError)
+        self.dbus_proxy._dbus_control.assert_not_called()
+
+    def test_call_async_send_exception(self):
+        """
+        The future fails if the call cannot be sent
+        """
+        self.dbus_proxy._dbus_alarm_list = MagicMock(side_effect=Exception("fail"))
+        future = self.async_proxy.alarm_list()
+        self.assertEqual(str(future.exception(timeout=0)), "fail")
+
+    def test_method_names(self):
+        """
+        Each method sends the matching DBus method with its arguments
+        """
+        for method_name, attr in [
+            ("get_config", "_dbus_get_config"),
+            ("get_config_all", "_dbus_get_config_all"),
+            ("get_categories", "_dbus_get_categories"),
+            ("get_setting", "_dbus_get_setting"),
+            ("control", "_dbus_control"),
+            ("alarm_list", "_dbus_alarm_list"),
+            ("alarm_acknowledge", "_dbus_alarm_acknowledge"),
+            ("single_snapshot", "_dbus_single_snapshot"),
+            ("put_file", "_dbus_put_file"),
+            ("operation", "_dbus_operation"),
+        ]:
+            with patch.object(self.async_proxy, "_call_async") as mock_call_async:
+                getattr(self.async_proxy, method_name)("arg")
+                mock_call_async.assert_called_once_with(attr, "arg")
+
+    def test_gather_results(self):
+        """
+        gather returns the results in order once all futures are done
+        """
+        futures = [Future(), Future()]
+        futures[0].set_result("a")
+        futures[1].set_result("b")
+        self.assertEqual(self.async_proxy.gather(*futures), ["a", "b"])
+
+    def test_gather_exception(self):
+        """
+        gather raises the error of a failed future
+        """
+        futures = [Future(), Future()]
+        futures[0].set_result("a")
+        futures[1].set_exception(ValueError("fail"))
+        with self.assertRaises(ValueError):
+            self.async_proxy.gather(*futures)
+
+    def test_gather_return_exceptions(self):
+        """
+        gather returns the error of failed and timed out futures in place of their result
+        """
+        futures = [Future(), Future(), Future()]
+        futures[0].set_result("a")
+        error = ValueError("fail")
+        futures[1].set_exception(error)
+        with patch.object(AsyncDbusProxyService, "_dbus_timeout", 0):
+            results = self.async_proxy.gather(*futures, return_exceptions=True)
+        self.assertEqual(results[:2], ["a", error])
+        self.assertIsInstance(results[2], TimeoutError)
+
+    def test_alarm_acknowledge_batch(self):
+        """
+        All acknowledge calls are sent before waiting, under the alarm acknowledge method lock
+        """
+        method_lock = self.dbus_proxy._get_method_lock("_dbus_alarm_acknowledge")
+        handlers = []
+
+        def method(*args, reply_handler, error_handler, timeout):
+            self.assertTrue(method_lock.locked())
+            handlers.append((reply_handler, error_handler))
+
+        def gather(*futures, return_exceptions):
+            self.assertEqual(len(handlers), 2)
+            handlers[0][0]('{"Result": "Ok"}')
+            handlers[1][1](Exception("fail"))
+            return AsyncDbusProxyService.gather(
+                self.async_proxy, *futures, return_exceptions=return_exceptions
+            )
+
+        self.dbus_proxy._dbus_alarm_acknowledge = MagicMock(side_effect=method)
+        with patch.object(
+            self.async_proxy, "gather", side_effect=gather
+        ), patch.object(self.dbus_proxy._reconnect_supervisor, "request_reconnect"):
+            results = self.async_proxy.alarm_acknowledge_batch(["a", "b"])
+
+        self.assertEqual(results[0], '{"Result": "Ok"}')
+        self.assertEqual(str(results[1]), "fail")
+        self.assertFalse(method_lock.locked())
@@ -1,9 +1,13 @@
+import time
 import unittest
 from unittest.mock import MagicMock, call, patch
 
 from N2KClient.n2kclient.models.common_enums import ConnectionStatus
 from N2KClient.n2kclient.models.dbus_connection_status import DBUSConnectionStatus
-from N2KClient.n2kclient.services.dbus_proxy_service.dbus_proxy import DbusProxyService
+from N2KClient.n2kclient.services.dbus_proxy_service.dbus_proxy import (
+    DbusNotConnectedError,
+    DbusProxyService,
+)
 import dbus
 
 
@@ -177,6 +181,67 @@ class TestDbusProxyService(unittest.TestCase):
                 "org.navico.HubN2K", "/org/navico/HubN2K"
             )
 
+    def test_connect_dbus_with_bus_address(self):
+        """
+        Test connect_dbus connects to the configured private bus instead of the system bus.
+        """
+        dbus_service = DbusProxyService(
+            MagicMock(), MagicMock(), MagicMock(), MagicMock()
+        )
+        dbus_service._dbus_bus_address = "unix:path=/tmp/n2k-load-test"
+
+        with patch.object(dbus_service, "_register_signal_handlers"), patch.object(
+            dbus_service, "_register_methods"
+        ), patch("dbus.bus.BusConnection") as mock_bus_connection, patch(
+            "dbus.SystemBus"
+        ) as mock_system_bus, patch(
+            "dbus.Interface"
+        ):
+            dbus_service._connect_dbus()
+            mock_bus_connection.assert_called_once_with("unix:path=/tmp/n2k-load-test")
+            mock_system_bus.assert_not_called()
+            self.assertEqual(dbus_service.bus, mock_bus_connection.return_value)
+
+    def test_register_signal_handlers_capturing(self):
+        """
+        Test signals are recorded in the capture before being queued while capturing.
+        """
+        dbus_service = DbusProxyService()
+        dbus_service._capture = MagicMock()
+        dbus_service._signal_dispatcher = MagicMock()
+        dbus_service.bus = MagicMock()
+
+        dbus_service._register_signal_handlers()
+        event_receiver = dbus_service.bus.add_signal_receiver.call_args_list[0][0][0]
+        snapshot_receiver = dbus_service.bus.add_signal_receiver.call_args_list[1][0][0]
+        event_receiver('{"Type": 1}')
+        snapshot_receiver("{}")
+
+        dbus_service._capture.record_signal.assert_has_calls(
+            [call("Event", '{"Type": 1}'), call("Snapshot", "{}")]
+        )
+        dbus_service._signal_dispatcher.enqueue_event.assert_called_once_with(
+            '{"Type": 1}'
+        )
+        dbus_service._signal_dispatcher.enqueue_snapshot.assert_called_once_with("{}")
+
+    def test_capture_response(self):
+        """
+        Test only the responses of the captured methods are recorded.
+        """
+        dbus_service = DbusProxyService()
+        dbus_service._capture = MagicMock()
+        dbus_service._dbus_get_config = MagicMock(return_value='{"Engines": []}')
+        dbus_service._dbus_control = MagicMock(return_value='{"Result": "Ok"}')
+
+        with patch.object(dbus_service, "_report_status"):
+            dbus_service._call_with_retry("_dbus_get_config", "Engines")
+            dbus_service._call_with_retry("_dbus_control", "{}")
+
+        dbus_service._capture.record_response.assert_called_once_with(
+            "GetConfig", ("Engines",), '{"Engines": []}'
+        )
+
     def test_register_signal_handlers(self):
         """
         Test _register_signal_handlers sets up the necessary signal handlers.
@@ -199,13 +264,13 @@ class TestDbusProxyService(unittest.TestCase):
 
         expected_calls = [
             call(
-                mock_event_handler,
+                dbus_service._signal_dispatcher.enqueue_event,
                 dbus_interface="org.navico.HubN2K.czone",
                 signal_name="Event",
                 path="/org/navico/HubN2K",
             ),
             call(
-                mock_snapshot_handler,
+                dbus_service._signal_dispatcher.enqueue_snapshot,
                 dbus_interface="org.navico.HubN2K.czone",
                 signal_name="Snapshot",
                 path="/org/navico/HubN2K",
@@ -216,6 +281,45 @@ class TestDbusProxyService(unittest.TestCase):
             expected_calls, any_order=True
         )
 
+    def test_dispatch_event(self):
+        """
+        Test _dispatch_event hands the payload to the event handler, if set.
+        """
+        mock_event_handler = MagicMock()
+        dbus_service = DbusProxyService(event_handler=mock_event_handler)
+        dbus_service._dispatch_event("{}")
+        mock_event_handler.assert_called_once_with("{}")
+
+        dbus_service.event_handler = None
+        dbus_service._dispatch_event("{}")
+
+    def test_dispatch_snapshot(self):
+        """
+        Test _dispatch_snapshot hands the payload to the snapshot handler, if set.
+        """
+        mock_snapshot_handler = MagicMock()
+        dbus_service = DbusProxyService(snapshot_handler=mock_snapshot_handler)
+        dbus_service._dispatch_snapshot("{}")
+        mock_snapshot_handler.assert_called_once_with("{}")
+
+        dbus_service.snapshot_handler = None
+        dbus_service._dispatch_snapshot("{}")
+
+    def test_get_signal_queue_metrics(self):
+        """
+        Test get_signal_queue_metrics returns the dispatcher metrics.
+        """
+        dbus_service = DbusProxyService()
+        self.assertEqual(
+            dbus_service.get_signal_queue_metrics(),
+            {
+                "queue_depth": 0,
+                "dropped_snapshots": 0,
+                "dropped_events": 0,
+                "processed_signals": 0,
+            },
+        )
+
     def test_register_methods(self):
         dbus_service = DbusProxyService()
         dbus_service.n2k_dbus_interface = MagicMock()
@@ -331,7 +435,7 @@ class TestDbusProxyService(unittest.TestCase):
 
     def test_call_with_retry_1_method_fail(self):
         """
-        On failure, the method should set status to false, and retry
+        On failure, the method should hand reconnection to the supervisor, and retry
         """
 
         mock_status_callback = MagicMock()
@@ -344,10 +448,9 @@ class TestDbusProxyService(unittest.TestCase):
             mock_snapshot_handler,
             mock_control_max_attempts,
         )
-        with patch.object(dbus_service, "_report_status") as mock_report_status, patch(
-            "N2KClient.n2kclient.services.dbus_proxy_service.dbus_proxy.sleep",
-            return_value=None,
-        ) as mock_sleep, patch.object(
+        with patch.object(dbus_service, "_report_status") as mock_report_status, patch.object(
+            dbus_service._reconnect_supervisor, "request_reconnect"
+        ) as mock_request_reconnect, patch.object(
             dbus_service, "_connect_dbus"
         ) as mock_connect_dbus:
             dbus_service._dbus_test_method = MagicMock(
@@ -356,48 +459,132 @@ class TestDbusProxyService(unittest.TestCase):
             result = dbus_service._call_with_retry("_dbus_test_method", max_attempts=2)
             self.assertEqual(result, "ok")
             self.assertEqual(dbus_service._dbus_test_method.call_count, 2)
-            mock_report_status.assert_any_call(False, "fail")
+            # The disconnected status is reported by the supervisor
+            self.assertNotIn(call(False, "fail"), mock_report_status.call_args_list)
             mock_report_status.assert_any_call(True)
-            mock_sleep.assert_called_with(dbus_service._dbus_retry_delay)
-            mock_connect_dbus.assert_called_once()
+            mock_request_reconnect.assert_called_once_with("fail")
+            mock_connect_dbus.assert_not_called()
 
-    def test_call_with_retry_1_method_fail_1_dbus_connect_fail(self):
+    def test_call_with_retry_reconnecting_bounded_fails_fast(self):
         """
-        On failure, the method should set status to false, and retry, fail connect_dbus and retry that too
+        While the supervisor is reconnecting, bounded calls raise DbusNotConnectedError without calling DBus
+        """
+
+        dbus_service = DbusProxyService()
+        dbus_service._dbus_test_method = MagicMock(return_value="ok")
+        with patch.object(
+            dbus_service._reconnect_supervisor, "is_reconnecting", return_value=True
+        ), patch.object(
+            dbus_service._reconnect_supervisor, "wait_connected"
+        ) as mock_wait_connected, self.assertRaises(DbusNotConnectedError):
+            dbus_service._call_with_retry("_dbus_test_method", max_attempts=3)
+        dbus_service._dbus_test_method.assert_not_called()
+        mock_wait_connected.assert_not_called()
+
+    def test_call_with_retry_reconnecting_bounded_retries(self):
+        """
+        A bounded call whose first attempt fails is sent again once the supervisor reconnected
+        """
+
+        dbus_service = DbusProxyService()
+        dbus_service._dbus_test_method = MagicMock(
+            side_effect=[dbus.exceptions.DBusException("fail"), "ok"]
+        )
+        with patch.object(
+            dbus_service._reconnect_supervisor, "request_reconnect"
+        ), patch.object(
+            dbus_service._reconnect_supervisor,
+            "is_reconnecting",
+            side_effect=[False, True],
+        ), patch.object(
+            dbus_service._reconnect_supervisor, "wait_connected", return_value=True
+        ) as mock_wait_connected, patch.object(
+            dbus_service, "_report_status"
+        ):
+            result = dbus_service._call_with_retry("_dbus_test_method", max_attempts=3)
+        self.assertEqual(result, "ok")
+        self.assertEqual(dbus_service._dbus_test_method.call_count, 2)
+        self.assertLessEqual(
+            mock_wait_connected.call_args[0][0], dbus_service._control_reconnect_grace
+        )
+
+    def test_control_bounded_while_reconnecting(self):
+        """
+        A control call whose attempt fails returns within the reconnect grace while the supervisor
+        keeps reconnecting, instead of waiting on every attempt
+        """
+
+        dbus_service = DbusProxyService(control_max_attempts=3)
+        dbus_service._control_reconnect_grace = 0.2
+        dbus_service._dbus_control = MagicMock(
+            side_effect=dbus.exceptions.DBusException("fail")
+        )
+        # The reconnect never completes
+        with patch.object(dbus_service._reconnect_supervisor, "_run"), patch.object(
+            dbus_service, "_report_status"
+        ):
+            start = time.monotonic()
+            with self.assertRaises(DbusNotConnectedError):
+                dbus_service.control("{}")
+            elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 1)
+        dbus_service._dbus_control.assert_called_once()
+
+    def test_call_with_retry_reports_disconnect_once(self):
+        """
+        A failed call reports the disconnected status once, through the supervisor
         """
 
         mock_status_callback = MagicMock()
-        mock_event_handler = MagicMock()
-        mock_snapshot_handler = MagicMock()
-        mock_control_max_attempts = MagicMock()
-        dbus_service = DbusProxyService(
-            mock_status_callback,
-            mock_event_handler,
-            mock_snapshot_handler,
-            mock_control_max_attempts,
+        dbus_service = DbusProxyService(mock_status_callback)
+        dbus_service._dbus_test_method = MagicMock(
+            side_effect=dbus.exceptions.DBusException("fail")
+        )
+        with patch.object(dbus_service._reconnect_supervisor, "_run"), self.assertRaises(
+            dbus.exceptions.DBusException
+        ):
+            dbus_service._call_with_retry("_dbus_test_method", max_attempts=1)
+        mock_status_callback.assert_called_once()
+        status = mock_status_callback.call_args[0][0]
+        self.assertEqual(status.connection_state, ConnectionStatus.DISCONNECTED)
+        self.assertEqual(status.reason, "fail")
+
+    def test_call_with_retry_reconnecting_unbounded_waits(self):
+        """
+        While the supervisor is reconnecting, unbounded calls wait for the connection before calling DBus
+        """
+
+        dbus_service = DbusProxyService()
+        dbus_service._dbus_test_method = MagicMock(return_value="ok")
+        with patch.object(
+            dbus_service._reconnect_supervisor, "is_reconnecting", return_value=True
+        ), patch.object(
+            dbus_service._reconnect_supervisor, "wait_connected", return_value=True
+        ) as mock_wait_connected, patch.object(
+            dbus_service, "_report_status"
+        ):
+            result = dbus_service._call_with_retry("_dbus_test_method")
+        self.assertEqual(result, "ok")
+        mock_wait_connected.assert_called_once()
+
+    def test_call_with_retry_different_methods_concurrent(self):
+        """
+        Calls to different methods use different locks, calls to the same method share one
+        """
+
+        dbus_service = DbusProxyService()
+        self.assertIsNot(
+            dbus_service._get_method_lock("_dbus_control"),
+            dbus_service._get_method_lock("_dbus_single_snapshot"),
+        )
+        self.assertIs(
+            dbus_service._get_method_lock("_dbus_control"),
+            dbus_service._get_method_lock("_dbus_control"),
         )
-        # Simulate _connect_dbus failing once, then succeeding
-        connect_dbus_side_effects = [Exception("connect fail"), None]
-        with patch.object(dbus_service, "_report_status") as mock_report_status, patch(
-            "N2KClient.n2kclient.services.dbus_proxy_service.dbus_proxy.sleep",
-            return_value=None,
-        ) as mock_sleep, patch.object(
-            dbus_service, "_connect_dbus", side_effect=connect_dbus_side_effects
-        ) as mock_connect_dbus:
-            dbus_service._dbus_test_method = MagicMock(
-                side_effect=[dbus.exceptions.DBusException("fail"), "ok"]
-            )
-            result = dbus_service._call_with_retry("_dbus_test_method", max_attempts=2)
-            self.assertEqual(result, "ok")
-            self.assertEqual(dbus_service._dbus_test_method.call_count, 2)
-            mock_report_status.assert_any_call(False, "fail")
-            mock_report_status.assert_any_call(True)
-            mock_sleep.assert_called_with(dbus_service._dbus_retry_delay)
-            self.assertEqual(mock_connect_dbus.call_count, 2)
 
     def test_call_with_retry_exceed_max_attempts(self):
         """
-        On failure, the method should set status to false. Exceeding max attempts stops attempts and raises exceptions
+        On failure, the method should hand reconnection to the supervisor. Exceeding max attempts stops attempts and raises exceptions
         """
 
         mock_status_callback = MagicMock()
@@ -414,6 +601,8 @@ class TestDbusProxyService(unittest.TestCase):
             "N2KClient.n2kclient.services.dbus_proxy_service.dbus_proxy.sleep",
             return_value=None,
         ) as mock_sleep, patch.object(
+            dbus_service._reconnect_supervisor, "request_reconnect"
+        ) as mock_request_reconnect, patch.object(
             dbus_service, "_connect_dbus"
         ) as mock_connect_dbus, self.assertRaises(
             dbus.exceptions.DBusException
@@ -422,9 +611,8 @@ class TestDbusProxyService(unittest.TestCase):
                 side_effect=[dbus.exceptions.DBusException("fail"), "ok"]
             )
             result = dbus_service._call_with_retry("_dbus_test_method", max_attempts=1)
-            self.assertEqual(result, "ok")
-            self.assertEqual(dbus_service._dbus_test_method.call_count, 1)
-            mock_report_status.assert_any_call(False, "fail")
+        self.assertEqual(dbus_service._dbus_test_method.call_count, 1)
+        mock_request_reconnect.assert_called_once_with("fail")
 
     def test_get_config(self):
         """
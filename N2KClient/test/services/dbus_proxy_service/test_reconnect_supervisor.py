@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from N2KClient.n2kclient.services.dbus_proxy_service.reconnect_supervisor import (
+    ReconnectSupervisor,
+)
+
+
+class TestReconnectSupervisor(unittest.TestCase):
+    """Unit tests for the ReconnectSupervisor"""
+
+    def setUp(self):
+        self.connect = MagicMock()
+        self.report_status = MagicMock()
+        self.supervisor = ReconnectSupervisor(
+            connect=self.connect,
+            report_status=self.report_status,
+            base_delay=0.5,
+            max_delay=4,
+        )
+
+    def test_init_not_reconnecting(self):
+        self.assertFalse(self.supervisor.is_reconnecting())
+        self.assertTrue(self.supervisor.wait_connected(timeout=0))
+
+    def test_backoff_delay(self):
+        """
+        Test the delay doubles each attempt, is capped, and is jittered within [delay / 2, delay].
+        """
+        for attempt, delay in [(0, 0.5), (1, 1), (2, 2), (3, 4), (10, 4)]:
+            backoff = self.supervisor._backoff_delay(attempt)
+            self.assertGreaterEqual(backoff, delay / 2)
+            self.assertLessEqual(backoff, delay)
+
+    def test_request_reconnect_single_thread(self):
+        """
+        Test a reconnect request while reconnecting does not start a second thread.
+        """
+        with patch(
+            "N2KClient.n2kclient.services.dbus_proxy_service.reconnect_supervisor.threading.Thread"
+        ) as mock_thread:
+            self.supervisor.request_reconnect("fail")
+            self.supervisor.request_reconnect("fail again")
+            mock_thread.assert_called_once()
+            mock_thread.return_value.start.assert_called_once()
+        self.assertTrue(self.supervisor.is_reconnecting())
+        self.report_status.assert_called_once_with(False, "fail")
+
+    def test_run_retries_until_connected(self):
+        """
+        Test the reconnect loop backs off on failure and reports the connection once re-established.
+        """
+        self.connect.side_effect = [Exception("fail"), Exception("fail"), None]
+        self.supervisor._connected.clear()
+        with patch(
+            "N2KClient.n2kclient.services.dbus_proxy_service.reconnect_supervisor.sleep"
+        ) as mock_sleep, patch.object(
+            self.supervisor, "_backoff_delay", side_effect=[0.1, 0.2, 0.3]
+        ) as mock_backoff:
+            self.supervisor._run()
+        self.assertEqual(self.connect.call_count, 3)
+        self.assertEqual(mock_backoff.call_count, 3)
+        mock_sleep.assert_called_with(0.3)
+        self.assertFalse(self.supervisor.is_reconnecting())
+        self.assertEqual(self.supervisor.reconnect_count, 1)
+        self.report_status.assert_called_once_with(True, "")
+
+    def test_reconnect_end_to_end(self):
+        """
+        Test a reconnect request re-establishes the connection on the background thread.
+        """
+        with patch(
+            "N2KClient.n2kclient.services.dbus_proxy_service.reconnect_supervisor.sleep"
+        ):
+            self.supervisor.request_reconnect("fail")
+            self.assertTrue(self.supervisor.wait_connected(timeout=5))
+        self.connect.assert_called_once()
+        self.assertIsNone(self.supervisor._thread)
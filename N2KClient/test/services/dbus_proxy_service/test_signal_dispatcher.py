@@ -0,0 +1,114 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from N2KClient.n2kclient.services.dbus_proxy_service.signal_dispatcher import (
+    SignalDispatcher,
+)
+
+
+class TestSignalDispatcher(unittest.TestCase):
+    """Unit tests for the SignalDispatcher"""
+
+    def setUp(self):
+        self.event_handler = MagicMock()
+        self.snapshot_handler = MagicMock()
+        self.dispatcher = SignalDispatcher(
+            event_handler=self.event_handler,
+            snapshot_handler=self.snapshot_handler,
+            max_queue_size=3,
+        )
+
+    def test_event_order_preserved(self):
+        """
+        Test events are handed out in the order they were received.
+        """
+        with patch.object(self.dispatcher, "_start_worker"):
+            self.dispatcher.enqueue_event("event1")
+            self.dispatcher.enqueue_event("event2")
+        self.assertEqual(
+            self.dispatcher._next_signal(), (self.event_handler, "event1")
+        )
+        self.assertEqual(
+            self.dispatcher._next_signal(), (self.event_handler, "event2")
+        )
+
+    def test_superseded_snapshot_dropped(self):
+        """
+        Test a queued snapshot is dropped when a newer one arrives, and the newer one is
+        handed out after the events received before it.
+        """
+        with patch.object(self.dispatcher, "_start_worker"):
+            self.dispatcher.enqueue_snapshot("snapshot1")
+            self.dispatcher.enqueue_event("event1")
+            self.dispatcher.enqueue_snapshot("snapshot2")
+        self.assertEqual(self.dispatcher.get_metrics()["queue_depth"], 2)
+        self.assertEqual(self.dispatcher.dropped_snapshots, 1)
+        self.assertEqual(
+            self.dispatcher._next_signal(), (self.event_handler, "event1")
+        )
+        self.assertEqual(
+            self.dispatcher._next_signal(), (self.snapshot_handler, "snapshot2")
+        )
+
+        with patch.object(self.dispatcher, "_start_worker"):
+            self.dispatcher.enqueue_snapshot("snapshot3")
+        self.assertEqual(
+            self.dispatcher._next_signal(), (self.snapshot_handler, "snapshot3")
+        )
+        self.assertEqual(self.dispatcher.dropped_snapshots, 1)
+
+    def test_superseded_snapshot_after_events(self):
+        """
+        Test a newer snapshot is queued after all the events received before it.
+        """
+        with patch.object(self.dispatcher, "_start_worker"):
+            self.dispatcher.enqueue_snapshot("snapshot1")
+            self.dispatcher.enqueue_event("event1")
+            self.dispatcher.enqueue_event("event2")
+            self.dispatcher.enqueue_snapshot("snapshot2")
+        signals = [self.dispatcher._next_signal() for _ in range(3)]
+        self.assertEqual(
+            signals,
+            [
+                (self.event_handler, "event1"),
+                (self.event_handler, "event2"),
+                (self.snapshot_handler, "snapshot2"),
+            ],
+        )
+        self.assertEqual(self.dispatcher.get_metrics()["queue_depth"], 0)
+
+    def test_queue_full_drops_event(self):
+        """
+        Test events received when the queue is full are dropped and counted.
+        """
+        with patch.object(self.dispatcher, "_start_worker"):
+            for index in range(4):
+                self.dispatcher.enqueue_event(f"event{index}")
+        metrics = self.dispatcher.get_metrics()
+        self.assertEqual(metrics["queue_depth"], 3)
+        self.assertEqual(metrics["dropped_events"], 1)
+
+    def test_stop(self):
+        """
+        Test _next_signal returns None once stopped.
+        """
+        self.dispatcher.stop()
+        self.assertIsNone(self.dispatcher._next_signal())
+
+    def test_worker_processes_signals(self):
+        """
+        Test the worker thread hands queued signals to their handlers, and survives handler errors.
+        """
+        done = threading.Event()
+        self.event_handler.side_effect = Exception("Test Exception")
+        self.snapshot_handler.side_effect = lambda _: done.set()
+        self.dispatcher.enqueue_event("event1")
+        self.dispatcher.enqueue_snapshot("snapshot1")
+        self.assertTrue(done.wait(timeout=5))
+        self.dispatcher.stop()
+        self.dispatcher._worker.join(timeout=5)
+
+        self.event_handler.assert_called_once_with("event1")
+        self.snapshot_handler.assert_called_once_with("snapshot1")
+        self.assertEqual(self.dispatcher.get_metrics()["processed_signals"], 2)
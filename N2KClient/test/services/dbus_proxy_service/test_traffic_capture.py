@@ -0,0 +1,83 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from N2KClient.n2kclient.services.dbus_proxy_service.traffic_capture import (
+    CAPTURE_START,
+    TrafficCapture,
+)
+
+
+class TrafficCaptureTest(unittest.TestCase):
+    """
+    Unit tests for the TrafficCapture class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "capture", "dbus.jsonl.gz")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record(self):
+        capture = TrafficCapture(path=self.path, max_size=1024 * 1024)
+        capture.record_response("GetConfig", ("Engines",), '{"Engines": []}')
+        capture.record_signal("Snapshot", '{"DC": {}}')
+        capture.close()
+
+        records = list(TrafficCapture.read(self.path))
+        self.assertEqual(
+            [record["signal"] for record in records],
+            [CAPTURE_START, "GetConfig.Engines", "Snapshot"],
+        )
+        self.assertEqual(records[2]["payload"], '{"DC": {}}')
+        self.assertLessEqual(records[1]["t"], records[2]["t"])
+
+    def test_rotate(self):
+        capture = TrafficCapture(path=self.path, max_size=2048)
+        capture.FLUSH_INTERVAL = 0
+        capture.record_response("GetConfigAll", (), '{"Circuits": []}')
+        for index in range(200):
+            capture.record_signal("Snapshot", f'{{"Sequence": {index}}}')
+        capture.close()
+
+        self.assertTrue(os.path.exists(f"{self.path}.1"))
+        records = list(TrafficCapture.read(self.path))
+        # The new file starts with the last responses, so it can be replayed on its own
+        self.assertEqual(
+            [record["signal"] for record in records[:2]],
+            [CAPTURE_START, "GetConfigAll"],
+        )
+        self.assertEqual(records[-1]["payload"], '{"Sequence": 199}')
+        self.assertLessEqual(
+            os.path.getsize(self.path) + os.path.getsize(f"{self.path}.1"), 2048 + 512
+        )
+
+    def test_read_truncated(self):
+        capture = TrafficCapture(path=self.path, max_size=1024 * 1024)
+        for index in range(100):
+            capture.record_signal("Snapshot", f'{{"Sequence": {index}}}')
+        capture.close()
+        with open(self.path, "rb") as file:
+            data = file.read()
+        with open(self.path, "wb") as file:
+            file.write(data[: len(data) // 2])
+
+        records = list(TrafficCapture.read(self.path))
+        self.assertLess(len(records), 101)
+        # The records up to the cut are intact
+        for index, record in enumerate(records[1:]):
+            self.assertEqual(record["payload"], f'{{"Sequence": {index}}}')
+
+    def test_write_error_stops_capture(self):
+        capture = TrafficCapture(path=self.path, max_size=1024 * 1024)
+        capture._file = gzip.open(os.path.join(self.directory.name, "closed.gz"), "wb")
+        capture._file.close()
+        capture.record_signal("Snapshot", "{}")
+        self.assertIsNone(capture._file)
+
+
+if __name__ == "__main__":
+    unittest.main()
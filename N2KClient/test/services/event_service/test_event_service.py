@@ -73,9 +73,11 @@ class EventServiceTest(unittest.TestCase):
             config_service=mock_config_service,
         )
         mock_parsed_event = MagicMock(type=eEventType.AlarmAdded)
-        with patch.object(EventParser, "parse_event", return_value=mock_parsed_event):
+        with patch.object(
+            EventParser, "parse_event", return_value=mock_parsed_event
+        ), patch.object(event_service, "_schedule_alarm_reload") as mock_schedule:
             event_service.event_handler("{}")
-            mock_alarm_service.load_active_alarms.assert_called_once()
+            mock_schedule.assert_called_once()
 
     def test_event_handler_alarm_removed(self):
         """
@@ -88,9 +90,11 @@ class EventServiceTest(unittest.TestCase):
             config_service=mock_config_service,
         )
         mock_parsed_event = MagicMock(type=eEventType.AlarmRemoved)
-        with patch.object(EventParser, "parse_event", return_value=mock_parsed_event):
+        with patch.object(
+            EventParser, "parse_event", return_value=mock_parsed_event
+        ), patch.object(event_service, "_schedule_alarm_reload") as mock_schedule:
             event_service.event_handler("{}")
-            mock_alarm_service.load_active_alarms.assert_called_once()
+            mock_schedule.assert_called_once()
 
     def test_event_handler_alarm_changed(self):
         """
@@ -103,9 +107,11 @@ class EventServiceTest(unittest.TestCase):
             config_service=mock_config_service,
         )
         mock_parsed_event = MagicMock(type=eEventType.AlarmChanged)
-        with patch.object(EventParser, "parse_event", return_value=mock_parsed_event):
+        with patch.object(
+            EventParser, "parse_event", return_value=mock_parsed_event
+        ), patch.object(event_service, "_schedule_alarm_reload") as mock_schedule:
             event_service.event_handler("{}")
-            mock_alarm_service.load_active_alarms.assert_called_once()
+            mock_schedule.assert_called_once()
 
     def test_event_handler_alarm_activated(self):
         """
@@ -118,9 +124,11 @@ class EventServiceTest(unittest.TestCase):
             config_service=mock_config_service,
         )
         mock_parsed_event = MagicMock(type=eEventType.AlarmActivated)
-        with patch.object(EventParser, "parse_event", return_value=mock_parsed_event):
+        with patch.object(
+            EventParser, "parse_event", return_value=mock_parsed_event
+        ), patch.object(event_service, "_schedule_alarm_reload") as mock_schedule:
             event_service.event_handler("{}")
-            mock_alarm_service.load_active_alarms.assert_called_once()
+            mock_schedule.assert_called_once()
 
     def test_event_handler_alarm_deactivated(self):
         """
@@ -133,9 +141,11 @@ class EventServiceTest(unittest.TestCase):
             config_service=mock_config_service,
         )
         mock_parsed_event = MagicMock(type=eEventType.AlarmDeactivated)
-        with patch.object(EventParser, "parse_event", return_value=mock_parsed_event):
+        with patch.object(
+            EventParser, "parse_event", return_value=mock_parsed_event
+        ), patch.object(event_service, "_schedule_alarm_reload") as mock_schedule:
             event_service.event_handler("{}")
-            mock_alarm_service.load_active_alarms.assert_called_once()
+            mock_schedule.assert_called_once()
 
     def test_event_handler_exception(self):
         """
@@ -152,3 +162,61 @@ class EventServiceTest(unittest.TestCase):
         ):
             res = event_service.event_handler("{}")
             self.assertEqual(res, None)
+
+    def test_schedule_alarm_reload_coalesces(self):
+        """
+        Test that a burst of alarm events produces a single reload.
+        """
+        mock_alarm_service = MagicMock()
+        mock_config_service = MagicMock()
+        event_service = EventService(
+            alarm_service=mock_alarm_service,
+            config_service=mock_config_service,
+        )
+        event_service._alarm_reload_window = 0.5
+        with patch(
+            "N2KClient.n2kclient.services.event_service.event_service.threading.Timer"
+        ) as mock_timer:
+            for _ in range(5):
+                event_service._schedule_alarm_reload()
+            mock_timer.assert_called_once_with(0.5, event_service._reload_alarms)
+            mock_timer.return_value.start.assert_called_once()
+            mock_alarm_service.load_active_alarms.assert_not_called()
+
+            event_service._reload_alarms()
+            mock_alarm_service.load_active_alarms.assert_called_once()
+            self.assertEqual(event_service.get_coalesced_alarm_event_count(), 4)
+            self.assertIsNone(event_service._alarm_reload_timer)
+
+            event_service._schedule_alarm_reload()
+            self.assertEqual(mock_timer.call_count, 2)
+
+    def test_schedule_alarm_reload_no_window(self):
+        """
+        Test that alarms are reloaded immediately when the window is 0.
+        """
+        mock_alarm_service = MagicMock()
+        mock_config_service = MagicMock()
+        event_service = EventService(
+            alarm_service=mock_alarm_service,
+            config_service=mock_config_service,
+        )
+        event_service._alarm_reload_window = 0
+        event_service._schedule_alarm_reload()
+        mock_alarm_service.load_active_alarms.assert_called_once()
+        self.assertEqual(event_service.get_coalesced_alarm_event_count(), 0)
+
+    def test_reload_alarms_exception(self):
+        """
+        Test that a failed reload is logged and does not raise.
+        """
+        mock_alarm_service = MagicMock()
+        mock_config_service = MagicMock()
+        event_service = EventService(
+            alarm_service=mock_alarm_service,
+            config_service=mock_config_service,
+        )
+        mock_alarm_service.load_active_alarms.side_effect = Exception("Test Exception")
+        event_service._pending_alarm_events = 1
+        event_service._reload_alarms()
+        self.assertEqual(event_service._pending_alarm_events, 0)
@@ -0,0 +1,106 @@
+import unittest
+
+from N2KClient.n2kclient.services.snapshot_service.snapshot_decoder import (
+    SnapshotDecoder,
+)
+
+
+class TestSnapshotDecoder(unittest.TestCase):
+    """
+    Unit tests for SnapshotDecoder
+    """
+
+    def test_decode_sections(self):
+        """
+        Ensures channels are yielded for configured devices in every state section.
+        """
+        snapshot_dict = {
+            "Circuits": {"Circuit.1": {"Level": 1}},
+            "Tanks": {"Tank.1": {"Level": 2}},
+            "Engines": {"Engine.1": {"Speed": 3}},
+            "DC": {"DC.1": {"Voltage": 4}},
+            "HVACs": {"HVAC.1": {"Mode": 5}},
+            "InverterChargers": {"InverterCharger.1": {"State": 6}},
+            "GNSS": {"GNSS.1": {"Fix": 7}},
+            "BinaryLogicState": {"BLS.1": {"State": 8}},
+        }
+        configured_ids = {
+            "Circuit.1",
+            "Tank.1",
+            "Engine.1",
+            "DC.1",
+            "HVAC.1",
+            "InverterCharger.1",
+            "GNSS.1",
+            "BLS.1",
+        }
+        res = list(SnapshotDecoder.decode(snapshot_dict, configured_ids))
+
+        self.assertCountEqual(
+            res,
+            [
+                ("Circuit.1", "Level", 1),
+                ("Tank.1", "Level", 2),
+                ("Engine.1", "Speed", 3),
+                ("DC.1", "Voltage", 4),
+                ("HVAC.1", "Mode", 5),
+                ("InverterCharger.1", "State", 6),
+                ("GNSS.1", "Fix", 7),
+                ("BLS.1", "State", 8),
+            ],
+        )
+
+    def test_decode_ac_lines(self):
+        """
+        Ensures AC line channels are yielded as {channel_id}.{line_id}.
+        """
+        snapshot_dict = {
+            "AC": {
+                "AC.1": {
+                    "AClines": {
+                        "1": {"Voltage": 120},
+                        "2": {"Voltage": 121, "Current": 3},
+                    }
+                }
+            }
+        }
+        res = list(SnapshotDecoder.decode(snapshot_dict, {"AC.1"}))
+
+        self.assertCountEqual(
+            res,
+            [
+                ("AC.1", "Voltage.1", 120),
+                ("AC.1", "Voltage.2", 121),
+                ("AC.1", "Current.2", 3),
+            ],
+        )
+
+    def test_decode_ac_lines_none(self):
+        """
+        Ensures AC devices without line state yield nothing.
+        """
+        snapshot_dict = {"AC": {"AC.1": {"AClines": None}, "AC.2": {}}}
+        res = list(SnapshotDecoder.decode(snapshot_dict, {"AC.1", "AC.2"}))
+
+        self.assertEqual(res, [])
+
+    def test_decode_skips_unconfigured_ids(self):
+        """
+        Ensures devices that are not configured are skipped.
+        """
+        snapshot_dict = {
+            "DC": {"DC.1": {"Voltage": 4}, "DC.2": {"Voltage": 5}},
+            "Circuits": {"Circuit.1": {"Level": 1}},
+        }
+        res = list(SnapshotDecoder.decode(snapshot_dict, {"DC.2"}))
+
+        self.assertEqual(res, [("DC.2", "Voltage", 5)])
+
+    def test_decode_skips_unknown_sections(self):
+        """
+        Ensures sections that do not hold device state are skipped.
+        """
+        snapshot_dict = {"Alarms": {"DC.1": {"Voltage": 4}}, "DC": None}
+        res = list(SnapshotDecoder.decode(snapshot_dict, {"DC.1"}))
+
+        self.assertEqual(res, [])
@@ -3,9 +3,11 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 from N2KClient.n2kclient.models.common_enums import N2kDeviceType
+from N2KClient.n2kclient.models.devices import ChangeSet, N2kDevice, N2kDevices
 from N2KClient.n2kclient.services.snapshot_service.snapshot_service import (
     SnapshotService,
 )
+from N2KClient.n2kclient.util.tracing import PipelineTracer
 
 
 class SnapshotServiceTest(unittest.TestCase):
@@ -57,8 +59,7 @@ class SnapshotServiceTest(unittest.TestCase):
     def test_snapshot_handler_engine_config(self):
         """
         Test the snapshot handler.
-        Ensures that process_state_from_snapshot is called with the correct arguments.
-        Ensures _merge_state_update is called with the correct arguments.
+        Ensures _merge_snapshot is called with the correct arguments.
         Ensures _process_engine_alarms_from_snapshot is called with the correct arguments, if latest engine config resolves to not None
         """
 
@@ -80,8 +81,8 @@ class SnapshotServiceTest(unittest.TestCase):
         with patch.object(
             snapshot_service, "_start_snapshot_timer"
         ) as mock_start_snapshot_timer, patch.object(
-            snapshot_service, "_merge_state_update"
-        ) as mock_merge_state_update:
+            snapshot_service, "_merge_snapshot"
+        ) as mock_merge_snapshot:
             snapshot_json = "{}"
             mock_get_latest_engine_config.return_value = MagicMock()
             snapshot_service.snapshot_handler(snapshot_json)
@@ -91,13 +92,68 @@ class SnapshotServiceTest(unittest.TestCase):
             mock_process_engine_alarms_from_snapshot.assert_called_once_with(
                 json.loads(snapshot_json)
             )
-            mock_merge_state_update.assert_called_once_with(json.loads(snapshot_json))
+            mock_merge_snapshot.assert_called_once_with(json.loads(snapshot_json))
+
+    def test_snapshot_handler_tracing(self):
+        """
+        Test the snapshot handler traces its stages when tracing is enabled, even if the snapshot fails.
+        """
+        snapshot_service = SnapshotService(
+            dbus_proxy=MagicMock(),
+            lock=MagicMock(),
+            get_latest_devices=MagicMock(return_value=N2kDevices()),
+            set_devices=MagicMock(),
+            get_latest_engine_config=MagicMock(),
+            process_engine_alarms_from_snapshot=MagicMock(),
+        )
+        tracer = PipelineTracer(enabled=True, dump_interval=0)
+
+        with patch.object(snapshot_service, "_start_snapshot_timer"), patch(
+            "N2KClient.n2kclient.services.snapshot_service.snapshot_service.pipeline_tracer",
+            tracer,
+        ):
+            snapshot_service.snapshot_handler("{}")
+            snapshot_service.snapshot_handler("invalid")
+
+        stats = tracer.get_stats()
+        self.assertEqual(
+            list(stats.keys()), ["decode", "engine_alarms", "merge", "publish", "total"]
+        )
+        self.assertEqual(stats["decode"]["count"], 2)
+        self.assertEqual(stats["merge"]["count"], 1)
+        self.assertEqual(stats["total"]["count"], 2)
+
+    def test_snapshot_handler_tracing_sent_time(self):
+        """
+        Test the snapshot handler records the transport and end to end latency of stamped snapshots.
+        """
+        snapshot_service = SnapshotService(
+            dbus_proxy=MagicMock(),
+            lock=MagicMock(),
+            get_latest_devices=MagicMock(return_value=N2kDevices()),
+            set_devices=MagicMock(),
+            get_latest_engine_config=MagicMock(return_value=None),
+            process_engine_alarms_from_snapshot=MagicMock(),
+        )
+        tracer = PipelineTracer(enabled=True, dump_interval=0)
+
+        with patch.object(snapshot_service, "_start_snapshot_timer"), patch(
+            "N2KClient.n2kclient.services.snapshot_service.snapshot_service.pipeline_tracer",
+            tracer,
+        ), patch(
+            "N2KClient.n2kclient.services.snapshot_service.snapshot_service.time.time_ns",
+            side_effect=[3_000_000, 5_000_000],
+        ):
+            snapshot_service.snapshot_handler('{"SentTime": 1000000}')
+
+        stats = tracer.get_stats()
+        self.assertEqual(stats["transport"]["max_ms"], 2.0)
+        self.assertEqual(stats["end_to_end"]["max_ms"], 4.0)
 
     def test_snapshot_handler_engine_config_none(self):
         """
         Test the snapshot handler.
-        Ensures that process_state_from_snapshot is called with the correct arguments.
-        Ensures _merge_state_update is called with the correct arguments.
+        Ensures _merge_snapshot is called with the correct arguments.
         Ensures _process_engine_alarms_from_snapshot is called with the correct arguments, if latest engine config resolves to not None
         """
 
@@ -119,8 +175,8 @@ class SnapshotServiceTest(unittest.TestCase):
         with patch.object(
             snapshot_service, "_start_snapshot_timer"
         ) as mock_start_snapshot_timer, patch.object(
-            snapshot_service, "_merge_state_update"
-        ) as mock_merge_state_update:
+            snapshot_service, "_merge_snapshot"
+        ) as mock_merge_snapshot:
             snapshot_json = "{}"
             mock_get_latest_engine_config.return_value = None
             snapshot_service.snapshot_handler(snapshot_json)
@@ -128,7 +184,7 @@ class SnapshotServiceTest(unittest.TestCase):
             mock_start_snapshot_timer.assert_called_once()
             mock_get_latest_engine_config.assert_called_once()
             mock_process_engine_alarms_from_snapshot.assert_not_called()
-            mock_merge_state_update.assert_called_once_with(json.loads(snapshot_json))
+            mock_merge_snapshot.assert_called_once_with(json.loads(snapshot_json))
 
     def test_snapshot_handler_exception(self):
         """
@@ -153,130 +209,17 @@ class SnapshotServiceTest(unittest.TestCase):
         with patch.object(
             snapshot_service, "_start_snapshot_timer"
         ) as mock_start_snapshot_timer, patch.object(
-            snapshot_service, "_merge_state_update"
-        ) as mock_merge_state_update:
+            snapshot_service, "_merge_snapshot"
+        ) as mock_merge_snapshot:
             snapshot_json = "{}"
             mock_start_snapshot_timer.side_effect = Exception("Test Exception")
             res = snapshot_service.snapshot_handler(snapshot_json)
             self.assertIsNone(res)
 
-    def test_state_from_snapshot_circuits(self):
-        """
-        Test the state extraction from the snapshot.
-        Ensures states are added and parsed properly to state structure.
-        Circuit
-        """
-
-        mock_dbus_service = MagicMock()
-        mock_lock = MagicMock()
-        mock_get_latest_devices = MagicMock()
-        mock_set_devices = MagicMock()
-        mock_get_latest_engine_config = MagicMock()
-        mock_process_engine_alarms_from_snapshot = MagicMock()
-        snapshot_service = SnapshotService(
-            dbus_proxy=mock_dbus_service,
-            lock=mock_lock,
-            get_latest_devices=mock_get_latest_devices,
-            set_devices=mock_set_devices,
-            get_latest_engine_config=mock_get_latest_engine_config,
-            process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
-        )
-
-        mock_snapshot_dict = {"Circuits": {"Circuit.1": {"TEST"}}}
-        res = snapshot_service._process_state_from_snapshot(mock_snapshot_dict)
-
-        self.assertIn("Circuit.1", res)
-        self.assertEqual(res["Circuit.1"], {"TEST"})
-
-    def test_state_from_snapshot_tank(self):
-        """
-        Test the state extraction from the snapshot.
-        Ensures states are added and parsed properly to state structure.
-        Tank
-        """
-
-        mock_dbus_service = MagicMock()
-        mock_lock = MagicMock()
-        mock_get_latest_devices = MagicMock()
-        mock_set_devices = MagicMock()
-        mock_get_latest_engine_config = MagicMock()
-        mock_process_engine_alarms_from_snapshot = MagicMock()
-        snapshot_service = SnapshotService(
-            dbus_proxy=mock_dbus_service,
-            lock=mock_lock,
-            get_latest_devices=mock_get_latest_devices,
-            set_devices=mock_set_devices,
-            get_latest_engine_config=mock_get_latest_engine_config,
-            process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
-        )
-
-        mock_snapshot_dict = {"Tanks": {"Tank.1": {"TEST"}}}
-        res = snapshot_service._process_state_from_snapshot(mock_snapshot_dict)
-
-        self.assertIn("Tank.1", res)
-        self.assertEqual(res["Tank.1"], {"TEST"})
-
-    def test_state_from_snapshot_engines(self):
-        """
-        Test the state extraction from the snapshot.
-        Ensures states are added and parsed properly to state structure.
-        Engines
-        """
-
-        mock_dbus_service = MagicMock()
-        mock_lock = MagicMock()
-        mock_get_latest_devices = MagicMock()
-        mock_set_devices = MagicMock()
-        mock_get_latest_engine_config = MagicMock()
-        mock_process_engine_alarms_from_snapshot = MagicMock()
-        snapshot_service = SnapshotService(
-            dbus_proxy=mock_dbus_service,
-            lock=mock_lock,
-            get_latest_devices=mock_get_latest_devices,
-            set_devices=mock_set_devices,
-            get_latest_engine_config=mock_get_latest_engine_config,
-            process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
-        )
-
-        mock_snapshot_dict = {"Engines": {"Engine.1": {"TEST"}}}
-        res = snapshot_service._process_state_from_snapshot(mock_snapshot_dict)
-
-        self.assertIn("Engine.1", res)
-        self.assertEqual(res["Engine.1"], {"TEST"})
-
-    def test_state_from_snapshot_ac(self):
-        """
-        Test the state extraction from the snapshot.
-        Ensures states are added and parsed properly to state structure.
-        AC
-        """
-
-        mock_dbus_service = MagicMock()
-        mock_lock = MagicMock()
-        mock_get_latest_devices = MagicMock()
-        mock_set_devices = MagicMock()
-        mock_get_latest_engine_config = MagicMock()
-        mock_process_engine_alarms_from_snapshot = MagicMock()
-        snapshot_service = SnapshotService(
-            dbus_proxy=mock_dbus_service,
-            lock=mock_lock,
-            get_latest_devices=mock_get_latest_devices,
-            set_devices=mock_set_devices,
-            get_latest_engine_config=mock_get_latest_engine_config,
-            process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
-        )
-
-        mock_snapshot_dict = {"AC": {"AC.1": {"TEST"}}}
-        res = snapshot_service._process_state_from_snapshot(mock_snapshot_dict)
-
-        self.assertIn("AC.1", res)
-        self.assertEqual(res["AC.1"], {"TEST"})
-
-    def test_state_from_snapshot_dc(self):
+    def test_merge_snapshot(self):
         """
-        Test the state extraction from the snapshot.
-        Ensures states are added and parsed properly to state structure.
-        DC
+        Test merge snapshot
+        Non AC, ensure nonac state properly updated
         """
 
         mock_dbus_service = MagicMock()
@@ -293,46 +236,21 @@ class SnapshotServiceTest(unittest.TestCase):
             get_latest_engine_config=mock_get_latest_engine_config,
             process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
         )
-
-        mock_snapshot_dict = {"DC": {"DC.1": {"TEST"}}}
-        res = snapshot_service._process_state_from_snapshot(mock_snapshot_dict)
-
-        self.assertIn("DC.1", res)
-        self.assertEqual(res["DC.1"], {"TEST"})
-
-    def test_state_from_snapshot_hvac(self):
-        """
-        Test the state extraction from the snapshot.
-        Ensures states are added and parsed properly to state structure.
-        Hvac
-        """
-
-        mock_dbus_service = MagicMock()
-        mock_lock = MagicMock()
-        mock_get_latest_devices = MagicMock()
-        mock_set_devices = MagicMock()
-        mock_get_latest_engine_config = MagicMock()
-        mock_process_engine_alarms_from_snapshot = MagicMock()
-        snapshot_service = SnapshotService(
-            dbus_proxy=mock_dbus_service,
-            lock=mock_lock,
-            get_latest_devices=mock_get_latest_devices,
-            set_devices=mock_set_devices,
-            get_latest_engine_config=mock_get_latest_engine_config,
-            process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
+        snapshot_dict = {"DC": {"dc.1": {"voltage": "TEST"}}}
+        mock_device = MagicMock(type=N2kDeviceType.DC)
+        mock_get_latest_devices.return_value = MagicMock(
+            devices={"dc.1": mock_device}, engine_devices={}
         )
+        snapshot_service._merge_snapshot(snapshot_dict)
 
-        mock_snapshot_dict = {"HVACs": {"hvac.1": {"TEST"}}}
-        res = snapshot_service._process_state_from_snapshot(mock_snapshot_dict)
+        mock_device.update_channel.assert_called_once_with("voltage", "TEST")
 
-        self.assertIn("hvac.1", res)
-        self.assertEqual(res["hvac.1"], {"TEST"})
+        mock_set_devices.assert_called_once()
 
-    def test_state_from_snapshot_inverter_chargers(self):
+    def test_merge_snapshot_change_set(self):
         """
-        Test the state extraction from the snapshot.
-        Ensures states are added and parsed properly to state structure.
-        Inverter Chargers
+        Test merge snapshot
+        Only channels whose value changed are reported in the ChangeSet
         """
 
         mock_dbus_service = MagicMock()
@@ -341,6 +259,7 @@ class SnapshotServiceTest(unittest.TestCase):
         mock_set_devices = MagicMock()
         mock_get_latest_engine_config = MagicMock()
         mock_process_engine_alarms_from_snapshot = MagicMock()
+        mock_set_device_changes = MagicMock()
         snapshot_service = SnapshotService(
             dbus_proxy=mock_dbus_service,
             lock=mock_lock,
@@ -348,47 +267,34 @@ class SnapshotServiceTest(unittest.TestCase):
             set_devices=mock_set_devices,
             get_latest_engine_config=mock_get_latest_engine_config,
             process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
+            set_device_changes=mock_set_device_changes,
         )
-
-        mock_snapshot_dict = {"InverterChargers": {"inverter_charger.1": {"TEST"}}}
-        res = snapshot_service._process_state_from_snapshot(mock_snapshot_dict)
-
-        self.assertIn("inverter_charger.1", res)
-        self.assertEqual(res["inverter_charger.1"], {"TEST"})
-
-    def test_state_from_snapshot_gnss(self):
-        """
-        Test the state extraction from the snapshot.
-        Ensures states are added and parsed properly to state structure.
-        GNSS
-        """
-
-        mock_dbus_service = MagicMock()
-        mock_lock = MagicMock()
-        mock_get_latest_devices = MagicMock()
-        mock_set_devices = MagicMock()
-        mock_get_latest_engine_config = MagicMock()
-        mock_process_engine_alarms_from_snapshot = MagicMock()
-        snapshot_service = SnapshotService(
-            dbus_proxy=mock_dbus_service,
-            lock=mock_lock,
-            get_latest_devices=mock_get_latest_devices,
-            set_devices=mock_set_devices,
-            get_latest_engine_config=mock_get_latest_engine_config,
-            process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
+        dc_device = N2kDevice(type=N2kDeviceType.DC)
+        dc_device.channels["voltage"] = 12.0
+        ac_device = N2kDevice(type=N2kDeviceType.AC)
+        engine_device = N2kDevice(type=N2kDeviceType.ENGINE)
+        engine_device.channels["speed"] = 1000
+        mock_get_latest_devices.return_value = MagicMock(
+            devices={"dc.1": dc_device, "ac.1": ac_device},
+            engine_devices={"engine.1": engine_device},
         )
+        snapshot_dict = {
+            "DC": {"dc.1": {"voltage": 12.0, "current": 1.5}},
+            "AC": {"ac.1": {"AClines": {1: {"voltage": 120}}}},
+            "Engines": {"engine.1": {"speed": 1000}},
+        }
+        snapshot_service._merge_snapshot(snapshot_dict)
+
+        expected = ChangeSet()
+        expected.add("dc.1", "current")
+        expected.add("ac.1", "voltage.1")
+        mock_set_device_changes.assert_called_once_with(expected)
+        mock_set_devices.assert_called_once()
 
-        mock_snapshot_dict = {"GNSS": {"gnss.1": {"TEST"}}}
-        res = snapshot_service._process_state_from_snapshot(mock_snapshot_dict)
-
-        self.assertIn("gnss.1", res)
-        self.assertEqual(res["gnss.1"], {"TEST"})
-
-    def test_state_from_snapshot_bls(self):
+    def test_merge_snapshot_mobile_changes(self):
         """
-        Test the state extraction from the snapshot.
-        Ensures states are added and parsed properly to state structure.
-        BLS
+        Test merge snapshot
+        Mobile channel deltas are published once per snapshot, and only when not empty
         """
 
         mock_dbus_service = MagicMock()
@@ -397,6 +303,7 @@ class SnapshotServiceTest(unittest.TestCase):
         mock_set_devices = MagicMock()
         mock_get_latest_engine_config = MagicMock()
         mock_process_engine_alarms_from_snapshot = MagicMock()
+        mock_set_mobile_changes = MagicMock()
         snapshot_service = SnapshotService(
             dbus_proxy=mock_dbus_service,
             lock=mock_lock,
@@ -404,46 +311,25 @@ class SnapshotServiceTest(unittest.TestCase):
             set_devices=mock_set_devices,
             get_latest_engine_config=mock_get_latest_engine_config,
             process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
+            set_mobile_changes=mock_set_mobile_changes,
         )
-
-        mock_snapshot_dict = {"BinaryLogicState": {"bls.1": {"TEST"}}}
-        res = snapshot_service._process_state_from_snapshot(mock_snapshot_dict)
-
-        self.assertIn("bls.1", res)
-        self.assertEqual(res["bls.1"], {"TEST"})
-
-    def test_merge_state_update(self):
-        """
-        Test merge state update
-        Non AC, ensure nonac state properly updated
-        """
-
-        mock_dbus_service = MagicMock()
-        mock_lock = MagicMock()
-        mock_get_latest_devices = MagicMock()
-        mock_set_devices = MagicMock()
-        mock_get_latest_engine_config = MagicMock()
-        mock_process_engine_alarms_from_snapshot = MagicMock()
-        snapshot_service = SnapshotService(
-            dbus_proxy=mock_dbus_service,
-            lock=mock_lock,
-            get_latest_devices=mock_get_latest_devices,
-            set_devices=mock_set_devices,
-            get_latest_engine_config=mock_get_latest_engine_config,
-            process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
+        devices = N2kDevices()
+        devices.set_subscription(
+            "dc.1.v", devices.get_channel_subject("dc.1", "voltage", N2kDeviceType.DC)
         )
-        state_update = {"dc.1": {"voltage": "TEST"}}
-        mock_device = MagicMock(type=N2kDeviceType.DC)
-        mock_get_latest_devices.return_value = MagicMock(devices={"dc.1": mock_device})
-        snapshot_service._merge_state_update(state_update)
+        devices.pop_mobile_changes()
+        mock_get_latest_devices.return_value = devices
 
-        mock_device.update_channel.assert_called_once_with("voltage", "TEST")
+        snapshot_service._merge_snapshot({"DC": {"dc.1": {"voltage": 12.5}}})
+        mock_set_mobile_changes.assert_called_once_with({"dc.1.v": 12.5})
 
-        mock_set_devices.assert_called_once()
+        mock_set_mobile_changes.reset_mock()
+        snapshot_service._merge_snapshot({"DC": {"dc.1": {"voltage": 12.5}}})
+        mock_set_mobile_changes.assert_not_called()
 
-    def test_merge_state_update_ac(self):
+    def test_merge_snapshot_ac(self):
         """
-        Test merge state update
+        Test merge snapshot
         AC, ensure nac state properly updated
         """
 
@@ -461,18 +347,20 @@ class SnapshotServiceTest(unittest.TestCase):
             get_latest_engine_config=mock_get_latest_engine_config,
             process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
         )
-        state_update = {"ac.1": {"AClines": {1: {"voltage": "TEST"}}}}
+        snapshot_dict = {"AC": {"ac.1": {"AClines": {1: {"voltage": "TEST"}}}}}
         mock_device = MagicMock(type=N2kDeviceType.AC)
-        mock_get_latest_devices.return_value = MagicMock(devices={"ac.1": mock_device})
-        snapshot_service._merge_state_update(state_update)
+        mock_get_latest_devices.return_value = MagicMock(
+            devices={"ac.1": mock_device}, engine_devices={}
+        )
+        snapshot_service._merge_snapshot(snapshot_dict)
 
         mock_device.update_channel.assert_called_once_with("voltage.1", "TEST")
 
         mock_set_devices.assert_called_once()
 
-    def test_merge_state_update_ac_lines_none(self):
+    def test_merge_snapshot_ac_lines_none(self):
         """
-        Test merge state update
+        Test merge snapshot
         AC, ensure nac state properly updated
         """
 
@@ -490,18 +378,20 @@ class SnapshotServiceTest(unittest.TestCase):
             get_latest_engine_config=mock_get_latest_engine_config,
             process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
         )
-        state_update = {"ac.1": {}}
+        snapshot_dict = {"AC": {"ac.1": {}}}
         mock_device = MagicMock(type=N2kDeviceType.AC)
-        mock_get_latest_devices.return_value = MagicMock(devices={"ac.1": mock_device})
-        snapshot_service._merge_state_update(state_update)
+        mock_get_latest_devices.return_value = MagicMock(
+            devices={"ac.1": mock_device}, engine_devices={}
+        )
+        snapshot_service._merge_snapshot(snapshot_dict)
 
         mock_device.update_channel.assert_not_called()
 
         mock_set_devices.assert_called_once()
 
-    def test_merge_state_update_engine(self):
+    def test_merge_snapshot_engine(self):
         """
-        Test merge state update
+        Test merge snapshot
         Engine, ensure state properly updated
         """
 
@@ -519,12 +409,12 @@ class SnapshotServiceTest(unittest.TestCase):
             get_latest_engine_config=mock_get_latest_engine_config,
             process_engine_alarms_from_snapshot=mock_process_engine_alarms_from_snapshot,
         )
-        state_update = {"engine.1": {"coolantPressure": "TEST"}}
+        snapshot_dict = {"Engines": {"engine.1": {"coolantPressure": "TEST"}}}
         mock_device = MagicMock(type=N2kDeviceType.ENGINE)
         mock_get_latest_devices.return_value = MagicMock(
-            engine_devices={"engine.1": mock_device}
+            devices={}, engine_devices={"engine.1": mock_device}
         )
-        snapshot_service._merge_state_update(state_update)
+        snapshot_service._merge_snapshot(snapshot_dict)
 
         mock_device.update_channel.assert_called_once_with("coolantPressure", "TEST")
 
@@ -880,6 +880,15 @@ class N2KClientTest(unittest.TestCase):
         # Assert the internal state or effect
         self.assertEqual(res, alarms_observable)
 
+    def test_get_alarm_history_not_recorded(self):
+        """
+        Test that a client created with record_alarm_history=False records and returns no alarm history.
+        """
+        client = N2KClient(record_alarm_history=False)
+        self.assertIsNone(client._alarm_history)
+        self.assertIsNone(client._alarm_service.alarm_history)
+        self.assertEqual(client.get_alarm_history(), [])
+
     def test_get_latest_engine_config(self):
         """
         Test the get_latest_engine_config method of N2KClient.
@@ -10,6 +10,7 @@ from N2KClient.n2kclient.util.common_utils import (
     map_enum_fields,
     map_list_fields,
     send_and_validate_response,
+    validate_response,
 )
 import types
 
@@ -224,3 +225,10 @@ class TestCommonUtils(unittest.TestCase):
             result = send_and_validate_response(mock_dbus_command, request, logger)
             self.assertFalse(result)
             logger.error.assert_called_once()
+
+    def test_validate_response(self):
+        logger = MagicMock()
+        self.assertTrue(validate_response('{"Result": "Ok"}'))
+        self.assertFalse(validate_response('{"Result": "Error"}'))
+        self.assertFalse(validate_response("invalid", logger))
+        logger.error.assert_called_once()
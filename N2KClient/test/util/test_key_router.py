@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+
+from N2KClient.n2kclient.util.key_router import KeyCategory, KeyRouter
+
+
+class TestKeyRouter(unittest.TestCase):
+    """
+    Class to test the KeyRouter inside of
+    the key_router.py file
+    """
+
+    def setUp(self):
+        self.router = KeyRouter(
+            telemetry_patterns=["marineEngine.\\d+.speed"],
+            location_pattern=r"gnss\.(.+?)\.loc",
+            state_dependent_patterns=[r"bilgePump\.(\d+)\.p"],
+        )
+
+    def test_classify(self):
+        self.assertEqual(
+            self.router.classify("marineEngine.1.speed"), KeyCategory.TELEMETRY
+        )
+        self.assertEqual(self.router.classify("gnss.n2k.loc"), KeyCategory.LOCATION)
+        self.assertEqual(
+            self.router.classify("bilgePump.2.p"), KeyCategory.STATE_DEPENDENT
+        )
+        self.assertEqual(self.router.classify("circuit.3.p"), KeyCategory.STATE)
+
+    def test_classify_without_optional_patterns(self):
+        router = KeyRouter(telemetry_patterns=["marineEngine.\\d+.speed"])
+        self.assertEqual(router.classify("gnss.n2k.loc"), KeyCategory.STATE)
+        self.assertEqual(router.classify("bilgePump.2.p"), KeyCategory.STATE)
+
+    def test_classify_cached(self):
+        self.router.classify("circuit.3.p")
+        with patch.object(self.router, "_match") as mock_match:
+            self.assertEqual(self.router.classify("circuit.3.p"), KeyCategory.STATE)
+            mock_match.assert_not_called()
+
+    def test_invalidate(self):
+        self.router.classify("circuit.3.p")
+        self.router.invalidate("new config")
+        with patch.object(
+            self.router, "_match", return_value=KeyCategory.STATE
+        ) as mock_match:
+            self.router.classify("circuit.3.p")
+            mock_match.assert_called_once_with("circuit.3.p")
+
+    def test_route(self):
+        routed = self.router.route(
+            {
+                "marineEngine.1.speed": 1000,
+                "gnss.n2k.loc": {"lat": 1, "long": 2},
+                "bilgePump.2.p": {"s": 1, "ts": 1},
+                "circuit.3.p": 1,
+            }
+        )
+        self.assertEqual(routed[KeyCategory.TELEMETRY], {"marineEngine.1.speed": 1000})
+        self.assertEqual(
+            routed[KeyCategory.LOCATION], {"gnss.n2k.loc": {"lat": 1, "long": 2}}
+        )
+        self.assertEqual(
+            routed[KeyCategory.STATE_DEPENDENT], {"bilgePump.2.p": {"s": 1, "ts": 1}}
+        )
+        self.assertEqual(routed[KeyCategory.STATE], {"circuit.3.p": 1})
+
+    def test_route_empty(self):
+        routed = self.router.route({})
+        self.assertEqual(routed, {category: {} for category in KeyCategory})
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch
+
+from N2KClient.n2kclient.util.tracing import LatencyHistogram, PipelineTracer
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    """Unit tests for LatencyHistogram"""
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(
+            histogram.to_dict(),
+            {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0},
+        )
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(99):
+            histogram.add(100_000)  # 100 microseconds
+        histogram.add(50_000_000)  # 50 milliseconds
+        stats = histogram.to_dict()
+        self.assertEqual(stats["count"], 100)
+        # 100 microseconds falls in the bucket below 128 microseconds
+        self.assertEqual(stats["p50_ms"], 0.128)
+        self.assertEqual(stats["p99_ms"], 0.128)
+        self.assertEqual(histogram.percentile(1.0), 50.0)
+        self.assertEqual(stats["max_ms"], 50.0)
+        self.assertAlmostEqual(stats["mean_ms"], (99 * 0.1 + 50) / 100)
+
+
+class PipelineTracerTest(unittest.TestCase):
+    """Unit tests for PipelineTracer"""
+
+    def test_disabled(self):
+        tracer = PipelineTracer(enabled=False, dump_interval=0)
+        self.assertIsNone(tracer.begin())
+        with tracer.stage("decode"):
+            pass
+        tracer.end()
+        self.assertEqual(tracer.get_stats(), {})
+
+    def test_trace(self):
+        tracer = PipelineTracer(enabled=True, dump_interval=0)
+        self.assertEqual(tracer.begin(), 1)
+        with tracer.stage("decode"):
+            pass
+        with tracer.stage("merge"):
+            pass
+        tracer.end()
+        self.assertEqual(tracer.begin(), 2)
+        tracer.end()
+
+        stats = tracer.get_stats()
+        self.assertEqual(list(stats.keys()), ["decode", "merge", "total"])
+        self.assertEqual(stats["decode"]["count"], 1)
+        self.assertEqual(stats["total"]["count"], 2)
+
+    def test_stage_outside_trace(self):
+        tracer = PipelineTracer(enabled=True, dump_interval=0)
+        with tracer.stage("send_telemetry"):
+            pass
+        tracer.end()
+        self.assertEqual(list(tracer.get_stats().keys()), ["send_telemetry"])
+
+    def test_dump_interval(self):
+        tracer = PipelineTracer(enabled=True, dump_interval=60)
+        with patch.object(tracer, "dump") as mock_dump:
+            tracer.begin()
+            tracer.end()
+            mock_dump.assert_not_called()
+            tracer._last_dump -= 60
+            tracer.begin()
+            tracer.end()
+            mock_dump.assert_called_once()
+
+    def test_dump_and_reset(self):
+        tracer = PipelineTracer(enabled=True, dump_interval=0)
+        tracer.record("decode", 2_000_000)
+        line = tracer.dump()
+        self.assertIn("decode n=1", line)
+        self.assertIn("max=2.000ms", line)
+        tracer.reset()
+        self.assertEqual(tracer.get_stats(), {})
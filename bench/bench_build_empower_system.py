@@ -0,0 +1,97 @@
+"""
+Benchmark for ConfigParser.parse_config and ConfigProcessor.build_empower_system on synthetic configurations.
+
+Run from the repository root:
+    python bench/bench_build_empower_system.py [--components 10 100 1000] [--repeat 5]
+
+No D-Bus or MQTT connection is needed, the configuration is generated in memory.
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import statistics
+import time
+
+import synthetic
+
+from n2kclient.models.devices import N2kDevices
+from n2kclient.services.config_service.config_parser.config_parser import (
+    ConfigParser,
+)
+from n2kclient.services.config_service.config_processor.config_processor import (
+    ConfigProcessor,
+)
+
+
+def _time(function, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench(component_count: int, repeat: int) -> dict[str, float]:
+    """
+    Time parsing, a full build and an incremental rebuild of a synthetic configuration.
+
+    Returns:
+        dict[str, float]: Median milliseconds per stage, and the number of things built.
+    """
+    config_str, categories_str, metadata_str = synthetic.generate_config(
+        component_count
+    )
+    parser = ConfigParser()
+    config = parser.parse_config(config_str, categories_str, metadata_str)
+    devices = N2kDevices()
+
+    def full_build():
+        ConfigProcessor().build_empower_system(config, N2kDevices())
+
+    processor = ConfigProcessor()
+    system = processor.build_empower_system(config, devices)
+
+    def incremental_build():
+        processor.build_empower_system(config, devices, incremental=True)
+
+    return {
+        "things": len(system.things),
+        "parse_ms": statistics.median(
+            _time(
+                lambda: parser.parse_config(config_str, categories_str, metadata_str),
+                repeat,
+            )
+        )
+        * 1000,
+        "build_ms": statistics.median(_time(full_build, repeat)) * 1000,
+        "incremental_ms": statistics.median(_time(incremental_build, repeat)) * 1000,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--components", type=int, nargs="+", default=[10, 100, 1000]
+    )
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(
+        f"{'components':>10} {'things':>7} {'parse ms':>10} {'build ms':>10} {'incremental ms':>15}"
+    )
+    for component_count in args.components:
+        # Model serialization reports unset optional fields with print, keep the table readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = bench(component_count, args.repeat)
+        print(
+            f"{component_count:>10} {result['things']:>7} {result['parse_ms']:>10.2f}"
+            f" {result['build_ms']:>10.2f} {result['incremental_ms']:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
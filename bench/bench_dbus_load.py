@@ -0,0 +1,205 @@
+"""
+End to end load test of a real N2KClient against the simulator in load mode, on a private D-Bus daemon.
+
+Run from the repository root, with dbus-daemon and the dbus and GLib bindings installed:
+    python bench/bench_dbus_load.py [--rates 1 5 10 20 50 100 200] [--components 100]
+        [--step-duration 20] [--warmup 5] [--burst-size 0] [--burst-interval 10]
+        [--replay stream.jsonl.gz] [--json]
+
+A private session bus is started, the simulator generates snapshots for the given number of components,
+or replays a recorded stream, and the client in this process connects to it with pipeline tracing
+enabled. The snapshot rate is stepped through the given rates, and for each step the offered and
+processed rates, the snapshots coalesced by the signal dispatcher, and the transport and end to end
+latency are reported. The maximum sustained rate is the highest step where at most MAX_DROP_FRACTION of
+the snapshots sent were dropped.
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+# Puts n2kclient on the path, as for the other benchmarks
+import synthetic  # noqa: F401
+
+import dbus
+
+from n2kclient.client import N2KClient
+from n2kclient.services.dbus_proxy_service.dbus_proxy import DbusProxyService
+from n2kclient.util.tracing import pipeline_tracer
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMULATOR_PATH = os.path.join(_ROOT, "simulator")
+OPATH = "/org/navico/HubN2K"
+IFACE = "org.navico.HubN2K.czone"
+BUS_NAME = "org.navico.HubN2K"
+# Fraction of the snapshots sent that may be dropped at a sustained rate
+MAX_DROP_FRACTION = 0.01
+# Seconds to wait for the simulator and the client configuration
+STARTUP_TIMEOUT = 60
+
+
+def _start_bus() -> tuple[subprocess.Popen, str]:
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--print-address", "--nofork"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    return daemon, daemon.stdout.readline().strip()
+
+
+def _start_simulator(address: str, args: argparse.Namespace) -> subprocess.Popen:
+    command = [
+        sys.executable,
+        "main.py",
+        "--load",
+        "--bus-address",
+        address,
+        "--components",
+        str(args.components),
+        "--rate",
+        str(args.rates[0]),
+    ]
+    if args.replay:
+        command += ["--replay", os.path.abspath(args.replay)]
+    return subprocess.Popen(command, cwd=SIMULATOR_PATH)
+
+
+def _wait_for(condition, description: str):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Timed out waiting for {description}")
+        time.sleep(0.5)
+
+
+def _simulator_interface(address: str) -> dbus.Interface:
+    bus = dbus.bus.BusConnection(address)
+    _wait_for(lambda: bus.name_has_owner(BUS_NAME), "the simulator")
+    return dbus.Interface(bus.get_object(BUS_NAME, OPATH), IFACE)
+
+
+def run_step(
+    client: N2KClient,
+    simulator: dbus.Interface,
+    rate: float,
+    args: argparse.Namespace,
+) -> dict:
+    """
+    Generate the given snapshot rate, and measure how the client keeps up once warmed up.
+
+    Returns:
+        dict: Offered and processed rates, drops, queue depth and latency percentiles of the step.
+    """
+    simulator.SetLoad(
+        json.dumps(
+            {
+                "Rate": rate,
+                "BurstSize": args.burst_size,
+                "BurstInterval": args.burst_interval,
+            }
+        )
+    )
+    time.sleep(args.warmup)
+    pipeline_tracer.reset()
+    metrics_start = client.get_signal_queue_metrics()
+    load_start = json.loads(simulator.LoadStats())
+    time.sleep(args.step_duration)
+    load_end = json.loads(simulator.LoadStats())
+    metrics_end = client.get_signal_queue_metrics()
+    latency = pipeline_tracer.get_stats()
+
+    elapsed = load_end["elapsed_s"] - load_start["elapsed_s"]
+    sent = load_end["snapshots_sent"] - load_start["snapshots_sent"]
+    end_to_end = latency.get("end_to_end", {})
+    transport = latency.get("transport", {})
+    dropped = metrics_end["dropped_snapshots"] - metrics_start["dropped_snapshots"]
+    return {
+        "rate": rate,
+        "offered_per_s": sent / elapsed,
+        "processed_per_s": end_to_end.get("count", 0) / elapsed,
+        "dropped_snapshots": dropped,
+        "drop_fraction": dropped / sent if sent else 0.0,
+        "dropped_events": metrics_end["dropped_events"]
+        - metrics_start["dropped_events"],
+        "queue_depth": metrics_end["queue_depth"],
+        "transport_p50_ms": transport.get("p50_ms", 0.0),
+        "transport_p99_ms": transport.get("p99_ms", 0.0),
+        "end_to_end_p50_ms": end_to_end.get("p50_ms", 0.0),
+        "end_to_end_p99_ms": end_to_end.get("p99_ms", 0.0),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--rates", type=float, nargs="+", default=[1, 5, 10, 20, 50, 100, 200]
+    )
+    arg_parser.add_argument("--components", type=int, default=100)
+    arg_parser.add_argument("--step-duration", type=float, default=20)
+    arg_parser.add_argument("--warmup", type=float, default=5)
+    arg_parser.add_argument("--burst-size", type=int, default=0)
+    arg_parser.add_argument("--burst-interval", type=float, default=10)
+    arg_parser.add_argument(
+        "--replay", help="stream file to replay instead of generating"
+    )
+    arg_parser.add_argument(
+        "--json", action="store_true", help="print the results as json"
+    )
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    daemon, address = _start_bus()
+    simulator_process = _start_simulator(address, args)
+    try:
+        simulator = _simulator_interface(address)
+
+        # Override the settings, read when the modules were imported
+        DbusProxyService._dbus_bus_address = address
+        pipeline_tracer.enabled = True
+        pipeline_tracer.dump_interval = 0
+        client = N2KClient(record_alarm_history=False)
+        client.start()
+        _wait_for(
+            lambda: len(client.get_latest_devices().devices) > 0,
+            "the client configuration",
+        )
+
+        results = [run_step(client, simulator, rate, args) for rate in args.rates]
+    finally:
+        simulator_process.terminate()
+        daemon.terminate()
+
+    sustained = [
+        result["rate"]
+        for result in results
+        if result["drop_fraction"] <= MAX_DROP_FRACTION
+    ]
+    max_sustained_rate = max(sustained) if sustained else 0.0
+
+    if args.json:
+        print(
+            json.dumps(
+                {"steps": results, "max_sustained_rate": max_sustained_rate}, indent=2
+            )
+        )
+        return
+    print(
+        f"{'rate':>6} {'offered/s':>10} {'processed/s':>12} {'dropped %':>10}"
+        f" {'queue':>6} {'e2e p50 ms':>11} {'e2e p99 ms':>11}"
+    )
+    for result in results:
+        print(
+            f"{result['rate']:>6g} {result['offered_per_s']:>10.1f}"
+            f" {result['processed_per_s']:>12.1f} {result['drop_fraction'] * 100:>10.2f}"
+            f" {result['queue_depth']:>6} {result['end_to_end_p50_ms']:>11.3f}"
+            f" {result['end_to_end_p99_ms']:>11.3f}"
+        )
+    print(f"Max sustained rate: {max_sustained_rate:g} snapshots/s")
+
+
+if __name__ == "__main__":
+    main()
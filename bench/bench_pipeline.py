@@ -0,0 +1,264 @@
+"""
+Benchmark of the snapshot to cloud pipeline on synthetic configurations, snapshots and alarm lists.
+
+Run from the repository root:
+    python bench/bench_pipeline.py [--components 10 100 1000] [--iterations 100]
+        [--build-iterations 10] [--json]
+
+ConfigProcessor.build_empower_system, AlarmService.load_active_alarms, SnapshotService.snapshot_handler
+and EmpowerService.device_state_changes are driven directly, and the throughput, p50 and p99 latency of
+each are reported, with the peak RSS of the process once each component count is done. Component counts
+run in the given order and the peak RSS never decreases, so give them in increasing order.
+
+No D-Bus or MQTT connection is needed. EmpowerService publishes to a stand-in ThingsBoardClient that
+serializes and counts the payloads, and the ThingsBoardClient, N2KClient, provisioning client and serial
+modules it imports are replaced by stand-ins, since importing the real ones needs the MQTT, dbus and serial
+bindings.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import types
+
+import reactivex as rx
+import synthetic
+
+from n2kclient.models.devices import N2kDevices
+from n2kclient.models.empower_system.alarm_list import AlarmList
+from n2kclient.models.empower_system.engine_alarm_list import EngineAlarmList
+from n2kclient.models.n2k_configuration.engine_configuration import (
+    EngineConfiguration,
+)
+from n2kclient.services.alarm_service.alarm_history import AlarmHistory
+from n2kclient.services.alarm_service.alarm_service import AlarmService
+from n2kclient.services.config_service.config_parser.config_parser import ConfigParser
+from n2kclient.services.config_service.config_processor.config_processor import (
+    ConfigProcessor,
+)
+from n2kclient.services.snapshot_service.snapshot_service import SnapshotService
+from n2kclient.util.key_router import KeyRouter
+
+# Distinct snapshots and alarm lists cycled through, covering every variation of the synthetic payloads
+SNAPSHOT_VARIANTS = 32
+ALARM_LIST_VARIANTS = 3
+
+
+class StubThingsBoardClient:
+    """
+    Stand-in for the ThingsBoardClient, serializing payloads as publishing them would, without a connection.
+    Attributes:
+        is_connected: Connection state, never connected.
+        messages: Number of payloads published.
+        bytes: Size of the serialized payloads published.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.is_connected = rx.subject.BehaviorSubject(False)
+        self.messages = 0
+        self.bytes = 0
+
+    def send_telemetry(self, telemetry, timestamp=None):
+        self._publish(telemetry)
+
+    def update_attributes(self, attributes):
+        self._publish(attributes)
+
+    def _publish(self, payload):
+        self.messages += 1
+        self.bytes += len(json.dumps(payload))
+
+    def __getattr__(self, name):
+        # Subscriptions and lifecycle calls made while importing the services
+        return lambda *args, **kwargs: None
+
+
+class StubN2KClient:
+    """
+    Stand-in for the N2KClient instantiated when the cloud services are imported.
+    """
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def _import_empower_service():
+    mqtt_client = types.ModuleType("mqtt_client")
+    mqtt_client.ThingsBoardClient = StubThingsBoardClient
+    n2k_client = types.ModuleType("n2kclient.client")
+    n2k_client.N2KClient = StubN2KClient
+    # Imported by tb_utils.utility and the GPS parser, need the MQTT and serial bindings
+    provisioning_client = types.ModuleType("provisioning_client")
+    provisioning_client.EmpowerProvisionClient = StubN2KClient
+    serial = types.ModuleType("serial")
+    sys.modules["mqtt_client"] = mqtt_client
+    sys.modules["n2kclient.client"] = n2k_client
+    sys.modules["provisioning_client"] = provisioning_client
+    sys.modules["serial"] = serial
+
+    try:
+        from services import empower_service
+    except ImportError as e:
+        raise SystemExit(
+            f"Failed to import EmpowerService for device_state_changes: {e}"
+        ) from e
+    return empower_service
+
+
+def _measure(function, iterations: int) -> dict[str, float]:
+    durations = []
+    for iteration in range(iterations):
+        start = time.perf_counter_ns()
+        function(iteration)
+        durations.append(time.perf_counter_ns() - start)
+    durations.sort()
+    return {
+        "ops_per_s": iterations / (sum(durations) / 1e9),
+        "p50_ms": durations[len(durations) // 2] / 1e6,
+        "p99_ms": durations[min(len(durations) - 1, len(durations) * 99 // 100)]
+        / 1e6,
+    }
+
+
+def bench(
+    component_count: int, iterations: int, build_iterations: int, empower_service
+) -> dict[str, dict]:
+    """
+    Time each stage of the pipeline on synthetic payloads for the given number of components.
+    Full builds are orders of magnitude slower than the other stages, so they are run build_iterations times.
+
+    Returns:
+        dict[str, dict]: Throughput and latency keyed by stage, with the peak RSS under "peak_rss_mb".
+    """
+    parser = ConfigParser()
+    config = parser.parse_config(*synthetic.generate_config(component_count))
+    engine_config = parser.parse_engine_configuration(
+        synthetic.generate_engine_config(component_count), EngineConfiguration()
+    )
+    processor = ConfigProcessor()
+    devices = N2kDevices()
+    system = processor.build_empower_system(config, devices)
+    engine_list = processor.build_engine_list(engine_config, devices)
+    results = {}
+
+    results["build_empower_system"] = _measure(
+        lambda _: ConfigProcessor().build_empower_system(config, N2kDevices()),
+        build_iterations,
+    )
+
+    state = {"alarms": AlarmList(), "engine_alarms": EngineAlarmList()}
+    alarm_lists = [
+        synthetic.generate_alarm_list(component_count, sequence)
+        for sequence in range(ALARM_LIST_VARIANTS)
+    ]
+    alarm_sequence = iter(range(sys.maxsize))
+    alarm_service = AlarmService(
+        alarm_list_func=lambda: alarm_lists[next(alarm_sequence) % len(alarm_lists)],
+        get_latest_alarms_func=lambda: state["alarms"],
+        get_config_func=lambda: config,
+        get_engine_config_func=lambda: engine_config,
+        get_engine_alarms_func=lambda: state["engine_alarms"],
+        set_alarm_list=lambda alarms: state.update(alarms=alarms),
+        set_engine_alarms=lambda alarms: state.update(engine_alarms=alarms),
+        acknowledge_alarm_func=lambda request: None,
+        get_latest_empower_system_func=lambda: system,
+        get_latest_engine_list_func=lambda: engine_list,
+        alarm_history=AlarmHistory(path=""),
+    )
+    results["load_active_alarms"] = _measure(
+        lambda _: alarm_service.load_active_alarms(), iterations
+    )
+
+    snapshots = [
+        synthetic.generate_snapshot(component_count, sequence)
+        for sequence in range(SNAPSHOT_VARIANTS)
+    ]
+    snapshot_service = SnapshotService(
+        dbus_proxy=None,
+        lock=threading.Lock(),
+        get_latest_devices=lambda: devices,
+        set_devices=lambda _: None,
+        get_latest_engine_config=lambda: engine_config,
+        process_engine_alarms_from_snapshot=alarm_service.process_engine_alarm_from_snapshots,
+        set_device_changes=lambda _: None,
+        set_mobile_changes=lambda _: None,
+    )
+    results["snapshot_handler"] = _measure(
+        lambda iteration: snapshot_service.snapshot_handler(
+            snapshots[iteration % len(snapshots)]
+        ),
+        iterations,
+    )
+    # Each snapshot restarts the timer requesting a snapshot when none was received
+    snapshot_service._periodic_snapshot_timer.cancel()
+
+    service = empower_service.EmpowerService.__new__(empower_service.EmpowerService)
+    # Only the state device_state_changes uses, __init__ connects the services
+    service._service_init_disposables = []
+    service.telemetry_consent = True
+    service.thingsboard_client = StubThingsBoardClient()
+    service.key_router = KeyRouter(
+        telemetry_patterns=empower_service.telemetry_filter_patterns,
+        location_pattern=empower_service.location_filter_pattern,
+        state_dependent_patterns=[empower_service.bilge_pump_power_filter_pattern],
+    )
+    results["device_state_changes"] = _measure(
+        lambda _: service.device_state_changes(devices), iterations
+    )
+
+    # Kilobytes on Linux
+    results["peak_rss_mb"] = (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    )
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument(
+        "--components", type=int, nargs="+", default=[10, 100, 1000]
+    )
+    arg_parser.add_argument("--iterations", type=int, default=100)
+    arg_parser.add_argument("--build-iterations", type=int, default=10)
+    arg_parser.add_argument(
+        "--json", action="store_true", help="print the results as json"
+    )
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    all_results = {}
+    # Model serialization and the cloud services report with print, keep the output readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        empower_service = _import_empower_service()
+        for component_count in args.components:
+            all_results[component_count] = bench(
+                component_count,
+                args.iterations,
+                args.build_iterations,
+                empower_service,
+            )
+
+    if args.json:
+        print(json.dumps(all_results, indent=2))
+        return
+    print(
+        f"{'components':>10} {'stage':<22} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9}"
+        f" {'peak RSS MB':>12}"
+    )
+    for component_count, results in all_results.items():
+        peak_rss_mb = results.pop("peak_rss_mb")
+        for stage, stats in results.items():
+            print(
+                f"{component_count:>10} {stage:<22} {stats['ops_per_s']:>10.1f}"
+                f" {stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} {peak_rss_mb:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
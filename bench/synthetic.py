@@ -0,0 +1,318 @@
+"""
+Synthetic configurations, snapshots and alarm lists for the benchmarks, scaled by component count.
+
+The payloads follow the format emitted by simulator/main.py, with one entry per configured component
+instead of its fixed handful of devices. Every group of COMPONENTS_PER_GROUP components holds
+CIRCUITS_PER_GROUP circuits, one DC meter, one tank and one AC meter, and there is one engine for every
+COMPONENTS_PER_ENGINE components.
+"""
+
+import json
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Import n2kclient the way HubTBClientService does, so both share the same modules
+for _path in (os.path.join(_ROOT, "N2KClient"), os.path.join(_ROOT, "HubTBClientService")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from n2kclient.models.constants import Constants, JsonKeys
+from n2kclient.models.n2k_configuration.ac import ACType
+from n2kclient.models.n2k_configuration.dc import DCType
+from n2kclient.models.n2k_configuration.ui_relationship_msg import ItemType
+
+COMPONENTS_PER_GROUP = 10
+CIRCUITS_PER_GROUP = 7
+COMPONENTS_PER_ENGINE = 50
+# One hidden child circuit for every CIRCUITS_PER_CHILD visible circuits
+CIRCUITS_PER_CHILD = 4
+# One active alarm for every CIRCUITS_PER_ALARM circuits
+CIRCUITS_PER_ALARM = 5
+# Id of the DC meters, tanks and AC meters, apart from the circuit ids
+METER_ID_OFFSET = 100000
+LOAD_CHANNEL_ADDRESS_OFFSET = 0x4000
+CATEGORIES = (Constants.Power, Constants.Lighting)
+
+
+def _relationship(primary_type, primary_id, secondary_type, secondary_id):
+    return {
+        JsonKeys.PRIMARY_TYPE: primary_type.value,
+        JsonKeys.PRIMARY_ID: primary_id,
+        JsonKeys.SECONDARY_TYPE: secondary_type.value,
+        JsonKeys.SECONDARY_ID: secondary_id,
+        JsonKeys.PRIMARY_CONFIG_ADDRESS: primary_id,
+        JsonKeys.SECONDARY_CONFIG_ADDRESS: secondary_id,
+    }
+
+
+def _circuit(circuit_id, category, hidden=False):
+    return {
+        JsonKeys.ID: {JsonKeys.VALID: True, JsonKeys.VALUE: circuit_id},
+        JsonKeys.CONTROL_ID: circuit_id,
+        JsonKeys.NAMEUTF8: f"Circuit {circuit_id}",
+        JsonKeys.NONVISIBLE_CIRCUIT: hidden,
+        JsonKeys.REMOTE_VISIBILITY: 1,
+        JsonKeys.CIRCUIT_TYPE: 0,
+        JsonKeys.SWITCH_TYPE: 1,
+        JsonKeys.SINGLE_THROW_ID: {JsonKeys.ENABLED: True, JsonKeys.ID: circuit_id},
+        JsonKeys.CIRCUIT_LOADS: [
+            {
+                JsonKeys.ID: circuit_id,
+                JsonKeys.NAMEUTF8: f"Load {circuit_id}",
+                JsonKeys.CHANNEL_ADDRESS: load_channel_address(circuit_id),
+                JsonKeys.LEVEL: 1000,
+            }
+        ],
+        JsonKeys.CATEGORIES: [
+            {JsonKeys.NAMEUTF8: category, JsonKeys.ENABLED: True, JsonKeys.INDEX: 0}
+        ],
+    }
+
+
+def load_channel_address(circuit_id: int) -> int:
+    """
+    Channel address of the load of a synthetic circuit, which its alarms are raised on.
+    """
+    return LOAD_CHANNEL_ADDRESS_OFFSET + circuit_id
+
+
+def counts(component_count: int) -> tuple[int, int, int]:
+    """
+    Split a component count into the number of visible circuits, meter groups and engines.
+
+    Returns:
+        tuple[int, int, int]: The circuit, group and engine counts.
+    """
+    groups = max(1, component_count // COMPONENTS_PER_GROUP)
+    engines = max(1, component_count // COMPONENTS_PER_ENGINE)
+    return groups * CIRCUITS_PER_GROUP, groups, engines
+
+
+def generate_config(component_count: int) -> tuple[str, str, str]:
+    """
+    Generate a synthetic configuration with about the given number of components.
+    Every circuit is in the Power or Lighting category, a fraction of them have a hidden child circuit,
+    and DC meters, tanks and AC meters are related to circuits through UI relationships.
+
+    Returns:
+        tuple[str, str, str]: The configuration, categories and config metadata json strings.
+    """
+    circuit_count, groups, _ = counts(component_count)
+    circuits = []
+    relationships = []
+    for circuit_id in range(1, circuit_count + 1):
+        category = CATEGORIES[circuit_id % 2]
+        circuits.append(_circuit(circuit_id, category))
+        if circuit_id % CIRCUITS_PER_CHILD == 0:
+            child_id = circuit_count + circuit_id
+            circuits.append(_circuit(child_id, category, hidden=True))
+            relationships.append(
+                _relationship(ItemType.Circuit, circuit_id, ItemType.Circuit, child_id)
+            )
+
+    dcs = []
+    tanks = []
+    acs = []
+    for instance in range(groups):
+        component_id = METER_ID_OFFSET + instance
+        dcs.append(
+            {
+                JsonKeys.ID: component_id,
+                JsonKeys.NAMEUTF8: f"Battery {instance}",
+                JsonKeys.INSTANCE: {JsonKeys.ENABLED: True, JsonKeys.INSTANCE: instance},
+                JsonKeys.DC_TYPE: DCType.Battery.value,
+                JsonKeys.SHOW_VOLTAGE: True,
+                JsonKeys.SHOW_CURRENT: True,
+                JsonKeys.SHOW_STATE_OF_CHARGE: True,
+                JsonKeys.CAPACITY: 100,
+            }
+        )
+        tanks.append(
+            {
+                JsonKeys.ID: component_id,
+                JsonKeys.NAMEUTF8: f"Tank {instance}",
+                JsonKeys.INSTANCE: {JsonKeys.ENABLED: True, JsonKeys.INSTANCE: instance},
+                JsonKeys.TANK_TYPE: 1,
+                JsonKeys.TANK_CAPACITY: 200,
+            }
+        )
+        acs.append(
+            {
+                JsonKeys.ID: component_id,
+                JsonKeys.NAMEUTF8: f"Shore Power {instance}",
+                JsonKeys.INSTANCE: {JsonKeys.ENABLED: True, JsonKeys.INSTANCE: instance},
+                JsonKeys.LINE: 0,
+                JsonKeys.AC_TYPE: ACType.ShorePower.value,
+                JsonKeys.NOMINAL_VOLTAGE: 230,
+                JsonKeys.NOMINAL_FREQUENCY: 50,
+            }
+        )
+        circuit_id = instance * CIRCUITS_PER_GROUP + 1
+        for item_type in (ItemType.DcMeter, ItemType.FluidLevel, ItemType.AcMeter):
+            relationships.append(
+                _relationship(item_type, component_id, ItemType.Circuit, circuit_id)
+            )
+        # Batteries are only reported when they are in a category, Power has index 0
+        relationships.append(
+            _relationship(ItemType.DcMeter, component_id, ItemType.Category, 1)
+        )
+
+    config = {
+        JsonKeys.CIRCUITS: circuits,
+        JsonKeys.DCS: dcs,
+        JsonKeys.TANKS: tanks,
+        JsonKeys.ACS: acs,
+        JsonKeys.UI_RELATIONSHIPS: relationships,
+    }
+    categories = {
+        JsonKeys.Items: [
+            {JsonKeys.NAMEUTF8: name, JsonKeys.ENABLED: True, JsonKeys.INDEX: index}
+            for index, name in enumerate(CATEGORIES)
+        ]
+    }
+    return json.dumps(config), json.dumps(categories), json.dumps({})
+
+
+def generate_engine_config(component_count: int) -> str:
+    """
+    Generate the engine configuration json string, as returned for the Engines config type.
+    """
+    _, _, engine_count = counts(component_count)
+    return json.dumps(
+        {
+            JsonKeys.ENGINES: [
+                {
+                    JsonKeys.ID: instance,
+                    JsonKeys.NAMEUTF8: f"Engine {instance}",
+                    JsonKeys.INSTANCE: {
+                        JsonKeys.ENABLED: True,
+                        JsonKeys.INSTANCE: instance,
+                    },
+                    JsonKeys.ENGINE_TYPE: 1,
+                }
+                for instance in range(engine_count)
+            ]
+        }
+    )
+
+
+def generate_snapshot(component_count: int, sequence: int) -> str:
+    """
+    Generate the snapshot json string emitted after the given number of snapshots.
+    As in the simulator, metered values and engine speed and temperature change on every snapshot, while
+    tank levels, circuit levels and engine discrete status change on a fraction of the snapshots, so the
+    merge sees a realistic mix of changed and unchanged channels. A GNSS device missing from the
+    configuration is included, it is skipped by the decoder.
+
+    Returns:
+        str: The snapshot json string.
+    """
+    circuit_count, groups, engine_count = counts(component_count)
+    fluctuation = sequence % 100
+    snapshot = {
+        JsonKeys.DC: {
+            f"{JsonKeys.DC}.{instance}": {
+                "ComponentStatus": "Connected",
+                "Voltage": 12.0 + fluctuation / 100,
+                "Current": 2.0 + fluctuation / 10,
+                "StateOfCharge": 75,
+                "Temperature": 23.11,
+                "CapacityRemaining": 1000.0,
+                "TimeRemaining": 120,
+                "TimeToCharge": 60,
+            }
+            for instance in range(groups)
+        },
+        JsonKeys.TANKS: {
+            f"{JsonKeys.TANKS}.{instance}": {
+                "ComponentStatus": "Connected",
+                "Level": 200 - sequence // 4 % 100,
+                "LevelPercent": 87,
+            }
+            for instance in range(groups)
+        },
+        JsonKeys.AC: {
+            f"{JsonKeys.AC}.{instance}": {
+                "Instance": instance,
+                "AClines": {
+                    "1": {
+                        "Instance": instance,
+                        "Line": 1,
+                        "ComponentStatus": "Connected",
+                        "Voltage": 230.0,
+                        "Current": 10.5,
+                        "Frequency": 50.0,
+                        "Power": 2400.0 + fluctuation,
+                    },
+                },
+            }
+            for instance in range(groups)
+        },
+        JsonKeys.ENGINES: {
+            f"{JsonKeys.ENGINES}.{instance}": {
+                "ComponentStatus": "Connected",
+                "EngineState": 1,
+                "Speed": fluctuation * 100,
+                "CoolantPressure": 50,
+                "CoolantTemperature": 50.0 + fluctuation,
+                "FuelLevel": 50,
+                "EngineHours": 1000,
+                JsonKeys.DISCRETE_STATUS_1: 1 << (sequence // 8 % 4),
+                JsonKeys.DISCRETE_STATUS_2: 1,
+            }
+            for instance in range(engine_count)
+        },
+        JsonKeys.CIRCUITS: {
+            f"{JsonKeys.CIRCUITS}.{circuit_id}": {
+                "IsOffline": False,
+                "Current": 1.5,
+                "Voltage": 12.5,
+                # One in eight circuits is switched on each snapshot
+                "Level": 100 if (circuit_id + sequence) % 8 == 0 else 0,
+            }
+            for circuit_id in range(1, circuit_count + 1)
+        },
+        JsonKeys.GNSS: {
+            f"{JsonKeys.GNSS}.128": {
+                "ComponentStatus": "Connected",
+                "FixType": "2D Fix",
+                "LatitudeDeg": 8.5,
+                "LongitudeDeg": 100.0,
+                "Sog": 5.5,
+            },
+        },
+    }
+    return json.dumps(snapshot)
+
+
+def generate_alarm_list(component_count: int, sequence: int) -> str:
+    """
+    Generate the alarm list json string returned after the given number of alarm list requests.
+    One in CIRCUITS_PER_ALARM circuits has an over current alarm on its load, and every request
+    acknowledges a different third of them, so each load changes the state of some alarms.
+
+    Returns:
+        str: The alarm list json string.
+    """
+    circuit_count, _, _ = counts(component_count)
+    alarms = []
+    for circuit_id in range(1, circuit_count + 1, CIRCUITS_PER_ALARM):
+        acknowledged = (circuit_id + sequence) % 3 == 0
+        alarms.append(
+            {
+                JsonKeys.ALARM_TYPE: 0,
+                JsonKeys.SEVERITY: 1,
+                JsonKeys.CURRENT_STATE: 2 if acknowledged else 1,
+                JsonKeys.CHANNEL_ID: load_channel_address(circuit_id),
+                JsonKeys.EXTERNAL_ALARM_ID: 12,
+                JsonKeys.UNIQUE_ID: circuit_id,
+                JsonKeys.VALID: True,
+                JsonKeys.NAME: "Over Current",
+                JsonKeys.CHANNEL: f"Load {circuit_id}",
+                JsonKeys.DEVICE: "OI 1",
+                JsonKeys.TITLE: f"Circuit {circuit_id}",
+                JsonKeys.DESCRIPTION: "",
+            }
+        )
+    return json.dumps({JsonKeys.Alarms: alarms})
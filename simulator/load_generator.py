@@ -0,0 +1,221 @@
+"""
+Load generator of the simulator, emitting snapshot and event streams at a configurable rate.
+
+Snapshots are generated for a given number of components with bench/synthetic.py, or replayed from a
+recorded stream file. Every snapshot is stamped with the wall clock time it is sent at, under SentTime,
+so a client tracing its pipeline can measure the end to end latency.
+
+Recorded stream files hold one json record per line, gzip compressed if the name ends in .gz:
+    {"t": <seconds since the start of the recording>, "signal": <name>, "payload": <json string>}
+Snapshot and Event records are replayed as signals, the last record of each method name (e.g.
+GetConfigAll, AlarmList) is returned by that method. Other records are ignored. The DBus traffic
+captures written by the N2KClient are in this format.
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+import zlib
+from typing import Any, Callable, Iterator, Optional
+
+SNAPSHOT_SIGNAL = "Snapshot"
+EVENT_SIGNAL = "Event"
+SENT_TIME_KEY = "SentTime"
+# Same payload as the simulator's periodic event, an alarm was added
+ALARM_EVENT = '{"Type": 1}'
+# Distinct synthetic snapshots and alarm lists cycled through
+SNAPSHOT_VARIANTS = 32
+ALARM_LIST_VARIANTS = 3
+# Snapshots emitted at once at most when catching up, so a stalled bus does not turn into a storm
+MAX_CATCH_UP_SECONDS = 1.0
+
+
+def read_stream(path: str) -> Iterator[dict[str, Any]]:
+    """
+    Read the records of a stream file, gzip compressed if the name ends in .gz.
+    A capture cut short, e.g. by a power loss, is read up to where it was cut.
+    """
+    open_file = gzip.open if path.endswith(".gz") else open
+    with open_file(path, "rt", encoding="utf-8") as stream:
+        try:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, zlib.error, json.JSONDecodeError):
+            return
+
+
+def stamp(payload: str, sent_ns: int) -> str:
+    """
+    Add the time a snapshot is sent at to its json string, without parsing it.
+    """
+    if payload.strip() == "{}":
+        return f'{{"{SENT_TIME_KEY}": {sent_ns}}}'
+    return f'{{"{SENT_TIME_KEY}": {sent_ns}, ' + payload.lstrip()[1:]
+
+
+class LoadGenerator:
+    """
+    Emits snapshots at a configurable rate, with periodic bursts of alarm events.
+    Attributes:
+        rate: Snapshots emitted per second.
+        burst_size: Alarm events emitted in each burst, 0 for none.
+        burst_interval: Seconds between two bursts.
+        snapshots: Snapshot json strings cycled through.
+        events: Recorded event json strings emitted after each snapshot, by snapshot index.
+        responses: Method response json strings cycled through, by method name.
+        snapshots_sent: Snapshots emitted since the load was set.
+        snapshots_skipped: Snapshots not emitted because the generator fell behind.
+        events_sent: Events emitted since the load was set.
+    Methods:
+        set_load: Change the rate and bursts, and reset the counters.
+        tick: Emit the snapshots and bursts due since the last tick.
+        response: Get the next response of a method.
+        get_stats: Get the emitted counts and rates.
+    """
+
+    def __init__(
+        self,
+        emit_snapshot: Callable[[str], None],
+        emit_event: Callable[[str], None],
+        component_count: Optional[int] = None,
+        replay_path: Optional[str] = None,
+        rate: float = 10.0,
+        burst_size: int = 0,
+        burst_interval: float = 10.0,
+    ):
+        self._emit_snapshot = emit_snapshot
+        self._emit_event = emit_event
+        self.snapshots = []
+        self.events = []
+        self.responses = {}
+        self._response_index = {}
+        if replay_path is not None:
+            self._load_recording(replay_path)
+        else:
+            self._load_synthetic(component_count or 10)
+        self.set_load(rate, burst_size, burst_interval)
+
+    def _load_synthetic(self, component_count: int):
+        bench_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench"
+        )
+        if bench_path not in sys.path:
+            sys.path.insert(0, bench_path)
+        import synthetic
+
+        self.snapshots = [
+            synthetic.generate_snapshot(component_count, sequence)
+            for sequence in range(SNAPSHOT_VARIANTS)
+        ]
+        self.events = [[] for _ in self.snapshots]
+        config, categories, _ = synthetic.generate_config(component_count)
+        self.responses = {
+            "GetConfigAll": [config],
+            "GetCategories": [categories],
+            "GetConfig.Engines": [synthetic.generate_engine_config(component_count)],
+            "AlarmList": [
+                synthetic.generate_alarm_list(component_count, sequence)
+                for sequence in range(ALARM_LIST_VARIANTS)
+            ],
+            "SingleSnapshot": self.snapshots[:1],
+        }
+
+    def _load_recording(self, path: str):
+        pending_events = []
+        for record in read_stream(path):
+            signal = record["signal"]
+            if signal == SNAPSHOT_SIGNAL:
+                self.snapshots.append(record["payload"])
+                self.events.append([])
+            elif signal == EVENT_SIGNAL:
+                if self.events:
+                    self.events[-1].append(record["payload"])
+                else:
+                    pending_events.append(record["payload"])
+            else:
+                self.responses[signal] = [record["payload"]]
+        if not self.snapshots:
+            raise ValueError(f"No snapshots recorded in {path}")
+        # Events recorded before the first snapshot are replayed with it
+        self.events[0] = pending_events + self.events[0]
+
+    def set_load(self, rate: float, burst_size: int = 0, burst_interval: float = 10.0):
+        """
+        Change the snapshot rate and the alarm bursts, and reset the counters.
+
+        Args:
+            rate: Snapshots emitted per second.
+            burst_size: Alarm events emitted in each burst, 0 for none.
+            burst_interval: Seconds between two bursts.
+        """
+        self.rate = rate
+        self.burst_size = burst_size
+        self.burst_interval = burst_interval
+        self.snapshots_sent = 0
+        self.snapshots_skipped = 0
+        self.events_sent = 0
+        self._bursts_sent = 0
+        self._start = time.monotonic()
+
+    def tick(self) -> bool:
+        """
+        Emit the snapshots and bursts due since the load was set, to be called from a GLib timeout.
+
+        Returns:
+            bool: True, to keep the timeout running.
+        """
+        elapsed = time.monotonic() - self._start
+        due = int(elapsed * self.rate) - self.snapshots_sent - self.snapshots_skipped
+        max_due = max(1, int(self.rate * MAX_CATCH_UP_SECONDS))
+        if due > max_due:
+            # Skip what could not be sent in time rather than bursting it
+            self.snapshots_skipped += due - max_due
+            due = max_due
+        for _ in range(due):
+            index = self.snapshots_sent % len(self.snapshots)
+            self._emit_snapshot(stamp(self.snapshots[index], time.time_ns()))
+            self.snapshots_sent += 1
+            for event in self.events[index]:
+                self._emit_event(event)
+                self.events_sent += 1
+
+        next_burst = (self._bursts_sent + 1) * self.burst_interval
+        if self.burst_size > 0 and elapsed >= next_burst:
+            for _ in range(self.burst_size):
+                self._emit_event(ALARM_EVENT)
+            self.events_sent += self.burst_size
+            self._bursts_sent += 1
+        return True
+
+    def response(self, method: str) -> Optional[str]:
+        """
+        Get the next response of a method, cycling through its variants.
+
+        Returns:
+            Optional[str]: The response json string, None if the workload has none for the method.
+        """
+        variants = self.responses.get(method)
+        if not variants:
+            return None
+        index = self._response_index.get(method, 0)
+        self._response_index[method] = index + 1
+        return variants[index % len(variants)]
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get the configured and achieved snapshot rates and the emitted counts since the load was set.
+        """
+        elapsed = time.monotonic() - self._start
+        return {
+            "rate": self.rate,
+            "burst_size": self.burst_size,
+            "burst_interval": self.burst_interval,
+            "elapsed_s": elapsed,
+            "snapshots_sent": self.snapshots_sent,
+            "snapshots_skipped": self.snapshots_skipped,
+            "events_sent": self.events_sent,
+            "sent_rate": self.snapshots_sent / elapsed if elapsed > 0 else 0.0,
+        }
@@ -1,11 +1,14 @@
+import argparse
 import json
 import logging
 import time
+from typing import Optional
 import dbus
 import dbus.service
 import platform
 from dbus.mainloop.glib import DBusGMainLoop
 from gi.repository import GLib
+from load_generator import LoadGenerator
 from models.config import CONFIG_JSON_STRING
 
 DBusGMainLoop(set_as_default=True)
@@ -13,6 +16,8 @@ DBusGMainLoop(set_as_default=True)
 OPATH = "/org/navico/HubN2K"
 IFACE = "org.navico.HubN2K.czone"
 BUS_NAME = "org.navico.HubN2K"
+# Milliseconds between two ticks of the load generator, fine enough for 200 snapshots per second
+LOAD_TICK_INTERVAL = 5
 
 
 class N2KDBusSimulator(dbus.service.Object):
@@ -20,8 +25,10 @@ class N2KDBusSimulator(dbus.service.Object):
     get_devices_count: int
     get_state_count: int
     device_list: list
+    load_generator: Optional[LoadGenerator]
 
-    def __init__(self):
+    def __init__(self, bus_address: Optional[str] = None):
+        self.load_generator = None
         self.get_devices_count = 0
         self.get_state_count = 0
         self.initial = True
@@ -48,7 +55,9 @@ class N2KDBusSimulator(dbus.service.Object):
         # Retry loop for DBus bus and service registration
         while True:
             try:
-                if platform.system() == "Darwin":
+                if bus_address:
+                    bus = dbus.bus.BusConnection(bus_address)
+                elif platform.system() == "Darwin":
                     bus = dbus.SessionBus()
                 else:
                     bus = dbus.SystemBus()
@@ -84,8 +93,19 @@ class N2KDBusSimulator(dbus.service.Object):
 
         pass
 
+    def _load_response(self, method: str) -> Optional[str]:
+        """
+        Response of the load generator workload to a method, None when not generating load.
+        """
+        if self.load_generator is None:
+            return None
+        return self.load_generator.response(method)
+
     @dbus.service.method(dbus_interface=IFACE, in_signature="", out_signature="s")
     def AlarmList(self):
+        load_response = self._load_response("AlarmList")
+        if load_response is not None:
+            return load_response
         return json.dumps(
             {
                 "Alarms": [
@@ -128,10 +148,16 @@ class N2KDBusSimulator(dbus.service.Object):
 
     @dbus.service.method(dbus_interface=IFACE, in_signature="", out_signature="s")
     def GetConfigAll(self):
+        load_response = self._load_response("GetConfigAll")
+        if load_response is not None:
+            return load_response
         return CONFIG_JSON_STRING
 
     @dbus.service.method(dbus_interface=IFACE, in_signature="s", out_signature="s")
     def GetConfig(self, type: str):
+        load_response = self._load_response(f"GetConfig.{type}")
+        if load_response is not None:
+            return load_response
         if type == "Engines":
             return '{"Engines":[{"DisplayType":41,"Id":0,"NameUTF8":"Starboard Engine","Instance":{"Enabled":true,"Instance":0},"SoftwareId":"Software_Id_0","CalibrationId":"CalibrationId_0","SerialNumber":"TESTSERIAL","ECUSerialNumber":"TESTECU","EngineType":1}]}'
         elif type == "NonVisibleCircuits":
@@ -176,6 +202,9 @@ class N2KDBusSimulator(dbus.service.Object):
 
     @dbus.service.method(dbus_interface=IFACE, in_signature="s", out_signature="s")
     def GetSetting(self, type: str):
+        load_response = self._load_response(f"GetSetting.{type}")
+        if load_response is not None:
+            return load_response
         if type == "FactoryData":
             return '{"FactoryDataSettings":{"SerialNumber":"1234567890","RTFirmwareVersion":"1.0.0","MenderArtifactInfo":"1.2.3"}}'
 
@@ -185,6 +214,9 @@ class N2KDBusSimulator(dbus.service.Object):
 
     @dbus.service.method(dbus_interface=IFACE, in_signature="", out_signature="s")
     def GetCategories(self):
+        load_response = self._load_response("GetCategories")
+        if load_response is not None:
+            return load_response
         # Fill in below with categories
         return '{"Items":[{"NameUTF8":"Pumps","Index":12},{"NameUTF8":"Lighting","Index":10},{"NameUTF8":"Vessel Critical","Index":1},{"NameUTF8":"Electronics","Index":3},{"NameUTF8":"Power","Index":14},{"NameUTF8":"Navigation","Index":2},{"NameUTF8":"Communications","Index":5},{"NameUTF8":"Refrigeration","Index":15},{"NameUTF8":"Entertainment","Index":16},{"NameUTF8":"Accessories","Index":6},{"NameUTF8":"Fans/Ventilation","Index":9},{"NameUTF8":"House/Habitat"},{"NameUTF8":"Engine Management","Index":8},{"NameUTF8":"Vessel Management","Index":11},{"NameUTF8":"Propulsion Management","Index":13},{"NameUTF8":"24-Hour Circuits","Index":4},{"NameUTF8":"Indicators and Alarms","Index":7},{"NameUTF8":"Climate","Index":17},{"NameUTF8":"Appliances","Index":18},{"NameUTF8":"Shore Fuse","Index":28},{"NameUTF8":"Bilge Pumps","Index":29},{"NameUTF8":"Audio","Index":23},{"NameUTF8":"Fuel","Index":24},{"NameUTF8":"Water Tanks","Index":25},{"Index":26},{"Index":27},{"NameUTF8":"Other","Index":19}]}'
 
@@ -230,8 +262,39 @@ class N2KDBusSimulator(dbus.service.Object):
         except Exception as e:
             return '{"Result": "Error", "Message": "Invalid JSON"}'
 
+    @dbus.service.method(dbus_interface=IFACE, in_signature="s", out_signature="s")
+    def SetLoad(self, load_request: str):
+        """
+        Change the load generated, e.g. {"Rate": 50, "BurstSize": 20, "BurstInterval": 5}.
+        Only available when the simulator runs in load mode.
+        """
+        if self.load_generator is None:
+            return '{"Result": "Error", "Message": "Not in load mode"}'
+        try:
+            load_json = json.loads(load_request)
+            self.load_generator.set_load(
+                float(load_json["Rate"]),
+                int(load_json.get("BurstSize", 0)),
+                float(load_json.get("BurstInterval", 10.0)),
+            )
+            return '{"Result": "Ok"}'
+        except Exception as e:
+            return json.dumps({"Result": "Error", "Message": str(e)})
+
+    @dbus.service.method(dbus_interface=IFACE, in_signature="", out_signature="s")
+    def LoadStats(self):
+        """
+        Counts and rates of the load generated since it was last set.
+        """
+        if self.load_generator is None:
+            return "{}"
+        return json.dumps(self.load_generator.get_stats())
+
     @dbus.service.method(dbus_interface=IFACE, in_signature="", out_signature="s")
     def SingleSnapshot(self):
+        load_response = self._load_response("SingleSnapshot")
+        if load_response is not None:
+            return load_response
         snapshot = {
             "DC": {
                 "DC.6": {
@@ -397,11 +460,15 @@ class Main:
         log_handler.setFormatter(formatter)
         self.logger.addHandler(log_handler)
 
-    def run(self):
-        service = N2KDBusSimulator()
+    def run(self, args: argparse.Namespace):
+        service = N2KDBusSimulator(bus_address=args.bus_address)
         loop = GLib.MainLoop()
         self.logger.info("Service started. Press Ctrl+C to exit.")
 
+        if args.load:
+            self.run_load(service, loop, args)
+            return
+
         def emit_event():
             service.Event('{"Type": 1}')
             return True  # Repeat every interval
@@ -567,10 +634,87 @@ class Main:
         except KeyboardInterrupt:
             self.logger.info("Service stopped.")
 
+    def run_load(
+        self,
+        service: N2KDBusSimulator,
+        loop: GLib.MainLoop,
+        args: argparse.Namespace,
+    ):
+        """
+        Emit the load generator's snapshots and alarm bursts until stopped or the duration elapsed,
+        logging the achieved rate every 10 seconds.
+        """
+        service.load_generator = LoadGenerator(
+            service.Snapshot,
+            service.Event,
+            component_count=args.components,
+            replay_path=args.replay,
+            rate=args.rate,
+            burst_size=args.burst_size,
+            burst_interval=args.burst_interval,
+        )
+        self.logger.setLevel(logging.INFO)
+        self.logger.info(
+            "Generating load: %s snapshots/s, %s alarm events every %ss",
+            args.rate,
+            args.burst_size,
+            args.burst_interval,
+        )
+
+        def log_stats():
+            self.logger.info("Load: %s", service.load_generator.get_stats())
+            return True
+
+        GLib.timeout_add(LOAD_TICK_INTERVAL, service.load_generator.tick)
+        GLib.timeout_add_seconds(10, log_stats)
+        if args.duration > 0:
+            GLib.timeout_add_seconds(args.duration, loop.quit)
+
+        try:
+            loop.run()
+        except KeyboardInterrupt:
+            pass
+        self.logger.info("Service stopped. %s", service.load_generator.get_stats())
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="N2K DBus simulator")
+    parser.add_argument(
+        "--bus-address",
+        help="address of a private bus to use instead of the system or session bus",
+    )
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="generate snapshots at a configurable rate instead of the fixed payloads",
+    )
+    parser.add_argument(
+        "--components",
+        type=int,
+        default=10,
+        help="components of the generated configuration and snapshots in load mode",
+    )
+    parser.add_argument(
+        "--replay", help="stream file to replay in load mode instead of generating"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=10.0, help="snapshots per second in load mode"
+    )
+    parser.add_argument(
+        "--burst-size", type=int, default=0, help="alarm events in each burst"
+    )
+    parser.add_argument(
+        "--burst-interval", type=float, default=10.0, help="seconds between bursts"
+    )
+    parser.add_argument(
+        "--duration", type=int, default=0, help="seconds to run for, 0 for no limit"
+    )
+    return parser.parse_args()
+
 
 def main():
     main = Main()
-    main.run()
+    main.run(parse_args())
 
 
 if __name__ == "__main__":